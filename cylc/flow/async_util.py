@@ -16,7 +16,8 @@
 """Utilities for use with asynchronous code."""
 
 import asyncio
-from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
 from pathlib import Path
 
 import pyuv
@@ -24,6 +25,85 @@ import pyuv
 from cylc.flow import LOG
 
 
+BLOCKING_WORKERS = 4
+"""The size of the thread pool used to run blocking pipe functions."""
+
+_BLOCKING_EXECUTOR = None
+
+# markers passed through the results queue of a pipe
+_FILTERED = object()
+_END = object()
+
+
+def _get_blocking_executor():
+    """Return the thread pool used to run blocking pipe functions."""
+    global _BLOCKING_EXECUTOR
+    if _BLOCKING_EXECUTOR is None:
+        _BLOCKING_EXECUTOR = ThreadPoolExecutor(
+            max_workers=BLOCKING_WORKERS,
+            thread_name_prefix='cylc-pipe'
+        )
+    return _BLOCKING_EXECUTOR
+
+
+class _Batch:
+    """Run calls to a blocking function in batches on a thread pool.
+
+    Calls made in the same iteration of the event loop are split between (up
+    to) BLOCKING_WORKERS jobs on the thread pool which saves a thread hand-off
+    per call for cheap functions (e.g. stat calls) whilst still running the
+    calls in parallel.
+
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.pending = []
+
+    async def __call__(self, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self.pending:
+            loop.call_soon(self._flush, loop)
+        self.pending.append((future, args, kwargs))
+        return await future
+
+    def _flush(self, loop):
+        pending, self.pending = self.pending, []
+        size = -(-len(pending) // BLOCKING_WORKERS)  # (rounded up)
+        for ind in range(0, len(pending), size):
+            chunk = pending[ind:ind + size]
+            job = loop.run_in_executor(
+                _get_blocking_executor(), self._run, chunk)
+            job.add_done_callback(partial(self._done, chunk))
+
+    def _run(self, pending):
+        results = []
+        for _, args, kwargs in pending:
+            try:
+                results.append((self.func(*args, **kwargs), None))
+            except Exception as exc:
+                results.append((None, exc))
+        return results
+
+    @staticmethod
+    def _done(pending, job):
+        if job.cancelled():
+            results = [(None, asyncio.CancelledError())] * len(pending)
+        elif job.exception():
+            results = [(None, job.exception())] * len(pending)
+        else:
+            results = job.result()
+        for (future, _, _), (result, exc) in zip(pending, results):
+            if future.done():
+                # the caller has given up waiting
+                continue
+            if exc is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exc)
+
+
 class _AsyncPipe:
     """Implement the @pipe interface.
 
@@ -43,6 +123,9 @@ class _AsyncPipe:
         filter_stop (bool):
             If True then items which fail a filter will not get yielded.
             If False then they will get yielded immediately.
+        concurrency (int):
+            The maximum number of items this function may process at once,
+            None for no limit.
         preserve_order (bool):
             If True then this will behave like a "conventional" pipe i.e.
             first-in first-out.
@@ -51,6 +134,12 @@ class _AsyncPipe:
 
             Concurrency is the same for both options as results get cached
             in the first case.
+        max_items (int):
+            The maximum number of items which may be in the pipe at once
+            (being processed or waiting to be yielded), None for no limit.
+
+            When this limit is reached the generator at the start of the
+            pipe is paused until items have been consumed.
         _left (_AsyncPipe):
             The previous item in the pipe or None.
         _right (_AsyncPipe):
@@ -64,13 +153,17 @@ class _AsyncPipe:
             args=None,
             kwargs=None,
             filter_stop=True,
-            preserve_order=True
+            preserve_order=True,
+            concurrency=None,
+            max_items=100
     ):
         self.func = func
         self.args = args or ()
         self.kwargs = kwargs or {}
         self.filter_stop = filter_stop
         self.preserve_order = preserve_order
+        self.concurrency = concurrency
+        self.max_items = max_items
         self._left = None
         self._right = None
 
@@ -79,89 +172,101 @@ class _AsyncPipe:
         coros = self.__iter__()
         gen = next(coros)  # the generator we start the pipe with
         coros = list(coros)  # the coros to push data through
-        running = []  # list of running asyncio tasks
+        limits = [  # per-function concurrency limits
+            asyncio.Semaphore(coro.concurrency) if coro.concurrency else None
+            for coro in coros
+        ]
+        slots = None  # limits the number of items in the pipe
+        if self.max_items:
+            slots = asyncio.Semaphore(self.max_items)
+        running = set()  # set of running asyncio tasks
         completed = asyncio.Queue()  # queue of processed items to yield
+        # run the generator
+        generator = asyncio.create_task(
+            self._generate(gen, coros, limits, slots, running, completed)
+        )
         try:
-            # run the generator
-            running.append(
-                asyncio.create_task(
-                    self._generate(gen, coros, running, completed)
-                )
-            )
             # push the data through the pipe and yield results
             if self.preserve_order:
                 meth = self._ordered
             else:
                 meth = self._unordered
-            async for item in meth(running, completed):
+            async for item in meth(generator, slots, completed):
                 yield item
         finally:
             # tidy up after ourselves
-            for task in running:
+            generator.cancel()
+            for task in list(running):
                 task.cancel()
 
-    async def _ordered(self, running, completed):
+    async def _ordered(self, generator, slots, completed):
         """The classic first-in first-out pipe behaviour."""
         cache = {}  # cache of results {index: result}
-        skip_cache = []  # list of results which have been filtered out
-        yield_ind = 0  # the result index used when preserve_order == True
-
-        while cache or running or not completed.empty():
-            # cache any completed items
-            if not completed.empty():
-                ind, item = await completed.get()
-                # add the item to the cache so we can yield in order
-                cache[ind] = item
-            # skip over any results which have been filtered out
-            while yield_ind in skip_cache:
-                skip_cache.remove(yield_ind)
-                yield_ind += 1
-            # yield any cached results
+        yield_ind = 0  # the index of the next result to yield
+        total = None  # the number of items generated
+
+        while total is None or yield_ind < total:
+            ind, item = await completed.get()
+            if item is _END:
+                generator.result()  # raise any error from the generator
+                total = ind
+                continue
+            # add the item to the cache so we can yield in order
+            cache[ind] = item
+            # yield any cached results, skipping those filtered out
             while yield_ind in cache:
-                yield cache.pop(yield_ind)
+                item = cache.pop(yield_ind)
                 yield_ind += 1
-            # process completed tasks
-            for task in running:
-                if task.done():
-                    running.remove(task)
-                    ind = task.result()
-                    if ind is not None:
-                        # this item has been filtered out
-                        skip_cache.append(ind)
-
-            await asyncio.sleep(0)  # don't allow this loop to block
-
-    async def _unordered(self, running, completed):
+                if item is not _FILTERED:
+                    yield item
+                if slots:
+                    slots.release()
+
+    async def _unordered(self, generator, slots, completed):
         """The optimal yield items as they are processed behaviour."""
-        while running or not completed.empty():
-            # return any completed items
-            if not completed.empty():
-                _, item = await completed.get()
+        count = 0  # the number of items out of the pipe
+        total = None  # the number of items generated
+
+        while total is None or count < total:
+            ind, item = await completed.get()
+            if item is _END:
+                generator.result()  # raise any error from the generator
+                total = ind
+                continue
+            count += 1
+            if item is not _FILTERED:
                 yield item
-            # process completed tasks
-            for task in running:
-                if task.done():
-                    running.remove(task)
+            if slots:
+                slots.release()
 
-            await asyncio.sleep(0)  # don't allow this loop to block
-
-    async def _generate(self, gen, coros, running, completed):
+    async def _generate(self, gen, coros, limits, slots, running, completed):
         """Pull data out of the generator."""
         ind = 0
-        async for item in gen.func(*gen.args, **gen.kwargs):
-            running.append(
-                asyncio.create_task(
-                    self._chain((ind, item), coros, completed)
+        try:
+            async for item in gen.func(*gen.args, **gen.kwargs):
+                if slots:
+                    # wait for room in the pipe
+                    await slots.acquire()
+                task = asyncio.create_task(
+                    self._chain((ind, item), coros, limits, completed)
                 )
-            )
-            ind += 1
+                running.add(task)
+                task.add_done_callback(running.discard)
+                ind += 1
+        finally:
+            completed.put_nowait((ind, _END))
 
-    async def _chain(self, item, coros, completed):
+    async def _chain(self, item, coros, limits, completed):
         """Push data through the coroutine pipe."""
         ind, item = item
-        for coro in coros:
+        for coro, limit in zip(coros, limits):
             try:
-                ret = await coro.func(item, *coro.args, **coro.kwargs)
+                if limit:
+                    async with limit:
+                        ret = await coro.func(
+                            item, *coro.args, **coro.kwargs)
+                else:
+                    ret = await coro.func(item, *coro.args, **coro.kwargs)
             except Exception as exc:
                 # if something goes wrong log the error and skip the item
                 LOG.warning(exc)
@@ -171,18 +276,19 @@ class _AsyncPipe:
                 continue
             elif ret is False and coro.filter_stop:
                 # filter failed -> stop
-                return ind
+                item = _FILTERED
+                break
             elif ret is False:
                 # filter failed but pipe configured to yield -> stop + yield
                 break
             else:
                 # returned an object -> continue
                 item = ret
-        await completed.put((ind, item))
+        completed.put_nowait((ind, item))
 
     def __or__(self, other):
         if isinstance(other, _PipeFunction):
-            other = _AsyncPipe(other.func)
+            other = other._pipe()
         other._left = self
         self.fastforward()._right = other
         # because we return self we only need __or__ not __ror__
@@ -232,42 +338,49 @@ class _PipeFunction:
 
     """
 
-    def __init__(self, func, preproc=None):
+    def __init__(self, func, preproc=None, concurrency=None, blocking=False):
+        if blocking:
+            func = wraps(func)(_Batch(func))
         self.func = func
         self.preproc = preproc
+        self.concurrency = concurrency
 
     def __call__(self, *args, filter_stop=True, **kwargs):
         # assign args/kwargs to a function in a pipe
         if self.preproc:
             args, kwargs = self.preproc(*args, **kwargs)
+        return self._pipe(args, kwargs, filter_stop)
+
+    def _pipe(self, args=None, kwargs=None, filter_stop=True):
         return _AsyncPipe(
             self.func,
             args,
             kwargs,
-            filter_stop
+            filter_stop,
+            concurrency=self.concurrency
         )
 
     def __or__(self, other):
-        this = _AsyncPipe(self.func)
+        this = self._pipe()
         return this | other
 
     async def __aiter__(self):
         # this permits pipes with only one step
-        async for item in _AsyncPipe(self.func):
+        async for item in self._pipe():
             yield item
 
     def __str__(self):
-        return _AsyncPipe(self.func).__str__()
+        return self._pipe().__str__()
 
     def __repr__(self):
-        return _AsyncPipe(self.func).__repr__()
+        return self._pipe().__repr__()
 
     @property
     def __doc__(self):
         return self.func.__doc__
 
 
-def pipe(func=None, preproc=None):
+def pipe(func=None, preproc=None, concurrency=None, blocking=False):
     """An asynchronous pipe implementation in pure Python.
 
     Use this to decorate async functions in order to arrange them into
@@ -275,9 +388,10 @@ def pipe(func=None, preproc=None):
     stages of the pipe simultaneously by doing what processing it can whilst
     waiting on IO to take place in the background.
 
-    Async pipes perform maximum concurrency running as far ahead as they can.
-    Don't use for cases where you only want the first N items as the pipe may
-    process items outside of this window.
+    Async pipes run as far ahead as they can, up to a limit on the number of
+    items in the pipe at once (see "Back Pressure" below). Don't use for cases
+    where you only want the first N items as the pipe may process items
+    outside of this window.
 
     Args:
         func (callable):
@@ -287,6 +401,14 @@ def pipe(func=None, preproc=None):
             provided to a function when the pipe is created.
 
             preproc(args: tuple, kwargs: dict) -> (args: tuple, kwargs: dict)
+        concurrency (int):
+            The maximum number of items this function may process at once.
+            Use this to limit resource usage, e.g. open files or network
+            connections.
+        blocking (bool):
+            Set for regular (non-async) functions which block, e.g. on
+            filesystem operations. The function will be run on a thread pool
+            (calls are batched together to save on thread hand-offs).
 
     Example:
         A generator to begin our pipe with:
@@ -340,6 +462,16 @@ def pipe(func=None, preproc=None):
             pipe = arange | even
             pipe.preserve_order = False
 
+    Back Pressure
+        To avoid creating an unbounded number of tasks, the generator at the
+        start of the pipe is paused when there are ``max_items`` items in the
+        pipe (default 100). Items leave the pipe when they are filtered out
+        or when the consumer requests the next item after them so a slow
+        consumer slows down the pipe::
+
+            pipe = arange | even
+            pipe.max_items = 10
+
     Providing Arguments To Functions:
         The first function in the pipe will receive no data. All subsequent
         functions will receive the result of the previous function
@@ -376,19 +508,13 @@ def pipe(func=None, preproc=None):
             pipe = generator | filter(filter_stop=False) | function
 
     """
-    if preproc and not func:
-        # @pipe(preproc=x)
-        def _pipe(func):
-            nonlocal preproc
-            return _PipeFunction(func, preproc)
-        return _pipe
-    elif func:
+    if func:
         # @pipe
         return _PipeFunction(func)
     else:
-        # @pipe()
+        # @pipe() / @pipe(preproc=x, ...)
         def _pipe(func):
-            return _PipeFunction(func)
+            return _PipeFunction(func, preproc, concurrency, blocking)
         return _pipe
 
 
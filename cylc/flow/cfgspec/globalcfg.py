@@ -320,7 +320,8 @@ with Conf('global.cylc', desc='''
             Configuration of the Cylc Scheduler's main loop.
         '''):
             Conf('plugins', VDR.V_STRING_LIST,
-                 ['health check', 'prune flow labels'], desc='''
+                 ['health check', 'prune flow labels', 'log structure sizes'],
+                 desc='''
                 Configure the default main loop plugins to use when
                 starting up new workflows.
             ''')
@@ -346,6 +347,14 @@ with Conf('global.cylc', desc='''
                     The interval with which this plugin is run.
                 ''')
 
+            with Conf('log structure sizes', meta=MainLoopPlugin, desc='''
+                Log the number of items and estimated size of major
+                scheduler structures.
+            '''):
+                Conf('interval', VDR.V_INTERVAL, DurationFloat(600), desc='''
+                    The interval with which this plugin is run.
+                ''')
+
         with Conf('logging', desc='''
             The workflow event log, held under the workflow run directory, is
             maintained as a rolling archive. Logs are rolled over (backed up
@@ -424,6 +433,23 @@ with Conf('global.cylc', desc='''
                 ``loadleveler``...
             ''')
             Conf('job runner command template', VDR.V_STRING)
+            Conf('job runner status cache', VDR.V_INTERVAL, DurationFloat(0),
+                 desc='''
+                How long the list of a user's jobs in the job runner may be
+                re-used when polling jobs on a host of this platform.
+
+                By default each job poll queries the job runner for the jobs
+                being polled. With many workflows on one host this can mean
+                many redundant queries. If set, the first poll queries the
+                job runner for all of the user's jobs and saves the result
+                on the job host, later polls by any of the user's workflows
+                use it until it is this old. Jobs missing from the saved
+                list (e.g. submitted since) are queried as before.
+
+                Only supported by job runners which can list all of a
+                user's jobs (``slurm`` and ``sge``). Set to ``PT0S`` to
+                disable.
+            ''')
             Conf('shell', VDR.V_STRING, '/bin/bash')
             Conf('communication method',
                  VDR.V_STRING, 'zmq',
@@ -473,6 +499,25 @@ with Conf('global.cylc', desc='''
 
                    5*PT1M, 10*PT5M
             ''')
+            Conf('adaptive execution polling', VDR.V_BOOLEAN, False, desc='''
+                Base the polling of running jobs on how long previous jobs of
+                the same task took to run.
+
+                Once a task has succeeded at least once, its execution polling
+                intervals are replaced:
+
+                * If task messaging is working for this platform, jobs are
+                  first polled once they have run for longer than any previous
+                  job, to catch jobs which have died without reporting.
+                * Otherwise (e.g. the ``poll`` communication method, or a poll
+                  has found a job started or succeeded before it reported it)
+                  jobs are polled just after the typical run times of previous
+                  jobs, to find out they have finished.
+
+                In both cases, polling then continues at the last of the
+                execution polling intervals. Polling after any execution time
+                limit is unchanged.
+            ''')
             Conf('execution time limit polling intervals',
                  VDR.V_INTERVAL_LIST, desc='''
                 The intervals between polling after a task job (submitted to
@@ -492,6 +537,22 @@ with Conf('global.cylc', desc='''
                 with some initial options or a command that implements a
                 similar interface to ``ssh``.
             ''')
+            Conf('ssh control persist', VDR.V_INTERVAL, DurationFloat(600),
+                 desc='''
+                How long the scheduler keeps a shared SSH connection to a
+                host of this platform open after its last use.
+
+                Rather than open a new SSH connection for each job
+                submission, poll or kill command, the scheduler keeps a
+                master connection open to each host and runs these commands
+                over it (see ``ControlMaster`` in ``ssh_config(5)``). This
+                requires ``ssh command`` to be OpenSSH.
+
+                The master is run with ``ControlPersist`` set to this too,
+                so it closes by itself if the scheduler is killed.
+
+                Set to ``PT0S`` to open a new connection for each command.
+            ''')
             Conf('use login shell', VDR.V_BOOLEAN, True, desc='''
                 Whether to use a login shell or not for remote command
                 invocation. By default cylc runs remote ssh commands using a
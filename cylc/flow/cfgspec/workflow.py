@@ -441,6 +441,51 @@ with Conf(
                the workflow from stalling.
         ''')
 
+        Conf('queue manager', VDR.V_STRING, 'independent', desc='''
+            The algorithm used to release tasks from the internal queues
+            configured below.
+
+            ``independent``
+               Each task belongs to one queue. Each queue releases tasks in
+               the order they were queued, while the number of active tasks
+               in the queue is below its limit.
+            ``priority``
+               As ``independent``, but each queue releases tasks in the order
+               given by ``[scheduling]queue priority``, and the total number
+               of active tasks can be limited by
+               ``[scheduling]active task limit``, with capacity shared
+               between queues according to their ``share``.
+
+            Other queue managers can be provided by installing packages
+            which register them under the ``cylc.task_queues`` entry point.
+        ''')
+
+        Conf('queue priority', VDR.V_STRING_LIST,
+             ['priority', 'cycle point', 'critical path'], desc='''
+            For the ``priority`` queue manager, the order of precedence of
+            the items by which queued tasks are prioritised:
+
+            ``priority``
+               The ``priority`` of the queue the task belongs to (highest
+               first).
+            ``cycle point``
+               The cycle point of the task (earliest first).
+            ``critical path``
+               The number of tasks in the longest chain of dependence, within
+               the cycle, from the task in the graph (longest first).
+
+            Tasks which are equal on all items are released in the order they
+            were queued.
+        ''')
+        Conf('active task limit', VDR.V_INTEGER, 0, desc='''
+            For the ``priority`` queue manager, the maximum number of active
+            tasks across all queues (zero means no limit).
+
+            Under this limit each queue is given capacity in proportion to its
+            ``share``: the next task is released from the queue with the
+            fewest active tasks per share.
+        ''')
+
         with Conf('queues', desc='''
             Configuration of internal queues, by which the number of
             simultaneously active tasks (submitted or running) can be limited,
@@ -455,6 +500,14 @@ with Conf(
                     time, for this queue.
                 ''')
                 Conf('members', VDR.V_STRING_LIST, desc='All tasks.''')
+                Conf('priority', VDR.V_INTEGER, 0, desc='''
+                    For the ``priority`` queue manager, the priority of tasks
+                    in this queue, higher first.
+                ''')
+                Conf('share', VDR.V_INTEGER, 1, desc='''
+                    For the ``priority`` queue manager, the relative share of
+                    the ``[scheduling]active task limit`` for this queue.
+                ''')
 
             with Conf('<queue name>', desc='''
                 Section heading for configuration of a single queue.
@@ -468,6 +521,14 @@ with Conf(
                     this queue (assigned tasks will automatically be removed
                     from the default queue).
                 ''')
+                Conf('priority', VDR.V_INTEGER, 0, desc='''
+                    For the ``priority`` queue manager, the priority of tasks
+                    in this queue, higher first.
+                ''')
+                Conf('share', VDR.V_INTEGER, 1, desc='''
+                    For the ``priority`` queue manager, the relative share of
+                    the ``[scheduling]active task limit`` for this queue.
+                ''')
 
         with Conf('special tasks', desc='''
             This section is used to identify tasks with special behaviour.
@@ -1652,3 +1713,13 @@ class RawWorkflowConfig(ParsecConfig):
         ParsecConfig.__init__(
             self, SPEC, upg, output_fname, tvars, cylc_config_validate)
         self.loadcfg(fpath, "workflow definition")
+
+    def __getstate__(self):
+        """Pickle without the (module level) spec."""
+        state = dict(self.__dict__)
+        del state['spec']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.spec = SPEC
@@ -26,9 +26,12 @@ Do some consistency checking, then construct task proxy objects and graph
 structures.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 import contextlib
 from copy import copy
 from fnmatch import fnmatchcase
+from functools import partial
+from multiprocessing import get_all_start_methods, get_context
 import os
 import re
 import traceback
@@ -42,7 +45,7 @@ from metomi.isodatetime.exceptions import IsodatetimeError
 from metomi.isodatetime.timezone import get_local_time_zone_format
 from metomi.isodatetime.dumpers import TimePointDumper
 from cylc.flow.parsec.OrderedDict import OrderedDictWithDefaults
-from cylc.flow.parsec.util import replicate
+from cylc.flow.parsec.util import poverlay, replicate, unshare
 
 from cylc.flow import LOG
 from cylc.flow.c3mro import C3
@@ -54,6 +57,7 @@ from cylc.flow.graph_parser import GraphParser
 from cylc.flow.param_expand import NameExpander
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.cfgspec.workflow import RawWorkflowConfig
+from cylc.flow import config_cache
 from cylc.flow.cycling.loader import (
     get_point, get_point_relative, get_interval, get_interval_cls,
     get_sequence, get_sequence_cls, init_cyclers, get_dump_format,
@@ -136,6 +140,35 @@ def interpolate_template(tmpl, params_dict):
         raise ParamExpandError('bad template syntax')
 
 
+def parse_graph(family_map, parameters, graph):
+    """Parse a graph section.
+
+    Returns:
+        tuple - (triggers, original, workflow_state_polling_tasks), see
+        GraphParser.
+
+    """
+    parser = GraphParser(family_map, parameters)
+    parser.parse_graph(graph)
+    return (
+        parser.triggers, parser.original, parser.workflow_state_polling_tasks)
+
+
+# (family_map, parameters) for parsing graph sections in worker processes.
+_graph_parser_args: Tuple[Any, ...] = ()
+
+
+def _init_graph_parser(family_map, parameters):
+    """Initialise a worker process for parsing graph sections."""
+    global _graph_parser_args
+    _graph_parser_args = (family_map, parameters)
+
+
+def _parse_graph_section(graph):
+    """Parse a graph section in a worker process."""
+    return parse_graph(*_graph_parser_args, graph)
+
+
 # TODO: separate config for run and non-run purposes?
 
 
@@ -143,6 +176,8 @@ class WorkflowConfig:
     """Class for workflow configuration items and derived quantities."""
 
     CHECK_CIRCULAR_LIMIT = 100  # If no. tasks > this, don't check circular
+    # Parse graph sections in parallel if there are more characters than this.
+    GRAPH_PARALLEL_MIN_SIZE = 100000
     VIS_N_POINTS = 3
 
     def __init__(
@@ -161,9 +196,8 @@ class WorkflowConfig:
         share_dir: Optional[str] = None
     ) -> None:
 
-        self.mem_log = mem_log_func
-        if self.mem_log is None:
-            self.mem_log = lambda x: None
+        self.mem_log: Callable[[str], None] = (
+            mem_log_func or (lambda x: None))
         self.mem_log("config.py:config.py: start init config")
         self.workflow = workflow  # workflow name
         self.fpath = fpath  # workflow definition
@@ -181,9 +215,10 @@ class WorkflowConfig:
         self.initial_point: Optional['PointBase'] = None
         self.start_point: Optional['PointBase'] = None
         self.final_point: Optional['PointBase'] = None
-        self.clock_offsets = {}
-        self.expiration_offsets = {}
-        self.ext_triggers = {}  # Old external triggers (client/server)
+        self.clock_offsets: Dict[str, 'IntervalBase'] = {}
+        self.expiration_offsets: Dict[str, 'IntervalBase'] = {}
+        # Old external triggers (client/server)
+        self.ext_triggers: Dict[str, str] = {}
         self.xtrigger_mgr = xtrigger_mgr
         self.workflow_polling_tasks = {}  # type: ignore # TODO figure out type
 
@@ -211,20 +246,42 @@ class WorkflowConfig:
             'first-parent descendants': {},
         }
         # tasks
-        self.leaves = []  # TODO figure out type
+        self.leaves: List[str] = []
         # one up from root
         self.feet = []  # type: ignore # TODO figure out type
 
+        # xtriggers used in the graph
+        self.xtriggers: Dict[str, SubFuncContext] = {}
+
         # Export local environmental workflow context before config parsing.
         self.process_workflow_env()
 
+        if output_fname:
+            output_fname = os.path.expandvars(output_fname)
+        if not config_cache.is_enabled():
+            self._process(template_vars, output_fname)
+            return
+        cache = config_cache.ConfigCache(self, template_vars, output_fname)
+        state = cache.load()
+        if state is not None:
+            self._restore(state)
+            self.mem_log("config.py: end init config (from cache)")
+            return
+        with cache.record():
+            self._process(template_vars, output_fname)
+        cache.dump()
+
+    def _process(
+        self,
+        template_vars: Optional[Mapping[str, Any]],
+        output_fname: Optional[str]
+    ) -> None:
+        """Parse, validate and process the workflow configuration."""
         # parse, upgrade, validate the workflow, but don't expand with default
         # items
         self.mem_log("config.py: before RawWorkflowConfig init")
-        if output_fname:
-            output_fname = os.path.expandvars(output_fname)
         self.pcfg = RawWorkflowConfig(
-            fpath,
+            self.fpath,
             output_fname,
             template_vars
         )
@@ -467,13 +524,15 @@ class WorkflowConfig:
                         "external triggers must be used only once.")
 
         self.leaves = self.get_task_name_list()
+        feet = set()
         for ancestors in self.runtime['first-parent ancestors'].values():
             try:
                 foot = ancestors[-2]  # one back from 'root'
             except IndexError:
                 pass
             else:
-                if foot not in self.feet:
+                if foot not in feet:
+                    feet.add(foot)
                     self.feet.append(foot)
 
         # Replace workflow and task name in workflow and task URLs.
@@ -489,7 +548,7 @@ class WorkflowConfig:
         self.cfg['meta']['URL'] = RE_WORKFLOW_NAME_VAR.sub(
             self.workflow, self.cfg['meta']['URL'])
         for name, cfg in self.cfg['runtime'].items():
-            cfg['meta']['URL'] = cfg['meta']['URL'] % {
+            url = cfg['meta']['URL'] % {
                 'workflow_name': self.workflow, 'task_name': name}
             # BACK COMPAT: CYLC_WORKFLOW_NAME, CYLC_TASK_NAME
             # from:
@@ -498,10 +557,11 @@ class WorkflowConfig:
             #     Cylc8
             # remove at:
             #     Cylc9
-            cfg['meta']['URL'] = RE_WORKFLOW_NAME_VAR.sub(
-                self.workflow, cfg['meta']['URL'])
-            cfg['meta']['URL'] = RE_TASK_NAME_VAR.sub(
-                name, cfg['meta']['URL'])
+            url = RE_WORKFLOW_NAME_VAR.sub(self.workflow, url)
+            url = RE_TASK_NAME_VAR.sub(name, url)
+            if url != cfg['meta']['URL']:
+                # (the inherited section may be shared with other tasks)
+                unshare(cfg, 'meta')['URL'] = url
 
         if getattr(self.options, 'is_validate', False):
             self.mem_log("config.py: before _check_circular()")
@@ -510,6 +570,25 @@ class WorkflowConfig:
 
         self.mem_log("config.py: end init config")
 
+    def _restore(self, state: Dict[str, Any]) -> None:
+        """Restore a processed configuration loaded from the cache.
+
+        Repeats the side effects of "_process".
+        """
+        self.__dict__.update(state)
+        set_utc_mode(self.cfg['scheduler']['UTC mode'])
+        init_cyclers(self.cfg)
+        if self.options is not None and (
+            getattr(self.options, 'fcp', None) == 'ignore'
+        ):
+            self.options.fcp = None
+        self.process_config_env()
+        for label, xtrig in self.xtriggers.items():
+            if self.xtrigger_mgr is None:
+                XtriggerManager.validate_xtrigger(label, xtrig, self.fdir)
+            else:
+                self.xtrigger_mgr.add_trig(label, xtrig, self.fdir)
+
     def prelim_process_graph(self) -> None:
         """Ensure graph is not empty; set integer cycling mode and icp/fcp = 1
         for simplest "R1 = foo" type graphs.
@@ -1022,11 +1101,23 @@ class WorkflowConfig:
     def compute_inheritance(self):
         LOG.debug("Parsing the runtime namespace hierarchy")
 
-        # TODO: Note an unused alternative mechanism was removed here
-        # (March 2020). It stored the result of each completed MRO and
-        # re-used these wherever possible. This could be more efficient
-        # for full namespaces in deep hierarchies. We should go back and
-        # look if inheritance computation becomes a problem.
+        # Each namespace result is the one for its linearized MRO less
+        # itself, overlaid with its own config. Results are memoized by MRO
+        # (from root) and overlays share the sections they don't set with
+        # the result they overlay, so namespaces with common ancestry (e.g.
+        # parameterized tasks) share most of their inherited config.
+        mro_results = {(): OrderedDictWithDefaults()}
+
+        def get_mro_result(hierarchy):
+            try:
+                return mro_results[hierarchy]
+            except KeyError:
+                result = poverlay(
+                    get_mro_result(hierarchy[:-1]),
+                    self.cfg['runtime'][hierarchy[-1]]
+                )
+                mro_results[hierarchy] = result
+                return result
 
         results = OrderedDictWithDefaults()
 
@@ -1035,26 +1126,12 @@ class WorkflowConfig:
         nses.sort(key=lambda ns: ns != 'root')
         for ns in nses:
             # for each namespace ...
-
-            hierarchy = copy(self.runtime['linearized ancestors'][ns])
-            hierarchy.reverse()
-
-            result = OrderedDictWithDefaults()
-
-            # Go up the linearized MRO from root, replicating or
-            # overriding each namespace element as we go.
-            for name in hierarchy:
-                replicate(result, self.cfg['runtime'][name])
-                # n_reps += 1
-
-            results[ns] = result
+            results[ns] = get_mro_result(
+                tuple(reversed(self.runtime['linearized ancestors'][ns])))
 
         # replace pre-inheritance namespaces with the post-inheritance result
         self.cfg['runtime'] = results
 
-        # uncomment this to compare the simple and efficient methods
-        # print '  Number of namespace replications:', n_reps
-
     # def print_inheritance(self):
     #     # (use for debugging)
     #     for foo in self.runtime:
@@ -1168,7 +1245,8 @@ class WorkflowConfig:
                 sleep_sec + DurationParser().parse(str(
                     rtc['simulation']['time limit buffer'])).get_seconds()
             )
-            rtc['job']['simulated run length'] = sleep_sec
+            # (inherited sections may be shared with other tasks)
+            unshare(rtc, 'job')['simulated run length'] = sleep_sec
 
             # Generate dummy scripting.
             rtc['init-script'] = ""
@@ -1191,7 +1269,7 @@ class WorkflowConfig:
             # All Cylc 7 config items which conflict with platform are removed.
             for section, key, _ in FORBIDDEN_WITH_PLATFORM:
                 if (section in rtc and key in rtc[section]):
-                    rtc[section][key] = None
+                    unshare(rtc, section)[key] = None
             rtc['platform'] = 'localhost'
 
             # Disable environment, in case it depends on env-script.
@@ -1211,7 +1289,7 @@ class WorkflowConfig:
                 # (And [] for "fail no points".)
                 for point_str in f_pts_orig:
                     f_pts.append(get_point(point_str).standardise())
-            rtc['simulation']['fail cycle points'] = f_pts
+            unshare(rtc, 'simulation')['fail cycle points'] = f_pts
 
     def get_parent_lists(self):
         return self.runtime['parents']
@@ -1467,9 +1545,9 @@ class WorkflowConfig:
                 self.implicit_tasks.add(name)
                 # These can't just be a reference to root runtime as we have to
                 # make some items task-specific: e.g. subst task name in URLs.
-                self.cfg['runtime'][name] = OrderedDictWithDefaults()
-                replicate(self.cfg['runtime'][name],
-                          self.cfg['runtime']['root'])
+                # (But they can share its sections.)
+                self.cfg['runtime'][name] = poverlay(
+                    self.cfg['runtime']['root'], None)
                 if 'root' not in self.runtime['descendants']:
                     # (happens when no runtimes are defined in flow.cylc)
                     self.runtime['descendants']['root'] = []
@@ -1614,6 +1692,7 @@ class WorkflowConfig:
                 XtriggerManager.validate_xtrigger(label, xtrig, self.fdir)
             else:
                 self.xtrigger_mgr.add_trig(label, xtrig, self.fdir)
+            self.xtriggers[label] = xtrig
             self.taskdefs[right].add_xtrig_label(label, seq)
 
     def get_actual_first_point(self, start_point):
@@ -1895,27 +1974,60 @@ class WorkflowConfig:
             else:
                 sections.append((section, value))
 
+        # Parse the graph sections, in worker processes if the graph is large.
+        # (The results are processed in section order either way.)
+        executor = None
+        if (
+            len(sections) > 1
+            and sum(len(graph) for _, graph in sections) > (
+                self.GRAPH_PARALLEL_MIN_SIZE)
+            and (os.cpu_count() or 1) > 1
+        ):
+            executor = ProcessPoolExecutor(
+                min(len(sections), os.cpu_count() or 1),
+                # (don't fork, this may be a multithreaded scheduler)
+                mp_context=get_context(
+                    'forkserver'
+                    if 'forkserver' in get_all_start_methods()
+                    else 'spawn'
+                ),
+                initializer=_init_graph_parser,
+                initargs=(family_map, self.parameters)
+            )
+            results = [
+                executor.submit(_parse_graph_section, graph).result
+                for _, graph in sections
+            ]
+        else:
+            results = [
+                partial(parse_graph, family_map, self.parameters, graph)
+                for _, graph in sections
+            ]
+
         # Parse and process each graph section.
         task_triggers = {}
-        for section, graph in sections:
-            try:
-                seq = get_sequence(section, icp, fcp)
-            except (AttributeError, TypeError, ValueError, CylcError) as exc:
-                if cylc.flow.flags.verbosity > 1:
-                    traceback.print_exc()
-                msg = 'Cannot process recurrence %s' % section
-                msg += ' (initial cycle point=%s)' % icp
-                msg += ' (final cycle point=%s)' % fcp
-                if isinstance(exc, CylcError):
-                    msg += ' %s' % exc.args[0]
-                raise WorkflowConfigError(msg)
-            self.sequences.append(seq)
-            parser = GraphParser(family_map, self.parameters)
-            parser.parse_graph(graph)
-            self.workflow_polling_tasks.update(
-                parser.workflow_state_polling_tasks)
-            self._proc_triggers(
-                parser.triggers, parser.original, seq, task_triggers)
+        try:
+            for (section, _), result in zip(sections, results):
+                try:
+                    seq = get_sequence(section, icp, fcp)
+                except (
+                    AttributeError, TypeError, ValueError, CylcError
+                ) as exc:
+                    if cylc.flow.flags.verbosity > 1:
+                        traceback.print_exc()
+                    msg = 'Cannot process recurrence %s' % section
+                    msg += ' (initial cycle point=%s)' % icp
+                    msg += ' (final cycle point=%s)' % fcp
+                    if isinstance(exc, CylcError):
+                        msg += ' %s' % exc.args[0]
+                    raise WorkflowConfigError(msg)
+                self.sequences.append(seq)
+                triggers, original, workflow_polling_tasks = result()
+                self.workflow_polling_tasks.update(workflow_polling_tasks)
+                self._proc_triggers(triggers, original, seq, task_triggers)
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         # Detect use of xtrigger names with '@' prefix (creates a task).
         overlap = set(self.taskdefs.keys()).intersection(
@@ -0,0 +1,350 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""On-disk cache of processed workflow configurations.
+
+Processing a workflow configuration (templating, parsing, validation, runtime
+inheritance, graph parsing) can take a long time for large workflows but the
+result depends only on:
+
+* The files in the workflow source directory (the ``flow.cylc`` file, include
+  files and any Python modules used by templating).
+* The template variables and any environment variables read by Jinja2.
+* The global configuration.
+* The command line options which affect the configuration.
+* The versions of Cylc (and Python) doing the processing.
+
+If ``CYLC_CONFIG_CACHE=true`` is set in the environment, the processed
+:py:class:`cylc.flow.config.WorkflowConfig` is pickled to
+``$XDG_CACHE_HOME/cylc/config/`` (default ``~/.cache/cylc/config/``) and is
+unpickled in place of processing the workflow again if none of the above have
+changed. Like Python's ``.pyc`` files, source files are compared by size and
+modification time rather than content.
+
+Limitations:
+
+* Files outside of the workflow source directory (e.g. absolute include paths
+  or files read by ``cylc.pre_configure`` plugins) are not tracked.
+* Configurations which depend on the current time (e.g.
+  ``initial cycle point = now``) are not cached.
+
+"""
+
+from contextlib import contextmanager, suppress
+from functools import lru_cache
+import gc
+from hashlib import sha256
+import logging
+import os
+from pathlib import Path
+import pickle
+import sys
+from tempfile import NamedTemporaryFile
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional, Tuple)
+
+from metomi.isodatetime.timezone import get_local_time_zone_format
+
+from cylc.flow import LOG, __version__ as CYLC_VERSION, iter_entry_points
+from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
+import cylc.flow.flags
+
+if TYPE_CHECKING:
+    from cylc.flow.config import WorkflowConfig
+
+
+ENV_CONFIG_CACHE = 'CYLC_CONFIG_CACHE'
+
+# WorkflowConfig attributes which are provided by the caller, not cached.
+EXCLUDE_ATTRS = frozenset({'options', 'xtrigger_mgr', 'mem_log'})
+
+# Command line options which affect the processed configuration.
+CONFIG_OPTIONS = (
+    'icp', 'startcp', 'fcp', 'utc_mode', 'cycle_point_tz', 'run_mode',
+    'is_validate', 'check_circular',
+)
+
+# Options which the configuration sets if it depends on the current time.
+TIME_OPTIONS = ('icp', 'startcp')
+
+# Run directory contents which cannot affect the configuration.
+IGNORE_DIRS = frozenset({'log', 'share', 'work'})
+
+# Template variables added by Cylc when processing the configuration.
+CYLC_TEMPLATE_VARS = frozenset({'CYLC_VERSION', 'CYLC_TEMPLATE_VARS'})
+
+# Stands for the template variables dictionary, which includes itself.
+_TEMPLATE_VARS = '<template variables>'
+
+
+def is_enabled() -> bool:
+    """Return True if the configuration cache is turned on."""
+    return os.getenv(ENV_CONFIG_CACHE, '').lower() in {'true', '1'}
+
+
+def get_cache_dir() -> Path:
+    """Return the directory which holds cached configurations."""
+    return Path(
+        os.getenv('XDG_CACHE_HOME') or '~/.cache', 'cylc', 'config'
+    ).expanduser()
+
+
+def _stat_tree(path: str, exclude: Optional[str] = None) -> List[tuple]:
+    """Return (path, size, mtime) for files which may affect the config.
+
+    Hidden files and directories, run directory contents (log, share, work)
+    and processed configuration files are skipped.
+    """
+    ret = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = sorted(
+            name for name in dirnames
+            if not name.startswith('.') and not (
+                dirpath == path and name in IGNORE_DIRS)
+        )
+        for name in sorted(filenames):
+            if name.startswith('.') or name.endswith('.processed'):
+                continue
+            fpath = os.path.join(dirpath, name)
+            if fpath == exclude:
+                continue
+            with suppress(OSError):
+                stat = os.stat(fpath)
+                ret.append((fpath, stat.st_size, stat.st_mtime_ns))
+    return ret
+
+
+@lru_cache()
+def _get_code_fingerprint() -> Tuple[Any, ...]:
+    """Return a fingerprint of the code which processes configurations.
+
+    This allows for changes to the Cylc source without a version change
+    (e.g. development installations) and for configuration plugins.
+    """
+    return (
+        CYLC_VERSION,
+        sys.version,
+        tuple(_stat_tree(os.path.dirname(__file__))),
+        tuple(sorted(
+            (entry_point.name, str(entry_point.dist))
+            for entry_point in iter_entry_points('cylc.pre_configure')
+        )),
+    )
+
+
+def _get_digest(*items: Any) -> str:
+    """Return the hex digest of the repr of items."""
+    return sha256(repr(items).encode()).hexdigest()
+
+
+class _RecordHandler(logging.Handler):
+    """Keep log records which need repeating when loading from the cache."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.records: List[Tuple[int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.levelno, record.getMessage()))
+
+
+class ConfigCache:
+    """Cache for one workflow configuration.
+
+    There is one cache entry for each set of arguments (workflow, template
+    variables, options), which is replaced when its other inputs change.
+
+    Args:
+        config:
+            The configuration being loaded, with the attributes set by
+            the start of "WorkflowConfig.__init__".
+        template_vars:
+            Template variables.
+        output_fname:
+            File the processed flow.cylc file will be written to, if any.
+
+    """
+
+    def __init__(
+        self,
+        config: 'WorkflowConfig',
+        template_vars: Optional[Mapping[str, Any]],
+        output_fname: Optional[str],
+    ) -> None:
+        self.config = config
+        self.template_vars = template_vars
+        self.output_fname = output_fname
+        self.options = {
+            key: getattr(config.options, key, None)
+            for key in CONFIG_OPTIONS
+        }
+        fpath = os.path.abspath(config.fpath)
+        # (one entry per set of arguments, replaced if the sources change)
+        self.path = get_cache_dir() / _get_digest(
+            fpath,
+            config.workflow,
+            sorted(
+                item for item in (template_vars or {}).items()
+                if item[0] not in CYLC_TEMPLATE_VARS
+            ),
+            self.options,
+            config.run_dir,
+            config.log_dir,
+            config.work_dir,
+            config.share_dir,
+        )
+        # (the Jinja2 filter, test and global directories in ~/.cylc)
+        user_dir = os.path.expanduser(os.path.join('~', '.cylc'))
+        self.digest = _get_digest(
+            _get_code_fingerprint(),
+            _stat_tree(
+                os.path.dirname(fpath),
+                output_fname and os.path.abspath(output_fname)
+            ),
+            [
+                _stat_tree(os.path.join(user_dir, name))
+                for name in ('Jinja2Filters', 'Jinja2Globals', 'Jinja2Tests')
+            ],
+            glbl_cfg().get(sparse=True),
+            cylc.flow.flags.verbosity,
+            get_local_time_zone_format(),
+        )
+        self.environ: Dict[str, Optional[str]] = {}
+        self.records: List[Tuple[int, str]] = []
+        self.added_template_vars: Dict[str, Any] = {}
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the cached configuration state, if up to date.
+
+        Repeats the warnings logged, the template variables added and the
+        processed flow.cylc file written by the original load.
+        """
+        try:
+            with open(self.path, 'rb') as handle:
+                header = pickle.load(handle)  # nosec
+                if (
+                    header['digest'] != self.digest
+                    or any(
+                        os.environ.get(key) != value
+                        for key, value in header['environ'].items()
+                    )
+                ):
+                    return None
+                # (the garbage collector would repeatedly traverse the new
+                # objects, which are all in use)
+                gc_enabled = gc.isenabled()
+                gc.disable()
+                try:
+                    data = pickle.load(handle)  # nosec
+                finally:
+                    if gc_enabled:
+                        gc.enable()
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            # e.g. truncated file or incompatible pickle
+            LOG.debug(f'Cannot load cached config {self.path}: {exc!r}')
+            return None
+        LOG.debug(f'Loaded cached config {self.path}')
+        for level, msg in data['records']:
+            LOG.log(level, msg)
+        if self.output_fname and data['processed'] is not None:
+            with open(self.output_fname, 'w') as handle:
+                handle.write(data['processed'])
+        state = data['state']
+        if self.template_vars:
+            for key, value in data['template_vars'].items():
+                if value == _TEMPLATE_VARS:
+                    value = self.template_vars
+                self.template_vars[key] = value  # type: ignore
+            state['pcfg'].tvars = self.template_vars
+        return state
+
+    @contextmanager
+    def record(self) -> Iterator[None]:
+        """Record the side inputs and outputs of processing the config."""
+        handler = _RecordHandler()
+        LOG.addHandler(handler)
+        template_vars = dict(self.template_vars or {})
+        try:
+            try:
+                from cylc.flow.parsec.jinja2support import record_environ
+            except ImportError:
+                yield
+                accessed: set = set()
+            else:
+                with record_environ() as accessed:
+                    yield
+        finally:
+            LOG.removeHandler(handler)
+        if None in accessed:
+            # The template used the whole environment.
+            self.environ = dict(os.environ)
+        else:
+            self.environ = {key: os.environ.get(key) for key in accessed}
+        self.records = handler.records
+        self.added_template_vars = {
+            key: _TEMPLATE_VARS if value is self.template_vars else value
+            for key, value in (self.template_vars or {}).items()
+            if key not in template_vars
+        }
+
+    def dump(self) -> None:
+        """Write the processed configuration to the cache.
+
+        Does nothing if the configuration depends on the current time.
+        """
+        for key in TIME_OPTIONS:
+            if getattr(self.config.options, key, None) != self.options[key]:
+                LOG.debug(f'Not caching config: {key} depends on the time')
+                return
+        processed = None
+        if self.output_fname:
+            with suppress(OSError), open(self.output_fname) as handle:
+                processed = handle.read()
+        state = {
+            key: value
+            for key, value in self.config.__dict__.items()
+            if key not in EXCLUDE_ATTRS
+        }
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile(
+                dir=self.path.parent, delete=False
+            ) as handle:
+                tmp_path = handle.name
+                pickle.dump(
+                    {'digest': self.digest, 'environ': self.environ},
+                    handle,
+                    pickle.HIGHEST_PROTOCOL
+                )
+                pickle.dump(
+                    {
+                        'state': state,
+                        'processed': processed,
+                        'records': self.records,
+                        'template_vars': self.added_template_vars,
+                    },
+                    handle,
+                    pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_path, self.path)
+        except Exception as exc:
+            # The cache is an optimisation, don't fail the load.
+            LOG.debug(f'Cannot cache config {self.path}: {exc!r}')
+            if tmp_path is not None:
+                with suppress(OSError):
+                    os.unlink(tmp_path)
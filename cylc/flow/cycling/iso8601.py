@@ -16,12 +16,14 @@
 
 """Date-time cycling by point, interval, and sequence classes."""
 
+from bisect import bisect_right
 import contextlib
 from functools import lru_cache
+from itertools import accumulate, product
 import re
-from typing import List, Optional, TYPE_CHECKING, Tuple
+from typing import Callable, List, Optional, TYPE_CHECKING, Tuple, Union
 
-from metomi.isodatetime.data import Calendar, Duration, CALENDAR
+from metomi.isodatetime.data import Calendar, Duration, TimePoint, CALENDAR
 from metomi.isodatetime.dumpers import TimePointDumper
 from metomi.isodatetime.timezone import (
     get_local_time_zone, get_local_time_zone_format, TimeZoneFormatMode)
@@ -40,7 +42,6 @@ from cylc.flow.wallclock import get_current_time_string
 from cylc.flow.parsec.validate import IllegalValueError
 
 if TYPE_CHECKING:
-    from metomi.isodatetime.data import TimePoint
     from metomi.isodatetime.parsers import (
         DurationParser, TimePointParser, TimeRecurrenceParser)
 
@@ -68,16 +69,38 @@ class WorkflowSpecifics:
     iso8601_parsers: Optional[
         Tuple['DurationParser', 'TimePointParser', 'TimeRecurrenceParser']
     ] = None
+    # Incremented by "init", invalidates integer points:
+    generation: int = 0
+    # Writes integer points as strings, False until first checked:
+    point_formatter: Union[
+        Callable[[int, int], Optional[Tuple[str, int]]], None, bool
+    ] = False
 
 
 class ISO8601Point(PointBase):
 
-    """A single point in an ISO8601 date time sequence."""
+    """A single point in an ISO8601 date time sequence.
+
+    As well as its string value, a point may hold its integer
+    representation (see "_point_seconds") which is used for comparison and
+    arithmetic. Results of arithmetic are created with it, so they needn't
+    be parsed.
+    """
 
     TYPE = CYCLER_TYPE_ISO8601
     TYPE_SORT_KEY = CYCLER_TYPE_SORT_KEY_ISO8601
 
-    __slots__ = ('value')
+    __slots__ = ('_record', '_generation')
+
+    def __init__(self, value, record=None):
+        super().__init__(value)
+        # (seconds, UTC offset seconds) or None if not yet known.
+        self._record = record
+        self._generation = WorkflowSpecifics.generation
+
+    def __reduce__(self):
+        # (the integer representation depends on the workflow context)
+        return (ISO8601Point, (self.value,))
 
     @classmethod
     def from_nonstandard_string(cls, point_string):
@@ -86,7 +109,10 @@ class ISO8601Point(PointBase):
 
     def add(self, other):
         """Add an Interval to self."""
-        return ISO8601Point(self._iso_point_add(self.value, other.value))
+        point = self._add_offsets(other.value, 1)
+        if point is None:
+            point = ISO8601Point(self._iso_point_add(self.value, other.value))
+        return point
 
     def standardise(self):
         """Reformat self.value into a standard representation."""
@@ -99,15 +125,53 @@ class ISO8601Point(PointBase):
             else:
                 message = str(exc)
             raise PointParsingError(type(self), self.value, message)
+        self._record = None
         return self
 
     def sub(self, other):
         """Subtract a Point or Interval from self."""
         if isinstance(other, ISO8601Point):
+            record = self._get_record()
+            other_record = other._get_record()
+            if record is None or other_record is None:
+                return ISO8601Interval(
+                    self._iso_point_sub_point(self.value, other.value))
             return ISO8601Interval(
-                self._iso_point_sub_point(self.value, other.value))
-        return ISO8601Point(
-            self._iso_point_sub_interval(self.value, other.value))
+                _get_seconds_as_interval_string(record[0] - other_record[0]))
+        point = self._add_offsets(other.value, -1)
+        if point is None:
+            point = ISO8601Point(
+                self._iso_point_sub_interval(self.value, other.value))
+        return point
+
+    def _get_record(self):
+        """Return self as (seconds, UTC offset seconds), or None."""
+        if (
+            self._record is None
+            or self._generation != WorkflowSpecifics.generation
+        ):
+            self._record = _point_seconds(self.value)
+            self._generation = WorkflowSpecifics.generation
+        return self._record
+
+    def _add_offsets(self, interval_string, sign):
+        """Return self plus sign * interval_string, using integers.
+
+        Return None if the integer representation cannot be used.
+        """
+        formatter = _get_point_formatter()
+        record = self._get_record()
+        offsets = _interval_offsets(interval_string)
+        if formatter is None or record is None or offsets is None:
+            return None
+        years, months, seconds = offsets
+        seconds = _add_to_seconds(
+            record[0], record[1], sign * years, sign * months, sign * seconds)
+        result = formatter(seconds, record[1])
+        if result is None:
+            return None
+        value, utc_offset = result
+        return ISO8601Point(value, (seconds, utc_offset))
 
     @staticmethod
     @lru_cache(10000)
@@ -118,7 +182,11 @@ class ISO8601Point(PointBase):
         return str(point + interval)
 
     def _cmp(self, other: 'ISO8601Point') -> int:
-        return self._iso_point_cmp(self.value, other.value)
+        record = self._get_record()
+        other_record = other._get_record()
+        if record is None or other_record is None:
+            return self._iso_point_cmp(self.value, other.value)
+        return cmp(record[0], other_record[0])
 
     @staticmethod
     @lru_cache(10000)
@@ -194,7 +262,8 @@ class ISO8601Interval(IntervalBase):
 
     def _cmp(self, other: 'IntervalBase') -> int:
         """Compare another interval with this one."""
-        return self._iso_interval_cmp(self.value, other.value)
+        return cmp(
+            _interval_cmp_key(self.value), _interval_cmp_key(other.value))
 
     def sub(self, other):
         """Subtract another interval from this one."""
@@ -232,14 +301,6 @@ class ISO8601Interval(IntervalBase):
         other = interval_parse(other_interval_string)
         return str(interval + other)
 
-    @staticmethod
-    @lru_cache(10000)
-    def _iso_interval_cmp(interval_string, other_interval_string):
-        """Compare one parsed interval_string with the other one."""
-        interval = interval_parse(interval_string)
-        other = interval_parse(other_interval_string)
-        return cmp(interval, other)
-
     @staticmethod
     @lru_cache(10000)
     def _iso_interval_sub(interval_string, other_interval_string):
@@ -856,6 +917,22 @@ def init(num_expanded_year_digits=0, custom_dump_format=None, time_zone=None,
         None, None, WorkflowSpecifics.iso8601_parsers
     )
 
+    # Parsing and arithmetic depend on the calendar and dump format.
+    WorkflowSpecifics.generation += 1
+    WorkflowSpecifics.point_formatter = False
+    for func in (
+        _point_parse,
+        _interval_parse,
+        _point_seconds,
+        _interval_offsets,
+        _interval_cmp_key,
+        ISO8601Point._iso_point_add,
+        ISO8601Point._iso_point_cmp,
+        ISO8601Point._iso_point_sub_interval,
+        ISO8601Point._iso_point_sub_point,
+    ):
+        func.cache_clear()
+
 
 def get_dump_format():
     """Return cycle point string dump format."""
@@ -864,15 +941,25 @@ def get_dump_format():
 
 def get_point_relative(offset_string, base_point):
     """Create a point from offset_string applied to base_point."""
-    try:
-        interval = ISO8601Interval(str(interval_parse(offset_string)))
-    except IsodatetimeError:
+    interval_string = _get_offset_interval_string(offset_string)
+    if interval_string is None:
         return ISO8601Point(str(
             WorkflowSpecifics.abbrev_util.parse_timepoint(
                 offset_string, context_point=_point_parse(base_point.value))
         ))
-    else:
-        return base_point + interval
+    return base_point + ISO8601Interval(interval_string)
+
+
+@lru_cache(10000)
+def _get_offset_interval_string(offset_string):
+    """Return offset_string as a standard interval string.
+
+    Return None if offset_string is not an interval (i.e. is a point).
+    """
+    try:
+        return str(interval_parse(offset_string))
+    except IsodatetimeError:
+        return None
 
 
 def interval_parse(interval_string):
@@ -919,3 +1006,341 @@ def _point_parse(point_string):
                 point_string, WorkflowSpecifics.DUMP_FORMAT)
     # Attempt to parse it in ISO 8601 format.
     return WorkflowSpecifics.point_parser.parse(point_string)
+
+
+# Integer representation of points and intervals.
+#
+# Point values remain strings (they are what gets stored, hashed and
+# displayed) but comparisons and most arithmetic are done on integers:
+# a point is held as (seconds since 0001-01-01T00:00Z in the current
+# calendar, time zone offset in seconds) and an interval as normalised
+# (years, months, seconds). Anything not covered (truncated points,
+# fractional values, custom "%" dump formats) falls back to isodatetime.
+
+SECONDS_IN_DAY = 86400
+
+RE_DUMP_FORMAT = re.compile(
+    r'^(?P<date_time>(?:\+XCCYY|CCYY|MM|DD|hh|mm|ss|[T:-])+)'
+    r'(?P<time_zone>Z|\+hh(?::?mm)?|[+-]\d\d(?::?\d\d)?)$'
+)
+RE_DUMP_FORMAT_TOKEN = re.compile(r'\+XCCYY|CCYY|MM|DD|hh|mm|ss|[T:-]')
+DUMP_FORMAT_TOKENS = {
+    '+XCCYY': '{xyear}',
+    'CCYY': '{year:04d}',
+    'MM': '{month:02d}',
+    'DD': '{day:02d}',
+    'hh': '{hour:02d}',
+    'mm': '{minute:02d}',
+    'ss': '{second:02d}',
+}
+
+
+@lru_cache(None)
+def _get_calendar_table(days_in_months, days_in_months_leap):
+    """Return year and month lengths for a calendar.
+
+    Returns:
+        tuple - (days in a year, extra days in a leap year, days before
+        each month, days before each month in a leap year)
+
+    """
+    return (
+        sum(days_in_months),
+        sum(days_in_months_leap) - sum(days_in_months),
+        tuple(accumulate((0,) + days_in_months[:-1])),
+        tuple(accumulate((0,) + days_in_months_leap[:-1])),
+    )
+
+
+def _get_calendar():
+    """Return the year and month lengths of the current calendar."""
+    return _get_calendar_table(
+        CALENDAR.DAYS_IN_MONTHS, CALENDAR.DAYS_IN_MONTHS_LEAP)
+
+
+def _is_leap_year(year, extra_leap_days):
+    """Return True if year has extra_leap_days (Gregorian rule)."""
+    return bool(extra_leap_days) and (
+        year % 4 == 0 and (year % 100 != 0 or year % 400 == 0))
+
+
+def _days_before_year(year, days_in_year, extra_leap_days):
+    """Return the number of days from 0001-01-01 to the start of year."""
+    year -= 1
+    days = days_in_year * year
+    if extra_leap_days:
+        days += extra_leap_days * (year // 4 - year // 100 + year // 400)
+    return days
+
+
+def _get_days_in_months(year):
+    """Return the days in each month of year, in the current calendar."""
+    if _is_leap_year(year, _get_calendar()[1]):
+        return CALENDAR.DAYS_IN_MONTHS_LEAP
+    return CALENDAR.DAYS_IN_MONTHS
+
+
+def _date_to_days(year, month, day):
+    """Return days since 0001-01-01 of a calendar date."""
+    days_in_year, extra_leap_days, starts, leap_starts = _get_calendar()
+    if _is_leap_year(year, extra_leap_days):
+        starts = leap_starts
+    return (
+        _days_before_year(year, days_in_year, extra_leap_days)
+        + starts[month - 1] + day - 1
+    )
+
+
+def _days_to_date(days):
+    """Return the calendar date (year, month, day) of days since 0001-01-01.
+
+    Examples:
+        >>> _days_to_date(_date_to_days(2000, 2, 29))
+        (2000, 2, 29)
+
+    """
+    days_in_year, extra_leap_days, starts, leap_starts = _get_calendar()
+    # Estimate the year from the mean year length, then correct it.
+    year = (days * 400) // (days_in_year * 400 + extra_leap_days * 97) + 1
+    while _days_before_year(year, days_in_year, extra_leap_days) > days:
+        year -= 1
+    while _days_before_year(year + 1, days_in_year, extra_leap_days) <= days:
+        year += 1
+    day = days - _days_before_year(year, days_in_year, extra_leap_days)
+    if _is_leap_year(year, extra_leap_days):
+        starts = leap_starts
+    month = bisect_right(starts, day)
+    return year, month, day - starts[month - 1] + 1
+
+
+@lru_cache(10000)
+def _point_seconds(point_string):
+    """Return a point string as (seconds, time zone offset seconds).
+
+    Seconds are counted from 0001-01-01T00:00Z in the current calendar.
+    Return None if the point cannot be represented this way (e.g. it is
+    truncated, before year 1 or not a valid date in the calendar).
+    """
+    try:
+        point = _point_parse(point_string)
+    except IsodatetimeError:
+        return None
+    if (
+        point.truncated
+        or not point.get_is_calendar_date()
+        or point.year < 1
+        or point.day_of_month > _get_days_in_months(point.year)[
+            point.month_of_year - 1]
+    ):
+        return None
+    time_zone = point.get_time_zone()
+    hour, minute, second = point.get_hour_minute_second()
+    utc_offset = (
+        time_zone.hours * 3600 + time_zone.minutes * 60)
+    seconds = (
+        _date_to_days(point.year, point.month_of_year, point.day_of_month)
+        * SECONDS_IN_DAY
+        + hour * 3600 + minute * 60 + second
+        - utc_offset
+    )
+    if seconds != int(seconds) or utc_offset != int(utc_offset):
+        return None
+    return int(seconds), int(utc_offset)
+
+
+@lru_cache(10000)
+def _interval_offsets(interval_string):
+    """Return an interval string as normalised (years, months, seconds).
+
+    Return None if the interval cannot be represented this way.
+    """
+    try:
+        interval = interval_parse(interval_string)
+    except IsodatetimeError:
+        return None
+    if interval.get_is_in_weeks():
+        interval.to_days()
+    seconds = (
+        interval.days * SECONDS_IN_DAY
+        + interval.hours * 3600 + interval.minutes * 60 + interval.seconds
+    )
+    if seconds != int(seconds):
+        return None
+    return interval.years, interval.months, int(seconds)
+
+
+@lru_cache(10000)
+def _interval_cmp_key(interval_string):
+    """Return a sort key for an interval string, c.f. Duration.__lt__."""
+    return interval_parse(interval_string).get_days_and_seconds()
+
+
+def _add_to_seconds(seconds, utc_offset, years, months, extra_seconds):
+    """Add an interval to a point, with calendar months like isodatetime.
+
+    Seconds are added first, then months one at a time (clamping the day
+    of month each time) and then years.
+    """
+    seconds += extra_seconds
+    if not years and not months:
+        return seconds
+    days, second_of_day = divmod(seconds + utc_offset, SECONDS_IN_DAY)
+    year, month, day = _days_to_date(days)
+    step = 1 if months > 0 else -1
+    for _ in range(abs(months)):
+        month += step
+        if month > 12:
+            month = 1
+            year += 1
+        elif month < 1:
+            month = 12
+            year -= 1
+        day = min(day, _get_days_in_months(year)[month - 1])
+    if years:
+        year += years
+        day = min(day, _get_days_in_months(year)[month - 1])
+    return (
+        _date_to_days(year, month, day) * SECONDS_IN_DAY
+        + second_of_day - utc_offset
+    )
+
+
+def _get_seconds_as_interval_string(seconds):
+    """Return a difference in seconds as isodatetime would write it.
+
+    Examples:
+        >>> _get_seconds_as_interval_string(90000)
+        'P1DT1H'
+        >>> _get_seconds_as_interval_string(-60)
+        '-PT1M'
+        >>> _get_seconds_as_interval_string(0)
+        'P0Y'
+
+    """
+    if not seconds:
+        return ISO8601Interval.NULL_INTERVAL_STRING
+    sign = '-' if seconds < 0 else ''
+    days, seconds = divmod(abs(seconds), SECONDS_IN_DAY)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    string = sign + 'P'
+    if days:
+        string += f'{days}D'
+    if hours or minutes or seconds:
+        string += 'T'
+        for value, unit in ((hours, 'H'), (minutes, 'M'), (seconds, 'S')):
+            if value:
+                string += f'{value}{unit}'
+    return string
+
+
+def _make_point_formatter(dump_format, num_expanded_year_digits):
+    """Return a function to write (seconds, UTC offset) as a point string.
+
+    The function returns the string and the UTC offset it is written in, or
+    None for points it cannot write, in which case isodatetime should be
+    used. Return None if the dump format is not supported at all.
+    """
+    match = RE_DUMP_FORMAT.match(dump_format)
+    if not match:
+        return None
+    template = ''.join(
+        DUMP_FORMAT_TOKENS.get(token, token)
+        for token in RE_DUMP_FORMAT_TOKEN.findall(match['date_time'])
+    )
+    if '{second' in template:
+        resolution = 1
+    elif '{minute' in template:
+        resolution = 60
+    elif '{hour' in template:
+        resolution = 3600
+    else:
+        resolution = SECONDS_IN_DAY
+    time_zone = match['time_zone']
+    fixed_utc_offset = None
+    if time_zone == 'Z':
+        fixed_utc_offset = 0
+    elif not time_zone.startswith('+hh'):
+        sign = -1 if time_zone[0] == '-' else 1
+        digits = time_zone[1:].replace(':', '')
+        fixed_utc_offset = sign * (
+            int(digits[:2]) * 3600 + int(digits[2:] or 0) * 60)
+    year_digits = 4 + num_expanded_year_digits
+
+    def _format_point(seconds, utc_offset):
+        if fixed_utc_offset is None:
+            sign = '-' if utc_offset < 0 else '+'
+            hours, minutes = divmod(abs(utc_offset) // 60, 60)
+            zone = f'{sign}{hours:02d}'
+            if time_zone == '+hh:mm':
+                zone += f':{minutes:02d}'
+            elif time_zone == '+hhmm':
+                zone += f'{minutes:02d}'
+            elif minutes:
+                return None
+        else:
+            utc_offset = fixed_utc_offset
+            zone = time_zone
+        days, second_of_day = divmod(seconds + utc_offset, SECONDS_IN_DAY)
+        if second_of_day % resolution:
+            return None
+        year, month, day = _days_to_date(days)
+        xyear = str(year).zfill(year_digits)
+        if year < 1 or len(xyear) > year_digits:
+            return None
+        hour, second = divmod(second_of_day, 3600)
+        minute, second = divmod(second, 60)
+        return template.format(
+            xyear='+' + xyear, year=year,
+            month=month, day=day, hour=hour, minute=minute, second=second
+        ) + zone, utc_offset
+
+    return _format_point
+
+
+def _get_point_formatter():
+    """Return the point formatter for the current workflow, or None.
+
+    The formatter is checked against isodatetime on first use and is
+    discarded if they disagree.
+    """
+    if WorkflowSpecifics.point_formatter is False:
+        WorkflowSpecifics.point_formatter = _check_point_formatter(
+            _make_point_formatter(
+                WorkflowSpecifics.DUMP_FORMAT,
+                WorkflowSpecifics.NUM_EXPANDED_YEAR_DIGITS
+            )
+        )
+    return WorkflowSpecifics.point_formatter
+
+
+def _check_point_formatter(formatter):
+    """Return formatter if it writes sample points as isodatetime would."""
+    if formatter is None:
+        return None
+    time_zones = {WorkflowSpecifics.ASSUMED_TIME_ZONE, (5, 30), (-3, 0)}
+    for (
+        (time_zone_hour, time_zone_minute), year, month, days
+    ) in product(
+        time_zones, (1900, 2000, 2100), (2, 12), (0, 30)
+    ):
+        point = TimePoint(
+            expanded_year_digits=WorkflowSpecifics.NUM_EXPANDED_YEAR_DIGITS,
+            year=year, month_of_year=month, day_of_month=27, hour_of_day=13,
+            minute_of_hour=7, second_of_minute=0,
+            time_zone_hour=time_zone_hour,
+            time_zone_minute=time_zone_minute,
+            dump_format=WorkflowSpecifics.DUMP_FORMAT
+        ) + Duration(days=days)
+        record = _point_seconds(str(point))
+        if record is None:
+            continue
+        for seconds, expected in (
+            (record[0], str(point)),
+            (record[0] + 60, str(point + Duration(minutes=1))),
+        ):
+            result = formatter(seconds, record[1])
+            if result is not None and result[0] != expected:
+                # (None is always safe, isodatetime is used instead.)
+                return None
+    return formatter
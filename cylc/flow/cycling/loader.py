@@ -19,7 +19,7 @@ Tasks spawn a sequence of POINTS (P) separated by INTERVALS (I).
 Each task may have multiple sequences, e.g. 12-hourly and 6-hourly.
 """
 
-from typing import Optional, Type, overload
+from typing import Dict, Optional, Type, overload
 
 from cylc.flow.cycling import PointBase, integer, iso8601
 from metomi.isodatetime.data import Calendar
@@ -34,8 +34,10 @@ IS_OFFSET_ABSOLUTE_IMPLS = {
 }
 
 
-POINTS = {INTEGER_CYCLING_TYPE: integer.IntegerPoint,
-          ISO8601_CYCLING_TYPE: iso8601.ISO8601Point}
+POINTS: Dict[str, Type[PointBase]] = {
+    INTEGER_CYCLING_TYPE: integer.IntegerPoint,
+    ISO8601_CYCLING_TYPE: iso8601.ISO8601Point
+}
 
 DUMP_FORMAT_GETTERS = {INTEGER_CYCLING_TYPE: integer.get_dump_format,
                        ISO8601_CYCLING_TYPE: iso8601.get_dump_format}
@@ -20,6 +20,7 @@
     B605: start_process_with_a_shell
     https://docs.openstack.org/developer/bandit/plugins/start_process_with_a_shell.html
 """
+import asyncio
 from shlex import split
 from subprocess import PIPE, STDOUT, DEVNULL, Popen  # nosec
 
@@ -57,3 +58,29 @@ def procopen(cmd, bufsize=0, executable=None, stdin=None, stdout=None,
                     universal_newlines, startupinfo, creationflags)
 
     return process
+
+
+async def async_procopen(cmd, stdin=None, stdoutpipe=False, stderrpipe=False,
+                         preexec_fn=None, usesh=False, env=None):
+    """Launch a command as an asyncio subprocess.
+
+    Takes the same arguments as the equivalent procopen arguments, returns an
+    asyncio.subprocess.Process.
+
+    """
+    if isinstance(cmd, str):
+        command = [cmd]
+    else:
+        command = list(cmd)
+    if usesh:
+        # as Popen does for shell=True
+        command = ['/bin/sh', '-c'] + command
+
+    return await asyncio.create_subprocess_exec(  # nosec
+        *command,
+        stdin=stdin,
+        stdout=PIPE if stdoutpipe else None,
+        stderr=PIPE if stderrpipe else None,
+        preexec_fn=preexec_fn,
+        env=env
+    )
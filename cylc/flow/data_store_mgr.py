@@ -59,9 +59,10 @@ Packaging methods are included for dissemination of protobuf messages.
 from contextlib import suppress
 from collections import Counter, deque
 from copy import deepcopy
+from itertools import count
 import json
 from time import time
-from typing import Union, Tuple, TYPE_CHECKING
+from typing import Iterable, List, Union, Tuple, TYPE_CHECKING
 import zlib
 
 from cylc.flow import __version__ as CYLC_VERSION, LOG, ID_DELIM
@@ -73,7 +74,7 @@ from cylc.flow.data_messages_pb2 import (  # type: ignore
 from cylc.flow.network import API
 from cylc.flow.workflow_status import get_workflow_status
 from cylc.flow.task_job_logs import JOB_LOG_OPTS, get_task_job_log
-from cylc.flow.task_proxy import TaskProxy
+from cylc.flow.task_proxy import GhostTask, TaskProxy
 from cylc.flow.task_state import (
     TASK_STATUS_WAITING,
     TASK_STATUS_SUBMITTED,
@@ -222,12 +223,147 @@ def task_mean_elapsed_time(tdef):
     return tdef.rtconfig.get('execution time limit', None)
 
 
-def apply_delta(key, delta, data):
-    """Apply delta to specific data-store workflow and type."""
+class NodeIndex:
+    """Secondary indexes of proxy nodes by the attributes they are filtered on.
+
+    These let the GraphQL resolvers narrow down the nodes to filter, rather
+    than scanning every node of the data store.
+
+    Attributes:
+        .states (dict):
+            Node IDs by state.
+        .cycle_points (dict):
+            Node IDs by cycle point.
+        .namespaces (dict):
+            Node IDs by the name of the node and (for task proxies) its
+            ancestors.
+        .held (set):
+            IDs of held nodes.
+        .queued (set):
+            IDs of queued nodes.
+
+    Examples:
+        >>> index = NodeIndex()
+        >>> index.add(PbTaskProxy(
+        ...     id='1|foo', state='waiting', cycle_point='1',
+        ...     namespace=['foo', 'root'], is_held=True))
+        >>> index.add(PbTaskProxy(
+        ...     id='1|bar', state='waiting', cycle_point='1',
+        ...     namespace=['bar', 'root']))
+        >>> sorted(index.namespaces['root']), index.held
+        (['1|bar', '1|foo'], {'1|foo'})
+        >>> index.add(PbTaskProxy(
+        ...     id='1|foo', state='running', cycle_point='1',
+        ...     namespace=['foo', 'root']))
+        >>> index.states
+        {'waiting': {'1|bar'}, 'running': {'1|foo'}}
+        >>> index.remove('1|bar')
+        >>> index.states, index.ordered({'1|foo'})
+        ({'running': {'1|foo'}}, ['1|foo'])
+
+    """
+
+    __slots__ = (
+        'states', 'cycle_points', 'namespaces', 'held', 'queued', '_keys',
+        '_counter')
+
+    def __init__(self):
+        self.states = {}
+        self.cycle_points = {}
+        self.namespaces = {}
+        self.held = set()
+        self.queued = set()
+        # {id: (insertion number, state, cycle point, namespaces)}
+        self._keys = {}
+        self._counter = count()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, node):
+        """Index a node, or re-index it after it has been updated."""
+        node_id = node.id
+        state = node.state
+        cycle_point = node.cycle_point
+        namespaces = tuple(getattr(node, 'namespace', (node.name,)))
+        keys = self._keys.get(node_id)
+        if keys is None:
+            number = next(self._counter)
+        else:
+            number = keys[0]
+            if keys[1:] != (state, cycle_point, namespaces):
+                self._unindex(node_id, keys)
+                keys = None
+        if keys is None:
+            self._keys[node_id] = (number, state, cycle_point, namespaces)
+            self.states.setdefault(state, set()).add(node_id)
+            self.cycle_points.setdefault(cycle_point, set()).add(node_id)
+            for namespace in namespaces:
+                self.namespaces.setdefault(namespace, set()).add(node_id)
+        if node.is_held:
+            self.held.add(node_id)
+        else:
+            self.held.discard(node_id)
+        if node.is_queued:
+            self.queued.add(node_id)
+        else:
+            self.queued.discard(node_id)
+
+    def remove(self, node_id):
+        """Remove a node from the indexes, if present."""
+        keys = self._keys.pop(node_id, None)
+        if keys is not None:
+            self._unindex(node_id, keys)
+            self.held.discard(node_id)
+            self.queued.discard(node_id)
+
+    def _unindex(self, node_id, keys):
+        _, state, cycle_point, namespaces = keys
+        self._discard(self.states, state, node_id)
+        self._discard(self.cycle_points, cycle_point, node_id)
+        for namespace in namespaces:
+            self._discard(self.namespaces, namespace, node_id)
+
+    @staticmethod
+    def _discard(index, key, node_id):
+        # Drop empty entries, cycle points come and go.
+        ids = index[key]
+        ids.discard(node_id)
+        if not ids:
+            del index[key]
+
+    def ordered(self, node_ids: Iterable[str]) -> List[str]:
+        """Return indexed node IDs in the order the nodes were added.
+
+        (Which is the order of the nodes in the data store.)
+        """
+        keys = self._keys
+        return sorted(
+            (node_id for node_id in node_ids if node_id in keys),
+            key=lambda node_id: keys[node_id][0])
+
+
+def apply_delta(key, delta, data, index=None):
+    """Apply delta to specific data-store workflow and type.
+
+    Args:
+        key (str):
+            The type of data element (e.g. TASK_PROXIES).
+        delta:
+            The delta message for this type.
+        data (dict):
+            The data-store of the workflow.
+        index (NodeIndex):
+            Index of the data elements of this type to keep up to date.
+
+    """
     # Assimilate new data
     if getattr(delta, 'added', False):
         if key != WORKFLOW:
             data[key].update({e.id: e for e in delta.added})
+            if index is not None:
+                for element in delta.added:
+                    index.add(element)
         elif delta.added.ListFields():
             data[key].CopyFrom(delta.added)
     # Merge in updated fields
@@ -249,6 +385,8 @@ def apply_delta(key, delta, data):
                             if field.name in CLEAR_FIELD_MAP[key]:
                                 data_element.ClearField(field.name)
                     data_element.MergeFrom(element)
+                    if index is not None:
+                        index.add(data_element)
                 except KeyError as exc:
                     # Ensure data-sync doesn't fail with
                     # network issues, sync reconcile/validate will catch.
@@ -299,6 +437,8 @@ def apply_delta(key, delta, data):
                 getattr(data[WORKFLOW], key).remove(del_id)
             # remove/prune element from data-store
             del data[key][del_id]
+            if index is not None:
+                index.remove(del_id)
 
 
 def create_delta_store(delta=None, workflow_id=None):
@@ -368,6 +508,11 @@ class DataStoreMgr:
                 Message containing the global information of the workflow.
         .descendants (dict):
             Local store of config.get_first_parent_descendants()
+        .indexes (dict):
+            .family_proxies (NodeIndex):
+                Index of the family proxies of the data-store.
+            .task_proxies (NodeIndex):
+                Index of the task proxies of the data-store.
         .n_edge_distance (int):
             Maximum distance of the data-store graph from the active pool.
         .parents (dict):
@@ -406,6 +551,12 @@ class DataStoreMgr:
         self.data = {
             self.workflow_id: deepcopy(DATA_TEMPLATE)
         }
+        self.indexes = {
+            self.workflow_id: {
+                FAMILY_PROXIES: NodeIndex(),
+                TASK_PROXIES: NodeIndex(),
+            }
+        }
         self.added = deepcopy(DATA_TEMPLATE)
         self.updated = deepcopy(DATA_TEMPLATE)
         self.deltas = {
@@ -611,12 +762,8 @@ class DataStoreMgr:
         """Generate graph window about given origin to n-edge-distance.
 
         Args:
-            name (str):
-                Task name.
-            point (cylc.flow.cycling.PointBase):
-                PointBase derived object.
-            flow_label (str):
-                Flow label used to distinguish multiple runs.
+            itask (cylc.flow.task_proxy.TaskProxy/GhostTask):
+                Task proxy, or light-weight ghost for nodes not in the pool.
             edge_distance (int):
                 Graph distance from active/origin node.
             active_id (str):
@@ -739,10 +886,9 @@ class DataStoreMgr:
             if t_id in self.n_window_nodes[active_id]:
                 continue
             self.increment_graph_window(
-                TaskProxy(
+                GhostTask(
                     self.schd.config.get_taskdef(t_name),
-                    t_point, flow_label,
-                    submit_num=0, reflow=reflow),
+                    t_point, flow_label, reflow),
                 edge_distance, active_id, descendant, is_parent)
 
     def remove_pool_node(self, name, point):
@@ -769,7 +915,7 @@ class DataStoreMgr:
         Args:
             tp_id (str):
                 data-store task proxy ID.
-            itask (cylc.flow.task_proxy.TaskProxy):
+            itask (cylc.flow.task_proxy.TaskProxy/GhostTask):
                 Update task-node from corresponding task proxy object.
             is_parent (bool):
                 Used to determine whether to load DB state.
@@ -1796,10 +1942,11 @@ class DataStoreMgr:
 
         # Apply deltas to local data-store
         data = self.data[self.workflow_id]
+        indexes = self.indexes[self.workflow_id]
         for key, delta in self.deltas.items():
             if delta.ListFields():
                 delta.reloaded = reloaded
-                apply_delta(key, delta, data)
+                apply_delta(key, delta, data, indexes.get(key))
 
         # Construct checksum on deltas for export
         update_time = time()
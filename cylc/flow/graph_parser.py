@@ -412,14 +412,17 @@ class GraphParser:
                 if not trig and not name.startswith('@'):
                     # (Avoiding @trigger nodes.)
                     trig = self.__class__.TRIG_SUCCEED
-                    if offset:
-                        this = r'\b%s\b%s(?!:)' % (
-                            re.escape(name), re.escape(offset))
-                    else:
-                        this = r'\b%s\b(?![\[:])' % re.escape(name)
-
                     that = name + offset + trig
-                    expr = re.sub(this, that, expr)
+                    if expr == name + offset:
+                        # Lone node, no need to compile a regex for it.
+                        expr = that
+                    else:
+                        if offset:
+                            this = r'\b%s\b%s(?!:)' % (
+                                re.escape(name), re.escape(offset))
+                        else:
+                            this = r'\b%s\b(?![\[:])' % re.escape(name)
+                        expr = re.sub(this, that, expr)
                 n_info.append((name, offset, trig))
             info = n_info
 
@@ -72,6 +72,8 @@ class SGEHandler:
     # N.B. The "qstat -j JOB_ID" command returns 1 if JOB_ID is no longer in
     # the system, so there is no need to filter its output.
     POLL_CMD = "qstat"
+    # (qstat lists all of the user's jobs)
+    POLL_ALL_CMD_TMPL = POLL_CMD
     REC_ID_FROM_SUBMIT_OUT = re.compile(r"\D+(?P<id>\d+)\D+")
     SUBMIT_CMD_TMPL = "qsub '%(job)s'"
 
@@ -121,6 +121,7 @@ class SLURMHandler():
     # N.B. The "squeue -j JOB_ID" command returns 1 if JOB_ID is no longer in
     # the system, so there is no need to filter its output.
     POLL_CMD = "squeue -h"
+    POLL_ALL_CMD_TMPL = "squeue -h -u '%(user)s'"
     REC_ID_FROM_SUBMIT_OUT = re.compile(
         r"\ASubmitted\sbatch\sjob\s(?P<id>\d+)")
     REC_ID_FROM_POLL_OUT = re.compile(r"^ *(?P<id>\d+)")
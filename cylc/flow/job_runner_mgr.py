@@ -77,6 +77,14 @@ job_runner.KILL_CMD_TMPL
        and terminate a job ID. The command is formed using the logic:
            job_runner.KILL_CMD_TMPL % {"job_id": job_id}
 
+job_runner.POLL_ALL_CMD_TMPL
+    * A Python string template for getting the job runner command to list all
+      of a user's jobs, in the same format as the poll command. The command
+      is formed using the logic:
+          job_runner.POLL_ALL_CMD_TMPL % {"user": user}
+      If defined, the list may be shared between polls (see
+      "JobRunnerManager.jobs_poll").
+
 job_runner.POLL_CANT_CONNECT_ERR
     * A string containing an error message. If this is defined, when a poll
       command returns a non-zero return code and its STDERR contains this
@@ -114,6 +122,7 @@ job_runner.SUBMIT_CMD_TMPL
 """
 
 from contextlib import suppress
+import fcntl
 import json
 import os
 import shlex
@@ -123,11 +132,13 @@ import traceback
 from shutil import rmtree
 from signal import SIGKILL
 from subprocess import DEVNULL  # nosec
+from time import time
 
 from cylc.flow.task_message import (
     CYLC_JOB_PID, CYLC_JOB_INIT_TIME, CYLC_JOB_EXIT_TIME, CYLC_JOB_EXIT,
     CYLC_MESSAGE)
 from cylc.flow.cylc_subproc import procopen
+from cylc.flow.hostuserutil import get_host, get_user
 from cylc.flow.task_job_logs import (
     JOB_LOG_ERR, JOB_LOG_JOB, JOB_LOG_OUT, JOB_LOG_STATUS)
 from cylc.flow.task_outputs import TASK_OUTPUT_SUCCEEDED
@@ -207,6 +218,7 @@ class JobRunnerManager():
     OUT_PREFIX_MESSAGE = "[TASK JOB MESSAGE]"
     OUT_PREFIX_SUMMARY = "[TASK JOB SUMMARY]"
     OUT_PREFIX_CMD_ERR = "[TASK JOB ERROR]"
+    STATUS_CACHE_DIR = os.path.join("~", ".cylc", "job-runner-status")
     _INSTANCES: dict = {}
 
     @classmethod
@@ -292,11 +304,14 @@ class JobRunnerManager():
                     sys.stdout.write("%s%s|%s|%s" % (
                         self.OUT_PREFIX_CMD_ERR, now, job_log_dir, line))
 
-    def jobs_poll(self, job_log_root, job_log_dirs):
+    def jobs_poll(self, job_log_root, job_log_dirs, status_cache=0):
         """Poll multiple jobs.
 
         job_log_root -- The log/job/ sub-directory of the workflow.
         job_log_dirs -- A list containing point/name/submit_num for task jobs.
+        status_cache -- If set, jobs found in a list of the user's jobs in
+                        the job runner which is up to this many seconds old
+                        are not queried (see _get_cached_job_ids).
 
         """
         if "$" in job_log_root:
@@ -333,7 +348,7 @@ class JobRunnerManager():
 
         for job_runner_name, my_ctx_list in ctx_list_by_job_runner.items():
             self._jobs_poll_runner(
-                job_log_root, job_runner_name, my_ctx_list)
+                job_log_root, job_runner_name, my_ctx_list, status_cache)
 
         cur_time_str = get_current_time_string()
         for ctx in ctx_list:
@@ -544,19 +559,101 @@ class JobRunnerManager():
 
         return ctx
 
-    def _jobs_poll_runner(self, job_log_root, job_runner_name, my_ctx_list):
+    @staticmethod
+    def _filter_poll_output(job_runner, out):
+        """Return the set of job IDs in the output of a poll command."""
+        if hasattr(job_runner, "filter_poll_many_output"):
+            # Allow custom filter
+            return set(job_runner.filter_poll_many_output(out))
+        # Just about all poll commands return a table, with column 1 being the
+        # job ID. Any table header will not match the IDs being polled.
+        job_ids = set()
+        for line in out.splitlines():
+            try:
+                job_ids.add(line.split(None, 1)[0])
+            except IndexError:
+                continue
+        return job_ids
+
+    def _get_cached_job_ids(self, job_runner_name, job_runner, max_age):
+        """Return the IDs of all of the user's jobs in the job runner.
+
+        The list is shared by all of the user's workflows on this host via a
+        file in STATUS_CACHE_DIR, it is re-used until it is "max_age" seconds
+        old. Only one process queries the job runner at a time, others wait
+        for its result.
+
+        Returns None if the job runner could not be queried.
+
+        """
+        path = os.path.join(
+            os.path.expanduser(self.STATUS_CACHE_DIR),
+            f"{get_host()}-{job_runner_name}.json")
+
+        def _load():
+            with suppress(OSError, ValueError):
+                if time() - os.stat(path).st_mtime < max_age:
+                    with open(path) as handle:
+                        return set(json.load(handle))
+            return None
+
+        job_ids = _load()
+        if job_ids is not None:
+            return job_ids
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # released on close
+            # another poll may have updated the list while we waited
+            job_ids = _load()
+            if job_ids is not None:
+                return job_ids
+            cmd = shlex.split(
+                job_runner.POLL_ALL_CMD_TMPL % {"user": get_user()})
+            try:
+                proc = procopen(cmd, stdindevnull=True,
+                                stderrpipe=True, stdoutpipe=True)
+            except OSError as exc:
+                if not exc.filename:
+                    exc.filename = cmd[0]
+                sys.stderr.write(f"{exc}\n")
+                return None
+            out, err = (f.decode() for f in proc.communicate())
+            if proc.returncode:
+                sys.stderr.write(err)
+                return None
+            job_ids = self._filter_poll_output(job_runner, out)
+            tmp_path = f"{path}.{os.getpid()}"
+            with open(tmp_path, "w") as handle:
+                json.dump(sorted(job_ids), handle)
+            os.replace(tmp_path, path)
+        return job_ids
+
+    def _jobs_poll_runner(
+        self, job_log_root, job_runner_name, my_ctx_list, status_cache=0
+    ):
         """Helper 2 for self.jobs_poll(job_log_root, job_log_dirs)."""
         exp_job_ids = [ctx.job_id for ctx in my_ctx_list]
-        bad_job_ids = list(exp_job_ids)
+        bad_job_ids = set(exp_job_ids)
         exp_pids = []
-        bad_pids = []
-        items = [[self._get_sys(job_runner_name), exp_job_ids, bad_job_ids]]
-        if getattr(items[0][0], "SHOULD_POLL_PROC_GROUP", False):
+        bad_pids = set()
+        job_runner = self._get_sys(job_runner_name)
+        if status_cache and hasattr(job_runner, "POLL_ALL_CMD_TMPL"):
+            job_ids = self._get_cached_job_ids(
+                job_runner_name, job_runner, status_cache)
+            if job_ids is not None:
+                # only query the job runner about jobs missing from the list
+                bad_job_ids -= job_ids
+                exp_job_ids = [
+                    id_ for id_ in exp_job_ids if id_ in bad_job_ids]
+        items = [[job_runner, exp_job_ids, bad_job_ids]]
+        if getattr(job_runner, "SHOULD_POLL_PROC_GROUP", False):
             exp_pids = [ctx.pid for ctx in my_ctx_list if ctx.pid is not None]
-            bad_pids.extend(exp_pids)
+            bad_pids.update(exp_pids)
             items.append([self._get_sys("background"), exp_pids, bad_pids])
         debug_messages = []
         for job_runner, exp_ids, bad_ids in items:
+            if not exp_ids:
+                continue
             if hasattr(job_runner, "get_poll_many_cmd"):
                 # Some poll commands may not be as simple
                 cmd = job_runner.get_poll_many_cmd(exp_ids)
@@ -573,8 +670,8 @@ class JobRunnerManager():
                     exc.filename = cmd[0]
                 sys.stderr.write(f"{exc}\n")
                 return
-            ret_code = proc.wait()
             out, err = (f.decode() for f in proc.communicate())
+            ret_code = proc.returncode
             debug_messages.append('{0} - {1}'.format(
                 job_runner, len(out.split('\n')))
             )
@@ -583,24 +680,9 @@ class JobRunnerManager():
                     job_runner.POLL_CANT_CONNECT_ERR in err):
                 # Poll command failed because it cannot connect to job runner
                 # Assume jobs are still healthy until the job runner is back.
-                bad_ids[:] = []
-            elif hasattr(job_runner, "filter_poll_many_output"):
-                # Allow custom filter
-                for id_ in job_runner.filter_poll_many_output(out):
-                    with suppress(ValueError):
-                        bad_ids.remove(id_)
+                bad_ids.clear()
             else:
-                # Just about all poll commands return a table, with column 1
-                # being the job ID. The logic here should be sufficient to
-                # ensure that any table header is ignored.
-                for line in out.splitlines():
-                    try:
-                        head = line.split(None, 1)[0]
-                    except IndexError:
-                        continue
-                    if head in exp_ids:
-                        with suppress(ValueError):
-                            bad_ids.remove(head)
+                bad_ids -= self._filter_poll_output(job_runner, out)
 
         debug_flag = False
         for ctx in my_ctx_list:
@@ -20,7 +20,9 @@
    This plugin is for Cylc developers debugging cylc memory usage.
 
    For general interest memory measurement try
-   ``/usr/bin/time -v cylc play`` or ``cylc play --profile``.
+   ``/usr/bin/time -v cylc play`` or ``cylc play --profile``. To keep an
+   eye on the size of the major scheduler structures use the (cheap)
+   ``log structure sizes`` plugin.
 
 .. note::
 
@@ -0,0 +1,52 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Log the size of major scheduler structures.
+
+Logs the number of items and their estimated size in bytes for the task pool,
+prerequisites, data store elements, delta queues, broadcasts, xtrigger caches
+and database queues, e.g::
+
+   Structure sizes: task proxies: 120 (180.2 KiB), prerequisites: ...
+
+This is cheap enough to leave on in production and is on by default, use it
+to spot structures which grow without limit. Sizes are logged at the end of
+each interval (not at start up). The same information is
+available from the ``structureSizes`` field of the workflow GraphQL type.
+
+For a more detailed (but expensive) breakdown of memory usage see the
+``log memory`` plugin.
+
+"""
+
+from cylc.flow import LOG
+from cylc.flow.main_loop import periodic
+from cylc.flow.memory_accounting import (
+    format_structure_sizes,
+    get_structure_sizes
+)
+
+
+@periodic
+async def log_structure_sizes(scheduler, state):
+    """Log the size of major scheduler structures."""
+    if not state.get('started'):
+        # the first run is at start up, log at the end of each interval
+        state['started'] = True
+        return
+    LOG.info(
+        'Structure sizes: '
+        + format_structure_sizes(get_structure_sizes(scheduler))
+    )
@@ -0,0 +1,238 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Lightweight accounting of the memory used by major scheduler structures.
+
+Unlike the ``log_memory`` main loop plugin this does not measure the whole
+scheduler. Instead it counts the items in each of the structures which grow
+with the size of a workflow and estimates their size in bytes from a small
+sample of items. This is cheap enough to do routinely in production, so
+unbounded growth of a structure can be spotted without a profiler.
+
+Estimates are approximate:
+
+* Items are measured to a limited depth, objects shared between many items
+  (e.g. task definitions and platforms) are not counted.
+* Data store elements are measured by their serialised size.
+* Structures can overlap (e.g. task proxies reference their prerequisites).
+
+"""
+
+from collections import deque
+from itertools import chain, islice
+from sys import getsizeof
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Dict, Iterable, List, NamedTuple, Set, TYPE_CHECKING
+
+from google.protobuf.message import Message
+
+from cylc.flow.data_store_mgr import (
+    EDGES,
+    FAMILIES,
+    FAMILY_PROXIES,
+    JOBS,
+    TASK_PROXIES,
+    TASKS,
+    WORKFLOW,
+)
+from cylc.flow.parsec.OrderedDict import OrderedDictWithDefaults
+from cylc.flow.taskdef import TaskDef
+
+if TYPE_CHECKING:
+    from cylc.flow.scheduler import Scheduler
+
+
+# The number of items sampled to estimate the size of each structure.
+SAMPLE_SIZE = 10
+
+# The number of levels of references followed when measuring an item.
+SIZEOF_DEPTH = 4
+
+# Objects not counted, these are shared between many items (e.g. task
+# definitions and configuration sections such as platforms).
+_SHARED_TYPES = (
+    TaskDef, OrderedDictWithDefaults,
+    type, FunctionType, MethodType, BuiltinFunctionType, ModuleType)
+
+_ATOMIC_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+class StructureSize(NamedTuple):
+    """The number of items in a structure and their estimated size."""
+
+    name: str
+    items: int
+    size: int  # bytes
+
+
+def _get_slots(obj: Any) -> Iterable[str]:
+    """Return the names of the slots of obj (and its base classes)."""
+    return chain.from_iterable(
+        getattr(cls, '__slots__', ()) for cls in type(obj).__mro__)
+
+
+def _sizeof(obj: Any, seen: Set[int], depth: int = SIZEOF_DEPTH) -> int:
+    """Estimate the size of obj and the objects it references (bytes).
+
+    Examples:
+        >>> _sizeof('a', set()) == getsizeof('a')
+        True
+        >>> items = ['aa', 'aa']
+        >>> _sizeof(items, set()) == getsizeof(items) + getsizeof('aa')
+        True
+
+    """
+    if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, Message):
+        return getsizeof(obj) + obj.ByteSize()
+    size = getsizeof(obj)
+    if depth == 0 or isinstance(obj, _ATOMIC_TYPES):
+        return size
+    if isinstance(obj, dict):
+        refs: Iterable = chain(obj.keys(), obj.values())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        refs = obj
+    else:
+        refs = chain(
+            getattr(obj, '__dict__', {}).values(),
+            (
+                getattr(obj, slot)
+                for slot in _get_slots(obj)
+                if hasattr(obj, slot)
+            )
+        )
+    return size + sum(_sizeof(ref, seen, depth - 1) for ref in refs)
+
+
+def estimate_size(items: List[Any], sample_size: int = SAMPLE_SIZE) -> int:
+    """Estimate the total size of a list of items from a sample (bytes).
+
+    Examples:
+        >>> estimate_size([])
+        0
+        >>> estimate_size(['aa'] * 100) == 100 * getsizeof('aa')
+        True
+
+    """
+    if not items:
+        return 0
+    step = max(1, len(items) // sample_size)
+    sample = list(islice(items, 0, None, step))[:sample_size]
+    sizes = []
+    for item in sample:
+        try:
+            # items are not shared with each other
+            sizes.append(_sizeof(item, set()))
+        except RuntimeError:
+            # item changed while being measured (by the main loop)
+            continue
+    if not sizes:
+        return 0
+    return round(len(items) * sum(sizes) / len(sizes))
+
+
+def _get_structures(schd: 'Scheduler') -> Dict[str, List[Any]]:
+    """Return the items in each structure to account for.
+
+    This may be called from outside of the main loop (e.g. by the GraphQL
+    server) so takes copies of the containers rather than iterating over
+    them (copying a container is atomic in CPython, iterating over it isn't).
+    """
+    pool = schd.pool
+    itasks = (
+        list(pool.main_pool_by_id.values())
+        + list(pool.hidden_pool_by_id.values())
+    )
+    data_store_mgr = schd.data_store_mgr
+    data = data_store_mgr.data[data_store_mgr.workflow_id]
+    xtrigger_mgr = schd.xtrigger_mgr
+    structures = {
+        'task proxies': itasks,
+        'prerequisites': [
+            prereq
+            for itask in itasks
+            for prereq in list(itask.state.prerequisites)
+        ],
+    }
+    for key in (TASKS, TASK_PROXIES, FAMILIES, FAMILY_PROXIES, JOBS, EDGES):
+        structures[f'data store {key}'] = list(data[key].values())
+    structures['data store deltas'] = [
+        element
+        for delta in (data_store_mgr.added, data_store_mgr.updated)
+        for key, elements in list(delta.items())
+        if key != WORKFLOW
+        for element in list(elements.values())
+    ]
+    structures['delta queues'] = list(data_store_mgr.publish_deltas) + [
+        item
+        for queue in list(
+            data_store_mgr.delta_queues[data_store_mgr.workflow_id].values())
+        for item in list(queue.queue)
+    ]
+    structures['broadcasts'] = [
+        (point, namespace, settings)
+        for point, namespaces in list(schd.broadcast_mgr.broadcasts.items())
+        for namespace, settings in list(namespaces.items())
+    ]
+    structures['xtrigger results'] = list(xtrigger_mgr.sat_xtrig.items())
+    structures['xtrigger call times'] = list(
+        xtrigger_mgr.t_next_call.items())
+    structures['db queues'] = [
+        stmt_args
+        for dao in (
+            schd.workflow_db_mgr.pri_dao,
+            schd.workflow_db_mgr.pub_dao
+        )
+        if dao is not None
+        for table in list(dao.tables.values())
+        for stmt_args in chain(
+            list(table.insert_queue),
+            *list(table.delete_queues.values()),
+            *list(table.update_queues.values())
+        )
+    ]
+    return structures
+
+
+def get_structure_sizes(schd: 'Scheduler') -> List[StructureSize]:
+    """Return the number of items and estimated size of major structures.
+
+    Args:
+        schd: The scheduler to account for.
+
+    """
+    return [
+        StructureSize(name, len(items), estimate_size(items))
+        for name, items in _get_structures(schd).items()
+    ]
+
+
+def format_structure_sizes(sizes: List[StructureSize]) -> str:
+    """Return a one line summary of structure sizes.
+
+    Examples:
+        >>> format_structure_sizes([
+        ...     StructureSize('task proxies', 10, 20480),
+        ...     StructureSize('broadcasts', 0, 0),
+        ... ])
+        'task proxies: 10 (20.0 KiB), broadcasts: 0 (0.0 KiB)'
+
+    """
+    return ', '.join(
+        f'{size.name}: {size.items} ({size.size / 1024:.1f} KiB)'
+        for size in sizes
+    )
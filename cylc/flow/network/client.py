@@ -15,12 +15,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Client for workflow runtime API."""
 
+import asyncio
 from functools import partial
+from itertools import count
 import os
 from shutil import which
 import socket
 import sys
-from typing import Union
+from typing import Dict, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
 
 import zmq
 import zmq.asyncio
@@ -32,6 +35,7 @@ from cylc.flow.exceptions import (
     ServiceFileError,
     WorkflowStopped
 )
+from cylc.flow.hostuserutil import get_fqdn_by_host
 from cylc.flow.network import (
     encode_,
     decode_,
@@ -40,13 +44,21 @@ from cylc.flow.network import (
 )
 from cylc.flow.network.client_factory import CommsMeth
 from cylc.flow.network.server import PB_METHOD_MAP
-from cylc.flow.workflow_files import detect_old_contact_file
+from cylc.flow.workflow_files import (
+    ContactFileFields,
+    detect_old_contact_file,
+    load_contact_file
+)
 
 
 class WorkflowRuntimeClient(ZMQSocketBase):
     """Initiate a client to the scheduler API.
 
-    Initiates the REQ part of a ZMQ REQ-REP pair.
+    Initiates the DEALER part of a ZMQ DEALER-ROUTER pair.
+
+    Each request is tagged with an ID which the server returns along with the
+    response, so many requests can be in flight at once on one connection,
+    e.g. ``asyncio.gather(*(client.async_request(...) for ...))``.
 
     This class contains the logic for the ZMQ message interface and client -
     server communication.
@@ -69,7 +81,7 @@ class WorkflowRuntimeClient(ZMQSocketBase):
             If both host and port are provided it is not necessary to load
             the contact file.
         port (int):
-            The port on which the REQ-REP TCP server is listening.
+            The port on which the TCP server is listening.
 
             If both host and port are provided it is not necessary to load
             the contact file.
@@ -117,10 +129,10 @@ class WorkflowRuntimeClient(ZMQSocketBase):
             host: str = None,
             port: int = None,
             context: object = None,
-            timeout: Union[float, str] = None,
+            timeout: Optional[Union[float, str]] = None,
             srv_public_key_loc: str = None
     ):
-        super().__init__(zmq.REQ, context=context)
+        super().__init__(zmq.DEALER, context=context)
         self.workflow = workflow
         if not host or not port:
             host, port, _ = get_location(workflow)
@@ -135,7 +147,10 @@ class WorkflowRuntimeClient(ZMQSocketBase):
         self.timeout = timeout * 1000
         self.timeout_handler = partial(
             self._timeout_handler, workflow, host, port)
-        self.poller = None
+        self.request_ids = count()
+        # futures for requests awaiting responses {request_id: future}
+        self.pending: Dict[bytes, asyncio.Future] = {}
+        self.receiver = None
         # Connect the ZMQ socket on instantiation
         self.start(self.host, self.port, srv_public_key_loc)
         # gather header info post start
@@ -150,10 +165,6 @@ class WorkflowRuntimeClient(ZMQSocketBase):
         # if there is no server don't keep the client hanging around
         self.socket.setsockopt(zmq.LINGER, int(self.DEFAULT_TIMEOUT))
 
-        # create a poller to handle timeouts
-        self.poller = zmq.Poller()
-        self.poller.register(self.socket, zmq.POLLIN)
-
     async def async_request(self, command, args=None, timeout=None):
         """Send an asynchronous request using asyncio.
 
@@ -174,12 +185,22 @@ class WorkflowRuntimeClient(ZMQSocketBase):
         msg.update(self.header)
         LOG.debug('zmq:send %s', msg)
         message = encode_(msg)
-        self.socket.send_string(message)
+        request_id = str(next(self.request_ids)).encode()
+        future = asyncio.get_event_loop().create_future()
+        self.pending[request_id] = future
+        # (the empty frame delimits the "envelope" as for REQ sockets)
+        await self.socket.send_multipart(
+            [request_id, b'', message.encode()])
+        if self.receiver is None or self.receiver.done():
+            self.receiver = asyncio.ensure_future(self._receive())
 
         # receive response
-        if self.poller.poll(timeout):
-            res = await self.socket.recv()
-        else:
+        try:
+            res = await asyncio.wait_for(future, timeout / 1000)
+        except asyncio.TimeoutError:
+            self.pending.pop(request_id, None)
+            if not self.pending:
+                self.receiver.cancel()
             if callable(self.timeout_handler):
                 self.timeout_handler()
             raise ClientTimeout(
@@ -200,6 +221,32 @@ class WorkflowRuntimeClient(ZMQSocketBase):
             error = response['error']
             raise ClientError(error['message'], error.get('traceback'))
 
+    async def _receive(self):
+        """Pass responses to the requests awaiting them.
+
+        Runs while there are requests awaiting responses. Late responses to
+        requests which have timed out are discarded.
+
+        """
+        while self.pending:
+            try:
+                request_id, *_, res = await self.socket.recv_multipart()
+            except zmq.error.ZMQError as exc:
+                for future in self.pending.values():
+                    if not future.done():
+                        future.set_exception(ClientError(str(exc)))
+                self.pending.clear()
+                return
+            future = self.pending.pop(request_id, None)
+            if future is not None and not future.done():
+                future.set_result(res)
+
+    def _bespoke_stop(self):
+        """Stop awaiting responses."""
+        super()._bespoke_stop()
+        if self.receiver is not None:
+            self.receiver.cancel()
+
     def serial_request(self, command, args=None, timeout=None):
         """Send a request.
 
@@ -285,3 +332,73 @@ class WorkflowRuntimeClient(ZMQSocketBase):
             raise WorkflowStopped(workflow)
 
     __call__ = serial_request
+
+
+# client cache {event_loop: {(workflow, host, port, uuid): client}}
+# (asyncio sockets are bound to the event loop they were created in)
+_CLIENTS: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def get_cached_client(
+    workflow: str,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    uuid: Optional[str] = None,
+    timeout: Optional[Union[float, str]] = None
+) -> WorkflowRuntimeClient:
+    """Return a client for the workflow, re-using an existing connection.
+
+    Clients are cached by workflow, host, port and run UUID for the current
+    event loop. If the workflow has restarted, the client for the old run
+    (which has the old run's keys) is closed.
+
+    Call close_cached_clients when done with them.
+
+    Args:
+        workflow:
+            Name of the workflow to connect to.
+        host:
+            The host where the flow is running if known.
+        port:
+            The port on which the TCP server is listening if known.
+        uuid:
+            The UUID of the workflow run if known.
+        timeout:
+            Set the default timeout of new clients in seconds.
+
+    Raises:
+        WorkflowStopped: if the workflow is not running.
+
+    """
+    if host and port and uuid:
+        key: Tuple[str, str, int, str] = (workflow, host, int(port), uuid)
+    else:
+        try:
+            contact = load_contact_file(workflow)
+        except ServiceFileError:
+            raise WorkflowStopped(workflow)
+        key = (
+            workflow,
+            get_fqdn_by_host(contact[ContactFileFields.HOST]),
+            int(contact[ContactFileFields.PORT]),
+            contact[ContactFileFields.UUID]
+        )
+    clients = _CLIENTS.setdefault(asyncio.get_event_loop(), {})
+    client = clients.get(key)
+    if client is None or client.socket.closed:
+        for old_key in list(clients):
+            if old_key[0] == workflow:
+                clients.pop(old_key).stop(stop_loop=False)
+        client = WorkflowRuntimeClient(
+            workflow, host=key[1], port=key[2], timeout=timeout)
+        clients[key] = client
+    return client
+
+
+def close_cached_clients() -> None:
+    """Close the clients cached for the current event loop.
+
+    See get_cached_client.
+    """
+    for client in _CLIENTS.pop(asyncio.get_event_loop(), {}).values():
+        client.stop(stop_loop=False)
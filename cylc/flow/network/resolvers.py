@@ -169,6 +169,63 @@ def node_filter(node, node_type, args):
     )
 
 
+def has_glob(pattern):
+    """Return True if a pattern contains fnmatch wildcards.
+
+    Examples:
+        >>> has_glob('foo'), has_glob('f*'), has_glob('f?o'), has_glob('[f]')
+        (False, True, True, True)
+
+    """
+    return any(char in pattern for char in '*?[')
+
+
+def index_ids_candidates(index, items):
+    """Return IDs of the indexed nodes which could match any id argument.
+
+    Returns None if the candidates cannot be narrowed down using the index
+    (i.e. if any id argument only has wildcard cycle point and name).
+    """
+    result = set()
+    for _, _, cycle, name, _, state in items:
+        candidates = []
+        if cycle and not has_glob(cycle):
+            candidates.append(index.cycle_points.get(cycle, set()))
+        if name and not has_glob(name):
+            candidates.append(index.namespaces.get(name, set()))
+        if state:
+            candidates.append(index.states.get(state, set()))
+        if not candidates:
+            return None
+        candidates.sort(key=len)
+        result.update(candidates[0].intersection(*candidates[1:]))
+    return result
+
+
+def index_candidates(index, args):
+    """Return IDs of the indexed nodes which could pass node_filter.
+
+    The IDs are in data-store order. Returns None if the arguments don't
+    narrow down the candidates (in which case all nodes must be filtered).
+    """
+    candidates = []
+    if args.get('states'):
+        candidates.append(set().union(*(
+            index.states.get(state, ()) for state in args['states'])))
+    if args.get('is_held'):
+        candidates.append(index.held)
+    if args.get('is_queued'):
+        candidates.append(index.queued)
+    if args.get('ids'):
+        ids = index_ids_candidates(index, args['ids'])
+        if ids is not None:
+            candidates.append(ids)
+    if not candidates:
+        return None
+    candidates.sort(key=len)
+    return index.ordered(candidates[0].intersection(*candidates[1:]))
+
+
 def get_flow_data_from_ids(data_store, native_ids):
     """Return workflow data by id."""
     w_ids = set()
@@ -238,10 +295,29 @@ class BaseResolvers:  # noqa: SIM119 (no real gain + mutable default)
         return sort_elements(
             [n
              for flow in await self.get_workflows_data(args)
-             for n in flow.get(node_type).values()
+             for n in self.get_candidate_nodes(flow, node_type, args)
              if node_filter(n, node_type, args)],
             args)
 
+    def get_candidate_nodes(self, flow, node_type, args):
+        """Return the nodes of a workflow which could pass the filter args.
+
+        Uses the data-store indexes (where available) to avoid filtering
+        every node of the workflow.
+        """
+        nodes = flow.get(node_type)
+        if 'sub_id' in args and args['delta_store']:
+            return nodes.values()
+        # (Data stores without indexes are scanned.)
+        index = getattr(self.data_store_mgr, 'indexes', {}).get(
+            flow[WORKFLOW].id, {}).get(node_type)
+        if index is None:
+            return nodes.values()
+        node_ids = index_candidates(index, args)
+        if node_ids is None:
+            return nodes.values()
+        return [nodes[node_id] for node_id in node_ids if node_id in nodes]
+
     async def get_nodes_by_ids(self, node_type, args):
         """Return protobuf node objects for given id."""
         nat_ids = set(args.get('native_ids', []))
@@ -46,6 +46,7 @@ e.g. :py:func:`contact_info`.
 
 from collections.abc import Iterable
 import asyncio
+import os
 from pathlib import Path
 import re
 
@@ -60,14 +61,18 @@ from cylc.flow.async_util import (
     scandir
 )
 from cylc.flow.network.client import (
-    WorkflowRuntimeClient, ClientError, ClientTimeout)
+    ClientError, ClientTimeout, get_cached_client)
 from cylc.flow.pathutil import get_workflow_run_dir
 from cylc.flow.exceptions import WorkflowStopped
 from cylc.flow.workflow_files import (
     ContactFileFields,
     WorkflowFiles,
     get_workflow_title,
-    load_contact_file_async,
+    dump_registry,
+    lock_registry,
+    load_contact_file,
+    load_registry,
+    update_registry,
     MAX_SCAN_DEPTH
 )
 
@@ -83,6 +88,8 @@ FLOW_FILES = {
     'log'
 }
 
+MAX_QUERIES = 50  # max number of workflows graphql_query contacts at once
+
 EXCLUDE_FILES = {
     WorkflowFiles.RUN_N,
     WorkflowFiles.Install.SOURCE
@@ -112,6 +119,13 @@ def dir_is_flow(listing):
 async def scan(run_dir=None, scan_dir=None, max_depth=MAX_SCAN_DEPTH):
     """List flows installed on the filesystem.
 
+    Flows are listed from the workflow registry (see
+    :py:func:`cylc.flow.workflow_files.load_registry`) if it is up to date,
+    otherwise the directory tree is walked and the registry rewritten.
+
+    The registry is out of date if there is a new top-level directory or if
+    any directory which was walked to build it has been modified.
+
     Args:
         run_dir (pathlib.Path):
             The run dir to look for workflows in, defaults to ~/cylc-run.
@@ -134,24 +148,121 @@ async def scan(run_dir=None, scan_dir=None, max_depth=MAX_SCAN_DEPTH):
     """
     if not run_dir:
         run_dir = Path(get_workflow_run_dir(''))
-    if not scan_dir:
-        scan_dir = run_dir
+    run_dir = Path(run_dir)
+    scan_dir = Path(scan_dir) if scan_dir else run_dir
+
+    # (load the registry first, see _scan_dir)
+    registry = load_registry(run_dir)
+    listing = [
+        subdir
+        for subdir in await scandir(run_dir)
+        if subdir.is_dir()
+    ]
+    if (
+        registry is not None
+        # any new top-level directory may contain unregistered flows
+        and {subdir.name for subdir in listing} <= set(registry['dirs'])
+        # as may any directory which has changed since the last walk
+        and _dirs_unchanged(run_dir, registry['mtimes'])
+    ):
+        flows = _scan_registry(registry, run_dir, scan_dir, max_depth)
+    else:
+        flows = _scan_dir(
+            run_dir,
+            scan_dir,
+            max_depth,
+            listing if scan_dir == run_dir else None,
+            registry
+        )
+    async for flow in flows:
+        yield flow
+
+
+def _dirs_unchanged(run_dir, mtimes):
+    """Return True if directories have the recorded modification times.
+
+    Args:
+        mtimes (dict):
+            {path relative to run_dir: modification time (ns)}
+
+    """
+    for name, mtime in mtimes.items():
+        try:
+            if os.stat(run_dir / name).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+async def _scan_registry(registry, run_dir, scan_dir, max_depth):
+    """List flows from the workflow registry.
+
+    Flows which have been removed are dropped from the registry.
 
+    """
+    removed = []
+    for name in registry['workflows']:
+        path = run_dir / name
+        try:
+            depth = len(path.relative_to(scan_dir).parts)
+        except ValueError:
+            # not in the scan dir
+            continue
+        if not 0 < depth <= max_depth:
+            continue
+        if not path.is_dir():
+            removed.append(name)
+            continue
+        yield {
+            'name': name,
+            'path': path,
+        }
+    if removed:
+        update_registry(remove=removed, run_dir=run_dir)
+
+
+async def _scan_dir(run_dir, scan_dir, max_depth, listing=None,
+                    registry=None):
+    """List flows by walking the directory tree.
+
+    If the whole run dir is scanned the workflow registry is rewritten from
+    the results, along with the modification times of the directories which
+    were looked in for flows. Workflows registered while the walk was running
+    are kept.
+
+    Args:
+        listing (list):
+            The directories in the scan dir if already known.
+        registry (dict):
+            The workflow registry as it was before the walk started.
+
+    """
     running = []
+    flows = []
+    mtimes = {}
 
     # wrapper for scandir to preserve context
     async def _scandir(path, depth):
+        # (get the mtime first so that changes made during the listing will
+        # be picked up by the next scan)
+        mtime = path.stat().st_mtime_ns
         contents = await scandir(path)
-        return path, depth, contents
+        return path, depth, mtime, contents
 
     # perform the first directory listing
-    for subdir in await scandir(scan_dir):
-        if subdir.is_dir():
-            running.append(
-                asyncio.create_task(
-                    _scandir(subdir, 1)
-                )
+    if listing is None:
+        listing = [
+            subdir
+            for subdir in await scandir(scan_dir)
+            if subdir.is_dir()
+        ]
+    for subdir in listing:
+        running.append(
+            asyncio.create_task(
+                _scandir(subdir, 1)
             )
+        )
 
     # perform all further directory listings
     while running:
@@ -161,27 +272,50 @@ async def scan(run_dir=None, scan_dir=None, max_depth=MAX_SCAN_DEPTH):
             return_when=asyncio.FIRST_COMPLETED
         )
         for task in done:
-            path, depth, contents = task.result()
+            path, depth, mtime, contents = task.result()
             running.remove(task)
             if dir_is_flow(contents):
                 # this is a flow directory
+                name = str(path.relative_to(run_dir))
+                flows.append(name)
                 yield {
-                    'name': str(path.relative_to(run_dir)),
+                    'name': name,
                     'path': path,
                 }
-            elif depth < max_depth:
-                # we may have a nested flow, lets see...
-                for subdir in contents:
-                    if (subdir.is_dir()
-                            and subdir.stem not in EXCLUDE_FILES):
-                        running.append(
-                            asyncio.create_task(
-                                _scandir(subdir, depth + 1)
+            else:
+                mtimes[str(path.relative_to(run_dir))] = mtime
+                if depth < max_depth:
+                    # we may have a nested flow, lets see...
+                    for subdir in contents:
+                        if (subdir.is_dir()
+                                and subdir.stem not in EXCLUDE_FILES):
+                            running.append(
+                                asyncio.create_task(
+                                    _scandir(subdir, depth + 1)
+                                )
                             )
-                        )
         # don't allow this to become blocking
         await asyncio.sleep(0)
 
+    if scan_dir == run_dir and max_depth == MAX_SCAN_DEPTH:
+        dirs = {subdir.name for subdir in listing}
+        workflows = set(flows)
+        try:
+            with lock_registry(run_dir):
+                new_registry = load_registry(run_dir)
+                if new_registry is not None:
+                    # keep anything registered since the walk started
+                    for key, items in (
+                        ('dirs', dirs), ('workflows', workflows)
+                    ):
+                        items.update(
+                            set(new_registry[key])
+                            - set(registry[key] if registry else ())
+                        )
+                dump_registry(dirs, workflows, run_dir, mtimes)
+        except OSError as exc:
+            LOG.debug(f'Could not write workflow registry: {exc}')
+
 
 def join_regexes(*patterns):
     """Combine multiple regexes using OR logic."""
@@ -203,8 +337,8 @@ async def filter_name(flow, pattern):
     return bool(pattern.match(flow['name']))
 
 
-@pipe
-async def is_active(flow, is_active):
+@pipe(blocking=True)
+def is_active(flow, is_active):
     """Filter flows by the presence of a contact file.
 
     Args:
@@ -222,8 +356,8 @@ async def is_active(flow, is_active):
     return _is_active == is_active
 
 
-@pipe
-async def contact_info(flow):
+@pipe(blocking=True)
+def contact_info(flow):
     """Read information from the contact file.
 
     Requires:
@@ -234,9 +368,7 @@ async def contact_info(flow):
             Flow information dictionary, provided by scan through the pipe.
 
     """
-    flow.update(
-        await load_contact_file_async(flow['name'], run_dir=flow['path'])
-    )
+    flow.update(load_contact_file(flow['name'], run_dir=flow['path']))
     return flow
 
 
@@ -315,7 +447,7 @@ def format_query(fields, filters=None):
     return (ret + '\n',), {'filters': filters}
 
 
-@pipe(preproc=format_query)
+@pipe(preproc=format_query, concurrency=MAX_QUERIES)
 async def graphql_query(flow, fields, filters=None):
     """Obtain information from a GraphQL request to the flow.
 
@@ -323,6 +455,9 @@ async def graphql_query(flow, fields, filters=None):
         * is_active(True)
         * contact_info
 
+    Connections to the flows are re-used, call
+    cylc.flow.network.client.close_cached_clients once the scan has finished.
+
     Args:
         flow (dict):
             Flow information dictionary, provided by scan through the pipe.
@@ -347,11 +482,12 @@ async def graphql_query(flow, fields, filters=None):
     """
     query = f'query {{ workflows(ids: ["{flow["name"]}"]) {{ {fields} }} }}'
     try:
-        client = WorkflowRuntimeClient(
+        client = get_cached_client(
             flow['name'],
             # use contact_info data if present for efficiency
             host=flow.get('CYLC_WORKFLOW_HOST'),
-            port=flow.get('CYLC_WORKFLOW_PORT')
+            port=flow.get('CYLC_WORKFLOW_PORT'),
+            uuid=flow.get('CYLC_WORKFLOW_UUID')
         )
     except WorkflowStopped:
         LOG.warning(f'Workflow not running: {flow["name"]}')
@@ -397,8 +533,8 @@ async def graphql_query(flow, fields, filters=None):
         return flow
 
 
-@pipe
-async def title(flow):
+@pipe(blocking=True)
+def title(flow):
     """Attempt to parse the workflow title out of the flow config file.
 
     .. warning::
@@ -52,6 +52,7 @@ from cylc.flow.data_store_mgr import (
     FAMILIES, FAMILY_PROXIES, JOBS, TASKS, TASK_PROXIES,
     DELTA_ADDED, DELTA_UPDATED
 )
+from cylc.flow.memory_accounting import get_structure_sizes
 from cylc.flow.workflow_status import StopMode
 
 
@@ -601,6 +602,17 @@ async def resolve_broadcasts(root, info, **args):
     return result
 
 
+def resolve_structure_sizes(root, info, **args):
+    """Resolve the sizes of major scheduler structures.
+
+    These are only available from the scheduler itself.
+    """
+    schd = getattr(info.context.get('resolvers'), 'schd', None)
+    if schd is None:
+        return None
+    return get_structure_sizes(schd)
+
+
 def resolve_json_dump(root, info, **args):
     field = getattr(root, to_snake_case(info.field_name), '{}') or '{}'
     return json.loads(field)
@@ -647,6 +659,15 @@ class TimeZone(ObjectType):
     string_extended = String()
 
 
+class StructureSize(ObjectType):
+    class Meta:
+        description = """
+The number of items in a scheduler structure and their estimated size."""
+    name = String()
+    count = Int(source='items')
+    size = Float(description='Estimated size (bytes).')
+
+
 class Workflow(ObjectType):
     class Meta:
         description = """Global workflow info."""
@@ -749,6 +770,13 @@ class Workflow(ObjectType):
             default_value=[]),
         resolver=resolve_broadcasts)
     pruned = Boolean()
+    structure_sizes = List(
+        StructureSize,
+        description=sstrip('''
+            The number of items and estimated size of major scheduler
+            structures, for spotting unbounded memory growth.
+        '''),
+        resolver=resolve_structure_sizes)
 
 
 class Job(ObjectType):
@@ -15,12 +15,16 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Server for workflow runtime API."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import getpass  # noqa: F401
 from queue import Queue
 from textwrap import dedent
+from threading import local
 from time import sleep
 
 from graphql.execution.executors.asyncio import AsyncioExecutor
+from graphql.language.parser import parse
 import zmq
 
 from cylc.flow import LOG
@@ -47,6 +51,47 @@ def expose(func=None):
     return func
 
 
+def is_mutation(message):
+    """Return True if a request may change the scheduler state.
+
+    Examples:
+        >>> is_mutation({'command': 'pb_entire_workflow', 'args': {}})
+        False
+        >>> is_mutation({'command': 'graphql', 'args': {
+        ...     'request_string': 'query { workflows { id } }'}})
+        False
+        >>> is_mutation({'command': 'graphql', 'args': {
+        ...     'request_string': 'mutation { pause(workflows: []) { id } }'}})
+        True
+
+    """
+    command = message.get('command')
+    if command in WorkflowRuntimeServer.QUERY_COMMANDS:
+        return False
+    if command != 'graphql':
+        return True
+    request_string = message.get('args', {}).get('request_string')
+    if not isinstance(request_string, str):
+        return True
+    if 'mutation' not in request_string:
+        return False
+    try:
+        document = parse(request_string)
+    except Exception:
+        # let the graphql endpoint report the error
+        return True
+    return any(
+        getattr(definition, 'operation', None) == 'mutation'
+        for definition in document.definitions
+    )
+
+
+def _init_worker():
+    """Set up a server worker thread."""
+    # for the GraphQL AsyncioExecutor
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
 def filter_none(dictionary):
     """Filter out `None` items from a dictionary:
 
@@ -88,6 +133,14 @@ class WorkflowRuntimeServer(ZMQSocketBase):
         * Returns responses of the format: {"data": {...}}
         * Returns error in the format: {"error": {"message": MSG}}
 
+    Concurrency:
+        Requests are received by a ROUTER socket (which REQ clients talk to
+        as they would a REP socket). Read-only requests (queries) are served
+        concurrently by a pool of QUERY_WORKERS threads. Requests which may
+        change the scheduler state (GraphQL mutations, including task
+        messages) are served one at a time, in the order received, by a
+        single thread. So slow queries don't hold up task messages.
+
     Common Arguments:
         Arguments which are shared between multiple commands.
 
@@ -113,6 +166,16 @@ class WorkflowRuntimeServer(ZMQSocketBase):
 
     """
 
+    QUERY_WORKERS = 4
+    """Number of threads serving queries."""
+
+    QUERY_COMMANDS = {
+        'api', 'get_graph_raw', 'pb_data_elements', 'pb_entire_workflow'}
+    """Endpoints which don't change the scheduler state.
+
+    (GraphQL queries are also read-only, see is_mutation.)
+    """
+
     RECV_TIMEOUT = 1
     """Max time the WorkflowRuntimeServer will wait for an incoming
     message in seconds.
@@ -127,13 +190,20 @@ class WorkflowRuntimeServer(ZMQSocketBase):
 
     def __init__(self, schd, context=None, barrier=None,
                  threaded=True, daemon=False):
-        super().__init__(zmq.REP, bind=True, context=context,
+        super().__init__(zmq.ROUTER, bind=True, context=context,
                          barrier=barrier, threaded=threaded, daemon=daemon)
         self.schd = schd
         self.workflow = schd.workflow
         self.public_priv = None  # update in get_public_priv()
         self.endpoints = None
         self.queue = None
+        self.query_pool = None
+        self.mutation_pool = None
+        # workers send responses to the listener over inproc sockets
+        self.responses = None
+        self.responses_address = f'inproc://cylc-server-{id(self)}'
+        self.response_sockets = []
+        self.local = local()
         self.resolvers = Resolvers(
             self.schd.data_store_mgr,
             schd=self.schd
@@ -160,7 +230,23 @@ class WorkflowRuntimeServer(ZMQSocketBase):
         # start accepting requests
         self.queue = Queue()
         self.register_endpoints()
-        self._listener()
+        self.responses = self.context.socket(zmq.PULL)
+        self.responses.bind(self.responses_address)
+        self.query_pool = ThreadPoolExecutor(
+            self.QUERY_WORKERS, initializer=_init_worker)
+        self.mutation_pool = ThreadPoolExecutor(1, initializer=_init_worker)
+        try:
+            self._listener()
+        finally:
+            self._stop_workers()
+
+    def _stop_workers(self):
+        """Wait for requests in progress, then close the worker sockets."""
+        for pool in (self.query_pool, self.mutation_pool):
+            pool.shutdown(wait=True)
+        for sock in self.response_sockets + [self.responses]:
+            sock.close(linger=0)
+        self.response_sockets.clear()
 
     def _bespoke_stop(self):
         """Stop the listener and Authenticator.
@@ -174,7 +260,8 @@ class WorkflowRuntimeServer(ZMQSocketBase):
             self.queue.put('STOP')
 
     def _listener(self):
-        """The server main loop, listen for and serve requests."""
+        """The server main loop, listen for requests and send responses."""
+        poller = None
         while True:
             # process any commands passed to the listener by its parent process
             if self.queue.qsize():
@@ -183,12 +270,22 @@ class WorkflowRuntimeServer(ZMQSocketBase):
                     break
                 raise ValueError('Unknown command "%s"' % command)
 
+            if poller is None:
+                poller = zmq.Poller()
+                poller.register(self.socket, zmq.POLLIN)
+                poller.register(self.responses, zmq.POLLIN)
             try:
-                # wait RECV_TIMEOUT for a message
-                msg = self.socket.recv_string()
-            except zmq.error.Again:
-                # timeout, continue with the loop, this allows the listener
+                # wait RECV_TIMEOUT for a message, this allows the listener
                 # thread to stop
+                events = dict(poller.poll(int(self.RECV_TIMEOUT) * 1000))
+                # send back responses from the workers
+                if self.responses in events:
+                    self._send_responses()
+                if self.socket in events:
+                    frames = self.socket.recv_multipart()
+                else:
+                    continue
+            except zmq.error.Again:
                 continue
             except zmq.error.ZMQError as exc:
                 LOG.exception('unexpected error: %s', exc)
@@ -196,21 +293,20 @@ class WorkflowRuntimeServer(ZMQSocketBase):
 
             # attempt to decode the message, authenticating the user in the
             # process
+            # (frames are: client identity, empty delimiter, message)
             try:
-                message = decode_(msg)
+                message = decode_(frames[-1].decode())
             except Exception as exc:  # purposefully catch generic exception
                 # failed to decode message, possibly resulting from failed
                 # authentication
                 LOG.exception('failed to decode message: "%s"', exc)
             else:
                 # success case - serve the request
-                res = self._receiver(message)
-                if message['command'] in PB_METHOD_MAP:
-                    response = res['data']
+                if is_mutation(message):
+                    pool = self.mutation_pool
                 else:
-                    response = encode_(res).encode()
-                # send back the string to bytes response
-                self.socket.send(response)
+                    pool = self.query_pool
+                pool.submit(self._serve, frames[:-1], message)
 
             # Note: we are using CurveZMQ to secure the messages (see
             # self.curve_auth, self.socket.curve_...key etc.). We have set up
@@ -219,6 +315,45 @@ class WorkflowRuntimeServer(ZMQSocketBase):
 
             sleep(0)  # yield control to other threads
 
+    def _send_responses(self):
+        """Send responses from the workers back to the clients."""
+        while True:
+            try:
+                frames = self.responses.recv_multipart(zmq.NOBLOCK)
+            except zmq.error.Again:
+                return
+            self.socket.send_multipart(frames)
+
+    def _serve(self, envelope, message):
+        """Serve a request (in a worker thread).
+
+        Args:
+            envelope (list):
+                The frames which route the response back to the client.
+            message (dict):
+                The decoded request.
+
+        """
+        try:
+            res = self._receiver(message)
+            if message['command'] in PB_METHOD_MAP:
+                response = res['data']
+            else:
+                response = encode_(res).encode()
+        except Exception as exc:
+            LOG.exception(exc)
+            return
+        # send back the string to bytes response (via the listener, as
+        # ZMQ sockets must not be shared between threads)
+        try:
+            sock = self.local.socket
+        except AttributeError:
+            sock = self.context.socket(zmq.PUSH)
+            sock.connect(self.responses_address)
+            self.local.socket = sock
+            self.response_sockets.append(sock)
+        sock.send_multipart(envelope + [response])
+
     def _receiver(self, message):
         """Wrap incoming messages and dispatch them to exposed methods.
 
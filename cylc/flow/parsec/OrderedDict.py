@@ -93,6 +93,22 @@ class OrderedDictWithDefaults(OrderedDict):
         """Include any default keys in the nonzero calculation."""
         return bool(list(self.keys()))
 
+    def __reduce__(self):
+        """Pickle (or copy) the set items, defaults are in the instance dict.
+
+        Examples:
+            >>> import pickle
+            >>> a = OrderedDictWithDefaults(x=1)
+            >>> a.defaults_ = {'y': 2}
+            >>> b = pickle.loads(pickle.dumps(a))
+            >>> list(OrderedDict.keys(b)), b.defaults_
+            (['x'], {'y': 2})
+
+        """
+        return (
+            self.__class__, (), self.__dict__, None,
+            iter(OrderedDict.items(self)))
+
     def prepend(self, key, value):
         """Prepend new item in the ordered dict."""
         # https://stackoverflow.com/questions/16664874/
@@ -18,14 +18,16 @@
 Importing code should catch ImportError in case Jinja2 is not installed.
 """
 
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 import importlib
 import os
 import pkgutil
 import re
 import sys
 import traceback
+from collections.abc import Mapping
 from glob import glob
+from typing import Iterator, Optional, Set
 
 from jinja2 import (
     BaseLoader,
@@ -42,6 +44,58 @@ from cylc.flow.parsec.exceptions import Jinja2Error
 TRACEBACK_LINENO = re.compile(r'(\s+)?File "<template>", line (\d+)')
 CONTEXT_LINES = 3
 
+# Names of environment variables read by templates, see "record_environ".
+_environ_accessed: Optional[Set[Optional[str]]] = None
+
+
+class RecordingEnviron(Mapping):
+    """Read-only view of os.environ which records the variables looked up.
+
+    Iterating over the environment records None, meaning that the template may
+    depend on any variable.
+
+    Examples:
+        >>> accessed = set()
+        >>> environ = RecordingEnviron(accessed)
+        >>> environ.get('CYLC_NOT_SET_FOR_DOCTEST', 'x')
+        'x'
+        >>> accessed
+        {'CYLC_NOT_SET_FOR_DOCTEST'}
+
+    """
+
+    def __init__(self, accessed: Set[Optional[str]]) -> None:
+        self._accessed = accessed
+
+    def __getitem__(self, key):
+        self._accessed.add(key)
+        return os.environ[key]
+
+    def __iter__(self):
+        self._accessed.add(None)
+        return iter(os.environ)
+
+    def __len__(self):
+        self._accessed.add(None)
+        return len(os.environ)
+
+
+@contextmanager
+def record_environ() -> Iterator[Set[Optional[str]]]:
+    """Record the environment variables read by templates in this context.
+
+    Yields:
+        The set of variable names read, updated as templates are rendered.
+
+    """
+    global _environ_accessed
+    accessed: Set[Optional[str]] = set()
+    _environ_accessed = accessed
+    try:
+        yield accessed
+    finally:
+        _environ_accessed = None
+
 
 class PyModuleLoader(BaseLoader):
     """Load python module as Jinja2 template.
@@ -182,7 +236,10 @@ def jinja2environment(dir_=None):
 
     # Import WORKFLOW HOST USER ENVIRONMENT into template:
     # (usage e.g.: {{environ['HOME']}}).
-    env.globals['environ'] = os.environ
+    if _environ_accessed is None:
+        env.globals['environ'] = os.environ
+    else:
+        env.globals['environ'] = RecordingEnviron(_environ_accessed)
     env.globals['raise'] = raise_helper
     env.globals['assert'] = assert_helper
 
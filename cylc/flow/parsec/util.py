@@ -19,6 +19,7 @@ The copy and override functions below assume values are either dicts
 (nesting) or shallow collections of simple types.
 """
 
+from collections import OrderedDict
 from copy import copy
 import sys
 
@@ -210,6 +211,65 @@ def pdeepcopy(source):
     return target
 
 
+def poverlay(base, source):
+    """Return a copy of base with source replicated into it.
+
+    Unlike "replicate", neither argument is modified and only the sections
+    which source sets are copied, the rest are shared with base. So many
+    overlays of a common base are cheap, but sections of the result must be
+    "unshare"d before being modified in-place.
+
+    Examples:
+        >>> base = OrderedDictWithDefaults()
+        >>> base['a'] = OrderedDictWithDefaults(x=1)
+        >>> base['b'] = OrderedDictWithDefaults(y=2)
+        >>> result = poverlay(base, {'b': {'z': 3}, 'c': 4})
+        >>> [(key, dict(val)) for key, val in result.items()
+        ...  if isinstance(val, dict)]
+        [('a', {'x': 1}), ('b', {'y': 2, 'z': 3})]
+        >>> result['c']
+        4
+        >>> result['a'] is base['a'], result['b'] is base['b']
+        (True, False)
+        >>> dict(base['b'])
+        {'y': 2}
+
+    """
+    if isinstance(base, OrderedDict):
+        # (not including the default items)
+        target = OrderedDictWithDefaults(OrderedDict.items(base))
+    else:
+        target = OrderedDictWithDefaults(base)
+    if hasattr(base, 'defaults_'):
+        target.defaults_ = base.defaults_
+    if not source:
+        return target
+    if hasattr(source, 'defaults_'):
+        target.defaults_ = pdeepcopy(source.defaults_)
+    for key, val in source.items():
+        if isinstance(val, dict):
+            if key not in target:
+                target[key] = poverlay(OrderedDictWithDefaults(), val)
+            elif val or hasattr(val, 'defaults_'):
+                target[key] = poverlay(target[key], val)
+        elif isinstance(val, list):
+            target[key] = val[:]
+        else:
+            target[key] = val
+    return target
+
+
+def unshare(target, key):
+    """Replace target[key] with a shallow copy of it and return the copy.
+
+    Use this before modifying a section which may be shared with other
+    configs (see "poverlay").
+    """
+    section = copy(target[key])
+    target[key] = section
+    return section
+
+
 def poverride(target, sparse, prepend=False):
     """Override or add items in a target pdict.
 
@@ -243,11 +303,15 @@ def m_override(target, sparse):
 
     Target keys must already exist unless there is a "__MANY__" placeholder in
     the right position.
+
+    Sections shared within sparse (see "poverlay") are shared in target too.
     """
     if not sparse:
         return
     stack = [(sparse, target, [], OrderedDictWithDefaults())]
     defaults_list = []
+    # {(id(source section), id(its many defaults)): (target section, ...)}
+    copies = {}
     while stack:
         source, dest, keylist, many_defaults = stack.pop(0)
         if many_defaults:
@@ -273,7 +337,13 @@ def m_override(target, sparse):
                             "parsec dict override: no __MANY__ placeholder" +
                             "%s" % (keylist + [key])
                         )
+                    copy_key = (id(val), id(child_many_defaults))
+                    if copy_key in copies:
+                        dest[key] = copies[copy_key][0]
+                        continue
                     dest[key] = OrderedDictWithDefaults()
+                    # (keep the keyed objects alive so their ids aren't reused)
+                    copies[copy_key] = (dest[key], val, child_many_defaults)
 
                 stack.append(
                     (val, dest[key], keylist + [key], child_many_defaults))
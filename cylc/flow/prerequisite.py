@@ -16,7 +16,10 @@
 
 """Functionality for expressing and evaluating logical triggers."""
 
+from functools import lru_cache
 import math
+import re
+from sys import intern
 
 from cylc.flow import ID_DELIM
 from cylc.flow.cycling.loader import get_point
@@ -25,6 +28,128 @@ from cylc.flow.data_messages_pb2 import (  # type: ignore
     PbPrerequisite, PbCondition)
 
 
+RE_MESSAGE_INDEX = re.compile(r'<(\d+)>')
+RE_CONDITION_TOKEN = re.compile(r'\s*(?:<(\d+)>|([()&|]))')
+
+
+@lru_cache(10000)
+def compile_condition(expr):
+    """Compile a conditional expression of message indices.
+
+    The expression is compiled to a tree of "and" and "or" nodes. Each node
+    is a tuple (is_or, mask, children) where mask has a bit set for each
+    message which is a direct operand of the node (see evaluate_condition).
+
+    Args:
+        expr (str): Expression of message indices (see
+            Prerequisite.set_condition) e.g. "<0>|(<1>&<2>)".
+
+    Raises:
+        ValueError: for an invalid expression.
+
+    Examples:
+        >>> compile_condition('<0>|(<1>&<2>)')
+        (True, 1, ((False, 6, ()),))
+        >>> compile_condition('(<0>|<1>)&<2>|<3>')
+        (True, 8, ((False, 4, ((True, 3, ()),)),))
+
+    """
+    tokens = []
+    pos = 0
+    while pos < len(expr.rstrip()):
+        match = RE_CONDITION_TOKEN.match(expr, pos)
+        if not match:
+            raise ValueError(f'invalid syntax at "{expr[pos:].strip()}"')
+        if match.group(1) is None:
+            tokens.append(match.group(2))
+        else:
+            tokens.append(1 << int(match.group(1)))
+        pos = match.end()
+    tokens.reverse()
+    node = _compile_operator(tokens, '|')
+    if tokens:
+        raise ValueError(
+            f'unexpected "{tokens[-1]}"'
+            ' (could be unmatched parentheses in the graph string?)')
+    if isinstance(node, int):
+        return (False, node, ())
+    return node
+
+
+def evaluate_condition(node, satisfied):
+    """Evaluate a compiled condition.
+
+    Args:
+        node (tuple): A compiled condition (see compile_condition).
+        satisfied (int): Mask with a bit set for each satisfied message.
+
+    Examples:
+        >>> node = compile_condition('<0>|(<1>&<2>)')
+        >>> evaluate_condition(node, 0b110)
+        True
+        >>> evaluate_condition(node, 0b010)
+        False
+
+    """
+    is_or, mask, children = node
+    if is_or:
+        return bool(satisfied & mask) or any(
+            evaluate_condition(child, satisfied) for child in children)
+    return satisfied & mask == mask and all(
+        evaluate_condition(child, satisfied) for child in children)
+
+
+def _compile_operator(tokens, operator):
+    """Compile "x <operator> y ..." from reversed tokens.
+
+    Return a single message bit or a node (see compile_condition).
+    """
+    if operator == '|':
+        operands = [_compile_operator(tokens, '&')]
+    else:
+        operands = [_compile_operand(tokens)]
+    while tokens and tokens[-1] == operator:
+        tokens.pop()
+        if operator == '|':
+            operands.append(_compile_operator(tokens, '&'))
+        else:
+            operands.append(_compile_operand(tokens))
+    if len(operands) == 1:
+        return operands[0]
+    is_or = operator == '|'
+    mask = 0
+    children = []
+    for operand in operands:
+        if isinstance(operand, int):
+            mask |= operand
+        elif operand[0] == is_or:
+            # e.g. "a | (b | c)"
+            mask |= operand[1]
+            children.extend(operand[2])
+        else:
+            children.append(operand)
+    return (is_or, mask, tuple(children))
+
+
+def _compile_operand(tokens):
+    """Compile a message or "( ... )" from reversed tokens."""
+    if not tokens:
+        raise ValueError(
+            'unexpected end of expression'
+            ' (could be unmatched parentheses in the graph string?)')
+    token = tokens.pop()
+    if token == '(':
+        node = _compile_operator(tokens, '|')
+        if not tokens or tokens.pop() != ')':
+            raise ValueError(
+                'unexpected end of expression'
+                ' (could be unmatched parentheses in the graph string?)')
+        return node
+    if isinstance(token, int):
+        return token
+    raise ValueError(f'unexpected "{token}"')
+
+
 class Prerequisite:
     """The concrete result of an abstract logical trigger expression.
 
@@ -42,8 +167,8 @@ class Prerequisite:
                  "target_point_strings", "start_point",
                  "conditional_expression", "point"]
 
-    # Extracts T from "foo.T succeeded" etc.
-    SATISFIED_TEMPLATE = 'bool(self.satisfied[("%s", "%s", "%s")])'
+    # Stands in for the Nth message of a conditional expression.
+    INDEX_TEMPLATE = '<%d>'
     MESSAGE_TEMPLATE = '%s.%s %s'
 
     DEP_STATE_SATISFIED = 'satisfied naturally'
@@ -66,8 +191,9 @@ class Prerequisite:
         # {('task name', 'point string', 'output'): DEP_STATE_X, ...}
         self.satisfied = {}
 
-        # Expression present only when conditions are used.
-        # 'foo.1 failed & bar.1 succeeded'
+        # Expression present only when conditions are used, with messages
+        # replaced by their index in self.satisfied (see set_condition).
+        # '<0>|<1>' for 'foo.1 failed|bar.1 succeeded'
         self.conditional_expression = None
 
         # The cached state of this prerequisite:
@@ -108,24 +234,32 @@ class Prerequisite:
         expr = self.conditional_expression
         if not expr:
             return None
-        for message in self.satisfied:
-            expr = expr.replace(self.SATISFIED_TEMPLATE % message,
-                                self.MESSAGE_TEMPLATE % message)
-        return expr
+        messages = [
+            self.MESSAGE_TEMPLATE % message for message in self.satisfied]
+        return RE_MESSAGE_INDEX.sub(
+            lambda match: messages[int(match.group(1))], expr)
 
     def set_condition(self, expr):
         """Set the conditional expression for this prerequisite.
 
         Resets the cached state (self._all_satisfied).
 
+        Messages in the expression are replaced by their index, so that
+        prerequisites generated from the same dependency share one
+        expression, which is compiled once (see compile_condition).
+
         """
         self._all_satisfied = None
         if '|' in expr:
-            # Make a Python expression so we can eval() the logic.
-            for message in self.satisfied:
-                expr = expr.replace(self.MESSAGE_TEMPLATE % message,
-                                    self.SATISFIED_TEMPLATE % message)
-            self.conditional_expression = expr
+            # (Longest first, in case one message is part of another.)
+            for index, message in sorted(
+                enumerate(self.MESSAGE_TEMPLATE % message
+                          for message in self.satisfied),
+                key=lambda item: len(item[1]),
+                reverse=True
+            ):
+                expr = expr.replace(message, self.INDEX_TEMPLATE % index)
+            self.conditional_expression = intern(expr)
 
     def is_satisfied(self):
         """Return True if prerequisite is satisfied.
@@ -154,15 +288,15 @@ class Prerequisite:
 
         """
         try:
-            res = eval(self.conditional_expression)
-        except (SyntaxError, ValueError) as exc:
-            err_msg = str(exc)
-            if str(exc).find("unexpected EOF") != -1:
-                err_msg += (
-                    " (could be unmatched parentheses in the graph string?)")
+            node = compile_condition(self.conditional_expression)
+        except ValueError as exc:
             raise TriggerExpressionError(
-                '"%s":\n%s' % (self.get_raw_conditional_expression(), err_msg))
-        return res
+                '"%s":\n%s' % (self.get_raw_conditional_expression(), exc))
+        satisfied = 0
+        for index, state in enumerate(self.satisfied.values()):
+            if state:
+                satisfied |= 1 << index
+        return evaluate_condition(node, satisfied)
 
     def satisfy_me(self, all_task_outputs):
         """Evaluate pre-requisite against known outputs.
@@ -170,9 +304,13 @@ class Prerequisite:
         Updates cache with the evaluation result.
 
         """
-        relevant_messages = all_task_outputs & set(self.satisfied)
-        for message in relevant_messages:
-            self.satisfied[message] = self.DEP_STATE_SATISFIED
+        relevant_messages = {
+            message for message in self.satisfied
+            if message in all_task_outputs
+        }
+        if relevant_messages:
+            for message in relevant_messages:
+                self.satisfied[message] = self.DEP_STATE_SATISFIED
             if self.conditional_expression is None:
                 self._all_satisfied = all(self.satisfied.values())
             else:
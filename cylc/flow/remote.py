@@ -162,7 +162,8 @@ DEFAULT_RSYNC_OPTS = [
 
 
 def construct_rsync_over_ssh_cmd(
-        src_path, dst_path, platform, rsync_includes=None):
+        src_path, dst_path, platform, rsync_includes=None, host=None,
+        ssh_cmd=None):
     """Constructs the rsync command used for remote file installation.
 
     Includes as standard the directories: app, bin, etc, lib; and the server
@@ -173,10 +174,13 @@ def construct_rsync_over_ssh_cmd(
         dst_path(string): path of target
         platform(dict)): contains info relating to platform
         rsync_includes(list): files and directories to be included in the rsync
+        host(string): host to install on, else selected from the platform
+        ssh_cmd(string): ssh command to use, else the platform's
 
     """
-    dst_host = get_host_from_platform(platform)
-    ssh_cmd = platform['ssh command']
+    dst_host = host or get_host_from_platform(platform)
+    if ssh_cmd is None:
+        ssh_cmd = platform['ssh command']
     rsync_cmd = [
         "rsync",
         "--delete",
@@ -205,17 +209,19 @@ def construct_rsync_over_ssh_cmd(
     return rsync_cmd
 
 
-def construct_ssh_cmd(raw_cmd, platform, **kwargs):
+def construct_ssh_cmd(raw_cmd, platform, host=None, ssh_cmd=None, **kwargs):
     """Build an SSH command for execution on a remote platform.
 
     Constructs the SSH command according to the platform configuration.
+    The host is selected from the platform and the ssh command is the
+    platform's, unless specified.
 
     See _construct_ssh_cmd for argument documentation.
     """
     return _construct_ssh_cmd(
         raw_cmd,
-        host=get_host_from_platform(platform),
-        ssh_cmd=platform['ssh command'],
+        host=host or get_host_from_platform(platform),
+        ssh_cmd=platform['ssh command'] if ssh_cmd is None else ssh_cmd,
         remote_cylc_path=platform['cylc path'],
         ssh_login_shell=platform['use login shell'],
         **kwargs
@@ -31,7 +31,7 @@ import sys
 from threading import Barrier
 from time import sleep, time
 import traceback
-from typing import Iterable, NoReturn, Optional, List
+from typing import Dict, Iterable, NoReturn, Optional, List
 from uuid import uuid4
 import zmq
 from zmq.auth.thread import ThreadAuthenticator
@@ -558,7 +558,7 @@ class Scheduler:
         try:
             self._configure_contact()
             if self.is_restart:
-                self.restart_remote_init()
+                await self.restart_remote_init()
             self.run_event_handlers(self.EVENT_STARTUP, 'workflow starting')
             await asyncio.gather(
                 *main_loop.get_runners(
@@ -680,7 +680,7 @@ class Scheduler:
             self.pool.load_abs_outputs_for_restart)
         self.pool.load_db_tasks_to_hold()
 
-    def restart_remote_init(self):
+    async def restart_remote_init(self):
         """Remote init for all submitted/running tasks in the pool."""
         distinct_install_target_platforms = []
         for itask in self.pool.get_tasks():
@@ -712,7 +712,7 @@ class Scheduler:
                 self.task_job_mgr.task_remote_mgr.file_install(platform)
         if incomplete_init:
             # TODO: Review whether this sleep is needed.
-            sleep(1.0)
+            await asyncio.sleep(1.0)
             # Remote init/file-install is done via process pool
             self.proc_pool.process()
         self.command_poll_tasks()
@@ -734,8 +734,12 @@ class Scheduler:
             return
 
     def process_queued_task_messages(self):
-        """Handle incoming task messages for each task proxy."""
-        messages = {}
+        """Handle incoming task messages for each task proxy.
+
+        Messages are taken off the queue in arrival order, batched by task ID
+        and dispatched directly to the owning task proxy.
+        """
+        messages: Dict[str, List[tuple]] = {}
         while self.message_queue.qsize():
             try:
                 task_job, event_time, severity, message = (
@@ -752,9 +756,11 @@ class Scheduler:
         # reverse change to task state, it is desirable to confirm this by
         # polling.
         to_poll_tasks = []
-        for itask in self.pool.get_tasks():
-            message_items = messages.get(itask.identity)
-            if message_items is None:
+        for task_id, message_items in messages.items():
+            itask = self.pool.get_task_by_id(task_id)
+            if itask is None:
+                LOG.debug(
+                    '%s: ignoring message(s) for task not in pool', task_id)
                 continue
             should_poll = False
             for submit_num, event_time, severity, message in message_items:
@@ -1039,6 +1045,8 @@ class Scheduler:
         # fmt: on
         workflow_files.dump_contact_file(self.workflow, contact_data)
         self.contact_data = contact_data
+        # Workflows need not be installed to run, make sure "scan" sees it
+        workflow_files.update_registry(add=[self.workflow])
 
     def load_flow_file(self, is_reload=False):
         """Load, and log the workflow definition."""
@@ -1290,7 +1298,7 @@ class Scheduler:
                     "Waiting for the command process pool to empty" +
                     " for shutdown")
                 while self.proc_pool.is_not_done():
-                    sleep(self.INTERVAL_STOP_PROCESS_POOL_EMPTY)
+                    await asyncio.sleep(self.INTERVAL_STOP_PROCESS_POOL_EMPTY)
                     if stop_process_pool_empty_msg:
                         LOG.info(stop_process_pool_empty_msg)
                         stop_process_pool_empty_msg = None
@@ -1385,6 +1393,9 @@ class Scheduler:
             self.previous_profile_point = now
             self.profiler.log_memory("scheduler.py: loop #%d: %s" % (
                 self.count, get_current_time_string()))
+            LOG.info(
+                "PROFILE: process pool: %(run)d commands run,"
+                " %(coalesced)d coalesced" % self.proc_pool.stats)
         self.count += 1
 
     async def main_loop(self):
@@ -1407,6 +1418,7 @@ class Scheduler:
                 self.reset_inactivity_timer()
 
             self.proc_pool.process()
+            self.task_job_mgr.task_remote_mgr.ssh_control_mgr.check()
 
             # Tasks in the main pool that are waiting but not queued must be
             # waiting on external dependencies, i.e. xtriggers or ext_triggers.
@@ -1641,6 +1653,7 @@ class Scheduler:
             if self.proc_pool.is_not_done():
                 # e.g. KeyboardInterrupt
                 self.proc_pool.terminate()
+                await self.proc_pool.join()
             self.proc_pool.process()
 
         if hasattr(self, 'pool'):
@@ -1694,6 +1707,9 @@ class Scheduler:
                 LOG.exception(exc)
             if self.task_job_mgr:
                 self.task_job_mgr.task_remote_mgr.remote_tidy()
+        if hasattr(self, 'task_job_mgr'):
+            # close shared ssh connections
+            self.task_job_mgr.task_remote_mgr.ssh_control_mgr.close()
 
         # The getattr() calls and if tests below are used in case the
         # workflow is not fully configured before the shutdown is called.
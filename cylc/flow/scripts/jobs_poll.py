@@ -37,6 +37,14 @@ def get_option_parser():
             ("[JOB-LOG-DIR ...]", "A point/name/submit_num sub-directory"),
         ],
     )
+    parser.add_option(
+        "--status-cache",
+        help=(
+            "Re-use a list of the user's jobs in the job runner which is"
+            " up to SECONDS old (obtaining it if necessary)."
+        ),
+        metavar="SECONDS", type="float", default=0, action="store",
+        dest="status_cache")
 
     return parser
 
@@ -44,7 +52,8 @@ def get_option_parser():
 @cli_function(get_option_parser)
 def main(parser, options, job_log_root, *job_log_dirs):
     """CLI main."""
-    JobRunnerManager().jobs_poll(job_log_root, job_log_dirs)
+    JobRunnerManager().jobs_poll(
+        job_log_root, job_log_dirs, status_cache=options.status_cache)
 
 
 if __name__ == "__main__":
@@ -53,6 +53,7 @@ from ansimarkup import ansiprint as cprint
 
 from cylc.flow import LOG
 from cylc.flow.exceptions import UserInputError
+from cylc.flow.network.client import close_cached_clients
 from cylc.flow.network.scan import (
     scan,
     is_active,
@@ -485,7 +486,10 @@ async def scanner(opts, write, scan_dir=None):
 
     LOG.debug(f'pipe: {repr(pipe)}')
 
-    await method(pipe, formatter, opts, write)
+    try:
+        await method(pipe, formatter, opts, write)
+    finally:
+        close_cached_clients()
 
 
 async def main(opts, color=False, scan_dir=None, write=cprint):
@@ -0,0 +1,371 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Manage shared SSH connections to remote platform hosts.
+
+Each remote job command (``jobs-submit``, ``jobs-poll``, ``jobs-kill``) is run
+over a new SSH connection, paying for connection setup and authentication
+every time. Instead the scheduler can keep a master connection open to each
+host it uses and multiplex commands over it (see ``ControlMaster`` in
+``ssh_config(5)``).
+
+Masters are started on first use. They are run with ``ControlPersist`` so
+once connected they go into the background (they are then controlled via
+their sockets) and exit by themselves after being idle for the persist time,
+which cleans up masters orphaned by a scheduler which was killed. While the
+scheduler is running it retires idle masters itself.
+
+Commands which find no master socket (e.g. while the master is still
+connecting) fall back to opening their own connection, so sharing is purely
+an optimisation.
+
+Masters are retired with ``ssh -O stop``, which stops them accepting new
+commands but lets those already running over them finish.
+"""
+
+from contextlib import suppress
+import hashlib
+from itertools import count
+from math import ceil
+import os
+import shlex
+from shutil import rmtree
+from subprocess import TimeoutExpired
+from tempfile import mkdtemp
+from time import time
+
+from cylc.flow import LOG
+from cylc.flow.cylc_subproc import procopen, DEVNULL
+from cylc.flow.platforms import get_host_from_platform
+from cylc.flow.remote import construct_rsync_over_ssh_cmd, construct_ssh_cmd
+from cylc.flow.subprocctx import SubProcContext
+
+
+class SSHControlMaster:
+    """A master SSH connection to a host.
+
+    Args:
+        ssh_cmd (str):
+            The SSH command (from the platform configuration).
+        host (str):
+            The host to connect to.
+        socket (str):
+            Path of the control socket.
+        persist (float):
+            How long to keep the master open after its last use (seconds).
+
+    """
+
+    # Have the master notice (and exit) if its connection dies.
+    MASTER_OPTS = ['-oServerAliveInterval=10', '-oServerAliveCountMax=3']
+
+    __slots__ = (
+        'ssh_cmd', 'host', 'socket', 'persist', 'proc', 'started',
+        'last_used')
+
+    def __init__(self, ssh_cmd, host, socket, persist):
+        self.ssh_cmd = ssh_cmd
+        self.host = host
+        self.socket = socket
+        self.persist = persist
+        self.proc = None
+        self.started = None
+        self.last_used = None
+
+    def __str__(self):
+        return f'ssh control master for {self.host}'
+
+    def get_ssh_cmd(self):
+        """Return the SSH command for multiplexing over this master.
+
+        (Options given earlier on the command line take precedence, so the
+        platform configuration can override these.)
+        """
+        return (
+            f'{self.ssh_cmd} -oControlMaster=no'
+            f' -oControlPath={shlex.quote(self.socket)}'
+        )
+
+    def get_control_cmd(self, command):
+        """Return an SSH command to control the master (e.g. "check")."""
+        return shlex.split(self.get_ssh_cmd()) + ['-O', command, self.host]
+
+    def is_connecting(self):
+        """Return True if the master is still connecting to the host."""
+        return self.proc is not None and self.proc.poll() is None
+
+    def is_alive(self):
+        """Return True if the master is connecting or accepting commands."""
+        return self.is_connecting() or self.is_connected()
+
+    def is_connected(self):
+        """Return True if the master is accepting commands."""
+        return os.path.exists(self.socket)
+
+    def _control(self, command, timeout):
+        """Send a control command to the master and wait for it."""
+        with suppress(OSError):
+            proc = procopen(
+                self.get_control_cmd(command),
+                stdin=DEVNULL, stdout=DEVNULL, stderr=DEVNULL)
+            try:
+                proc.wait(timeout)
+            except TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    def start(self):
+        """Start the master process.
+
+        This doesn't wait for the connection to be established. Once it is,
+        ssh goes into the background and the process started here exits.
+        """
+        with suppress(FileNotFoundError):
+            # Stale socket from a previous master.
+            os.unlink(self.socket)
+        cmd = (
+            shlex.split(self.ssh_cmd)
+            + self.MASTER_OPTS
+            + [
+                '-oControlMaster=yes',
+                f'-oControlPath={self.socket}',
+                # (whole seconds, zero would mean forever)
+                f'-oControlPersist={max(ceil(self.persist), 1)}s',
+            ]
+            + ['-N', self.host]
+        )
+        LOG.debug(f'Starting {self}: {" ".join(map(shlex.quote, cmd))}')
+        self.started = time()
+        try:
+            self.proc = procopen(
+                cmd, stdin=DEVNULL, stdout=DEVNULL, stderr=DEVNULL)
+        except OSError as exc:
+            LOG.warning(f'Could not start {self}: {exc}')
+            self.proc = None
+
+    def stop(self, timeout=1.0):
+        """Stop the master process.
+
+        Commands still running over the master are left to finish, the
+        master exits once they have.
+        """
+        if self.is_connected():
+            LOG.debug(f'Stopping {self}')
+            self._control('stop', timeout)
+        self.terminate(timeout)
+
+    def terminate(self, timeout=1.0):
+        """Terminate the master process.
+
+        Commands still running over the master are terminated too.
+        """
+        if self.is_alive():
+            LOG.debug(f'Terminating {self}')
+        if self.is_connecting():
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout)
+            except TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        if self.is_connected():
+            self._control('exit', timeout)
+        self.proc = None
+        with suppress(FileNotFoundError):
+            os.unlink(self.socket)
+
+
+class SSHControlMgr:
+    """Manage master SSH connections to remote platform hosts.
+
+    Connection sharing is configured per platform by
+    "[platforms][<platform>]ssh control persist", which is how long a master
+    connection is kept open after its last use (or zero to not share
+    connections).
+
+    Masters are health checked every CHECK_INTERVAL seconds, those which
+    are idle or have stopped responding are retired and those which have
+    died or failed to connect are terminated, so that the next command to
+    the host starts a new one (this is how lost connections are
+    re-established).
+
+    Retired masters stop accepting new commands and exit once the commands
+    running over them have finished (which is why each master gets its own
+    socket).
+
+    Args:
+        proc_pool (cylc.flow.subprocpool.SubProcPool):
+            Pool to run health checks in.
+
+    """
+
+    CHECK_INTERVAL = 60.0
+    # Minimum time between attempts to start a master for the same host.
+    RESTART_DELAY = 30.0
+
+    def __init__(self, proc_pool):
+        self.proc_pool = proc_pool
+        # {(ssh command, host): SSHControlMaster}
+        self.masters = {}
+        # Masters waiting for their commands to finish.
+        self.retired = []
+        self.control_dir = None
+        self.socket_ids = count()
+        self.next_check = time() + self.CHECK_INTERVAL
+
+    def _get_socket(self, ssh_cmd, host):
+        """Return the control socket path for a connection."""
+        if self.control_dir is None:
+            # (Socket paths are limited to ~100 characters, so these can't
+            # go in the workflow run directory.)
+            self.control_dir = mkdtemp(prefix='cylc-ssh-')
+        name = hashlib.md5(  # nosec (not a security feature)
+            f'{ssh_cmd}\n{host}'.encode()).hexdigest()[:16]
+        return os.path.join(
+            self.control_dir, f'{name}.{next(self.socket_ids)}')
+
+    def get_ssh_cmd(self, platform, host):
+        """Return the SSH command to run a command on a platform host.
+
+        Starts a master connection to the host if needed.
+        """
+        ssh_cmd = platform['ssh command']
+        persist = platform['ssh control persist']
+        if not persist:
+            return ssh_cmd
+        key = (ssh_cmd, host)
+        try:
+            master = self.masters[key]
+        except KeyError:
+            master = SSHControlMaster(
+                ssh_cmd, host, self._get_socket(ssh_cmd, host), persist)
+            self.masters[key] = master
+        else:
+            master.persist = persist
+        now = time()
+        if not master.is_alive() and (
+            master.started is None
+            or now - master.started > self.RESTART_DELAY
+        ):
+            master.start()
+        master.last_used = now
+        return master.get_ssh_cmd()
+
+    def construct_ssh_cmd(self, raw_cmd, platform, **kwargs):
+        """Build an SSH command for a platform, sharing the connection.
+
+        See cylc.flow.remote.construct_ssh_cmd.
+        """
+        host = get_host_from_platform(platform)
+        return construct_ssh_cmd(
+            raw_cmd,
+            platform,
+            host=host,
+            ssh_cmd=self.get_ssh_cmd(platform, host),
+            **kwargs
+        )
+
+    def construct_rsync_over_ssh_cmd(self, src_path, dst_path, platform,
+                                     rsync_includes=None):
+        """Build an rsync command for a platform, sharing the connection.
+
+        See cylc.flow.remote.construct_rsync_over_ssh_cmd.
+        """
+        host = get_host_from_platform(platform)
+        return construct_rsync_over_ssh_cmd(
+            src_path,
+            dst_path,
+            platform,
+            rsync_includes,
+            host=host,
+            ssh_cmd=self.get_ssh_cmd(platform, host)
+        )
+
+    def check(self):
+        """Health check the masters, retire or stop failed and idle ones.
+
+        Call periodically, checks are only done every CHECK_INTERVAL seconds.
+        """
+        now = time()
+        if now < self.next_check:
+            return
+        self.next_check = now + self.CHECK_INTERVAL
+        for master in list(self.retired):
+            if not master.is_alive():
+                LOG.debug(f'{master} stopped')
+                master.terminate()
+                self.retired.remove(master)
+        for master in list(self.masters.values()):
+            if master.proc is None:
+                continue
+            if not master.is_alive():
+                LOG.debug(f'{master} exited')
+                master.terminate()
+            elif now - master.last_used > master.persist:
+                LOG.debug(f'{master} idle')
+                self._retire(master)
+            elif not master.is_connected():
+                if now - master.started > self.CHECK_INTERVAL:
+                    LOG.warning(f'{master} failed to connect')
+                    master.terminate()
+            else:
+                self.proc_pool.put_command(
+                    SubProcContext(
+                        'ssh-control-check', master.get_control_cmd('check')),
+                    self._check_callback,
+                    [master, master.proc]
+                )
+
+    def _retire(self, master):
+        """Stop a master accepting new commands.
+
+        The next command to the host starts a new master, this one exits once
+        the commands running over it have finished.
+        """
+        LOG.debug(f'Retiring {master}')
+        del self.masters[(master.ssh_cmd, master.host)]
+        self.retired.append(master)
+        self.proc_pool.put_command(
+            SubProcContext('ssh-control-stop', master.get_control_cmd('stop')),
+            self._stop_callback,
+            [master]
+        )
+
+    def _check_callback(self, ctx, master, proc):
+        """Retire a master which failed its health check."""
+        if (
+            ctx.ret_code
+            and master.proc is proc
+            and self.masters.get((master.ssh_cmd, master.host)) is master
+        ):
+            LOG.warning(f'{master} is not responding, retiring it')
+            self._retire(master)
+
+    @staticmethod
+    def _stop_callback(ctx, master):
+        """Terminate a retired master which could not be asked to stop."""
+        if ctx.ret_code and master.is_alive():
+            LOG.warning(f'{master} is not responding, terminating it')
+            master.terminate()
+
+    def close(self):
+        """Stop all masters and remove their sockets."""
+        for master in [*self.masters.values(), *self.retired]:
+            master.stop()
+        self.masters.clear()
+        self.retired.clear()
+        if self.control_dir is not None:
+            rmtree(self.control_dir, ignore_errors=True)
+            self.control_dir = None
@@ -15,10 +15,10 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Manage queueing and pooling of subprocesses for the scheduler."""
 
+import asyncio
 from collections import deque
 import json
 import os
-import select
 from signal import SIGKILL
 import sys
 from tempfile import SpooledTemporaryFile
@@ -28,13 +28,13 @@ from subprocess import DEVNULL  # nosec
 
 from cylc.flow import LOG
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
-from cylc.flow.cylc_subproc import procopen
+from cylc.flow.cylc_subproc import async_procopen, procopen
 from cylc.flow.wallclock import get_current_time_string
 
 _XTRIG_FUNCS: dict = {}
 
 
-def _killpg(proc, signal):
+def _killpg(proc, signal, cmd=None):
     """Kill a process group."""
     try:
         os.killpg(proc.pid, signal)
@@ -48,9 +48,13 @@ def _killpg(proc, signal):
         # we could go through the processes in the group and call waitpid on
         # them but waitpid is blocking and this would be a messy solution for a
         # problem that shouldn't happen (it's really a bug in the Cylc subproc)
+        if cmd is None:
+            cmd = proc.args
+        if not isinstance(cmd, str):
+            cmd = ' '.join(cmd)
         LOG.error(
             f'Could not kill process group: {proc.pid}'
-            f'\nCommand: {" ".join(proc.args)}'
+            f'\nCommand: {cmd}'
         )
         return False
     return True
@@ -122,11 +126,24 @@ class SubProcPool:
     context object using the SubProcPool.put_command method. A callback can
     be specified to notify the caller on exit of the subprocess.
 
+    Commands are run as asyncio subprocesses on the running event loop. A
+    command is launched as soon as it is queued if there is room in the pool,
+    its output is read as it is written and, when it exits, its callback is
+    called and the next queued command is launched straight away. Commands
+    queued when no event loop is running are launched by the next call to
+    SubProcPool.process made within one.
+
     A command launched by the pool is expected to write to STDOUT and STDERR.
-    These are captured while the command runs and/or when the command exits.
-    The contents are appended to the `.out` and `.err` attributes of the
-    SubProcContext object as they are read. STDIN can also be specified for the
-    command. This is currently fed into the command using a temporary file.
+    These are captured while the command runs and are set as the `.out` and
+    `.err` attributes of the SubProcContext object when it exits. STDIN can
+    also be specified for the command. This is currently fed into the command
+    using a temporary file.
+
+    Commands which would do the same thing can be given the same coalescing
+    key when they are queued. While a command with a given key is queued or
+    running, further commands put with that key are not run, instead they
+    receive the output and exit status of the first and their callbacks are
+    called when it exits.
 
     Note: For a cylc command that uses
     `cylc.flow.option_parsers.CylcOptionParser`, the default logging handler
@@ -138,7 +155,6 @@ class SubProcPool:
 
     ERR_WORKFLOW_STOPPING = 'workflow stopping, command not run'
     JOBS_SUBMIT = 'jobs-submit'
-    POLLREAD = select.POLLIN | select.POLLPRI
     RET_CODE_WORKFLOW_STOPPING = 999
 
     def __init__(self):
@@ -150,11 +166,10 @@ class SubProcPool:
         # .stopping may be set by an API command in a different thread
         self.stopping_lock = RLock()
         self.queuings = deque()
-        self.runnings = []
-        try:
-            self.pipepoller = select.poll()
-        except AttributeError:  # select.poll not implemented for this OS
-            self.pipepoller = None
+        self.runnings = {}  # {asyncio.Task: asyncio.subprocess.Process}
+        self.errors = deque()  # errors raised by callbacks
+        self.coalescing = {}  # {key: [[ctx, callback, callback_args], ...]}
+        self.stats = {'run': 0, 'coalesced': 0}
 
     def close(self):
         """Close pool."""
@@ -179,10 +194,85 @@ class SubProcPool:
         with self.stopping_lock:
             return self.stopping
 
-    def _proc_exit(self, proc, err_xtra, ctx, callback, callback_args):
-        """Get ret_code, out, err of exited command, and call its callback."""
-        ctx.ret_code = proc.wait()
-        out, err = (f.decode() for f in proc.communicate())
+    def process(self):
+        """Launch queued commands, raise any error from a callback.
+
+        Commands are normally launched as they are queued (or as room becomes
+        available in the pool), this launches any that were queued when no
+        event loop was running.
+
+        Callbacks are called by the event loop when commands exit, errors they
+        raise are re-raised here so they reach the scheduler main loop.
+        """
+        self._launch()
+        if self.errors:
+            raise self.errors.popleft()
+
+    async def join(self):
+        """Wait for running commands to exit."""
+        while self.runnings:
+            await asyncio.wait(list(self.runnings))
+
+    def _launch(self):
+        """Launch queued commands while there is room in the pool."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no event loop to run commands in, try again later
+            return
+        stopping = self._is_stopping()
+        while self.queuings and len(self.runnings) < self.size:
+            ctx, callback, callback_args = self.queuings.popleft()
+            if stopping and ctx.cmd_key == self.JOBS_SUBMIT:
+                self._cancel_command(ctx, callback, callback_args)
+            else:
+                task = loop.create_task(
+                    self._run_command_async(ctx, callback, callback_args))
+                self.runnings[task] = None
+                self.stats['run'] += 1
+
+    async def _run_command_async(self, ctx, callback, callback_args):
+        """Run a command in the pool, call its callback when it exits."""
+        task = asyncio.current_task()
+        proc = None
+        try:
+            proc = await self._run_command_init_async(
+                ctx, callback, callback_args)
+            if proc is not None:
+                self.runnings[task] = proc
+                ctx.timeout = time() + self.proc_pool_timeout
+                await self._proc_exit(proc, ctx, callback, callback_args)
+        except asyncio.CancelledError:
+            # event loop shutting down, don't leave the command behind
+            if proc is not None and proc.returncode is None:
+                _killpg(proc, SIGKILL, ctx.cmd)
+            raise
+        except Exception as exc:
+            self.errors.append(exc)
+        finally:
+            del self.runnings[task]
+            self._launch()
+
+    async def _proc_exit(self, proc, ctx, callback, callback_args):
+        """Wait for command to exit, get ret_code, out, err and callback."""
+        # read STDOUT/STDERR as they are written, a full pipe would stop the
+        # command from proceeding
+        readers = asyncio.gather(proc.stdout.read(), proc.stderr.read())
+        err_xtra = ""
+        try:
+            try:
+                await asyncio.wait_for(proc.wait(), ctx.timeout - time())
+            except asyncio.TimeoutError:
+                # Command timed out, kill it
+                if _killpg(proc, SIGKILL, ctx.cmd):
+                    err_xtra = (
+                        f"\nkilled on timeout ({self.proc_pool_timeout})")
+                await proc.wait()
+            out, err = (f.decode() for f in await readers)
+        except asyncio.CancelledError:
+            readers.cancel()
+            raise
+        ctx.ret_code = proc.returncode
         if out:
             if ctx.out is None:
                 ctx.out = ''
@@ -193,47 +283,7 @@ class SubProcPool:
             ctx.err += err + err_xtra
         self._run_command_exit(ctx, callback, callback_args)
 
-    def process(self):
-        """Process done child processes and submit more."""
-        # Handle child processes that are done
-        runnings = []
-        for proc, ctx, callback, callback_args in self.runnings:
-            # Command completed/exited
-            if proc.poll() is not None:
-                self._proc_exit(proc, "", ctx, callback, callback_args)
-                continue
-            # Command timed out, kill it
-            if time() > ctx.timeout:
-                err_xtra = ""
-                if _killpg(proc, SIGKILL):
-                    err_xtra = (
-                        f"\nkilled on timeout ({self.proc_pool_timeout})"
-                    )
-                self._proc_exit(proc, err_xtra, ctx, callback, callback_args)
-                continue
-            # Command still running, see if STDOUT/STDERR are readable or not
-            runnings.append([proc, ctx, callback, callback_args])
-            # Unblock proc's STDOUT/STDERR if necessary. Otherwise, a full
-            # STDOUT or STDERR may stop command from proceeding.
-            self._poll_proc_pipes(proc, ctx)
-
-        # Update list of running items
-        self.runnings[:] = runnings
-        # Create more child processes, if items in queue and space in pool
-        stopping = self._is_stopping()
-        while self.queuings and len(self.runnings) < self.size:
-            ctx, callback, callback_args = self.queuings.popleft()
-            if stopping and ctx.cmd_key == self.JOBS_SUBMIT:
-                ctx.err = self.ERR_WORKFLOW_STOPPING
-                ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
-                self._run_command_exit(ctx)
-            else:
-                proc = self._run_command_init(ctx, callback, callback_args)
-                if proc is not None:
-                    ctx.timeout = time() + self.proc_pool_timeout
-                    self.runnings.append([proc, ctx, callback, callback_args])
-
-    def put_command(self, ctx, callback=None, callback_args=None):
+    def put_command(self, ctx, callback=None, callback_args=None, key=None):
         """Queue a new shell command to execute.
 
         Arguments:
@@ -245,14 +295,51 @@ class SubProcPool:
                     callback(ctx, *callback_args) -> None
             callback_args (list):
                 Extra arguments to the callback function.
+            key (hashable):
+                Coalescing key. If a command with the same key is already
+                queued or running this command is not run, it gets the
+                result of that command instead.
         """
         if (self.closed or self._is_stopping() and
                 ctx.cmd_key == self.JOBS_SUBMIT):
             ctx.err = self.ERR_WORKFLOW_STOPPING
             ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
             self._run_command_exit(ctx, callback, callback_args)
+        elif key in self.coalescing:
+            self.coalescing[key].append([ctx, callback, callback_args])
+            self.stats['coalesced'] += 1
         else:
+            if key is not None:
+                self.coalescing[key] = [[ctx, callback, callback_args]]
+                callback, callback_args = self._coalesced_exit, [key]
             self.queuings.append([ctx, callback, callback_args])
+            self._launch()
+
+    def _coalesced_exit(self, ctx, key):
+        """Deliver the result of a command to all commands with its key."""
+        for wctx, callback, callback_args in self.coalescing.pop(key):
+            if wctx is not ctx:
+                wctx.ret_code = ctx.ret_code
+                wctx.out = ctx.out
+                wctx.err = ctx.err
+            try:
+                self._run_command_exit(wctx, callback, callback_args)
+            except Exception as exc:
+                # don't let one callback stop the others
+                self.errors.append(exc)
+
+    def _cancel_command(self, ctx, callback=None, callback_args=None):
+        """Drop a queued command without running it."""
+        if callback == self._coalesced_exit:
+            # the callbacks of coalesced commands are not called either
+            for wctx, _, _ in self.coalescing.pop(callback_args[0]):
+                wctx.err = self.ERR_WORKFLOW_STOPPING
+                wctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
+                self._run_command_exit(wctx)
+        else:
+            ctx.err = self.ERR_WORKFLOW_STOPPING
+            ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
+            self._run_command_exit(ctx)
 
     @classmethod
     def run_command(cls, ctx):
@@ -274,103 +361,54 @@ class SubProcPool:
             self.stopping = True
 
     def terminate(self):
-        """Drain queue, and kill and process remaining child processes."""
+        """Drain queue, and kill remaining child processes.
+
+        Await SubProcPool.join to process the killed commands.
+        """
         self.close()
         # Drain queue
         while self.queuings:
-            ctx = self.queuings.popleft()[0]
-            ctx.err = self.ERR_WORKFLOW_STOPPING
-            ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
-            self._run_command_exit(ctx)
+            self._cancel_command(*self.queuings.popleft())
         # Kill remaining processes
-        for value in self.runnings:
-            proc = value[0]
+        for proc in self.runnings.values():
             if proc:
                 _killpg(proc, SIGKILL)
-        # Wait for child processes
-        self.process()
-
-    def _poll_proc_pipes(self, proc, ctx):
-        """Poll STDOUT/ERR of proc and read some data if possible.
 
-        This helps to unblock the command by unblocking its pipes.
-        """
-        if self.pipepoller is None:
-            return  # select.poll not supported on this OS
-        for handle in [proc.stdout, proc.stderr]:
-            if not handle.closed:
-                self.pipepoller.register(handle.fileno(), self.POLLREAD)
-        while True:
-            fileno_list = [
-                fileno
-                for fileno, event in self.pipepoller.poll(0.0)
-                if event & self.POLLREAD]
-            if not fileno_list:
-                # Nothing readable
-                break
-            received_data = []
-            for fileno in fileno_list:
-                # If a file handle is readable, read something from it, add
-                # results into the command context object's `.out` or `.err`,
-                # whichever is relevant. To avoid blocking:
-                # 1. Use `os.read` here instead of `file.read` to avoid any
-                #    buffering that may cause the file handle to block.
-                # 2. Call os.read only once after a poll. Poll again before
-                #    another read - otherwise the os.read call may block.
-                try:
-                    data = os.read(fileno, 65536).decode()  # 64K
-                except OSError:
-                    continue
-                received_data.append(data != '')
-                if fileno == proc.stdout.fileno():
-                    if ctx.out is None:
-                        ctx.out = ''
-                    ctx.out += data
-                elif fileno == proc.stderr.fileno():
-                    if ctx.err is None:
-                        ctx.err = ''
-                    ctx.err += data
-            if received_data and not all(received_data):
-                # if no data was pushed down the pipe exit the polling loop,
-                # we can always re-enter the polling loop later if there is
-                # more data
-                # NOTE: this suppresses an infinite polling-loop observed
-                # on darwin see:
-                # https://github.com/cylc/cylc-flow/issues/3535
-                # https://github.com/cylc/cylc-flow/pull/3543
-                return
-        self.pipepoller.unregister(proc.stdout.fileno())
-        self.pipepoller.unregister(proc.stderr.fileno())
+    @classmethod
+    def _get_stdin(cls, ctx):
+        """Return the STDIN for the command in ctx."""
+        if ctx.cmd_kwargs.get('stdin_files'):
+            if len(ctx.cmd_kwargs['stdin_files']) > 1:
+                stdin_file = cls.get_temporary_file()
+                for file_ in ctx.cmd_kwargs['stdin_files']:
+                    if hasattr(file_, 'read'):
+                        stdin_file.write(file_.read())
+                    else:
+                        with open(file_, 'rb') as openfile:
+                            stdin_file.write(openfile.read())
+                stdin_file.seek(0)
+            elif hasattr(ctx.cmd_kwargs['stdin_files'][0], 'read'):
+                stdin_file = ctx.cmd_kwargs['stdin_files'][0]
+            else:
+                stdin_file = open(  # noqa: SIM115
+                    # (nasty use of file handles, should avoid in future)
+                    ctx.cmd_kwargs['stdin_files'][0], 'rb'
+                )
+        elif ctx.cmd_kwargs.get('stdin_str'):
+            stdin_file = cls.get_temporary_file()
+            stdin_file.write(ctx.cmd_kwargs.get('stdin_str').encode())
+            stdin_file.seek(0)
+        else:
+            stdin_file = DEVNULL
+        return stdin_file
 
     @classmethod
     def _run_command_init(cls, ctx, callback=None, callback_args=None):
         """Prepare and launch shell command in ctx."""
         try:
-            if ctx.cmd_kwargs.get('stdin_files'):
-                if len(ctx.cmd_kwargs['stdin_files']) > 1:
-                    stdin_file = cls.get_temporary_file()
-                    for file_ in ctx.cmd_kwargs['stdin_files']:
-                        if hasattr(file_, 'read'):
-                            stdin_file.write(file_.read())
-                        else:
-                            with open(file_, 'rb') as openfile:
-                                stdin_file.write(openfile.read())
-                    stdin_file.seek(0)
-                elif hasattr(ctx.cmd_kwargs['stdin_files'][0], 'read'):
-                    stdin_file = ctx.cmd_kwargs['stdin_files'][0]
-                else:
-                    stdin_file = open(  # noqa: SIM115
-                        # (nasty use of file handles, should avoid in future)
-                        ctx.cmd_kwargs['stdin_files'][0], 'rb'
-                    )
-            elif ctx.cmd_kwargs.get('stdin_str'):
-                stdin_file = cls.get_temporary_file()
-                stdin_file.write(ctx.cmd_kwargs.get('stdin_str').encode())
-                stdin_file.seek(0)
-            else:
-                stdin_file = DEVNULL
             proc = procopen(
-                ctx.cmd, stdin=stdin_file, stdoutpipe=True, stderrpipe=True,
+                ctx.cmd, stdin=cls._get_stdin(ctx),
+                stdoutpipe=True, stderrpipe=True,
                 # Execute command as a process group leader,
                 # so we can use "os.killpg" to kill the whole group.
                 preexec_fn=os.setpgrp,
@@ -379,17 +417,44 @@ class SubProcPool:
             # calls to open a shell are aggregated in cylc_subproc.procopen()
             # with logging for what is calling it and the commands given
         except OSError as exc:
-            if exc.filename is None:
-                exc.filename = ctx.cmd[0]
-            LOG.exception(exc)
-            ctx.ret_code = 1
-            ctx.err = str(exc)
-            cls._run_command_exit(ctx, callback, callback_args)
+            cls._run_command_error(exc, ctx, callback, callback_args)
             return None
         else:
             LOG.debug(ctx.cmd)
             return proc
 
+    @classmethod
+    async def _run_command_init_async(
+        cls, ctx, callback=None, callback_args=None
+    ):
+        """Prepare and launch shell command in ctx as an asyncio subprocess.
+        """
+        try:
+            proc = await async_procopen(
+                ctx.cmd, stdin=cls._get_stdin(ctx),
+                stdoutpipe=True, stderrpipe=True,
+                # Execute command as a process group leader,
+                # so we can use "os.killpg" to kill the whole group.
+                preexec_fn=os.setpgrp,
+                env=ctx.cmd_kwargs.get('env'),
+                usesh=ctx.cmd_kwargs.get('shell'))
+        except OSError as exc:
+            cls._run_command_error(exc, ctx, callback, callback_args)
+            return None
+        else:
+            LOG.debug(ctx.cmd)
+            return proc
+
+    @classmethod
+    def _run_command_error(cls, exc, ctx, callback=None, callback_args=None):
+        """Process a command which could not be launched."""
+        if exc.filename is None:
+            exc.filename = ctx.cmd[0]
+        LOG.exception(exc)
+        ctx.ret_code = 1
+        ctx.err = str(exc)
+        cls._run_command_exit(ctx, callback, callback_args)
+
     @classmethod
     def _run_command_exit(cls, ctx, callback=None, callback_args=None):
         """Process command completion."""
@@ -16,6 +16,8 @@
 
 """Timer for task actions."""
 
+from heapq import heapify, heappop, heappush
+from itertools import count
 from time import time
 
 from cylc.flow.wallclock import (
@@ -105,3 +107,92 @@ class TaskActionTimer:
     def unset_waiting(self):
         """Unset waiting flag after an action has completed."""
         self.is_waiting = False
+
+
+class TimerQueue:
+    """Keep track of when timers fall due, so they needn't all be polled.
+
+    Timers are identified by hashable keys and each key has at most one due
+    time. Rescheduling or cancelling a key leaves its old entry in the heap,
+    it is discarded when it reaches the top.
+
+    Examples:
+        >>> queue = TimerQueue()
+        >>> queue.schedule('a', 3.0)
+        >>> queue.schedule('b', 1.0)
+        >>> queue.schedule('c', 2.0)
+        >>> queue.schedule('b', 4.0)
+        >>> queue.cancel('c')
+        >>> queue.next_due()
+        3.0
+        >>> queue.pop_due(3.5)
+        ['a']
+        >>> queue.pop_due(10.0)
+        ['b']
+        >>> len(queue)
+        0
+
+    """
+
+    __slots__ = ["_heap", "_entries", "_counter"]
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._counter = count()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def schedule(self, key, due):
+        """Set the time (seconds since epoch) at which key falls due.
+
+        A due time of None cancels the key.
+        """
+        if due is None:
+            self.cancel(key)
+            return
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == due:
+            return
+        entry = (due, next(self._counter), key)
+        self._entries[key] = entry
+        heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            # Too many cancelled entries, rebuild the heap.
+            self._heap = list(self._entries.values())
+            heapify(self._heap)
+
+    def cancel(self, key):
+        """Forget key, if scheduled."""
+        self._entries.pop(key, None)
+
+    def next_due(self):
+        """Return the earliest due time, or None if nothing is scheduled."""
+        heap = self._heap
+        while heap and self._entries.get(heap[0][2]) is not heap[0]:
+            heappop(heap)
+        if heap:
+            return heap[0][0]
+        return None
+
+    def pop_due(self, now=None):
+        """Remove and return keys due strictly before now, earliest first.
+
+        This matches "TaskActionTimer.is_delay_done".
+        """
+        if now is None:
+            now = time()
+        heap = self._heap
+        entries = self._entries
+        keys = []
+        while heap and heap[0][0] < now:
+            entry = heappop(heap)
+            key = entry[2]
+            if entries.get(key) is entry:
+                del entries[key]
+                keys.append(key)
+        return keys
@@ -39,13 +39,15 @@ from cylc.flow.parsec.config import ItemNotFoundError
 from cylc.flow import LOG, LOG_LEVELS
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.hostuserutil import get_host, get_user, is_remote_host
+from cylc.flow.network.client_factory import CommsMeth
 from cylc.flow.pathutil import (
     get_remote_workflow_run_job_dir,
     get_workflow_run_job_dir)
 from cylc.flow.subprocctx import SubFuncContext, SubProcContext
 from cylc.flow.task_action_timer import (
     TaskActionTimer,
-    TimerFlags
+    TimerFlags,
+    TimerQueue
 )
 from cylc.flow.platforms import get_platform, get_host_from_platform
 from cylc.flow.task_job_logs import (
@@ -86,6 +88,62 @@ TaskJobLogsRetrieveContext = namedtuple(
     ["key", "ctx_type", "platform_n", "max_size"])
 
 
+def get_adaptive_polling_intervals(
+    elapsed_times, intervals, messaging, margin=0.1, min_interval=30.0
+):
+    """Return execution polling intervals adapted to previous run times.
+
+    If jobs report their progress by messaging, polls are only needed to
+    detect jobs which die without reporting, so the first poll is held off
+    until the job has run for longer than any previous one. Otherwise polls
+    are how the scheduler finds out jobs have finished, so they are placed
+    just after the quantiles of the previous run times. Either way, later
+    polls use the last configured interval.
+
+    Args:
+        elapsed_times (iterable):
+            Run times (seconds) of previous jobs of the task.
+        intervals (list):
+            The configured execution polling intervals (seconds).
+        messaging (bool):
+            Whether jobs on the platform report their progress by messaging.
+        margin (float):
+            Poll this fraction of a run time after it.
+        min_interval (float):
+            Don't poll more often than this (seconds).
+
+    Examples:
+        >>> get_adaptive_polling_intervals([], [60, 900], True)
+        [60, 900]
+        >>> get_adaptive_polling_intervals(
+        ...     [100, 1000, 300], [900], True, margin=0.5)
+        [1500.0, 900.0]
+        >>> get_adaptive_polling_intervals(
+        ...     [100, 1000, 300], [900], False, margin=0.5)
+        [150.0, 300.0, 1050.0, 900.0]
+
+    """
+    if not elapsed_times:
+        return list(intervals)
+    times = sorted(elapsed_times)
+    if messaging:
+        run_times = [times[-1]]
+    else:
+        run_times = [
+            times[round(quantile * (len(times) - 1))]
+            for quantile in (0, 0.25, 0.5, 0.75, 1)
+        ]
+    delays = []
+    poll_time = 0.0
+    for run_time in run_times:
+        delay = run_time * (1 + margin) - poll_time
+        if delay >= min_interval or not delays:
+            delays.append(max(delay, min_interval))
+            poll_time += delays[-1]
+    delays.append(float(intervals[-1]) if intervals else 900.0)
+    return delays
+
+
 def log_task_job_activity(ctx, workflow, point, name, submit_num=None):
     """Log an activity for a task job."""
     ctx_str = str(ctx)
@@ -200,6 +258,16 @@ class TaskEventsManager():
         # NOTE: do not mutate directly
         # use the {add,remove,unset_waiting}_event_timers methods
         self._event_timers = {}
+        # Event timers that need attention, i.e. those not waiting for a
+        # handler to complete, by the time they fall due.
+        self._event_timer_queue = TimerQueue()
+        # Due mail notification timers held back until "next_mail_time".
+        self._mail_timers_deferred = set()
+        # Job poll timers and timeouts by task ID, see "schedule_job_timer".
+        self._job_timer_queue = TimerQueue()
+        # Whether task messaging appears to be working for each platform.
+        # {platform_name: bool}
+        self.platform_messaging = {}
         # NOTE: flag for DB use
         self.event_timers_updated = True
         # To be set by the task pool:
@@ -235,6 +303,7 @@ class TaskEventsManager():
         """Check/handle job timeout and poll timer"""
         can_poll = self.check_poll_time(itask, now)
         if itask.timeout is None or now <= itask.timeout:
+            self.schedule_job_timer(itask)
             return can_poll
         # Timeout reached for task, emit event and reset itask.timeout
         if itask.state(TASK_STATUS_RUNNING):
@@ -247,6 +316,7 @@ class TaskEventsManager():
         with suppress(TypeError, ValueError):
             msg += ' after %s' % intvl_as_str(itask.timeout - time_ref)
         itask.timeout = None  # emit event only once
+        self.schedule_job_timer(itask)
         if msg and event:
             LOG.warning('[%s] -%s', itask, msg)
             self.setup_event_handlers(itask, event, msg)
@@ -254,6 +324,30 @@ class TaskEventsManager():
         else:
             return can_poll
 
+    def schedule_job_timer(self, itask):
+        """Register when the task's job timeout or next poll falls due.
+
+        Call whenever "itask.timeout" or "itask.poll_timer" changes.
+        """
+        due = itask.timeout
+        if itask.poll_timer is not None and (
+            due is None
+            or (
+                itask.poll_timer.timeout is not None
+                and itask.poll_timer.timeout < due
+            )
+        ):
+            due = itask.poll_timer.timeout
+        self._job_timer_queue.schedule(itask.identity, due)
+
+    def pop_due_job_timers(self, now):
+        """Return IDs of tasks whose job timeout or poll time has come.
+
+        Pass each task (if still in the pool) to "check_job_time", which
+        reschedules it as required.
+        """
+        return self._job_timer_queue.pop_due(now)
+
     def _get_remote_conf(self, itask, key):
         """Get deprecated "[remote]" items that default to platforms."""
         overrides = self.broadcast_mgr.get_broadcast(itask.identity)
@@ -283,10 +377,19 @@ class TaskEventsManager():
         """
         ctx_groups = {}
         now = time()
-        for id_key, timer in self._event_timers.copy().items():
-            key1, point, name, submit_num = id_key
-            if timer.is_waiting:
+        due_keys = self._event_timer_queue.pop_due(now)
+        if self._mail_timers_deferred and (
+            schd_ctx.stop_mode
+            or self.next_mail_time is None
+            or self.next_mail_time <= now
+        ):
+            due_keys.extend(self._mail_timers_deferred)
+            self._mail_timers_deferred.clear()
+        for id_key in due_keys:
+            timer = self._event_timers.get(id_key)
+            if timer is None or timer.is_waiting:
                 continue
+            key1, point, name, submit_num = id_key
             # Set timer if timeout is None.
             if not timer.is_timeout_set():
                 if timer.next() is None:
@@ -305,7 +408,10 @@ class TaskEventsManager():
                         point, name, submit_num, key1,
                         timer.delay_timeout_as_str()))
             # Ready to run?
-            if not timer.is_delay_done() or (
+            if not timer.is_delay_done():
+                self._event_timer_queue.schedule(id_key, timer.timeout)
+                continue
+            if (
                 # Avoid flooding user's mail box with mail notification.
                 # Group together as many notifications as possible within a
                 # given interval.
@@ -314,6 +420,7 @@ class TaskEventsManager():
                 self.next_mail_time is not None and
                 self.next_mail_time > now
             ):
+                self._mail_timers_deferred.add(id_key)
                 continue
 
             timer.set_waiting()
@@ -324,7 +431,8 @@ class TaskEventsManager():
                         (key1, submit_num),
                         timer.ctx.cmd, env=os.environ, shell=True,
                     ),
-                    self._custom_handler_callback, [schd_ctx, id_key])
+                    self._custom_handler_callback, [schd_ctx, id_key],
+                    key=(self.HANDLER_CUSTOM, timer.ctx.cmd))
             else:
                 # Group together built-in event handlers, where possible
                 if timer.ctx not in ctx_groups:
@@ -400,6 +508,8 @@ class TaskEventsManager():
                 itask, severity, message, event_time, flag, submit_num):
             return None
 
+        self._check_messaging(itask, message, flag)
+
         # always update the workflow state summary for latest message
         if flag == self.FLAG_POLLED:
             new_msg = f'{message} {self.FLAG_POLLED}'
@@ -592,6 +702,35 @@ class TaskEventsManager():
             message, timestamp, submit_num, itask.flow_label)
         return True
 
+    def _check_messaging(self, itask, message, flag):
+        """Record whether task messaging is working for the task's platform.
+
+        It isn't if a poll finds a job has started or succeeded before the
+        job has told us.
+        """
+        if itask.tdef.run_mode == 'simulation':
+            # simulated jobs have no platform
+            return
+        if flag == self.FLAG_RECEIVED:
+            self.platform_messaging[itask.platform['name']] = True
+        elif flag == self.FLAG_POLLED and (
+            (
+                message == self.EVENT_STARTED
+                and itask.state(TASK_STATUS_SUBMITTED)
+            )
+            or (
+                message == self.EVENT_SUCCEEDED
+                and itask.state(*TASK_STATUSES_ACTIVE)
+            )
+        ):
+            self.platform_messaging[itask.platform['name']] = False
+
+    def is_messaging(self, platform):
+        """Return True if jobs on the platform are reporting by messaging."""
+        if platform['communication method'] == CommsMeth.POLL.value:
+            return False
+        return self.platform_messaging.get(platform['name'], True)
+
     def setup_event_handlers(self, itask, event, message):
         """Set up handlers for a task event."""
         if itask.tdef.run_mode != 'live':
@@ -1198,6 +1337,7 @@ class TaskEventsManager():
             # Reset, task not active
             itask.timeout = None
             itask.poll_timer = None
+            self.schedule_job_timer(itask)
             return
         ctx = (itask.submit_num, itask.state.status)
         if itask.poll_timer and itask.poll_timer.ctx == ctx:
@@ -1213,6 +1353,12 @@ class TaskEventsManager():
             delays = list(self._get_workflow_platforms_conf(
                 itask, 'execution polling intervals',
                 default=[900]))  # default 15 minute intervals
+            if itask.platform.get('adaptive execution polling'):
+                delays = get_adaptive_polling_intervals(
+                    itask.tdef.elapsed_times,
+                    delays,
+                    self.is_messaging(itask.platform)
+                )
             if itask.summary[self.KEY_EXECUTE_TIME_LIMIT]:
                 time_limit = itask.summary[self.KEY_EXECUTE_TIME_LIMIT]
                 time_limit_delays = itask.platform.get(
@@ -1262,6 +1408,7 @@ class TaskEventsManager():
         LOG.info('[%s] -%s', itask, message)
         # Set next poll time
         self.check_poll_time(itask)
+        self.schedule_job_timer(itask)
 
     def add_event_timer(self, id_key, event_timer):
         """Add a new event timer.
@@ -1272,6 +1419,7 @@ class TaskEventsManager():
 
         """
         self._event_timers[id_key] = event_timer
+        self._schedule_event_timer(id_key, event_timer)
         self.event_timers_updated = True
 
     def remove_event_timer(self, id_key):
@@ -1282,6 +1430,8 @@ class TaskEventsManager():
 
         """
         del self._event_timers[id_key]
+        self._event_timer_queue.cancel(id_key)
+        self._mail_timers_deferred.discard(id_key)
         self.event_timers_updated = True
 
     def unset_waiting_event_timer(self, id_key):
@@ -1291,5 +1441,20 @@ class TaskEventsManager():
             key (str)
 
         """
-        self._event_timers[id_key].unset_waiting()
+        timer = self._event_timers[id_key]
+        timer.unset_waiting()
+        self._schedule_event_timer(id_key, timer)
         self.event_timers_updated = True
+
+    def _schedule_event_timer(self, id_key, timer):
+        """Queue an event timer for "process_events".
+
+        Timers with no timeout set are due immediately, so that the next
+        call to "process_events" can set one.
+        """
+        if timer.is_waiting:
+            self._event_timer_queue.cancel(id_key)
+        elif timer.timeout is None:
+            self._event_timer_queue.schedule(id_key, float('-inf'))
+        else:
+            self._event_timer_queue.schedule(id_key, timer.timeout)
@@ -51,7 +51,8 @@ from cylc.flow.hostuserutil import (
 from cylc.flow.job_file import JobFileWriter
 from cylc.flow.parsec.util import (
     pdeepcopy,
-    poverride
+    poverride,
+    unshare
 )
 from cylc.flow.pathutil import get_remote_workflow_run_job_dir
 from cylc.flow.platforms import (
@@ -62,7 +63,6 @@ from cylc.flow.platforms import (
     get_localhost_install_target,
     get_platform
 )
-from cylc.flow.remote import construct_ssh_cmd
 from cylc.flow.subprocctx import SubProcContext
 from cylc.flow.subprocpool import SubProcPool
 from cylc.flow.task_action_timer import (
@@ -124,6 +124,9 @@ class TaskJobManager:
     JOBS_POLL = 'jobs-poll'
     JOBS_SUBMIT = SubProcPool.JOBS_SUBMIT
     POLL_FAIL = 'poll failed'
+    # Jobs due to be polled within this many seconds of a poll of other
+    # jobs on the same platform are polled with them.
+    POLL_BATCH_WINDOW = 60.0
     REMOTE_SELECT_MSG = 'waiting for remote host selection'
     REMOTE_INIT_MSG = 'remote host initialising'
     REMOTE_FILE_INSTALL_MSG = 'file installation in progress'
@@ -152,14 +155,34 @@ class TaskJobManager:
         """
         now = time()
         poll_tasks = set()
-        for itask in task_pool.get_tasks():
+        for id_ in self.task_events_mgr.pop_due_job_timers(now):
+            itask = task_pool.get_task_by_id(id_)
+            if itask is None:
+                continue
             if self.task_events_mgr.check_job_time(itask, now):
                 poll_tasks.add(itask)
+        if poll_tasks:
+            # Bring forward polls falling due soon on the same platforms, to
+            # poll them with the same "jobs-poll" commands.
+            platforms = {itask.platform['name'] for itask in poll_tasks}
+            soon = now + self.POLL_BATCH_WINDOW
+            for id_ in self.task_events_mgr.pop_due_job_timers(soon):
+                itask = task_pool.get_task_by_id(id_)
+                if itask is None:
+                    continue
+                if (
+                    itask not in poll_tasks
+                    and itask.platform['name'] in platforms
+                    and self.task_events_mgr.check_poll_time(itask, soon)
+                ):
+                    poll_tasks.add(itask)
+                # (timeouts are not brought forward)
+                self.task_events_mgr.schedule_job_timer(itask)
+            for itask in poll_tasks:
                 if itask.poll_timer.delay is not None:
                     LOG.info(
                         '[%s] -poll now, (next in %s)',
                         itask, itask.poll_timer.delay_timeout_as_str())
-        if poll_tasks:
             self.poll_task_jobs(workflow, poll_tasks)
 
     def kill_task_jobs(self, workflow, itasks):
@@ -386,7 +409,8 @@ class TaskJobManager:
                 cmd, [len(b) for b in itasks_batches])
 
             if remote_mode:
-                cmd = construct_ssh_cmd(cmd, platform)
+                cmd = self.task_remote_mgr.ssh_control_mgr.construct_ssh_cmd(
+                    cmd, platform)
             else:
                 cmd = ['cylc'] + cmd
 
@@ -756,17 +780,29 @@ class TaskJobManager:
                 remote_mode = False
             if LOG.isEnabledFor(DEBUG):
                 cmd.append("--debug")
+            if (
+                cmd_key == self.JOBS_POLL
+                and platform['job runner status cache']
+            ):
+                cmd.append(
+                    "--status-cache=%d" % platform['job runner status cache'])
             cmd.append("--")
             cmd.append(get_remote_workflow_run_job_dir(workflow))
             job_log_dirs = []
             if remote_mode:
-                cmd = construct_ssh_cmd(cmd, platform)
+                cmd = self.task_remote_mgr.ssh_control_mgr.construct_ssh_cmd(
+                    cmd, platform)
             for itask in sorted(itasks, key=lambda itask: itask.identity):
                 job_log_dirs.append(get_task_job_id(
                     itask.point, itask.tdef.name, itask.submit_num))
             cmd += job_log_dirs
+            key = None
+            if cmd_key == self.JOBS_POLL:
+                # an identical poll may already be queued or running
+                key = (cmd_key, tuple(cmd))
             self.proc_pool.put_command(
-                SubProcContext(cmd_key, cmd), callback, [workflow, itasks])
+                SubProcContext(cmd_key, cmd), callback, [workflow, itasks],
+                key=key)
 
     @staticmethod
     def _set_retry_timers(itask, rtconfig=None, retry=True):
@@ -946,7 +982,8 @@ class TaskJobManager:
                     f"for task {itask.identity}: host = "
                     f"{rtconfig['remote']['host']} evaluated as {host_n}"
                 )
-                rtconfig['remote']['host'] = host_n
+                # (the section may be shared with other tasks)
+                unshare(rtconfig, 'remote')['host'] = host_n
 
             try:
                 platform = get_platform(rtconfig)
@@ -18,6 +18,9 @@
 
 from contextlib import suppress
 from collections import Counter
+from functools import partial
+from heapq import heappop, heappush
+from itertools import chain
 from string import ascii_letters
 import json
 from time import time
@@ -52,7 +55,10 @@ from cylc.flow.task_state import (
 )
 from cylc.flow.wallclock import get_current_time_string
 from cylc.flow.platforms import get_platform
-from cylc.flow.task_queues.independent import IndepQueueManager
+from cylc.flow.task_queues import (
+    TaskQueueManagerBase,
+    get_queue_manager_class
+)
 
 if TYPE_CHECKING:
     from cylc.flow.config import WorkflowConfig
@@ -64,6 +70,20 @@ if TYPE_CHECKING:
 
 Pool = Dict['PointBase', Dict[str, TaskProxy]]
 
+# Tasks in these states do not hold back the runahead limit.
+RUNAHEAD_FINISHED_STATUSES = {
+    TASK_STATUS_FAILED,
+    TASK_STATUS_SUCCEEDED,
+    TASK_STATUS_EXPIRED
+}
+
+# Tasks in these states count towards queue limits.
+QUEUE_ACTIVE_STATUSES = {
+    TASK_STATUS_PREPARING,
+    TASK_STATUS_SUBMITTED,
+    TASK_STATUS_RUNNING
+}
+
 
 class FlowLabelMgr:
     """
@@ -174,6 +194,8 @@ class TaskPool:
         self.max_num_active_cycle_points: int = (
             self.config.get_max_num_active_cycle_points())
         self._prev_runahead_sequence_points: Optional[List['PointBase']] = None
+        self._prev_runahead_sequence_limit: Optional['PointBase'] = None
+        self._runahead_limit_point: Optional['PointBase'] = None
 
         self.main_pool: Pool = {}
         self.hidden_pool: Pool = {}
@@ -181,9 +203,31 @@ class TaskPool:
         self.hidden_pool_list: List[TaskProxy] = []
         self.main_pool_changed = False
         self.hidden_pool_changed = False
+        # Task proxies indexed by ID for direct lookup.
+        self.main_pool_by_id: Dict[str, TaskProxy] = {}
+        self.hidden_pool_by_id: Dict[str, TaskProxy] = {}
+        # Maintained on task state change (see _update_task_counts):
+        # - number of unfinished tasks (main and hidden pools) by point
+        self.unfinished_point_counts: Dict['PointBase', int] = Counter()
+        # - heap of points with unfinished tasks (may contain stale points)
+        self._unfinished_points_heap: List['PointBase'] = []
+        # - runahead limited tasks (main pool only) by point
+        self.runahead_pool: Pool = {}
+        # - number of active tasks (main pool only) by name, for queueing
+        self.active_task_counts: Dict[str, int] = Counter()
+        # Pool points which count towards the runahead limit but aren't
+        # on the sequences (e.g. after reload), and points added to the pool
+        # since they were last checked.
+        self._runahead_extra_points: Set['PointBase'] = set()
+        self._runahead_new_points: Set['PointBase'] = set()
+        self._runahead_rescan = True
 
         self.hold_point: Optional['PointBase'] = None
         self.abs_outputs_done: Set[Tuple[str, str, str]] = set()
+        # Tasks (main and hidden pools) by the outputs their prerequisites
+        # depend on: {(name, point, output): {identity: itask}}
+        self._prereq_index: Dict[
+            Tuple[str, str, str], Dict[str, TaskProxy]] = {}
 
         self.stop_task_id: Optional[str] = None
         self.stop_task_finished = False
@@ -192,11 +236,7 @@ class TaskPool:
 
         self.orphans: List[str] = []
         self.task_name_list = self.config.get_task_name_list()
-        self.task_queue_mgr = IndepQueueManager(
-            self.config.cfg['scheduling']['queues'],
-            self.config.get_task_name_list(),
-            self.config.runtime['descendants']
-        )
+        self.task_queue_mgr = self._get_task_queue_mgr()
         self.tasks_to_hold: Set[Tuple[str, 'PointBase']] = set()
 
     def set_stop_task(self, task_id):
@@ -211,6 +251,20 @@ class TaskPool:
         else:
             LOG.warning("Requested stop task name does not exist: %s" % name)
 
+    def _get_task_queue_mgr(self) -> TaskQueueManagerBase:
+        """Return a new task queue manager, with current active counts."""
+        task_queue_mgr = get_queue_manager_class(
+            self.config.cfg['scheduling']['queue manager']
+        )(
+            self.config.cfg['scheduling']['queues'],
+            self.config.get_task_name_list(),
+            self.config.runtime['descendants'],
+            self.config
+        )
+        for name, count in self.active_task_counts.items():
+            task_queue_mgr.update_active(name, count)
+        return task_queue_mgr
+
     def stop_task_done(self):
         """Return True if stop task has succeeded."""
         if self.stop_task_id is not None and self.stop_task_finished:
@@ -222,17 +276,139 @@ class TaskPool:
         else:
             return False
 
+    def _update_task_counts(
+        self,
+        itask: TaskProxy,
+        status: str,
+        is_runahead: bool,
+        in_main_pool: bool,
+        increment: int
+    ) -> None:
+        """Add (increment=1) or remove (increment=-1) a task from pool counts.
+
+        Args:
+            itask: The task.
+            status: The task status to count the task under.
+            is_runahead: The runahead state to count the task under.
+            in_main_pool: True if the task is in the main pool, False if it
+                is in the hidden pool.
+            increment: 1 to add the task, -1 to remove it.
+
+        """
+        point = itask.point
+        if status not in RUNAHEAD_FINISHED_STATUSES:
+            self.unfinished_point_counts[point] += increment
+            if not self.unfinished_point_counts[point]:
+                del self.unfinished_point_counts[point]
+            elif increment > 0 and self.unfinished_point_counts[point] == 1:
+                heappush(self._unfinished_points_heap, point)
+        if in_main_pool and status in QUEUE_ACTIVE_STATUSES:
+            name = itask.tdef.name
+            self.active_task_counts[name] += increment
+            if not self.active_task_counts[name]:
+                del self.active_task_counts[name]
+            self.task_queue_mgr.update_active(name, increment)
+        if in_main_pool and is_runahead:
+            if increment > 0:
+                self.runahead_pool.setdefault(point, {})
+                self.runahead_pool[point][itask.identity] = itask
+            else:
+                del self.runahead_pool[point][itask.identity]
+                if not self.runahead_pool[point]:
+                    del self.runahead_pool[point]
+
+    def _runahead_point_removed(self, point: 'PointBase') -> None:
+        """Note removal of a point from the main or hidden pool."""
+        if point in self._runahead_extra_points:
+            self._runahead_rescan = True
+
+    def get_min_unfinished_point(self) -> Optional['PointBase']:
+        """Return the earliest point with unfinished tasks, or None."""
+        heap = self._unfinished_points_heap
+        while heap and heap[0] not in self.unfinished_point_counts:
+            heappop(heap)
+        if heap:
+            return heap[0]
+        return None
+
+    def _task_state_changed(self, itask: TaskProxy, prev_state) -> None:
+        """Callback for task state changes, keeps the pool counts in sync.
+
+        Args:
+            itask: The task.
+            prev_state: The previous (status, is_held, is_queued, is_runahead)
+                of the task.
+
+        """
+        in_main_pool = self.main_pool_by_id.get(itask.identity) is itask
+        self._update_task_counts(
+            itask, prev_state[0], prev_state[3], in_main_pool, -1)
+        self._update_task_counts(
+            itask, itask.state.status, itask.state.is_runahead, in_main_pool,
+            1)
+
+    def _track_task(self, itask: TaskProxy, in_main_pool: bool) -> None:
+        """Start counting a task which has been put in a pool."""
+        self._update_task_counts(
+            itask, itask.state.status, itask.state.is_runahead, in_main_pool,
+            1)
+        itask.state.on_change = partial(self._task_state_changed, itask)
+        for prereq in chain(
+            itask.state.prerequisites, itask.state.suicide_prerequisites
+        ):
+            for message in prereq.satisfied:
+                self._prereq_index.setdefault(
+                    message, {})[itask.identity] = itask
+
+    def _untrack_task(self, itask: TaskProxy, in_main_pool: bool) -> None:
+        """Stop counting a task which has been taken out of a pool."""
+        itask.state.on_change = None
+        self._update_task_counts(
+            itask, itask.state.status, itask.state.is_runahead, in_main_pool,
+            -1)
+        for prereq in chain(
+            itask.state.prerequisites, itask.state.suicide_prerequisites
+        ):
+            for message in prereq.satisfied:
+                dependents = self._prereq_index.get(message)
+                if (
+                    dependents is not None
+                    and dependents.get(itask.identity) is itask
+                ):
+                    del dependents[itask.identity]
+                    if not dependents:
+                        del self._prereq_index[message]
+
+    def get_dependent_tasks(
+        self, message: Tuple[str, str, str]
+    ) -> List[TaskProxy]:
+        """Return pool tasks with prerequisites on an output.
+
+        Args:
+            message: The output as a (name, point, output) tuple.
+
+        """
+        return list(self._prereq_index.get(message, {}).values())
+
     def _swap_out(self, itask):
         """Swap old task for new, during reload."""
         if itask.point in self.hidden_pool:
             if itask.identity in self.hidden_pool[itask.point]:
+                self._untrack_task(
+                    self.hidden_pool[itask.point][itask.identity], False)
                 self.hidden_pool[itask.point][itask.identity] = itask
+                self.hidden_pool_by_id[itask.identity] = itask
+                self._track_task(itask, False)
                 self.hidden_pool_changed = True
         elif (
             itask.point in self.main_pool
             and itask.identity in self.main_pool[itask.point]
         ):
+            self._untrack_task(
+                self.main_pool[itask.point][itask.identity], True)
             self.main_pool[itask.point][itask.identity] = itask
+            self.main_pool_by_id[itask.identity] = itask
+            self._track_task(itask, True)
             self.main_pool_changed = True
 
     def add_to_pool(self, itask, is_new=True):
@@ -245,8 +421,15 @@ class TaskPool:
         """
         if itask.is_task_prereqs_not_done() and not itask.is_manual_submit:
             # Add to hidden pool if not satisfied.
+            prev_itask = self.hidden_pool_by_id.get(itask.identity)
+            if prev_itask is not None:
+                self._untrack_task(prev_itask, False)
+            if itask.point not in self.hidden_pool:
+                self._runahead_new_points.add(itask.point)
             self.hidden_pool.setdefault(itask.point, {})
             self.hidden_pool[itask.point][itask.identity] = itask
+            self.hidden_pool_by_id[itask.identity] = itask
+            self._track_task(itask, False)
             self.hidden_pool_changed = True
         else:
             # Add to main pool.
@@ -256,11 +439,21 @@ class TaskPool:
             except KeyError:
                 pass
             else:
+                self._untrack_task(
+                    self.hidden_pool_by_id.pop(itask.identity), False)
                 self.hidden_pool_changed = True
                 if not self.hidden_pool[itask.point]:
                     del self.hidden_pool[itask.point]
+                    self._runahead_point_removed(itask.point)
+            prev_itask = self.main_pool_by_id.get(itask.identity)
+            if prev_itask is not None:
+                self._untrack_task(prev_itask, True)
+            if itask.point not in self.main_pool:
+                self._runahead_new_points.add(itask.point)
             self.main_pool.setdefault(itask.point, {})
             self.main_pool[itask.point][itask.identity] = itask
+            self.main_pool_by_id[itask.identity] = itask
+            self._track_task(itask, True)
             self.main_pool_changed = True
 
             # Register pool node reference data-store with ID_DELIM format
@@ -293,6 +486,9 @@ class TaskPool:
         below that point (and <= the stop point, if there is a stop point).
         Return True if any tasks released, else False.
 
+        Only runahead limited tasks and cycle points are examined here, using
+        the per-point counts maintained on task state change.
+
         """
         if not self.main_pool:
             # (At start-up, in case main pool doesn't exist yet)
@@ -303,39 +499,20 @@ class TaskPool:
         # Any finished tasks can be released immediately (this can happen at
         # restart when all tasks are initially loaded into the runahead pool).
         # And any manually-triggered task.
-
-        for itask in (
+        for itask in [
             itask
-            for point_id_map in self.main_pool.values()
+            for point_id_map in self.runahead_pool.values()
             for itask in point_id_map.values()
-            if itask.state.is_runahead
-            if itask.state(
-                TASK_STATUS_FAILED,
-                TASK_STATUS_SUCCEEDED,
-                TASK_STATUS_EXPIRED
-            )
+            if itask.state(*RUNAHEAD_FINISHED_STATUSES)
             or itask.is_manual_submit
-        ):
+        ]:
             self.release_runahead_task(itask)
             released = True
 
-        points = []
-        for point, itasks in sorted(self.get_tasks_by_point().items()):
-            if points or any(
-                not itask.state(
-                    TASK_STATUS_FAILED,
-                    TASK_STATUS_SUCCEEDED,
-                    TASK_STATUS_EXPIRED
-                )
-                for itask in itasks
-            ):
-                points.append(point)
-
-        if not points:
-            return False
-
         # Get the earliest point with unfinished tasks.
-        runahead_base_point = min(points)
+        runahead_base_point = self.get_min_unfinished_point()
+        if runahead_base_point is None:
+            return released
 
         runahead_number_limit = None
         runahead_time_limit = None
@@ -349,6 +526,7 @@ class TaskPool:
                 runahead_base_point == self._prev_runahead_base_point):
             # Cache for speed.
             sequence_points = self._prev_runahead_sequence_points
+            sequence_limit = self._prev_runahead_sequence_limit
         else:
             sequence_points = set()
             for sequence in self.config.sequences:
@@ -365,15 +543,47 @@ class TaskPool:
                         count += 1
                     sequence_points.add(seq_point)
                     seq_point = sequence.get_next_point(seq_point)
+            sequence_limit = None
+            if runahead_number_limit is not None:
+                sequence_limit = sorted(
+                    sequence_points.union([runahead_base_point])
+                )[:runahead_number_limit][-1]
             self._prev_runahead_sequence_points = sequence_points
+            self._prev_runahead_sequence_limit = sequence_limit
             self._prev_runahead_base_point = runahead_base_point
-
-        points = set(points).union(sequence_points)
+            self._runahead_rescan = True
 
         if runahead_number_limit is not None:
             # Calculate which tasks to release based on a maximum number of
             # active cycle points (active meaning non-finished tasks).
-            latest_allowed_point = sorted(points)[:runahead_number_limit][-1]
+            # Pool points are normally sequence points, any which aren't
+            # (e.g. after reload) count towards the limit if below it. Only
+            # check points added since last time unless a rescan is needed.
+            rescan = self._runahead_rescan
+            if rescan:
+                self._runahead_rescan = False
+                self._runahead_extra_points.clear()
+                new_points = chain(self.main_pool, self.hidden_pool)
+            else:
+                new_points = self._runahead_new_points
+            extra_points = {
+                point
+                for point in new_points
+                if runahead_base_point < point < sequence_limit
+                and point not in sequence_points
+                and (point in self.main_pool or point in self.hidden_pool)
+            }
+            self._runahead_new_points = set()
+            if rescan or extra_points:
+                self._runahead_extra_points.update(extra_points)
+                if self._runahead_extra_points:
+                    self._runahead_limit_point = sorted(
+                        self._runahead_extra_points.union(
+                            sequence_points, [runahead_base_point])
+                    )[:runahead_number_limit][-1]
+                else:
+                    self._runahead_limit_point = sequence_limit
+            latest_allowed_point = self._runahead_limit_point
             if self.max_future_offset is not None:
                 # For the first N points, release their future trigger tasks.
                 latest_allowed_point += self.max_future_offset
@@ -401,16 +611,12 @@ class TaskPool:
         # self.release_runahead_tasks() can change the task pool size
         # (parentless tasks are spawned when their previous instances are
         # released from runahead limiting).
-        release_me = []
-        for itask in (
+        release_me = [
             itask
-            for point, itask_id_map in self.main_pool.items()
-            for itask in itask_id_map.values()
+            for point, itask_id_map in self.runahead_pool.items()
             if point <= latest_allowed_point
-            if itask.state.is_runahead
-        ):
-            release_me.append(itask)
-
+            for itask in itask_id_map.values()
+        ]
         for itask in release_me:
             self.release_runahead_task(itask)
             released = True
@@ -462,6 +668,7 @@ class TaskPool:
                     itask.set_summary_time('started', time_run)
                 if timeout is not None:
                     itask.timeout = timeout
+                    self.task_events_mgr.schedule_job_timer(itask)
             elif status == TASK_STATUS_PREPARING:
                 # put back to be readied again.
                 status = TASK_STATUS_WAITING
@@ -528,14 +735,15 @@ class TaskPool:
             return
         LOG.info("+ %s.%s %s" % (name, cycle, ctx_key))
         if ctx_key == "poll_timer":
-            itask = self._get_task_by_id(id_)
+            itask = self.get_task_by_id(id_)
             if itask is None:
                 LOG.warning("%(id)s: task not found, skip" % {"id": id_})
                 return
             itask.poll_timer = TaskActionTimer(
                 ctx, delays, num, delay, timeout)
+            self.task_events_mgr.schedule_job_timer(itask)
         elif ctx_key[0] == "try_timers":
-            itask = self._get_task_by_id(id_)
+            itask = self.get_task_by_id(id_)
             if itask is None:
                 LOG.warning("%(id)s: task not found, skip" % {"id": id_})
                 return
@@ -640,9 +848,12 @@ class TaskPool:
             pass
         else:
             # e.g. for suicide?
+            self._untrack_task(
+                self.hidden_pool_by_id.pop(itask.identity), False)
             self.hidden_pool_changed = True
             if not self.hidden_pool[itask.point]:
                 del self.hidden_pool[itask.point]
+                self._runahead_point_removed(itask.point)
             return
 
         try:
@@ -650,9 +861,11 @@ class TaskPool:
         except KeyError:
             pass
         else:
+            self._untrack_task(self.main_pool_by_id.pop(itask.identity), True)
             self.main_pool_changed = True
             if not self.main_pool[itask.point]:
                 del self.main_pool[itask.point]
+                self._runahead_point_removed(itask.point)
                 self.task_queue_mgr.remove_task(itask)
                 if itask.tdef.max_future_prereq_offset is not None:
                     self.set_max_future_offset()
@@ -702,17 +915,13 @@ class TaskPool:
 
         return point_itasks
 
-    def _get_hidden_task_by_id(self, id_):
-        """Return runahead pool task by ID if it exists, or None."""
-        for itask_ids in list(self.hidden_pool.values()):
-            with suppress(KeyError):
-                return itask_ids[id_]
+    def _get_hidden_task_by_id(self, id_: str) -> Optional[TaskProxy]:
+        """Return hidden pool task by ID if it exists, or None."""
+        return self.hidden_pool_by_id.get(id_)
 
-    def _get_task_by_id(self, id_):
+    def get_task_by_id(self, id_: str) -> Optional[TaskProxy]:
         """Return main pool task by ID if it exists, or None."""
-        for itask_ids in list(self.main_pool.values()):
-            with suppress(KeyError):
-                return itask_ids[id_]
+        return self.main_pool_by_id.get(id_)
 
     def queue_task(self, itask: TaskProxy) -> None:
         """Queue a task that is ready to run."""
@@ -722,16 +931,7 @@ class TaskPool:
 
     def release_queued_tasks(self):
         """Return list of queue-released tasks for job prep."""
-        released = self.task_queue_mgr.release_tasks(
-            Counter(
-                [
-                    t.tdef.name for t in self.get_tasks()
-                    if t.state(TASK_STATUS_PREPARING,
-                               TASK_STATUS_SUBMITTED,
-                               TASK_STATUS_RUNNING)
-                ]
-            )
-        )
+        released = self.task_queue_mgr.release_tasks()
         for itask in released:
             itask.state.reset(is_queued=False)
             itask.state.reset(TASK_STATUS_PREPARING)
@@ -837,16 +1037,13 @@ class TaskPool:
 
         # Reassign live tasks to the internal queue
         del self.task_queue_mgr
-        self.task_queue_mgr = IndepQueueManager(
-            self.config.cfg['scheduling']['queues'],
-            self.config.get_task_name_list(),
-            self.config.runtime['descendants']
-        )
+        self.task_queue_mgr = self._get_task_queue_mgr()
 
         # Now queue all tasks that are ready to run
         for itask in self.get_tasks():
             if itask.state.is_queued:
-                # Already queued
+                # Already queued, move to the new queue manager
+                self.task_queue_mgr.push_task(itask)
                 continue
             ready_check_items = itask.is_ready_to_run()
             # Use this periodic checking point for data-store delta
@@ -1151,14 +1348,18 @@ class TaskPool:
             # No children depend on this output
             children = []
 
+        message = (itask.tdef.name, str(itask.point), output)
+        if (
+            message not in self.abs_outputs_done
+            and any(is_abs for _, _, is_abs in children)
+        ):
+            self.abs_outputs_done.add(message)
+            self.workflow_db_mgr.put_insert_abs_output(
+                str(itask.point), itask.tdef.name, output)
+            self.workflow_db_mgr.process_queued_ops()
+
         suicide = []
         for c_name, c_point, is_abs in children:
-            if is_abs:
-                self.abs_outputs_done.add((itask.tdef.name,
-                                          str(itask.point), output))
-                self.workflow_db_mgr.put_insert_abs_output(
-                    str(itask.point), itask.tdef.name, output)
-                self.workflow_db_mgr.process_queued_ops()
             if itask.reflow:
                 c_task = self.get_or_spawn_task(
                     c_name, c_point, flow_label=itask.flow_label,
@@ -1170,13 +1371,16 @@ class TaskPool:
             if c_task is not None:
                 # Update downstream prerequisites directly.
                 if is_abs:
-                    tasks, _ = self.filter_task_proxies([c_name])
+                    # Only the instances of the child which depend on it.
+                    tasks = [
+                        t for t in self.get_dependent_tasks(message)
+                        if t.tdef.name == c_name and t is not c_task
+                    ]
+                    tasks.append(c_task)
                 else:
                     tasks = [c_task]
                 for t in tasks:
-                    t.state.satisfy_me({
-                        (itask.tdef.name, str(itask.point), output)
-                    })
+                    t.state.satisfy_me({message})
                     self.data_store_mgr.delta_task_prerequisite(t)
                 # Event-driven suicide.
                 if (c_task.state.suicide_prerequisites and
@@ -1226,7 +1430,7 @@ class TaskPool:
 
     def get_task_main(self, name, point, flow_label=None):
         """Return task proxy from main pool and merge flow label if found."""
-        itask = self._get_task_by_id(TaskID.get(name, point))
+        itask = self.get_task_by_id(TaskID.get(name, point))
         if itask is not None:
             self._merge_flow_labels(itask, flow_label)
         return itask
@@ -1235,7 +1439,7 @@ class TaskPool:
         """Return existing task proxy and merge flow label if found."""
         itask = (
             self._get_hidden_task_by_id(TaskID.get(name, point))
-            or self._get_task_by_id(TaskID.get(name, point))
+            or self.get_task_by_id(TaskID.get(name, point))
         )
         if itask is None:
             LOG.debug('Task %s.%s not found in task pool.', name, point)
@@ -1329,9 +1533,12 @@ class TaskPool:
                     "task beyond the stop point"
                 )
 
-        # Attempt to satisfy any absolute triggers now.
-        # TODO: consider doing this only for tasks with absolute prerequisites.
-        if itask.state.prerequisites_are_not_all_satisfied():
+        # Attempt to satisfy any absolute triggers now (this only looks up
+        # the task's own prerequisite messages).
+        if (
+            self.abs_outputs_done
+            and itask.state.prerequisites_are_not_all_satisfied()
+        ):
             itask.state.satisfy_me(self.abs_outputs_done)
 
         if parent_id is not None:
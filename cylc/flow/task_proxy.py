@@ -426,3 +426,91 @@ class TaskProxy:
         return any(
             fnmatchcase(ns, name) for ns in self.tdef.namespace_hierarchy
         )
+
+
+class GhostTask:
+    """A light-weight view of a task instance which is not in the pool.
+
+    Used for the (not yet spawned, or already removed) nodes of the
+    data-store graph window. Only the task definition, cycle point and flow
+    label are stored; the graph children and the task state (prerequisites,
+    outputs, triggers) are generated from the task definition on first use,
+    so nodes which are already in the data store cost very little.
+
+    Attributes:
+        .tdef:
+            The definition object of this task.
+        .point:
+            Cycle point of the task.
+        .flow_label:
+            Flow label of the task.
+        .reflow:
+            Flow on from outputs.
+        .graph_children:
+            Graph children as {output: [(name, point, is_abs), ...], ...}.
+        .state:
+            A TaskState object for this task (waiting).
+
+    """
+
+    # Memory optimization - constrain possible attributes to this list.
+    __slots__ = [
+        'clock_trigger_time',
+        'flow_label',
+        'point',
+        'point_as_seconds',
+        'reflow',
+        'tdef',
+        '_graph_children',
+        '_state',
+    ]
+
+    def __init__(
+        self,
+        tdef: 'TaskDef',
+        point: 'PointBase',
+        flow_label: Optional[str],
+        reflow: bool = True
+    ) -> None:
+        self.tdef = tdef
+        self.point = point
+        self.flow_label = flow_label
+        self.reflow = reflow
+        self.clock_trigger_time: Optional[float] = None
+        self.point_as_seconds: Optional[int] = None
+        self._graph_children: Optional[Dict[str, list]] = None
+        self._state: Optional[TaskState] = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} '{self.identity}'>"
+
+    def __str__(self) -> str:
+        """Stringify using "self.identity"."""
+        return self.identity
+
+    @property
+    def identity(self) -> str:
+        """Task ID in NAME.POINT syntax."""
+        return TaskID.get(self.tdef.name, self.point)
+
+    @property
+    def graph_children(self) -> Dict[str, list]:
+        """Graph children of this task, as for TaskProxy.graph_children."""
+        if self._graph_children is None:
+            self._graph_children = generate_graph_children(
+                self.tdef, self.point)
+        return self._graph_children
+
+    @property
+    def state(self) -> TaskState:
+        """Task state of this task, as for a newly spawned TaskProxy."""
+        if self._state is None:
+            self._state = TaskState(
+                self.tdef, self.point, TASK_STATUS_WAITING, False)
+            if TASK_OUTPUT_SUCCEEDED in self.graph_children:
+                self._state.outputs.add(TASK_OUTPUT_SUCCEEDED)
+        return self._state
+
+    get_offset_as_seconds = staticmethod(TaskProxy.get_offset_as_seconds)
+    get_point_as_seconds = TaskProxy.get_point_as_seconds
+    is_waiting_clock_done = TaskProxy.is_waiting_clock_done
@@ -14,22 +14,49 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-"""Define the Cylc task queue management API."""
+"""Define the Cylc task queue management API.
 
-from typing import List, Dict, Counter, Any
+Queue managers are selected by the ``[scheduling]queue manager`` setting,
+which names a ``cylc.task_queues`` entry point, e.g. in ``setup.cfg``::
+
+    [options.entry_points]
+    cylc.task_queues =
+        my_queues = my_package.my_module:MyQueueManager
+
+Queue managers must implement the TaskQueueManagerBase interface.
+
+"""
+
+from textwrap import indent
+from typing import List, Dict, Any, Optional, Type, TYPE_CHECKING
 from abc import ABCMeta, abstractmethod
 
+from cylc.flow import iter_entry_points
+from cylc.flow.exceptions import WorkflowConfigError
 from cylc.flow.task_proxy import TaskProxy
 
+if TYPE_CHECKING:
+    from cylc.flow.config import WorkflowConfig
+
 
 class TaskQueueManagerBase(metaclass=ABCMeta):
-    """Base class for queueing implementations."""
+    """Base class for queueing implementations.
+
+    The task pool keeps the queue manager informed of the number of active
+    (preparing, submitted or running) tasks by name, via update_active, as
+    task states change. Implementations should keep whatever counts they
+    need up to date from that, so that release_tasks (called every main loop
+    iteration) takes time in proportion to the number of tasks released,
+    rather than the number of tasks in the pool.
+
+    """
 
     @abstractmethod
     def __init__(self,
                  qconfig: dict,
                  all_task_names: List[str],
-                 descendants: dict
+                 descendants: dict,
+                 config: Optional['WorkflowConfig'] = None
                  ) -> None:
         """Initialize task queue manager from workflow config.
 
@@ -37,6 +64,8 @@ class TaskQueueManagerBase(metaclass=ABCMeta):
            * qconfig: flow.cylc queues config
            * all_task_names: list of all task names
            * descendants: runtime family dict
+           * config: the workflow config, for implementations that need
+             more than the queues config (e.g. the graph)
 
         """
         pass
@@ -47,8 +76,24 @@ class TaskQueueManagerBase(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def release_tasks(self, active: Counter[str]) -> List[TaskProxy]:
-        """Release tasks, given current active task counts."""
+    def release_tasks(self) -> List[TaskProxy]:
+        """Release tasks, given current active task counts.
+
+        Released tasks are made active by the caller, which will then report
+        them to update_active.
+        """
+        pass
+
+    @abstractmethod
+    def update_active(self, name: str, change: int) -> None:
+        """Update the number of active tasks with the given task name.
+
+        Arguments:
+           * name: task name
+           * change: change in the number of active tasks, positive when
+             tasks become active, negative when they cease to be active
+
+        """
         pass
 
     @abstractmethod
@@ -98,3 +143,20 @@ class TaskQueueManagerBase(metaclass=ABCMeta):
             queues[qname]["members"] = qmembers
             queues[qname]["limit"] = queue["limit"]
         return queues
+
+
+def get_queue_manager_class(name: str) -> Type[TaskQueueManagerBase]:
+    """Return the queue manager class registered under the given name."""
+    entry_points = {
+        entry_point.name: entry_point
+        for entry_point in iter_entry_points('cylc.task_queues')
+    }
+    try:
+        entry_point = entry_points[name]
+    except KeyError:
+        raise WorkflowConfigError(
+            f'No task queue manager: "{name}"\n'
+            + '    Available queue managers:\n'
+            + indent('\n'.join(sorted(entry_points)), '        ')
+        )
+    return entry_point.load()
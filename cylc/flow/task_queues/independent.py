@@ -18,11 +18,14 @@
 
 from collections import deque
 from contextlib import suppress
-from typing import List, Set, Dict, Counter, Any
+from typing import List, Set, Dict, Any, Optional, TYPE_CHECKING
 
 from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.task_queues import TaskQueueManagerBase
 
+if TYPE_CHECKING:
+    from cylc.flow.config import WorkflowConfig
+
 
 class LimitedTaskQueue:
     """One task queue with group members and active limit."""
@@ -32,19 +35,18 @@ class LimitedTaskQueue:
         self.limit = limit  # max active tasks
         self.members = members  # member task names
         self.deque: deque = deque()
+        self.n_active = 0  # number of active member tasks
 
     def push_task(self, itask: TaskProxy) -> None:
         """Queue task if in my membership list."""
         if itask.tdef.name in self.members:
             self.deque.appendleft(itask)
 
-    def release(self, active: Counter[str]) -> List[TaskProxy]:
+    def release(self) -> List[TaskProxy]:
         """Release tasks if below the active limit."""
-        # The "active" argument counts active tasks by name.
         released: List[TaskProxy] = []
-        n_active: int = 0
-        for mem in self.members:
-            n_active += active[mem]
+        # (Released tasks are counted in n_active once they are active.)
+        n_active: int = self.n_active
         while not self.limit or n_active < self.limit:
             try:
                 itask = self.deque.pop()
@@ -53,7 +55,6 @@ class LimitedTaskQueue:
                 break
             released.append(itask)
             n_active += 1
-            active.update({itask.tdef.name: 1})
         return released
 
     def remove(self, itask: TaskProxy) -> bool:
@@ -85,7 +86,8 @@ class IndepQueueManager(TaskQueueManagerBase):
     def __init__(self,
                  qconfig: dict,
                  all_task_names: List[str],
-                 descendants: dict
+                 descendants: dict,
+                 config: Optional['WorkflowConfig'] = None
                  ) -> None:
 
         # Map of queues by name.
@@ -100,33 +102,47 @@ class IndepQueueManager(TaskQueueManagerBase):
 
         # Make the queues independent.
         queues = self._make_indep(queues)
-        for name, config in queues.items():
-            self.queues[name] = LimitedTaskQueue(
-                config["limit"], config["members"]
-            )
+        # Map of queues by member task name.
+        self.queue_by_task: Dict[str, LimitedTaskQueue] = {}
+        for name, queue_config in queues.items():
+            self.queues[name] = self._make_queue(name, queue_config)
+            for member in queue_config["members"]:
+                self.queue_by_task[member] = self.queues[name]
 
         self.force_released: Set[TaskProxy] = set()
 
+    def _make_queue(self, name: str, config: dict) -> LimitedTaskQueue:
+        """Return a new queue, given its expanded config."""
+        return LimitedTaskQueue(config["limit"], config["members"])
+
     def push_task(self, itask: TaskProxy) -> None:
         """Push a task to the appropriate queue."""
-        for queue in self.queues.values():
+        queue = self.queue_by_task.get(itask.tdef.name)
+        if queue is not None:
             queue.push_task(itask)
 
-    def release_tasks(self, active: Counter[str]) -> List[TaskProxy]:
+    def release_tasks(self) -> List[TaskProxy]:
         """Release tasks up to the queue limits."""
         released: List[TaskProxy] = []
         for queue in self.queues.values():
-            released += queue.release(active)
+            if queue.deque:
+                released += queue.release()
         if self.force_released:
             released += list(self.force_released)
             self.force_released = set()
         return released
 
+    def update_active(self, name: str, change: int) -> None:
+        """Update the active task count of the queue the task belongs to."""
+        queue = self.queue_by_task.get(name)
+        if queue is not None:
+            queue.n_active += change
+
     def remove_task(self, itask: TaskProxy) -> None:
         """Remove a task from whichever queue it belongs to."""
-        for queue in self.queues.values():
-            if queue.remove(itask):
-                break
+        queue = self.queue_by_task.get(itask.tdef.name)
+        if queue is not None:
+            queue.remove(itask)
 
     def force_release_task(self, itask: TaskProxy) -> None:
         """Remove a task from whichever queue it belongs to.
@@ -139,6 +155,8 @@ class IndepQueueManager(TaskQueueManagerBase):
     def adopt_tasks(self, orphans: List[str]) -> None:
         """Adopt orphaned tasks to the default group."""
         self.queues[self.Q_DEFAULT].adopt(orphans)
+        for orphan in orphans:
+            self.queue_by_task.setdefault(orphan, self.queues[self.Q_DEFAULT])
 
     def _make_indep(self, in_queues: dict) -> dict:
         """Make queues independent: each task can belong to one queue only.
@@ -0,0 +1,278 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Implement prioritised, fair-share task queues."""
+
+from heapq import heappop, heappush
+from itertools import count
+from typing import (
+    Any, Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING, cast)
+
+from cylc.flow.exceptions import WorkflowConfigError
+from cylc.flow.task_proxy import TaskProxy
+from cylc.flow.task_queues.independent import (
+    IndepQueueManager,
+    LimitedTaskQueue
+)
+
+if TYPE_CHECKING:
+    from cylc.flow.config import WorkflowConfig
+
+
+# Items which can be used to order tasks in the queues.
+PRIORITY_QUEUE = 'priority'
+PRIORITY_CYCLE_POINT = 'cycle point'
+PRIORITY_CRITICAL_PATH = 'critical path'
+PRIORITY_ORDER_DEFAULT = [
+    PRIORITY_QUEUE,
+    PRIORITY_CYCLE_POINT,
+    PRIORITY_CRITICAL_PATH
+]
+
+
+def get_critical_paths(config: 'WorkflowConfig') -> Dict[str, int]:
+    """Return the critical path length of each task in the graph.
+
+    This is the number of tasks in the longest chain of same-cycle graph
+    children starting from (and including) the task.
+
+    """
+    taskdefs = config.taskdefs
+    # Same-cycle graph children of each task.
+    graph_children: Dict[str, Set[str]] = {
+        name: {
+            child
+            for outputs in taskdef.graph_children.values()
+            for children in outputs.values()
+            for child, trigger in children
+            if trigger.cycle_point_offset is None and child in taskdefs
+        }
+        for name, taskdef in taskdefs.items()
+    }
+
+    # Order tasks children first (reverse topological order) with an
+    # iterative depth first search, long chains would exceed the recursion
+    # limit.
+    order: List[str] = []
+    visited: Set[str] = set()
+    for root in taskdefs:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, iter(graph_children[root]))]
+        while stack:
+            name, children = stack[-1]
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(graph_children[child])))
+                    break
+            else:
+                stack.pop()
+                order.append(name)
+
+    # Fill in lengths from the leaves upward.
+    lengths: Dict[str, int] = {}
+    for name in order:
+        # (children not yet done are cyclic dependence, which is invalid
+        # within a cycle, ignore them)
+        lengths[name] = 1 + max(
+            (lengths.get(child, 0) for child in graph_children[name]),
+            default=0
+        )
+    return lengths
+
+
+class PriorityTaskQueue(LimitedTaskQueue):
+    """One task queue with group members and active limit, by priority.
+
+    Tasks are released in order of their sort key, then the order they were
+    queued in.
+
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        members: Set[str],
+        priority: int,
+        share: int,
+        get_key: Callable[[TaskProxy, int], Tuple[Any, ...]]
+    ) -> None:
+        super().__init__(limit, members)
+        self.priority = priority  # user-assigned queue priority
+        self.share = share  # fair-share weight
+        self.get_key = get_key
+        # Heap of [sort key, queue number, task or None if removed].
+        self.heap: List[list] = []
+        self.entries: Dict[TaskProxy, list] = {}
+        self.counter = count()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def push_task(self, itask: TaskProxy) -> None:
+        """Queue task if in my membership list."""
+        if itask.tdef.name in self.members:
+            entry = [
+                self.get_key(itask, self.priority), next(self.counter), itask]
+            self.entries[itask] = entry
+            heappush(self.heap, entry)
+
+    def peek(self) -> Optional[list]:
+        """Return the entry of the next task to release, or None."""
+        while self.heap and self.heap[0][2] is None:
+            heappop(self.heap)
+        if self.heap:
+            return self.heap[0]
+        return None
+
+    def pop(self) -> TaskProxy:
+        """Remove and return the next task to release."""
+        self.peek()
+        itask = heappop(self.heap)[2]
+        del self.entries[itask]
+        return itask
+
+    def release(self) -> List[TaskProxy]:
+        """Release tasks if below the active limit."""
+        released: List[TaskProxy] = []
+        n_active: int = self.n_active
+        while self.entries and (not self.limit or n_active < self.limit):
+            released.append(self.pop())
+            n_active += 1
+        return released
+
+    def remove(self, itask: TaskProxy) -> bool:
+        """Remove a single task from queue, return True if removed."""
+        entry = self.entries.pop(itask, None)
+        if entry is None:
+            return False
+        entry[2] = None
+        return True
+
+
+class PriorityQueueManager(IndepQueueManager):
+    """Implement prioritised, fair-share task queues.
+
+    As for independent queues, each task belongs to one queue and each queue
+    limits its number of active tasks. In addition:
+
+    * Queued tasks are released in priority order, according to the
+      "[scheduling]queue priority" items:
+
+      * "priority" - the "priority" of the queue (highest first)
+      * "cycle point" - the task cycle point (earliest first)
+      * "critical path" - the number of tasks in the longest chain of
+        dependence in the graph from the task (longest first)
+
+    * The "[scheduling]active task limit" limits the total number of active
+      tasks. Under this limit queues are given capacity in proportion to
+      their "share", i.e. the next task is released from the queue with the
+      fewest active tasks per share (then from the queue whose next task has
+      the highest priority).
+
+    """
+
+    def __init__(self,
+                 qconfig: dict,
+                 all_task_names: List[str],
+                 descendants: dict,
+                 config: Optional['WorkflowConfig'] = None
+                 ) -> None:
+        self.qconfig = qconfig
+        self.limit = 0
+        self.order = list(PRIORITY_ORDER_DEFAULT)
+        self.critical_paths: Dict[str, int] = {}
+        if config is not None:
+            self.limit = config.cfg['scheduling']['active task limit']
+            self.order = config.cfg['scheduling']['queue priority']
+            self.critical_paths = get_critical_paths(config)
+        for item in self.order:
+            if item not in PRIORITY_ORDER_DEFAULT:
+                raise WorkflowConfigError(
+                    f'Illegal [scheduling]queue priority item: "{item}"'
+                    f' (valid items are: {", ".join(PRIORITY_ORDER_DEFAULT)})'
+                )
+        self.n_active = 0  # total number of active tasks
+        super().__init__(qconfig, all_task_names, descendants, config)
+
+    def _make_queue(self, name: str, config: dict) -> PriorityTaskQueue:
+        """Return a new queue, given its expanded config."""
+        share = self.qconfig[name].get('share', 1)
+        if share < 1:
+            raise WorkflowConfigError(
+                f'[scheduling][queues][{name}]share must be at least 1')
+        return PriorityTaskQueue(
+            config["limit"],
+            config["members"],
+            self.qconfig[name].get('priority', 0),
+            share,
+            self.get_key
+        )
+
+    def get_key(self, itask: TaskProxy, priority: int) -> Tuple[Any, ...]:
+        """Return the sort key of a task in a queue of the given priority."""
+        key: List[Any] = []
+        for item in self.order:
+            if item == PRIORITY_QUEUE:
+                key.append(-priority)
+            elif item == PRIORITY_CYCLE_POINT:
+                key.append(itask.point)
+            else:  # PRIORITY_CRITICAL_PATH
+                key.append(-self.critical_paths.get(itask.tdef.name, 1))
+        return tuple(key)
+
+    def update_active(self, name: str, change: int) -> None:
+        """Update the active task counts of the task's queue and in total."""
+        super().update_active(name, change)
+        self.n_active += change
+
+    def release_tasks(self) -> List[TaskProxy]:
+        """Release tasks by priority and share, up to the limits."""
+        released: List[TaskProxy] = []
+        n_active = self.n_active
+        if not self.limit or n_active < self.limit:
+            # Heap of (active tasks per share, next task key, index, queue)
+            # for queues with tasks to release.
+            candidates: List[tuple] = []
+            n_released: Dict[int, int] = {}
+            # (queues are made by _make_queue)
+            queues = cast(Dict[str, PriorityTaskQueue], self.queues)
+            for index, queue in enumerate(queues.values()):
+                entry = queue.peek()
+                if entry is not None and (
+                    not queue.limit or queue.n_active < queue.limit
+                ):
+                    n_released[index] = 0
+                    heappush(candidates, (
+                        queue.n_active / queue.share, entry[0], index, queue))
+            while candidates and (not self.limit or n_active < self.limit):
+                _, _, index, queue = heappop(candidates)
+                released.append(queue.pop())
+                n_active += 1
+                n_released[index] += 1
+                n_queue_active = queue.n_active + n_released[index]
+                entry = queue.peek()
+                if entry is not None and (
+                    not queue.limit or n_queue_active < queue.limit
+                ):
+                    heappush(candidates, (
+                        n_queue_active / queue.share, entry[0], index, queue))
+        if self.force_released:
+            released += list(self.force_released)
+            self.force_released = set()
+        return released
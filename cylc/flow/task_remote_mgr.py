@@ -40,7 +40,7 @@ from cylc.flow.pathutil import (
     get_remote_workflow_run_dir,
     get_dirs_to_symlink,
     get_workflow_run_dir)
-from cylc.flow.remote import construct_rsync_over_ssh_cmd
+from cylc.flow.ssh_control_mgr import SSHControlMgr
 from cylc.flow.subprocctx import SubProcContext
 from cylc.flow.workflow_files import (
     WorkflowFiles,
@@ -80,6 +80,7 @@ class TaskRemoteMgr:
         self.uuid_str = None
         self.ready = False
         self.rsync_includes = None
+        self.ssh_control_mgr = SSHControlMgr(proc_pool)
 
     def subshell_eval(self, command, command_pattern, host_check=True):
         """Evaluate a task platform from a subshell string.
@@ -205,7 +206,7 @@ class TaskRemoteMgr:
             if value is not None:
                 cmd.append(f"{key}={quote(value)} ")
         # Create the ssh command
-        cmd = construct_ssh_cmd(cmd, platform)
+        cmd = self.ssh_control_mgr.construct_ssh_cmd(cmd, platform)
         self.proc_pool.put_command(
             SubProcContext(
                 'remote-init',
@@ -349,7 +350,7 @@ class TaskRemoteMgr:
         install_target = platform['install target']
         ctx = SubProcContext(
             'file-install',
-            construct_rsync_over_ssh_cmd(
+            self.ssh_control_mgr.construct_rsync_over_ssh_cmd(
                 src_path,
                 dst_path,
                 platform,
@@ -185,6 +185,9 @@ class TaskState:
             Has the status been updated since previous update?
         .kill_failed (boolean):
             Has a job kill attempt failed since previous status change?
+        .on_change (callable):
+            If set, called after each state change with the previous
+            (status, is_held, is_queued, is_runahead) as its argument.
         .outputs (cylc.flow.task_outputs.TaskOutputs):
             Known outputs of the task.
         .prerequisites (list<cylc.flow.prerequisite.Prerequisite>):
@@ -212,6 +215,7 @@ class TaskState:
         "identity",
         "is_updated",
         "kill_failed",
+        "on_change",
         "outputs",
         "prerequisites",
         "status",
@@ -230,6 +234,7 @@ class TaskState:
         self.is_runahead = True  # limit on spawning, until released
         self.is_updated = False
         self.time_updated = None
+        self.on_change = None
 
         self._is_satisfied = None
         self._suicide_is_satisfied = None
@@ -442,6 +447,8 @@ class TaskState:
         self.time_updated = get_current_time_string()
         self.is_updated = True
         LOG.debug("[%s] -%s => %s", self.identity, prev_message, str(self))
+        if self.on_change is not None:
+            self.on_change(current_status)
 
         if is_held:
             # only reset task outputs if not setting task to held
@@ -17,6 +17,7 @@
 """Task definition."""
 
 from collections import deque
+from contextlib import suppress
 
 from cylc.flow.exceptions import TaskDefError
 from cylc.flow.task_id import TaskID
@@ -25,7 +26,20 @@ from cylc.flow import LOG
 
 
 def generate_graph_children(tdef, point):
-    """Determine graph children of this task (for spawning)."""
+    """Determine graph children of this task (for spawning).
+
+    Results are cached on the task definition, so must not be modified.
+    """
+    with suppress(KeyError):
+        return tdef.graph_children_cache[point]
+    graph_children = _generate_graph_children(tdef, point)
+    tdef.cache_graph_relatives(
+        tdef.graph_children_cache, point, graph_children)
+    return graph_children
+
+
+def _generate_graph_children(tdef, point):
+    """Determine graph children of this task, uncached."""
     graph_children = {}
     for seq, dout in tdef.graph_children.items():
         for output, downs in dout.items():
@@ -62,7 +76,19 @@ def generate_graph_children(tdef, point):
 
 
 def generate_graph_parents(tdef, point):
-    """Determine graph parents of this task."""
+    """Determine graph parents of this task.
+
+    Results are cached on the task definition, so must not be modified.
+    """
+    with suppress(KeyError):
+        return tdef.graph_parents_cache[point]
+    graph_parents = _generate_graph_parents(tdef, point)
+    tdef.cache_graph_relatives(tdef.graph_parents_cache, point, graph_parents)
+    return graph_parents
+
+
+def _generate_graph_parents(tdef, point):
+    """Determine graph parents of this task, uncached."""
     graph_parents = {}
     for seq, ups in tdef.graph_parents.items():
         graph_parents[seq] = []
@@ -105,11 +131,14 @@ class TaskDef:
         "sequential", "is_coldstart",
         "workflow_polling_cfg", "clocktrigger_offset", "expiration_offset",
         "namespace_hierarchy", "dependencies", "outputs", "param_var",
-        "graph_children", "graph_parents",
-        "external_triggers", "xtrig_labels", "name", "elapsed_times"]
+        "graph_children", "graph_parents", "graph_children_cache",
+        "graph_parents_cache", "external_triggers", "xtrig_labels", "name",
+        "elapsed_times"]
 
     # Store the elapsed times for a maximum of 10 cycles
     MAX_LEN_ELAPSED_TIMES = 10
+    # Cache graph children/parents for a maximum of 20 cycle points
+    MAX_LEN_GRAPH_CACHE = 20
     ERR_PREFIX_TASK_NOT_ON_SEQUENCE = "Invalid cycle point for task: "
 
     def __init__(self, name, rtcfg, run_mode, start_point, initial_point):
@@ -136,6 +165,9 @@ class TaskDef:
         self.outputs = set()
         self.graph_children = {}
         self.graph_parents = {}
+        # {point: generate_graph_{children,parents}(self, point)}
+        self.graph_children_cache = {}
+        self.graph_parents_cache = {}
         self.param_var = {}
         self.external_triggers = []
         self.xtrig_labels = {}  # {sequence: [labels]}
@@ -154,6 +186,7 @@ class TaskDef:
         self.graph_children.setdefault(
             sequence, {}).setdefault(
                 trigger.output, []).append((taskname, trigger))
+        self.clear_graph_cache()
 
     # graph_parents not currently used, but might be soon:
     def add_graph_parent(self, trigger, parent, sequence):
@@ -165,6 +198,7 @@ class TaskDef:
         if sequence not in self.graph_parents:
             self.graph_parents[sequence] = set()
         self.graph_parents[sequence].add((parent, trigger))
+        self.clear_graph_cache()
 
     def add_dependency(self, dependency, sequence):
         """Add a dependency to a named sequence.
@@ -193,6 +227,24 @@ class TaskDef:
         """Add a sequence."""
         if sequence not in self.sequences:
             self.sequences.append(sequence)
+            self.clear_graph_cache()
+
+    def cache_graph_relatives(self, cache, point, relatives):
+        """Cache graph children or parents at point.
+
+        The oldest entry is dropped when the cache is full.
+        """
+        cache[point] = relatives
+        if len(cache) > self.MAX_LEN_GRAPH_CACHE:
+            del cache[next(iter(cache))]
+
+    def clear_graph_cache(self):
+        """Clear cached graph children and parents.
+
+        Must be called if the graph (or sequences) of this task change.
+        """
+        self.graph_children_cache.clear()
+        self.graph_parents_cache.clear()
 
     def describe(self):
         """Return title and description of the current task."""
@@ -18,10 +18,12 @@
 
 import aiofiles
 from collections import deque
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from enum import Enum
+import fcntl
 from functools import partial
 import glob
+import json
 import logging
 import os
 from pathlib import Path
@@ -31,8 +33,8 @@ import shutil
 from subprocess import Popen, PIPE, DEVNULL
 import time
 from typing import (
-    Any, Container, Deque, Dict, Iterable, List, NamedTuple, Optional, Set,
-    Tuple, TYPE_CHECKING, Union
+    Any, Container, Deque, Dict, Iterable, Iterator, List, NamedTuple,
+    Optional, Set, Tuple, TYPE_CHECKING, Union
 )
 import zmq.auth
 
@@ -297,6 +299,9 @@ PS_OPTS = '-wopid,args'
 
 MAX_SCAN_DEPTH = 4  # How many subdir levels down to look for valid run dirs
 
+REGISTRY_FILE = '.cylc-registry.json'  # Index of workflows in cylc-run
+REGISTRY_VERSION = 2
+
 CONTACT_FILE_EXISTS_MSG = r"""workflow contact file exists: %(fname)s
 
 Workflow "%(workflow)s" is already running, listening at "%(host)s:%(port)s".
@@ -415,6 +420,142 @@ def get_contact_file(reg):
         get_workflow_srv_dir(reg), WorkflowFiles.Service.CONTACT)
 
 
+def get_registry_file(run_dir: Optional[Union[Path, str]] = None) -> Path:
+    """Return the path of the workflow registry for a cylc-run directory."""
+    if run_dir is None:
+        run_dir = get_workflow_run_dir('')
+    return Path(run_dir, REGISTRY_FILE)
+
+
+def load_registry(
+    run_dir: Optional[Union[Path, str]] = None
+) -> Optional[Dict[str, Any]]:
+    """Load the workflow registry for a cylc-run directory.
+
+    The registry is an index of the workflows installed in the cylc-run
+    directory which saves "cylc scan" from having to walk the whole tree. It
+    contains:
+
+    dirs:
+        The names of all directories at the top of the cylc-run directory
+        (whether or not they contain workflows) at the time the registry was
+        written, a new directory not in this list means the registry is out
+        of date.
+    workflows:
+        The names of all installed workflows.
+    mtimes:
+        The modification times (ns) of the directories below the top of the
+        cylc-run directory which "cylc scan" looked in for workflows (i.e.
+        those which are not workflows themselves), a change to any of these
+        means the registry may be out of date (e.g. a workflow copied in or
+        installed by another version of Cylc).
+
+    The registry is a cache, it is rebuilt by "cylc scan" whenever it is
+    missing or out of date so it is safe to delete.
+
+    Returns:
+        The registry, or None if it does not exist or cannot be read.
+
+    """
+    with suppress(OSError, ValueError):
+        with open(get_registry_file(run_dir)) as handle:
+            registry = json.load(handle)
+        if (
+            isinstance(registry, dict)
+            and registry.get('version') == REGISTRY_VERSION
+        ):
+            return registry
+    return None
+
+
+def dump_registry(
+    dirs: Iterable[str],
+    workflows: Iterable[str],
+    run_dir: Optional[Union[Path, str]] = None,
+    mtimes: Optional[Dict[str, int]] = None
+) -> None:
+    """Write the workflow registry for a cylc-run directory.
+
+    The file is replaced atomically so readers never see a partial registry.
+
+    """
+    path = get_registry_file(run_dir)
+    tmp_path = f'{path}.{os.getpid()}'
+    with open(tmp_path, 'w') as handle:
+        json.dump(
+            {
+                'version': REGISTRY_VERSION,
+                'dirs': sorted(set(dirs)),
+                'workflows': sorted(set(workflows)),
+                'mtimes': mtimes or {},
+            },
+            handle
+        )
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def lock_registry(
+    run_dir: Optional[Union[Path, str]] = None
+) -> Iterator[None]:
+    """Hold the lock on the workflow registry for a cylc-run directory.
+
+    Hold this whilst reading and rewriting the registry so that concurrent
+    changes are not lost.
+
+    """
+    with open(f'{get_registry_file(run_dir)}.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)  # released on close
+        yield
+
+
+def update_registry(
+    add: Iterable[str] = (),
+    remove: Iterable[str] = (),
+    run_dir: Optional[Union[Path, str]] = None
+) -> None:
+    """Add workflows to, or remove workflows from, the workflow registry.
+
+    Does nothing if there is no registry, the next "cylc scan" will build one.
+
+    Args:
+        add: Names of workflows to add.
+        remove: Names of workflows to remove, along with any workflows
+            nested beneath them.
+        run_dir: The cylc-run directory, defaults to ~/cylc-run.
+
+    """
+    if run_dir is None:
+        run_dir = get_workflow_run_dir('')
+    path = get_registry_file(run_dir)
+    if not path.exists():
+        return
+    try:
+        with lock_registry(run_dir):
+            registry = load_registry(run_dir)
+            if registry is None:
+                return
+            dirs = set(registry['dirs'])
+            workflows = set(registry['workflows'])
+            for name in map(os.path.normpath, add):
+                workflows.add(name)
+                dirs.add(Path(name).parts[0])
+            for name in map(os.path.normpath, remove):
+                workflows = {
+                    workflow
+                    for workflow in workflows
+                    if workflow != name
+                    and not workflow.startswith(f'{name}{REG_DELIM}')
+                }
+                top = Path(name).parts[0]
+                if not Path(run_dir, top).is_dir():
+                    dirs.discard(top)
+            dump_registry(dirs, workflows, run_dir, registry['mtimes'])
+    except OSError as exc:
+        # the registry is only a cache, scan will rebuild it if need be
+        LOG.warning(f'Could not update workflow registry {path}: {exc}')
+
+
 def get_flow_file(reg: str) -> str:
     """Return the path of a workflow's flow.cylc file.
 
@@ -467,10 +608,13 @@ def get_workflow_srv_dir(reg):
     return os.path.join(run_d, WorkflowFiles.Service.DIRNAME)
 
 
-def load_contact_file(reg):
+def load_contact_file(reg, run_dir=None):
     """Load contact file. Return data as key=value dict."""
     file_base = WorkflowFiles.Service.CONTACT
-    path = get_workflow_srv_dir(reg)
+    if not run_dir:
+        path = get_workflow_srv_dir(reg)
+    else:
+        path = os.path.join(run_dir, WorkflowFiles.Service.DIRNAME)
     file_content = _load_local_item(file_base, path)
     if not file_content:
         raise ServiceFileError("Couldn't load contact file")
@@ -696,6 +840,8 @@ def clean(reg: str, run_dir: Path, rm_dirs: Optional[Set[str]] = None) -> None:
     for symlink, target in symlink_dirs.items():
         # Remove empty parents of symlink target up to <symlink_dir>/cylc-run/
         _remove_empty_parents(target, Path(reg, symlink))
+    if rm_dirs is None:
+        update_registry(remove=[reg])
 
 
 def get_symlink_dirs(reg: str, run_dir: Union[Path, str]) -> Dict[str, Path]:
@@ -1342,6 +1488,7 @@ def install_workflow(
     else:
         raise WorkflowFilesError(
             "Source directory between runs are not consistent.")
+    update_registry(add=[named_run])
     install_log.info(f'INSTALLED {named_run} from {source}')
     print(f'INSTALLED {named_run} from {source}')
     _close_install_log(install_log)
@@ -0,0 +1,248 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Fixtures for benchmarks.
+
+The integration test fixtures are re-exported here so that benchmarks can
+create and run workflows in the same way as integration tests.
+"""
+
+from time import perf_counter
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from integration.conftest import *  # noqa: F401,F403
+
+
+# {heading: (stat, format)}
+WORKFLOW_COLUMNS = {
+    'tasks': ('tasks', 'd'),
+    'tasks/s': ('tasks_per_sec', '.1f'),
+    'p50 (ms)': ('loop_p50', '.2f'),
+    'p90 (ms)': ('loop_p90', '.2f'),
+    'p99 (ms)': ('loop_p99', '.2f'),
+    'RSS (MiB)': ('peak_rss', '.1f'),
+    'DB (KiB)': ('db_size', '.1f'),
+}
+
+
+def _get_results(terminalreporter, key):
+    return [
+        value
+        for report in terminalreporter.stats.get('passed', [])
+        if report.when == 'call'
+        for key_, value in report.user_properties
+        if key_ == key
+    ]
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Print tables of benchmark results at the end of the session.
+
+    Results are passed back via the "user_properties" of test reports so that
+    this works when tests are run in xdist workers.
+    """
+    results: List[Tuple[str, float, int]] = _get_results(
+        terminalreporter, 'benchmark')
+    if results:
+        width = max(len(name) for name, _, _ in results)
+        terminalreporter.section('benchmarks')
+        terminalreporter.write_line(
+            f'{"benchmark":<{width}}  {"best (s)":>12}  {"per op (s)":>12}')
+        for name, best, ops in results:
+            terminalreporter.write_line(
+                f'{name:<{width}}  {best:>12.6f}  {best / ops:>12.3e}')
+    mem_results: List[Tuple[str, int, int]] = _get_results(
+        terminalreporter, 'benchmark_memory')
+    if mem_results:
+        width = max(len(name) for name, _, _ in mem_results)
+        terminalreporter.section('memory benchmarks')
+        terminalreporter.write_line(
+            f'{"benchmark":<{width}}  {"peak (KiB)":>12}  {"per op (B)":>12}')
+        for name, peak, ops in mem_results:
+            terminalreporter.write_line(
+                f'{name:<{width}}  {peak / 1024:>12.1f}  {peak / ops:>12.1f}')
+    wf_results: List[Tuple[str, Dict[str, float]]] = _get_results(
+        terminalreporter, 'benchmark_workflow')
+    if wf_results:
+        width = max(len(name) for name, _ in wf_results)
+        terminalreporter.section('workflow benchmarks')
+        terminalreporter.write_line(
+            f'{"benchmark":<{width}}  '
+            + '  '.join(f'{heading:>10}' for heading in WORKFLOW_COLUMNS))
+        for name, stats in wf_results:
+            terminalreporter.write_line(
+                f'{name:<{width}}  '
+                + '  '.join(
+                    f'{stats[key]:>10{fmt}}'
+                    for key, fmt in WORKFLOW_COLUMNS.values()))
+
+
+@pytest.fixture
+def benchmark_result(request):
+    """Record a measurement for the session summary.
+
+    For benchmarks which measure something other than the time taken to call
+    a function.
+
+    Args:
+        name (str):
+            Name to report the result under.
+        seconds (float):
+            The measured time (seconds).
+        ops (int):
+            The number of operations performed in that time.
+
+    """
+    def _benchmark_result(name: str, seconds: float, ops: int = 1) -> None:
+        request.node.user_properties.append(
+            ('benchmark', (name, seconds, ops)))
+
+    return _benchmark_result
+
+
+@pytest.fixture
+def benchmark(benchmark_result):
+    """Time a function, recording the result for the session summary.
+
+    Args:
+        name (str):
+            Name to report the result under.
+        func (callable):
+            The function to time, called with no arguments.
+        ops (int):
+            The number of operations performed by a single call of func, used
+            to report the time per operation.
+        repeat (int):
+            Number of times to call func, the best time is reported.
+        setup (callable):
+            Called with no arguments before each call of func, not timed.
+
+    Returns:
+        float - the best time taken by a single call of func (seconds).
+
+    """
+    def _benchmark(
+        name: str,
+        func: Callable[[], Any],
+        ops: int = 1,
+        repeat: int = 3,
+        setup: Optional[Callable[[], Any]] = None
+    ) -> float:
+        times = []
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = perf_counter()
+            func()
+            times.append(perf_counter() - start)
+        best = min(times)
+        benchmark_result(name, best, ops)
+        return best
+
+    return _benchmark
+
+
+@pytest.fixture
+def benchmark_memory(request):
+    """Measure the peak memory allocated by a function call.
+
+    Python memory allocations are traced with tracemalloc, so this measures
+    the memory allocated (and not yet freed) by Python code while the function
+    runs, not the process RSS.
+
+    Args:
+        name (str):
+            Name to report the result under.
+        func (callable):
+            The function to measure, called with no arguments.
+        ops (int):
+            The number of operations performed by a single call of func, used
+            to report the memory per operation.
+        setup (callable):
+            Called with no arguments before func, not measured.
+
+    Returns:
+        int - the peak memory allocated during the call (bytes).
+
+    """
+    def _benchmark_memory(
+        name: str,
+        func: Callable[[], Any],
+        ops: int = 1,
+        setup: Optional[Callable[[], Any]] = None
+    ) -> int:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            base = tracemalloc.get_traced_memory()[0]
+            func()
+            peak = tracemalloc.get_traced_memory()[1] - base
+        finally:
+            tracemalloc.stop()
+        request.node.user_properties.append(
+            ('benchmark_memory', (name, peak, ops)))
+        return peak
+
+    return _benchmark_memory
+
+
+@pytest.fixture
+def benchmark_workflow(request):
+    """Record the results of running a workflow for the session summary.
+
+    Args:
+        name (str):
+            Name to report the result under.
+        tasks (int):
+            The number of tasks which ran.
+        seconds (float):
+            The time taken to run the workflow (seconds).
+        loop_times (list):
+            The time taken by each main loop iteration (seconds).
+        peak_rss (int):
+            The peak resident set size of the process during the run (bytes).
+        db_size (int):
+            The size of the workflow databases after the run (bytes).
+
+    """
+    def _benchmark_workflow(
+        name: str,
+        tasks: int,
+        seconds: float,
+        loop_times: List[float],
+        peak_rss: int,
+        db_size: int
+    ) -> None:
+        loop_times = sorted(loop_times)
+
+        def _percentile(percent):
+            return 1000 * loop_times[
+                round(percent / 100 * (len(loop_times) - 1))]
+
+        request.node.user_properties.append(('benchmark_workflow', (name, {
+            'tasks': tasks,
+            'tasks_per_sec': tasks / seconds,
+            'loop_p50': _percentile(50),
+            'loop_p90': _percentile(90),
+            'loop_p99': _percentile(99),
+            'peak_rss': peak_rss / 1024 ** 2,
+            'db_size': db_size / 1024,
+        })))
+
+    return _benchmark_workflow
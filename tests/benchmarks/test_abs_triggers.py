@@ -0,0 +1,98 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark satisfying absolute triggers in a busy task pool."""
+
+from typing import Callable
+
+import pytest
+
+from cylc.flow.cycling.integer import IntegerPoint
+from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_outputs import TASK_OUTPUT_SUCCEEDED
+
+N_SETUP = 10
+N_MEMBERS = 20
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('n_points', [5, 50])
+async def test_spawn_on_abs_output(
+    n_points: int,
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    benchmark: Callable
+) -> None:
+    """Time completing outputs which many waiting tasks depend on via [^]."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'task parameters': {
+            'k': f'1..{N_SETUP}',
+            'm': f'1..{N_MEMBERS}'
+        },
+        'scheduling': {
+            'cycling mode': 'integer',
+            'initial cycle point': 1,
+            'runahead limit': f'P{n_points}',
+            'graph': {
+                'R1': 'setup<k>',
+                'P1': 'setup<k>[^] & foo<m>[-P1] => foo<m>'
+            }
+        }
+    })
+    schd: Scheduler = scheduler(reg)
+    async with run(schd):
+        pool = schd.pool
+        names = sorted(schd.config.taskdefs)
+        setup = [
+            pool.get_task(name, IntegerPoint('1'))
+            for name in names
+            if name.startswith('setup')
+        ]
+        waiting = []
+        for point in range(1, n_points + 1):
+            for name in names:
+                if name.startswith('foo'):
+                    itask = pool.get_or_spawn_task(
+                        name, IntegerPoint(str(point)), setup[0].flow_label)
+                    pool.add_to_pool(itask, is_new=False)
+                    waiting.append(itask)
+
+        def reset():
+            pool.abs_outputs_done.clear()
+            for itask in waiting:
+                itask.state.set_prerequisites_not_satisfied()
+
+        def complete_setup():
+            for itask in setup:
+                pool.spawn_on_output(itask, TASK_OUTPUT_SUCCEEDED)
+
+        benchmark(
+            f'spawn on absolute output [pool={len(waiting)}]',
+            complete_setup,
+            ops=N_SETUP,
+            setup=reset
+        )
+        # the [^] prerequisites of every waiting task are satisfied
+        for itask in waiting:
+            for prereq in itask.state.prerequisites:
+                assert all(
+                    prereq.satisfied[message]
+                    for message in prereq.satisfied
+                    if message[0].startswith('setup')
+                )
@@ -0,0 +1,116 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark loading the config of a large parameterized workflow."""
+
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from cylc.flow.config import WorkflowConfig
+from cylc.flow.scheduler_cli import RunOptions
+from cylc.flow.workflow_files import WorkflowFiles
+
+
+@pytest.mark.parametrize('member_env', [False, True])
+@pytest.mark.parametrize('members', [1000, 10000])
+def test_workflow_config(
+    members: int,
+    member_env: bool,
+    flow: Callable,
+    run_dir: Path,
+    benchmark: Callable,
+    benchmark_memory: Callable
+) -> None:
+    """Time and measure the memory of the runtime inheritance.
+
+    The members inherit most of their config from a family, optionally
+    adding to its environment.
+    """
+    reg = flow({
+        'task parameters': {
+            'm': f'1..{members}'
+        },
+        'scheduling': {
+            'cycling mode': 'integer',
+            'initial cycle point': 1,
+            'graph': {
+                'P1': 'start => mem<m> => end'
+            }
+        },
+        'runtime': {
+            'root': {
+                'script': 'echo "$CYLC_TASK_ID"',
+                'execution retry delays': 'PT1M, PT5M',
+                'environment': {
+                    f'ROOT_{ind}': f'${{HOME}}/{ind}' for ind in range(20)
+                },
+                'events': {
+                    'handlers': 'echo %(id)s',
+                    'handler events': 'failed'
+                }
+            },
+            'ENSEMBLE': {
+                'pre-script': 'sleep 1',
+                'execution time limit': 'PT1H',
+                'environment': {
+                    f'ENSEMBLE_{ind}': f'$ROOT_{ind}' for ind in range(20)
+                },
+                'directives': {
+                    '--mem': '1G',
+                    '--time': '60',
+                    '--ntasks': '4',
+                    '--partition': 'compute'
+                }
+            },
+            'mem<m>': {
+                'inherit': 'ENSEMBLE',
+                'environment': {
+                    'MEMBER': '$CYLC_TASK_PARAM_m'
+                } if member_env else {}
+            },
+            'start': {},
+            'end': {}
+        }
+    })
+    flow_file = Path(run_dir, reg, WorkflowFiles.FLOW_FILE)
+    configs = []
+
+    def load_config():
+        configs.append(WorkflowConfig(reg, flow_file, RunOptions()))
+
+    name = f'workflow config [members={members}, member env={member_env}]'
+    benchmark(
+        name,
+        load_config,
+        ops=members,
+        repeat=1
+    )
+    benchmark_memory(
+        name,
+        load_config,
+        ops=members
+    )
+    # the members inherit from the family
+    member = min(
+        task for task in configs[-1].get_task_name_list()
+        if task.startswith('mem')
+    )
+    rtconfig = configs[-1].get_taskdef(member).rtconfig
+    assert rtconfig['directives']['--mem'] == '1G'
+    assert rtconfig['environment']['ROOT_0'] == '${HOME}/0'
+    assert ('MEMBER' in rtconfig['environment']) is member_env
@@ -0,0 +1,115 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark loading the config of a large workflow from the cache."""
+
+from pathlib import Path
+import shutil
+from typing import Callable
+
+import pytest
+
+from cylc.flow.config import WorkflowConfig
+from cylc.flow.config_cache import ENV_CONFIG_CACHE, get_cache_dir
+from cylc.flow.scheduler_cli import RunOptions
+from cylc.flow.workflow_files import WorkflowFiles
+
+
+@pytest.mark.parametrize('members', [1000, 10000])
+def test_config_cache(
+    members: int,
+    flow: Callable,
+    run_dir: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    benchmark: Callable
+) -> None:
+    """Time cold and warm loads of a large parameterized workflow."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    reg = flow({
+        'task parameters': {
+            'm': f'1..{members}'
+        },
+        'scheduling': {
+            'cycling mode': 'integer',
+            'initial cycle point': 1,
+            'graph': {
+                'P1': 'start => mem<m> => end'
+            }
+        },
+        'runtime': {
+            'root': {
+                'script': 'echo "$CYLC_TASK_ID"',
+                'environment': {
+                    f'ROOT_{ind}': f'${{HOME}}/{ind}' for ind in range(20)
+                }
+            },
+            'ENSEMBLE': {
+                'execution time limit': 'PT1H',
+                'directives': {
+                    '--mem': '1G',
+                    '--ntasks': '4'
+                }
+            },
+            'mem<m>': {
+                'inherit': 'ENSEMBLE',
+                'environment': {
+                    'MEMBER': '$CYLC_TASK_PARAM_m'
+                }
+            },
+            'start': {},
+            'end': {}
+        }
+    })
+    flow_file = Path(run_dir, reg, WorkflowFiles.FLOW_FILE)
+    configs = []
+
+    def load_config():
+        configs.append(WorkflowConfig(reg, flow_file, RunOptions()))
+
+    def clear_cache():
+        shutil.rmtree(get_cache_dir(), ignore_errors=True)
+
+    monkeypatch.setenv(ENV_CONFIG_CACHE, 'false')
+    benchmark(
+        f'config cache disabled [members={members}]',
+        load_config,
+        ops=members,
+        repeat=1
+    )
+    monkeypatch.setenv(ENV_CONFIG_CACHE, 'true')
+    benchmark(
+        f'config cache cold [members={members}]',
+        load_config,
+        ops=members,
+        repeat=1,
+        setup=clear_cache
+    )
+    benchmark(
+        f'config cache warm [members={members}]',
+        load_config,
+        ops=members
+    )
+    assert (
+        configs[-1].get_task_name_list() == configs[0].get_task_name_list()
+    )
+    member = min(
+        task for task in configs[-1].get_task_name_list()
+        if task.startswith('mem')
+    )
+    member = configs[-1].get_taskdef(member).rtconfig
+    assert member['directives']['--mem'] == '1G'
+    assert member['environment']['MEMBER'] == '$CYLC_TASK_PARAM_m'
@@ -0,0 +1,88 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark date-time cycle point arithmetic in different calendars."""
+
+from random import Random
+from typing import Callable
+
+import pytest
+
+from cylc.flow.cycling.iso8601 import ISO8601Interval, ISO8601Point, init
+
+# More points than the arithmetic caches hold.
+N_POINTS = 20000
+
+
+@pytest.fixture
+def calendar(request):
+    """Set the calendar for a test and reset it afterwards."""
+    init(time_zone='Z', cycling_mode=request.param)
+    yield request.param
+    init(time_zone='Z', cycling_mode='gregorian')
+
+
+def reset_caches():
+    """Forget the results of earlier runs."""
+    init(time_zone='Z')
+
+
+@pytest.mark.parametrize(
+    'calendar', ['gregorian', '360day', '365day'], indirect=True)
+@pytest.mark.parametrize('step', ['PT1H', 'P1M'])
+def test_point_add(calendar: str, step: str, benchmark: Callable) -> None:
+    """Time stepping a point through a long sequence."""
+    interval = ISO8601Interval(step)
+    points = []
+
+    def add():
+        points.clear()
+        point = ISO8601Point('10000101T0000Z')
+        for _ in range(N_POINTS):
+            point = point + interval
+            points.append(point)
+
+    benchmark(
+        f'point + {step} [{calendar}]',
+        add,
+        ops=N_POINTS,
+        setup=reset_caches
+    )
+    assert points[0] < points[-1]
+
+
+@pytest.mark.parametrize(
+    'calendar', ['gregorian', '360day', '365day'], indirect=True)
+def test_point_sort(calendar: str, benchmark: Callable) -> None:
+    """Time sorting (i.e. comparing) and differencing shuffled points."""
+    point = ISO8601Point('20000101T0000Z')
+    interval = ISO8601Interval('PT1H')
+    points = []
+    for _ in range(N_POINTS):
+        point += interval
+        points.append(point)
+    shuffled = list(points)
+    Random(0).shuffle(shuffled)
+    results = []
+
+    def sort():
+        results[:] = sorted(shuffled)
+
+    def sub():
+        results[:] = [point - points[0] for point in shuffled]
+
+    benchmark(f'sort points [{calendar}]', sort, ops=N_POINTS)
+    assert results == points
+    benchmark(f'point - point [{calendar}]', sub, ops=N_POINTS)
@@ -0,0 +1,79 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark loading the config of a workflow with a large graph."""
+
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from cylc.flow.config import WorkflowConfig
+from cylc.flow.scheduler_cli import RunOptions
+from cylc.flow.workflow_files import WorkflowFiles
+
+
+SECTIONS = 64
+PAIRS = 250
+
+
+def graph_section(section: int) -> str:
+    """Return a graph section which gives 1550 graph edges."""
+    return '\n'.join(
+        f'a{section}_{ind} => b{section}_{ind} => d{section}_{ind}\n'
+        f'b{section}_{ind}:fail | c{section}_{ind % 50} => e{section}_{ind}'
+        for ind in range(PAIRS)
+    )
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_graph_parse(
+    parallel: bool,
+    flow: Callable,
+    run_dir: Path,
+    benchmark: Callable,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Time the loading of a graph with many sections and ~100k edges."""
+    if not parallel:
+        monkeypatch.setattr(WorkflowConfig, 'GRAPH_PARALLEL_MIN_SIZE', 10**12)
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'scheduling': {
+            'cycling mode': 'integer',
+            'graph': {
+                f'R1/{section + 1}': graph_section(section)
+                for section in range(SECTIONS)
+            }
+        }
+    })
+    flow_file = Path(run_dir, reg, WorkflowFiles.FLOW_FILE)
+    configs = []
+
+    def load_config():
+        configs.append(WorkflowConfig(reg, flow_file, RunOptions()))
+
+    edges = SECTIONS * (PAIRS * 6 + 50)
+    benchmark(
+        f'graph parse [edges={edges}, parallel={parallel}]',
+        load_config,
+        ops=edges,
+        repeat=1
+    )
+    assert len(configs[-1].taskdefs) == SECTIONS * (PAIRS * 4 + 50)
+    assert sum(map(len, configs[-1].edges.values())) == edges
@@ -0,0 +1,78 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark data-store graph window generation for a wide ensemble."""
+
+from itertools import count
+from typing import Callable
+
+import pytest
+
+from cylc.flow.cycling.integer import IntegerPoint
+from cylc.flow.data_store_mgr import TASK_PROXIES
+from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_proxy import TaskProxy
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('members', [200, 2000])
+async def test_increment_graph_window(
+    members: int,
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    benchmark: Callable,
+    benchmark_memory: Callable
+) -> None:
+    """Time the graph window of a task which fans out to an ensemble."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'task parameters': {
+            'm': f'1..{members}'
+        },
+        'scheduling': {
+            'cycling mode': 'integer',
+            'initial cycle point': 1,
+            'graph': {
+                'P1': 'start => mem<m> => end'
+            }
+        }
+    })
+    schd: Scheduler = scheduler(reg)
+    async with run(schd):
+        data_store_mgr = schd.data_store_mgr
+        tdef = schd.config.get_taskdef('start')
+        # use a new cycle point for each window so none are already stored
+        points = count(100)
+
+        def increment_graph_window():
+            data_store_mgr.increment_graph_window(
+                TaskProxy(tdef, IntegerPoint(next(points)), 'x'))
+
+        benchmark(
+            f'increment graph window [members={members}]',
+            increment_graph_window,
+            ops=members
+        )
+        benchmark_memory(
+            f'increment graph window [members={members}]',
+            increment_graph_window,
+            ops=members
+        )
+        # the ensemble members and their parent are in the window
+        assert len(data_store_mgr.added[TASK_PROXIES]) >= 4 * (members + 1)
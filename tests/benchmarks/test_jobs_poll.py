@@ -0,0 +1,100 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark job polling by many workflows with a shared status cache.
+
+Uses a stand-in for a job runner poll command (e.g. squeue) which emulates
+the time taken by the job runner to respond.
+"""
+
+from pathlib import Path
+import sys
+from textwrap import dedent
+from time import perf_counter
+from typing import Callable
+
+import pytest
+
+from cylc.flow.job_runner_mgr import JobRunnerManager
+from cylc.flow.task_job_logs import JOB_LOG_STATUS
+
+WORKFLOWS = 60
+JOBS = 20
+DELAY = 0.05
+
+
+@pytest.mark.parametrize('status_cache', [0, 60])
+def test_jobs_poll(
+    status_cache: int,
+    tmp_path: Path,
+    benchmark_result: Callable,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Time one round of job polls by many workflows on one host."""
+    calls = tmp_path / 'calls'
+    calls.touch()
+    script = tmp_path / 'fake-squeue'
+    script.write_text(dedent(f'''
+        #!{sys.executable}
+        import sys
+        from time import sleep
+        with open({str(calls)!r}, 'a') as handle:
+            handle.write(' '.join(sys.argv[1:]) + '\\n')
+        sleep({DELAY})
+        for workflow in range({WORKFLOWS}):
+            for job in range({JOBS}):
+                job_id = str(workflow * 1000 + job)
+                if '--all' in sys.argv or job_id in sys.argv:
+                    print(f'{{job_id}} R')
+    ''').lstrip())
+    script.chmod(0o755)
+
+    class FakeHandler:
+        POLL_CMD = str(script)
+        POLL_ALL_CMD_TMPL = f"{script} --all -u '%(user)s'"
+
+    monkeypatch.setitem(JobRunnerManager._INSTANCES, 'fake', FakeHandler())
+    monkeypatch.setattr(
+        JobRunnerManager, 'STATUS_CACHE_DIR', str(tmp_path / 'cache'))
+
+    workflows = []
+    for workflow in range(WORKFLOWS):
+        job_log_root = tmp_path / str(workflow) / 'log' / 'job'
+        job_log_dirs = []
+        for job in range(JOBS):
+            job_log_dir = f'1/foo{job}/01'
+            (job_log_root / job_log_dir).mkdir(parents=True)
+            (job_log_root / job_log_dir / JOB_LOG_STATUS).write_text(
+                'CYLC_JOB_RUNNER_NAME=fake\n'
+                f'CYLC_JOB_ID={workflow * 1000 + job}\n'
+            )
+            job_log_dirs.append(job_log_dir)
+        workflows.append((str(job_log_root), job_log_dirs))
+
+    # each "cylc jobs-poll" is a new process so its state is not shared
+    start = perf_counter()
+    for job_log_root, job_log_dirs in workflows:
+        JobRunnerManager().jobs_poll(
+            job_log_root, job_log_dirs, status_cache=status_cache)
+    elapsed = perf_counter() - start
+
+    n_calls = len(calls.read_text().splitlines())
+    assert n_calls == (1 if status_cache else WORKFLOWS)
+    benchmark_result(
+        f'jobs-poll [workflows={WORKFLOWS}, jobs={JOBS},'
+        f' status cache={status_cache}s, job runner calls={n_calls}]',
+        elapsed,
+        WORKFLOWS
+    )
@@ -0,0 +1,90 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark satisfying conditional prerequisites."""
+
+from typing import Callable
+
+import pytest
+
+from cylc.flow.cycling.integer import IntegerPoint
+from cylc.flow.prerequisite import Prerequisite
+
+N_PREREQS = 2000
+
+
+def make_prerequisites(n_messages):
+    """Return prerequisites like "(a0 | a1) & (a2 | a3) & ..." => foo."""
+    prereqs = []
+    for ind in range(N_PREREQS):
+        point = str(ind)
+        prereq = Prerequisite(IntegerPoint(point))
+        messages = []
+        for msg_ind in range(n_messages):
+            prereq.add(f'a{msg_ind}', point, 'succeeded')
+            messages.append(
+                Prerequisite.MESSAGE_TEMPLATE % (
+                    f'a{msg_ind}', point, 'succeeded'))
+        prereq.set_condition('&'.join(
+            f'({messages[msg_ind]}|{messages[msg_ind + 1]})'
+            for msg_ind in range(0, n_messages, 2)
+        ))
+        prereqs.append(prereq)
+    return prereqs
+
+
+@pytest.mark.parametrize('n_messages', [2, 8, 32])
+def test_satisfy_me(n_messages: int, benchmark: Callable) -> None:
+    """Time satisfying each message of many prerequisites in turn."""
+    prereqs = []
+    outputs = [
+        [{(f'a{msg_ind}', str(ind), 'succeeded')} for ind in range(N_PREREQS)]
+        for msg_ind in range(0, n_messages, 2)
+    ]
+
+    def setup():
+        prereqs[:] = make_prerequisites(n_messages)
+
+    def satisfy():
+        for msg_outputs in outputs:
+            for prereq, output in zip(prereqs, msg_outputs):
+                prereq.satisfy_me(output)
+                prereq.is_satisfied()
+
+    benchmark(
+        f'satisfy_me [messages={n_messages}]',
+        satisfy,
+        ops=N_PREREQS * len(outputs),
+        setup=setup
+    )
+    assert all(prereq.is_satisfied() for prereq in prereqs)
+
+
+@pytest.mark.parametrize('n_messages', [2, 8, 32])
+def test_prerequisite_memory(
+    n_messages: int,
+    benchmark_memory: Callable
+) -> None:
+    """Measure the memory used by conditional prerequisites."""
+    prereqs = []
+
+    def make():
+        prereqs[:] = make_prerequisites(n_messages)
+
+    benchmark_memory(
+        f'conditional prerequisites [messages={n_messages}]',
+        make,
+        ops=N_PREREQS
+    )
@@ -0,0 +1,108 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark queue managers by simulated workflow completion time.
+
+A chain of tasks competes with bulk "post-processing" tasks for a limited
+queue; the time for the chain (i.e. the product which is published) and the
+whole cycle to complete is reported for each queue manager.
+
+Note simulated run times are measured from whole seconds so are only
+accurate to about a second.
+"""
+
+import asyncio
+from time import time
+from typing import Callable, Dict
+
+import pytest
+
+from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_pool import TaskPool
+
+
+N_POST = 8
+LIMIT = 2
+RUN_LENGTH = 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('queue_manager', ['independent', 'priority'])
+async def test_queue_manager_completion_time(
+    queue_manager: str,
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    benchmark_result: Callable,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Time a simulation mode run of a chain of tasks behind bulk tasks."""
+    monkeypatch.setattr(Scheduler, 'INTERVAL_MAIN_LOOP', 0.05)
+    monkeypatch.setattr(Scheduler, 'INTERVAL_MAIN_LOOP_QUICK', 0.05)
+    finished: Dict[str, float] = {}
+    remove = TaskPool.remove
+
+    def _remove(self, itask, reason=None):
+        finished[itask.tdef.name] = time()
+        return remove(self, itask, reason)
+
+    monkeypatch.setattr(TaskPool, 'remove', _remove)
+
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'task parameters': {
+            'm': f'1..{N_POST}'
+        },
+        'scheduling': {
+            'queue manager': queue_manager,
+            'queues': {
+                'default': {
+                    'limit': LIMIT
+                }
+            },
+            'graph': {
+                'R1': '''
+                    start => post<m>
+                    start => a => b => c => d => publish
+                '''
+            }
+        },
+        'runtime': {
+            'root': {
+                'simulation': {
+                    'default run length': f'PT{RUN_LENGTH}S'
+                }
+            }
+        }
+    })
+    schd: Scheduler = scheduler(
+        reg, run_mode='simulation', paused_start=False)
+    async with run(schd):
+        start = time()
+        while len(finished) < N_POST + 6 and time() - start < 120:
+            await asyncio.sleep(0.05)
+    assert len(finished) == N_POST + 6
+    begin = finished['start']
+    benchmark_result(
+        f'queue manager chain completion [{queue_manager}]',
+        finished['d'] - begin
+    )
+    benchmark_result(
+        f'queue manager cycle completion [{queue_manager}]',
+        max(finished.values()) - begin
+    )
@@ -0,0 +1,66 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark releasing tasks from limited queues at increasing pool sizes."""
+
+from typing import Callable
+
+import pytest
+
+from cylc.flow.scheduler import Scheduler
+
+
+LIMIT = 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('pool_size', [100, 1000, 10000])
+async def test_release_queued_tasks(
+    pool_size: int,
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    benchmark: Callable
+) -> None:
+    """Time a queue release pass with the queue limit reached."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'task parameters': {
+            'm': f'1..{pool_size}'
+        },
+        'scheduling': {
+            'queues': {
+                'default': {
+                    'limit': LIMIT
+                }
+            },
+            'graph': {
+                'R1': 'foo<m>'
+            }
+        }
+    })
+    schd: Scheduler = scheduler(reg)
+    async with run(schd):
+        schd.pool.release_runahead_tasks()
+        assert len(schd.pool.release_queued_tasks()) == LIMIT
+
+        benchmark(
+            f'release queued tasks [pool={pool_size}, limit={LIMIT}]',
+            schd.pool.release_queued_tasks
+        )
+        assert not schd.pool.release_queued_tasks()
@@ -0,0 +1,109 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark filtered GraphQL node queries on a large data store."""
+
+import asyncio
+from typing import Callable
+from unittest.mock import Mock
+
+import pytest
+
+from cylc.flow.data_messages_pb2 import PbTaskProxy  # type: ignore
+from cylc.flow.data_store_mgr import DataStoreMgr, TASK_PROXIES, WORKFLOW
+from cylc.flow.network.resolvers import BaseResolvers
+from cylc.flow.network.schema import parse_node_id
+
+CYCLES = 100
+TASKS = 1000
+
+
+@pytest.fixture(scope='module')
+def data_store_mgr():
+    """A data store with 100k task proxies.
+
+    1 in 100 tasks is running and 1 in 50 is held, the tasks are in 10
+    families.
+    """
+    data_store_mgr = DataStoreMgr(Mock(owner='me', workflow='large'))
+    w_id = data_store_mgr.workflow_id
+    data_store_mgr.data[w_id][WORKFLOW].id = w_id
+    for cycle in range(1, CYCLES + 1):
+        for ind in range(TASKS):
+            name = f't{ind}'
+            tp_id = f'{w_id}|{cycle}|{name}'
+            data_store_mgr.added[TASK_PROXIES][tp_id] = PbTaskProxy(
+                id=tp_id,
+                name=name,
+                cycle_point=str(cycle),
+                namespace=[name, f'FAM{ind % 10}', 'root'],
+                state='running' if ind % 100 == 0 else 'waiting',
+                is_held=ind % 50 == 1,
+            )
+    data_store_mgr.apply_deltas()
+    data_store_mgr.clear_deltas()
+    return data_store_mgr
+
+
+@pytest.mark.parametrize('indexed', [False, True])
+@pytest.mark.parametrize(
+    'query, args, expected',
+    [
+        ('state', {'states': ['running']}, CYCLES * TASKS // 100),
+        ('cycle point', {'ids': ['50|*']}, TASKS),
+        ('namespace', {'ids': ['*|FAM3']}, CYCLES * TASKS // 10),
+        ('held', {'is_held': True}, CYCLES * TASKS // 50),
+    ]
+)
+def test_get_nodes_all(
+    query: str,
+    args: dict,
+    expected: int,
+    indexed: bool,
+    data_store_mgr: DataStoreMgr,
+    benchmark: Callable,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Time filtered queries of task proxies."""
+    if not indexed:
+        monkeypatch.setattr(data_store_mgr, 'indexes', {})
+    resolvers = BaseResolvers(data_store_mgr)
+    node_args = {
+        'ghosts': False,
+        'workflows': [],
+        'exworkflows': [],
+        'ids': [],
+        'exids': [],
+        'states': [],
+        'exstates': [],
+        'mindepth': -1,
+        'maxdepth': -1,
+        **args
+    }
+    node_args['ids'] = [
+        parse_node_id(n_id, TASK_PROXIES) for n_id in node_args['ids']]
+    results = []
+
+    def get_nodes():
+        results.append(asyncio.run(
+            resolvers.get_nodes_all(TASK_PROXIES, node_args)))
+
+    benchmark(
+        f'get_nodes_all [query={query}, indexed={indexed}]',
+        get_nodes,
+        ops=CYCLES * TASKS
+    )
+    assert len(results[-1]) == expected
@@ -0,0 +1,73 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark runahead limiting across many active cycle points."""
+
+from typing import Callable
+
+import pytest
+
+from cylc.flow.scheduler import Scheduler
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('n_points', [100, 1000, 3000])
+async def test_release_runahead_tasks(
+    n_points: int,
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    benchmark: Callable
+) -> None:
+    """Time filling, then holding, a runahead window of n_points."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'scheduling': {
+            'cycling mode': 'integer',
+            'initial cycle point': 1,
+            'runahead limit': f'P{n_points - 1}',
+            'graph': {
+                'P1': 'foo & bar => baz'
+            }
+        }
+    })
+    schd: Scheduler = scheduler(reg)
+    async with run(schd):
+        calls = 0
+
+        def fill():
+            # each call releases one cycle point which spawns the next
+            nonlocal calls
+            while schd.pool.release_runahead_tasks():
+                calls += 1
+
+        benchmark(
+            f'runahead fill [points={n_points}]',
+            fill,
+            ops=n_points - 1,
+            repeat=1
+        )
+        # (the first point is released on startup)
+        assert calls == n_points - 1
+        # (only the next point is held back)
+        assert len(schd.pool.runahead_pool) == 1
+
+        benchmark(
+            f'runahead steady state [points={n_points}]',
+            schd.pool.release_runahead_tasks,
+            repeat=5
+        )
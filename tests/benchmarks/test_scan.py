@@ -0,0 +1,134 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark "cylc scan" over many installed and running workflows."""
+
+from contextlib import AsyncExitStack
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+import pytest
+
+from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
+from cylc.flow.network.scan import is_active, scan
+from cylc.flow.scripts.scan import main, ScanOptions
+from cylc.flow.workflow_files import WorkflowFiles, get_registry_file
+
+N_FLOWS = 200
+N_SOURCES = 1000
+N_RUNS = 5  # per source, i.e. N_SOURCES * N_RUNS run dirs
+
+
+@pytest.mark.asyncio
+async def test_scan_rich(
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    one_conf: dict,
+    test_dir: Path,
+    benchmark_result: Callable,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Time scanning running workflows with the rich format."""
+    # each workflow needs two ports
+    cfg = glbl_cfg()
+    cfg_get = cfg.get
+    monkeypatch.setattr(
+        cfg,
+        'get',
+        lambda keys=None, sparse=False: (
+            list(range(43001, 43001 + 3 * N_FLOWS))
+            if keys == ['scheduler', 'run hosts', 'ports']
+            else cfg_get(keys, sparse)
+        )
+    )
+    async with AsyncExitStack() as stack:
+        for _ in range(N_FLOWS):
+            schd = scheduler(flow(one_conf), paused_start=True)
+            await stack.enter_async_context(run(schd))
+
+        times = []
+        first_times = []
+        failures = []
+        for _ in range(3):
+            lines = []
+            start = perf_counter()
+
+            def _write(line):
+                if not lines:
+                    first_times.append(perf_counter() - start)
+                lines.append(line)
+
+            await main(
+                ScanOptions(format='rich', states='all'),
+                write=_write,
+                scan_dir=test_dir
+            )
+            times.append(perf_counter() - start)
+            # workflows which could not be contacted are omitted
+            failures.append(N_FLOWS - len(lines))
+            assert all('paused' in line for line in lines)
+
+    benchmark_result(
+        f'cylc scan -t rich [workflows={N_FLOWS}, failed={max(failures)}]',
+        min(times),
+        N_FLOWS
+    )
+    benchmark_result(
+        f'cylc scan -t rich first result [workflows={N_FLOWS}]',
+        min(first_times)
+    )
+
+
+@pytest.mark.asyncio
+async def test_scan_run_dirs(
+    tmp_path: Path,
+    benchmark_result: Callable
+) -> None:
+    """Time listing stopped workflows in a large cylc-run dir."""
+    for source in range(N_SOURCES):
+        source_dir = tmp_path / f'flow{source}'
+        (source_dir / WorkflowFiles.Install.DIRNAME).mkdir(parents=True)
+        for run in range(1, N_RUNS + 1):
+            run_dir = source_dir / f'run{run}'
+            for dirname in ('log', 'share', 'work', '.service'):
+                (run_dir / dirname).mkdir(parents=True)
+            (run_dir / WorkflowFiles.FLOW_FILE).touch()
+
+    async def _scan():
+        start = perf_counter()
+        names = [
+            flow['name']
+            async for flow in scan(tmp_path) | is_active(False)
+        ]
+        assert len(names) == N_SOURCES * N_RUNS
+        return perf_counter() - start
+
+    registry = get_registry_file(tmp_path)
+    walk_times = []
+    for _ in range(3):
+        registry.unlink(missing_ok=True)
+        walk_times.append(await _scan())
+    registry_times = [await _scan() for _ in range(3)]
+
+    benchmark_result(
+        f'cylc scan walk [run dirs={N_SOURCES * N_RUNS}]',
+        min(walk_times)
+    )
+    benchmark_result(
+        f'cylc scan registry [run dirs={N_SOURCES * N_RUNS}]',
+        min(registry_times)
+    )
@@ -0,0 +1,130 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark task message latency while heavy queries are being served."""
+
+import asyncio
+from statistics import quantiles
+from threading import Event
+from time import perf_counter
+from typing import Callable
+
+import pytest
+
+from cylc.flow.network.client import WorkflowRuntimeClient
+from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_message import MUTATION
+
+POOL_SIZE = 500
+QUERY_CLIENTS = 4
+N_MESSAGES = 100
+QUERY = '''
+query {
+  taskProxies {
+    id
+    state
+    cyclePoint
+    jobs { id state }
+    prerequisites { expression satisfied }
+  }
+}
+'''
+
+
+def _client(reg):
+    # each thread needs its own event loop and socket
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    return WorkflowRuntimeClient(reg, timeout=60)
+
+
+def query_loop(reg: str, stop: Event) -> int:
+    """Issue heavy queries until told to stop."""
+    client = _client(reg)
+    queries = 0
+    while not stop.is_set():
+        client.serial_request('graphql', {'request_string': QUERY})
+        queries += 1
+    return queries
+
+
+def send_messages(reg: str, itasks) -> list:
+    """Send task messages one at a time, return the latency of each."""
+    client = _client(reg)
+    latencies = []
+    for ind in range(N_MESSAGES):
+        itask = itasks[ind % len(itasks)]
+        start = perf_counter()
+        client.serial_request('graphql', {
+            'request_string': MUTATION,
+            'variables': {
+                'wFlows': [reg],
+                'taskJob': f'{itask.point}/{itask.tdef.name}/01',
+                'eventTime': None,
+                'messages': [['INFO', 'the quick brown fox']],
+            }
+        })
+        latencies.append(perf_counter() - start)
+    return latencies
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('concurrent', [False, True])
+async def test_message_latency(
+    concurrent: bool,
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    benchmark_result: Callable,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Measure task message latency under a heavy query load."""
+    if not concurrent:
+        # serve every request one at a time, as a REP socket would
+        monkeypatch.setattr(
+            'cylc.flow.network.server.is_mutation', lambda message: True)
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'task parameters': {
+            'm': f'1..{POOL_SIZE}'
+        },
+        'scheduling': {
+            'graph': {
+                'R1': 'foo<m>'
+            }
+        }
+    })
+    schd: Scheduler = scheduler(reg)
+    async with run(schd):
+        itasks = schd.pool.get_tasks()
+        loop = asyncio.get_event_loop()
+        stop = Event()
+        queries = [
+            loop.run_in_executor(None, query_loop, reg, stop)
+            for _ in range(QUERY_CLIENTS)
+        ]
+        try:
+            latencies = await loop.run_in_executor(
+                None, send_messages, reg, itasks)
+        finally:
+            stop.set()
+            n_queries = sum(await asyncio.gather(*queries))
+        assert n_queries
+
+    percentiles = quantiles(latencies, n=100)
+    name = f'task message latency [concurrent={concurrent}]'
+    benchmark_result(f'{name} p50', percentiles[49])
+    benchmark_result(f'{name} p99', percentiles[98])
@@ -0,0 +1,240 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark running synthetic workflows in simulation mode.
+
+Workflows are run to completion with simulated jobs which succeed straight
+away and no sleep between main loop iterations, so the results are dominated
+by the scheduler itself (mostly TaskPool, DataStoreMgr and
+WorkflowDatabaseManager) and can be reproduced without a batch system.
+
+The results reported for each workflow are:
+
+* tasks/s - the number of tasks run per second of wallclock time.
+* p50, p90, p99 - percentiles of the time taken by a main loop iteration.
+* RSS - the peak resident set size of the process during the run.
+* DB - the size of the workflow databases at the end of the run.
+
+Workflows run in UTC mode so that simulated start times don't depend on the
+local time zone (pytest.ini sets an unusual one).
+"""
+
+import asyncio
+from pathlib import Path
+import sqlite3
+from time import perf_counter
+from typing import Callable, Optional
+
+import psutil
+import pytest
+
+from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_pool import TaskPool
+from cylc.flow.task_state import TASK_STATUS_SUCCEEDED
+
+# fail a benchmark which takes longer than this (seconds) rather than hang
+TIMEOUT = 600
+
+# fail a benchmark if no simulated job completes for this many main loop
+# iterations in a row
+MAX_IDLE_LOOPS = 10000
+
+
+def _conf(scheduling: dict, **conf) -> dict:
+    """Return a workflow config with jobs which take no time to run."""
+    return {
+        'scheduler': {
+            'allow implicit tasks': True,
+            'UTC mode': True
+        },
+        'scheduling': scheduling,
+        'runtime': {
+            'root': {
+                'simulation': {
+                    'default run length': 'PT0S'
+                }
+            }
+        },
+        **conf
+    }
+
+
+def _cycling(n_points: int, graph: str) -> dict:
+    """Return integer cycling scheduling config."""
+    return {
+        'cycling mode': 'integer',
+        'initial cycle point': 1,
+        'final cycle point': n_points,
+        'graph': {
+            'P1': graph
+        }
+    }
+
+
+@pytest.fixture
+def simulate(
+    flow: Callable,
+    scheduler: Callable,
+    monkeypatch: pytest.MonkeyPatch,
+    benchmark_workflow: Callable
+):
+    """Run a workflow in simulation mode and record the results.
+
+    Args:
+        name (str):
+            Name to report the result under.
+        conf (dict):
+            The workflow configuration.
+        n_tasks (int):
+            The number of tasks the workflow should run.
+        on_loop (callable):
+            Called with the scheduler on each main loop iteration.
+
+    """
+    async def _simulate(
+        name: str,
+        conf: dict,
+        n_tasks: int,
+        on_loop: Optional[Callable[[Scheduler], None]] = None
+    ) -> None:
+        reg = flow(conf)
+        schd = scheduler(reg, run_mode='simulation', paused_start=False)
+
+        # accelerate time: don't sleep between main loop iterations
+        monkeypatch.setattr(Scheduler, 'INTERVAL_MAIN_LOOP', 0)
+        monkeypatch.setattr(Scheduler, 'INTERVAL_MAIN_LOOP_QUICK', 0)
+
+        # record every main loop interval, not just the latest
+        schd.main_loop_intervals = loop_times = []
+
+        # sample the RSS once per main loop iteration
+        proc = psutil.Process()
+        peak_rss = proc.memory_info().rss
+        sim_time_check = TaskPool.sim_time_check
+        idle_loops = 0
+
+        def _sim_time_check(pool, message_queue):
+            nonlocal peak_rss, idle_loops
+            peak_rss = max(peak_rss, proc.memory_info().rss)
+            if on_loop:
+                on_loop(schd)
+            changed = sim_time_check(pool, message_queue)
+            idle_loops = 0 if changed else idle_loops + 1
+            if idle_loops > MAX_IDLE_LOOPS:
+                # (raise in the main loop so the scheduler shuts down)
+                raise AssertionError(
+                    f'No simulated job completed in {MAX_IDLE_LOOPS}'
+                    ' main loop iterations'
+                )
+            return changed
+
+        monkeypatch.setattr(TaskPool, 'sim_time_check', _sim_time_check)
+
+        await schd.install()
+        start = perf_counter()
+        await asyncio.wait_for(schd.run(), TIMEOUT)
+        seconds = perf_counter() - start
+
+        db_mgr = schd.workflow_db_mgr
+        with sqlite3.connect(db_mgr.pri_path) as conn:
+            (succeeded,), = conn.execute(
+                'SELECT COUNT(*) FROM task_states WHERE status = ?',
+                [TASK_STATUS_SUCCEEDED])
+        assert succeeded == n_tasks
+
+        benchmark_workflow(
+            name,
+            n_tasks,
+            seconds,
+            loop_times,
+            peak_rss,
+            sum(
+                Path(path).stat().st_size
+                for path in (db_mgr.pri_path, db_mgr.pub_path)
+            )
+        )
+
+    return _simulate
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('width', [100, 1000])
+async def test_ensemble(width: int, simulate: Callable):
+    """A wide ensemble of tasks between two others."""
+    await simulate(
+        f'ensemble [width={width}]',
+        _conf(
+            {'graph': {'R1': 'start => foo<m> => end'}},
+            **{'task parameters': {'m': f'1..{width}'}}
+        ),
+        width + 2
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('length', [100, 500])
+async def test_chain(length: int, simulate: Callable):
+    """A long chain of tasks, each waiting for the one before."""
+    await simulate(
+        f'chain [length={length}]',
+        _conf(
+            {'graph': {'R1': 'foo<m-1> => foo<m>'}},
+            **{'task parameters': {'m': f'1..{length}'}}
+        ),
+        length
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('n_points', [100, 500])
+async def test_cycling(n_points: int, simulate: Callable):
+    """Many cycle points with inter-cycle dependencies."""
+    await simulate(
+        f'cycling [points={n_points}]',
+        _conf(_cycling(n_points, 'foo[-P1] => foo => bar & baz')),
+        n_points * 3
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('n_points', [5, 20])
+async def test_xtriggers(n_points: int, simulate: Callable):
+    """Xtriggers which run in the process pool, each gating many tasks."""
+    scheduling = _cycling(n_points, '@x => foo<m>')
+    scheduling['xtriggers'] = {'x': 'xrandom(percent=100, _=%(point)s)'}
+    await simulate(
+        f'xtriggers [points={n_points}]',
+        _conf(scheduling, **{'task parameters': {'m': '1..20'}}),
+        n_points * 20
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('n_points', [100])
+async def test_broadcasts(n_points: int, simulate: Callable):
+    """A broadcast to the active cycle points on every main loop iteration.
+    """
+    def _broadcast(schd):
+        points = {str(itask.point) for itask in schd.pool.get_tasks()}
+        if points:
+            schd.broadcast_mgr.put_broadcast(
+                points, ['root'], [{'environment': {'FOO': 'foo'}}])
+
+    await simulate(
+        f'broadcasts [points={n_points}]',
+        _conf(_cycling(n_points, 'foo[-P1] => foo => bar & baz')),
+        n_points * 3,
+        on_loop=_broadcast
+    )
@@ -0,0 +1,94 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark spawning tasks (and their graph windows) on multiple sequences.
+"""
+
+from typing import Callable, Iterator
+
+import pytest
+
+from cylc.flow.cycling.loader import get_point, get_interval
+from cylc.flow.scheduler import Scheduler
+
+
+N_PARAMS = 125  # 500 tasks
+
+
+@pytest.mark.asyncio
+async def test_spawn_tasks(
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    benchmark: Callable
+) -> None:
+    """Time spawning all tasks of a cycle point of a four-sequence workflow.
+    """
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True,
+            'UTC mode': True
+        },
+        'task parameters': {
+            'm': f'1..{N_PARAMS}'
+        },
+        'scheduling': {
+            'initial cycle point': '2000',
+            'graph': {
+                'PT6H': 'a<m>[-PT6H] => a<m>',
+                'T00, T12': 'a<m> => b<m>',
+                'T06': 'a<m> => c<m>',
+                'P1D': 'b<m>[-P1D] => d<m>'
+            }
+        }
+    })
+    schd: Scheduler = scheduler(reg)
+    async with run(schd):
+        pool = schd.pool
+        taskdefs = schd.config.taskdefs
+        names = list(taskdefs)
+        assert len(names) == 4 * N_PARAMS
+
+        def get_points() -> Iterator:
+            point = get_point('20000105T0000Z').standardise()
+            interval = get_interval('PT6H')
+            while True:
+                yield point
+                point += interval
+
+        points = get_points()
+        spawned = []
+
+        def spawn_point():
+            point = next(points)
+            for name in names:
+                if not any(
+                    seq.is_valid(point) for seq in taskdefs[name].sequences
+                ):
+                    continue
+                itask = pool.spawn_task(name, point, 'x')
+                # satisfy the task so it goes into the main pool and its
+                # data-store graph window is generated
+                itask.state.set_prerequisites_all_satisfied()
+                pool.add_to_pool(itask, is_new=False)
+                spawned.append(itask)
+
+        benchmark(
+            f'spawn tasks [tasks={len(names)}, points=4]',
+            lambda: [spawn_point() for _ in range(4)],
+            ops=8 * N_PARAMS
+        )
+        assert len(spawned) == 3 * 8 * N_PARAMS
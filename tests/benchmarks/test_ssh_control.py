@@ -0,0 +1,78 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark remote commands with and without shared SSH connections.
+
+Uses a stand-in for ssh which emulates the connection setup time.
+"""
+
+from pathlib import Path
+import shlex
+import subprocess
+import sys
+from time import sleep, time
+from typing import Callable
+from unittest.mock import Mock
+
+import pytest
+
+from cylc.flow.ssh_control_mgr import SSHControlMgr
+
+FAKE_SSH = Path(__file__).parents[1] / 'unit' / 'fake_ssh.py'
+COMMANDS = 20
+
+
+@pytest.mark.parametrize('persist', [0.0, 60.0])
+@pytest.mark.parametrize('delay', [0.1, 0.5])
+def test_ssh_commands(
+    persist: float,
+    delay: float,
+    benchmark: Callable,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Time running commands over (fake) SSH one after another."""
+    monkeypatch.setenv('FAKE_SSH_DELAY', str(delay))
+    platform = {
+        'ssh command': f'{sys.executable} {FAKE_SSH}',
+        'ssh control persist': persist,
+        'hosts': ['fakehost'],
+    }
+    ssh_control_mgr = SSHControlMgr(Mock())
+    if persist:
+        # wait for the master to connect
+        ssh_control_mgr.get_ssh_cmd(platform, 'fakehost')
+        master, = ssh_control_mgr.masters.values()
+        timeout = time() + 10
+        while not master.is_connected() and time() < timeout:
+            sleep(0.01)
+
+    def run_commands():
+        for _ in range(COMMANDS):
+            ssh_cmd = ssh_control_mgr.get_ssh_cmd(platform, 'fakehost')
+            subprocess.run(
+                [*shlex.split(ssh_cmd), '-n', 'fakehost', 'true'],
+                check=True
+            )
+
+    try:
+        benchmark(
+            f'ssh commands [connect={delay}s, shared={bool(persist)}]',
+            run_commands,
+            ops=COMMANDS,
+            repeat=1
+        )
+    finally:
+        ssh_control_mgr.close()
@@ -0,0 +1,61 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark the throughput of short commands through the process pool."""
+
+import asyncio
+from time import perf_counter
+from typing import Callable
+
+import pytest
+
+from cylc.flow.scheduler import Scheduler
+from cylc.flow.subprocctx import SubProcContext
+from cylc.flow.subprocpool import SubProcPool
+
+POOL_SIZE = 16
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('n_commands', [1000, 10000])
+async def test_subprocpool_throughput(
+    n_commands: int,
+    benchmark_result: Callable
+) -> None:
+    """Time running trivial commands through the pool.
+
+    The pool is driven the way the scheduler main loop drives it.
+    """
+    pool = SubProcPool()
+    pool.size = POOL_SIZE
+    ret_codes = []
+
+    start = perf_counter()
+    for _ in range(n_commands):
+        pool.put_command(
+            SubProcContext('bench', ['true']),
+            lambda ctx: ret_codes.append(ctx.ret_code)
+        )
+    while pool.is_not_done():
+        pool.process()
+        await asyncio.sleep(Scheduler.INTERVAL_MAIN_LOOP_QUICK)
+    elapsed = perf_counter() - start
+
+    assert ret_codes == [0] * n_commands
+    benchmark_result(
+        f'process pool [size={POOL_SIZE}, commands={n_commands}]',
+        elapsed,
+        n_commands
+    )
@@ -0,0 +1,73 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark task message throughput at increasing task pool sizes."""
+
+from typing import Callable
+
+import pytest
+
+from cylc.flow.scheduler import Scheduler
+
+
+N_MESSAGES = 100
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('pool_size', [100, 1000, 10000])
+async def test_task_messages(
+    pool_size: int,
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    benchmark: Callable
+) -> None:
+    """Time processing a batch of task messages against a large pool."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'task parameters': {
+            'm': f'1..{pool_size}'
+        },
+        'scheduling': {
+            'graph': {
+                'R1': 'foo<m>'
+            }
+        }
+    })
+    schd: Scheduler = scheduler(reg)
+    async with run(schd):
+        itasks = schd.pool.get_tasks()
+        assert len(itasks) == pool_size
+        # spread the messages evenly over the pool
+        targets = itasks[::max(1, pool_size // N_MESSAGES)][:N_MESSAGES]
+
+        def queue_messages():
+            for itask in targets:
+                schd.message_queue.put((
+                    f'{itask.point}/{itask.tdef.name}/{itask.submit_num:02d}',
+                    '2000-01-01T00:00:00Z',
+                    'INFO',
+                    'the quick brown fox'
+                ))
+
+        benchmark(
+            f'task messages [pool={pool_size}, messages={len(targets)}]',
+            schd.process_queued_task_messages,
+            ops=len(targets),
+            setup=queue_messages
+        )
+        assert not schd.message_queue.qsize()
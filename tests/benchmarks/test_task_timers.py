@@ -0,0 +1,101 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark checking job and event handler timers when few are due."""
+
+from time import time
+from typing import Callable
+from unittest.mock import Mock
+
+import pytest
+
+from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_action_timer import TaskActionTimer
+from cylc.flow.task_events_mgr import (
+    CustomTaskEventHandlerContext,
+    TaskEventsManager
+)
+from cylc.flow.task_state import TASK_STATUS_RUNNING
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('pool_size', [100, 1000, 10000])
+async def test_check_task_jobs(
+    pool_size: int,
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    benchmark: Callable
+) -> None:
+    """Time a main loop check of job timers, none of which are due."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'task parameters': {
+            'm': f'1..{pool_size}'
+        },
+        'scheduling': {
+            'graph': {
+                'R1': 'foo<m>'
+            }
+        }
+    })
+    schd: Scheduler = scheduler(reg)
+    async with run(schd):
+        now = time()
+        for itask in schd.pool.get_tasks():
+            itask.state.reset(TASK_STATUS_RUNNING)
+            itask.poll_timer = TaskActionTimer(
+                ctx=(itask.submit_num, itask.state.status),
+                delays=[3600]
+            )
+            itask.poll_timer.next()
+            itask.timeout = now + 7200
+            schd.task_events_mgr.schedule_job_timer(itask)
+        schd.task_job_mgr.poll_task_jobs = Mock()
+
+        benchmark(
+            f'check task jobs [pool={pool_size}]',
+            lambda: schd.task_job_mgr.check_task_jobs(schd.workflow, schd.pool)
+        )
+        assert not schd.task_job_mgr.poll_task_jobs.called
+
+
+@pytest.mark.parametrize('n_timers', [100, 1000, 10000])
+def test_process_events(n_timers: int, benchmark: Callable) -> None:
+    """Time processing event timers, mostly waiting on their handlers."""
+    task_events_mgr = TaskEventsManager(
+        None, Mock(), None, None, None, None, None, None)
+    for ind in range(n_timers):
+        key1 = ('event-handler-00', 'failed')
+        timer = TaskActionTimer(
+            CustomTaskEventHandlerContext(
+                key1, TaskEventsManager.HANDLER_CUSTOM, 'true'),
+            [3600]
+        )
+        task_events_mgr.add_event_timer((key1, '1', f'foo{ind}', 1), timer)
+        if ind % 10:
+            timer.set_waiting()
+    schd = Mock(stop_mode=None)
+    # set timeouts on the timers not waiting
+    task_events_mgr.process_events(schd)
+
+    benchmark(
+        f'process event timers [timers={n_timers}]',
+        lambda: task_events_mgr.process_events(schd)
+    )
+    assert not task_events_mgr.proc_pool.put_command.called
@@ -15,9 +15,17 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """Test cylc.flow.client.WorkflowRuntimeClient."""
+import asyncio
+from time import sleep
+
 import pytest
 
-from cylc.flow.network.client import WorkflowRuntimeClient
+from cylc.flow.exceptions import ClientTimeout
+from cylc.flow.network.client import (
+    WorkflowRuntimeClient,
+    close_cached_clients,
+    get_cached_client
+)
 from cylc.flow.network.server import PB_METHOD_MAP
 
 
@@ -53,3 +61,78 @@ async def test_protobuf(harness):
     pb_data = PB_METHOD_MAP['pb_entire_workflow']()
     pb_data.ParseFromString(ret)
     assert schd.workflow in pb_data.workflow.id
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests(harness):
+    """It should handle many requests in flight at once."""
+    schd, client = harness
+    rets = await asyncio.gather(*(
+        client.async_request(
+            'graphql',
+            {'request_string': 'query { workflows { id } }'}
+        )
+        for _ in range(20)
+    ))
+    assert len(rets) == 20
+    assert all(
+        ret['workflows'][0]['id'] == schd.id
+        for ret in rets
+    )
+    assert not client.pending
+
+
+@pytest.mark.asyncio
+async def test_timeout(harness, monkeypatch):
+    """It should remain usable after a request times out."""
+    schd, client = harness
+
+    def get_graph_raw(**kwargs):
+        sleep(1)
+        return 'slow'
+
+    monkeypatch.setattr(schd.server, 'get_graph_raw', get_graph_raw)
+    with pytest.raises(ClientTimeout):
+        await client.async_request('get_graph_raw', timeout=0.1)
+    assert not client.pending
+    # the late response should be discarded
+    await asyncio.sleep(1)
+    ret = await client.async_request(
+        'graphql',
+        {'request_string': 'query { workflows { id } }'}
+    )
+    assert ret['workflows'][0]['id'] == schd.id
+
+
+@pytest.mark.asyncio
+async def test_get_cached_client(harness):
+    """It should re-use clients for the same workflow run."""
+    schd, _ = harness
+    client = get_cached_client(schd.workflow)
+    assert get_cached_client(schd.workflow) is client
+    assert get_cached_client(
+        schd.workflow, host=client.host, port=client.port, uuid=schd.uuid_str
+    ) is client
+    await client.async_request('api')
+
+    # a workflow restarted on a different port gets a new client
+    new_client = get_cached_client(
+        schd.workflow,
+        host=client.host,
+        port=client.port + 1,
+        uuid=schd.uuid_str
+    )
+    assert new_client is not client
+    assert client.socket.closed
+
+    # as does one restarted on the same port (it will have new keys)
+    client = new_client
+    new_client = get_cached_client(
+        schd.workflow, host=client.host, port=client.port, uuid='new-run')
+    assert new_client is not client
+    assert client.socket.closed
+
+    close_cached_clients()
+    assert new_client.socket.closed
+    assert get_cached_client(schd.workflow) is not new_client
+    close_cached_clients()
@@ -0,0 +1,103 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Test accounting of the memory used by scheduler structures."""
+
+import logging
+
+import pytest
+
+from cylc.flow.main_loop.log_structure_sizes import log_structure_sizes
+from cylc.flow.memory_accounting import get_structure_sizes
+from cylc.flow.network.client import WorkflowRuntimeClient
+
+
+@pytest.mark.asyncio
+@pytest.fixture(scope='module')
+async def harness(mod_flow, mod_scheduler, mod_run):
+    reg = mod_flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'task parameters': {
+            'm': '1..5'
+        },
+        'scheduling': {
+            'graph': {
+                'R1': 'foo<m> => bar'
+            }
+        }
+    })
+    schd = mod_scheduler(reg)
+    async with mod_run(schd):
+        yield schd
+
+
+@pytest.mark.asyncio
+async def test_get_structure_sizes(harness):
+    """It should count and estimate the size of scheduler structures."""
+    schd = harness
+    sizes = {size.name: size for size in get_structure_sizes(schd)}
+    assert sizes['task proxies'].items == 5
+    assert sizes['task proxies'].size > 0
+    assert sizes['data store task_proxies'].items >= 5
+    assert sizes['data store task_proxies'].size > 0
+    assert sizes['broadcasts'] == ('broadcasts', 0, 0)
+
+    schd.broadcast_mgr.put_broadcast(
+        ['1'], ['root'], [{'environment': {'FOO': 'foo'}}])
+    try:
+        sizes = {size.name: size for size in get_structure_sizes(schd)}
+        assert sizes['broadcasts'].items == 1
+        assert sizes['broadcasts'].size > 0
+    finally:
+        schd.broadcast_mgr.clear_broadcast(['1'], ['root'])
+
+
+@pytest.mark.asyncio
+async def test_log_structure_sizes(harness, caplog, log_filter):
+    """It should log structure sizes."""
+    schd = harness
+    caplog.set_level(logging.INFO, 'cylc')
+    state = {}
+    # it shouldn't log at start up
+    await log_structure_sizes(schd, state)
+    assert not log_filter(caplog, contains='Structure sizes')
+    await log_structure_sizes(schd, state)
+    assert log_filter(
+        caplog,
+        level=logging.INFO,
+        regex=r'Structure sizes: task proxies: 5 \(\d+\.\d KiB\),'
+    )
+
+
+@pytest.mark.asyncio
+async def test_graphql(harness):
+    """It should return structure sizes via the GraphQL API."""
+    schd = harness
+    client = WorkflowRuntimeClient(schd.workflow)
+    ret = await client.async_request(
+        'graphql',
+        {
+            'request_string':
+                'query { workflows { structureSizes { name count size } } }'
+        }
+    )
+    sizes = {
+        size['name']: size
+        for size in ret['workflows'][0]['structureSizes']
+    }
+    assert sizes['task proxies']['count'] == 5
+    assert sizes['task proxies']['size'] > 0
@@ -18,7 +18,8 @@ from typing import Callable
 import pytest
 from unittest.mock import Mock
 
-from cylc.flow.data_store_mgr import ID_DELIM, EDGES, TASK_PROXIES
+from cylc.flow.data_store_mgr import (
+    ID_DELIM, EDGES, FAMILY_PROXIES, TASK_PROXIES)
 from cylc.flow.network.resolvers import Resolvers
 from cylc.flow.network.schema import parse_node_id
 from cylc.flow.scheduler import Scheduler
@@ -120,6 +121,40 @@ async def test_get_nodes_all(mock_flow, node_args):
     assert len(nodes) == 1
 
 
+@pytest.mark.parametrize(
+    'node_type, args',
+    [
+        (TASK_PROXIES, {'states': ['waiting']}),
+        (TASK_PROXIES, {'states': ['waiting', 'running']}),
+        (TASK_PROXIES, {'states': ['failed']}),
+        (TASK_PROXIES, {'ghosts': True, 'states': ['']}),
+        (TASK_PROXIES, {'ids': ['{cycle}|foo']}),
+        (TASK_PROXIES, {'ids': ['{cycle}|*']}),
+        (TASK_PROXIES, {'ghosts': True, 'ids': ['2000*|foo', 'bar']}),
+        (TASK_PROXIES, {'ghosts': True, 'ids': ['*|f*']}),
+        (TASK_PROXIES, {'ids': ['root:waiting'], 'exstates': ['running']}),
+        (TASK_PROXIES, {'is_held': True}),
+        (TASK_PROXIES, {'is_held': False, 'is_queued': False}),
+        (FAMILY_PROXIES, {'ghosts': True, 'ids': ['{cycle}|root']}),
+    ]
+)
+@pytest.mark.asyncio
+async def test_get_nodes_all_index(
+    mock_flow, node_args, node_type, args, monkeypatch
+):
+    """Test the data-store indexes don't change the nodes returned."""
+    node_args.update(args)
+    cycle = next(iter(mock_flow.data[TASK_PROXIES].values())).cycle_point
+    node_args['ids'] = [
+        parse_node_id(n_id.format(cycle=cycle), node_type)
+        for n_id in node_args['ids']
+    ]
+    nodes = await mock_flow.resolvers.get_nodes_all(node_type, node_args)
+    monkeypatch.setattr(mock_flow.schd.data_store_mgr, 'indexes', {})
+    assert nodes == await mock_flow.resolvers.get_nodes_all(
+        node_type, node_args)
+
+
 @pytest.mark.asyncio
 async def test_get_nodes_by_ids(mock_flow, node_args):
     """Test method returning workflow(s) node messages
@@ -21,12 +21,17 @@ from tempfile import TemporaryDirectory
 
 import pytest
 
+from cylc.flow.async_util import scandir
 from cylc.flow.network.scan import (
     graphql_query,
     is_active,
     scan
 )
-from cylc.flow.workflow_files import WorkflowFiles
+from cylc.flow.workflow_files import (
+    WorkflowFiles,
+    load_registry,
+    update_registry
+)
 
 
 SRV_DIR = Path(WorkflowFiles.Service.DIRNAME)
@@ -269,6 +274,101 @@ async def test_max_depth(nested_run_dir):
     ]
 
 
+@pytest.mark.asyncio
+async def test_registry(tmp_path, monkeypatch):
+    """It should list flows from the registry and rebuild it if need be."""
+    init_flows(
+        tmp_path,
+        running=('foo',),
+        registered=('bar/run1',),
+        un_registered=('qux',)
+    )
+    # the first scan walks the run dir and writes the registry
+    assert await listify(scan(tmp_path)) == ['bar/run1', 'foo']
+    registry = load_registry(tmp_path)
+    assert registry == {
+        'version': 2,
+        'dirs': ['bar', 'foo', 'qux'],
+        'workflows': ['bar/run1', 'foo'],
+        'mtimes': {
+            name: (tmp_path / name).stat().st_mtime_ns
+            for name in ('bar', f'bar/{INSTALL}', 'qux')
+        }
+    }
+
+    # the registry is used while the walked dirs are unchanged
+    with monkeypatch.context() as m:
+        m.setattr('cylc.flow.network.scan._scan_dir', None)
+        assert await listify(scan(tmp_path)) == ['bar/run1', 'foo']
+        assert await listify(
+            scan(tmp_path, scan_dir=tmp_path / 'bar', max_depth=1)
+        ) == ['bar/run1']
+
+        # removed flows are dropped from the registry
+        rmtree(tmp_path / 'foo')
+        assert await listify(scan(tmp_path)) == ['bar/run1']
+        assert load_registry(tmp_path)['workflows'] == ['bar/run1']
+
+    # a new top-level dir means the run dir must be walked again
+    init_flows(tmp_path, registered=('baz',))
+    assert await listify(scan(tmp_path)) == ['bar/run1', 'baz']
+    assert load_registry(tmp_path)['workflows'] == ['bar/run1', 'baz']
+
+    # as does a change to a walked dir
+    init_flows(tmp_path, registered=('bar/run2', 'qux/run1'))
+    assert await listify(scan(tmp_path)) == [
+        'bar/run1', 'bar/run2', 'baz', 'qux/run1'
+    ]
+    assert load_registry(tmp_path)['workflows'] == [
+        'bar/run1', 'bar/run2', 'baz', 'qux/run1'
+    ]
+
+
+@pytest.mark.asyncio
+async def test_registry_unregistered_nested(tmp_path):
+    """It should find nested flows which were not registered.
+
+    E.g. runs copied into the run dir or installed by another Cylc version.
+    """
+    init_flows(tmp_path, registered=('proj/run1',), un_registered=('a/b',))
+    assert await listify(scan(tmp_path)) == ['proj/run1']
+
+    (tmp_path / 'proj/run2').mkdir()
+    (tmp_path / 'proj/run2/flow.cylc').touch()
+    assert await listify(scan(tmp_path)) == ['proj/run1', 'proj/run2']
+
+    # (in a dir two levels down which already existed)
+    (tmp_path / 'a/b/c').mkdir()
+    (tmp_path / 'a/b/c/flow.cylc').touch()
+    assert await listify(scan(tmp_path)) == ['a/b/c', 'proj/run1', 'proj/run2']
+    assert load_registry(tmp_path)['workflows'] == [
+        'a/b/c', 'proj/run1', 'proj/run2'
+    ]
+
+
+@pytest.mark.asyncio
+async def test_registry_walk_concurrent(tmp_path, monkeypatch):
+    """It should keep flows registered while the run dir is walked."""
+    init_flows(tmp_path, registered=('proj/run1',))
+    assert await listify(scan(tmp_path)) == ['proj/run1']
+    # a new top-level dir so the run dir is walked
+    init_flows(tmp_path, un_registered=('qux',))
+
+    async def _scandir(path):
+        ret = await scandir(path)
+        if path == tmp_path / 'proj':
+            # a flow is installed after the walk has listed its parent dir
+            init_flows(tmp_path, registered=('proj/run3',))
+            update_registry(add=['proj/run3'], run_dir=tmp_path)
+        return ret
+
+    monkeypatch.setattr('cylc.flow.network.scan.scandir', _scandir)
+    assert await listify(scan(tmp_path)) == ['proj/run1']
+    assert load_registry(tmp_path)['workflows'] == ['proj/run1', 'proj/run3']
+    monkeypatch.undo()
+    assert await listify(scan(tmp_path)) == ['proj/run1', 'proj/run3']
+
+
 @pytest.mark.asyncio
 async def test_scan_sigstop(flow, scheduler, run, one_conf, test_dir, caplog):
     """It should log warnings if workflows are un-contactable.
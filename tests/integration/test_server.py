@@ -17,10 +17,13 @@
 from async_timeout import timeout
 import asyncio
 from getpass import getuser
+from time import sleep
 
 import pytest
 
+from cylc.flow.network.client import WorkflowRuntimeClient
 from cylc.flow.network.server import PB_METHOD_MAP
+from cylc.flow.task_message import MUTATION
 
 
 @pytest.mark.asyncio
@@ -79,6 +82,43 @@ def test_pb_entire_workflow(myflow):
     assert data.workflow.id == myflow.id
 
 
+@pytest.mark.asyncio
+async def test_concurrent_requests(myflow, monkeypatch):
+    """Slow queries should not hold up other requests."""
+    def get_graph_raw(**kwargs):
+        sleep(2)
+        return 'slow'
+
+    monkeypatch.setattr(myflow.server, 'get_graph_raw', get_graph_raw)
+    client = WorkflowRuntimeClient(myflow.workflow)
+    slow = asyncio.ensure_future(client.async_request('get_graph_raw'))
+    await asyncio.sleep(0.2)
+
+    # queries and (serialised) mutations are served in the mean time
+    ret = await client.async_request(
+        'graphql',
+        {'request_string': 'query { workflows { id } }'}
+    )
+    assert ret['workflows'][0]['id'] == myflow.id
+    for ind in range(3):
+        ret = await client.async_request(
+            'graphql',
+            {
+                'request_string': MUTATION,
+                'variables': {
+                    'wFlows': [myflow.workflow],
+                    'taskJob': '1/one/01',
+                    'eventTime': None,
+                    'messages': [['INFO', f'hello {ind}']],
+                }
+            }
+        )
+        assert ret['message']['result']
+    assert not slow.done()
+
+    assert await slow == 'slow'
+
+
 @pytest.mark.asyncio
 @pytest.fixture
 async def accident(flow, scheduler, run, one_conf):
@@ -0,0 +1,66 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from time import time
+
+import pytest
+
+from cylc.flow.task_action_timer import TaskActionTimer
+from cylc.flow.task_state import TASK_STATUS_RUNNING
+
+
+@pytest.mark.asyncio
+async def test_check_task_jobs_batch(flow, scheduler, run, monkeypatch):
+    """Polls due soon should be brought forward to join a poll."""
+    reg = flow({
+        'scheduler': {'allow implicit tasks': True},
+        'scheduling': {'graph': {'R1': 'a & b & c'}},
+    })
+    schd = scheduler(reg)
+    async with run(schd):
+        polled = []
+        monkeypatch.setattr(
+            schd.task_job_mgr,
+            'poll_task_jobs',
+            lambda workflow, itasks: polled.extend(itasks)
+        )
+        now = time()
+        itasks = {itask.tdef.name: itask for itask in schd.pool.get_tasks()}
+        # a: poll due now, b: poll due soon, c: poll due later
+        for name, due in (('a', -1), ('b', 30), ('c', 600)):
+            itask = itasks[name]
+            itask.state.reset(TASK_STATUS_RUNNING)
+            itask.timeout = now + 3600
+            itask.poll_timer = TaskActionTimer(
+                ctx=(itask.submit_num, itask.state.status),
+                delays=[900],
+                timeout=now + due
+            )
+            schd.task_events_mgr.schedule_job_timer(itask)
+
+        schd.task_job_mgr.check_task_jobs(schd.workflow, schd.pool)
+        assert sorted(itask.tdef.name for itask in polled) == ['a', 'b']
+        for name in 'ab':
+            # next poll scheduled
+            assert itasks[name].poll_timer.timeout > now + 800
+            # timeout unchanged
+            assert itasks[name].timeout == now + 3600
+        assert itasks['c'].poll_timer.timeout == now + 600
+
+        # nothing more is due
+        polled.clear()
+        schd.task_job_mgr.check_task_jobs(schd.workflow, schd.pool)
+        assert polled == []
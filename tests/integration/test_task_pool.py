@@ -15,6 +15,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from cylc.flow import CYLC_LOG
+from collections import Counter
 import logging
 import pytest
 from pytest import param
@@ -23,6 +24,15 @@ from typing import Callable, Iterable, List, Tuple, Union
 from cylc.flow.cycling import PointBase
 from cylc.flow.cycling.integer import IntegerPoint
 from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_outputs import TASK_OUTPUT_SUCCEEDED
+from cylc.flow.task_pool import (
+    QUEUE_ACTIVE_STATUSES,
+    RUNAHEAD_FINISHED_STATUSES
+)
+from cylc.flow.task_state import (
+    TASK_STATUS_RUNNING,
+    TASK_STATUS_SUCCEEDED
+)
 
 
 EXAMPLE_FLOW_CFG = {
@@ -406,3 +416,109 @@ async def test_hold_point(
 
     assert task_pool.tasks_to_hold == set()
     assert db_select(example_flow, True, 'tasks_to_hold') == []
+
+
+@pytest.mark.asyncio
+async def test_get_task_by_id(example_flow: Scheduler) -> None:
+    """Test the task ID index is kept in sync with the pool."""
+    task_pool = example_flow.pool
+    for itask in task_pool.get_tasks():
+        assert task_pool.get_task_by_id(itask.identity) is itask
+    assert sorted(task_pool.main_pool_by_id) == sorted(
+        itask.identity for itask in task_pool.get_tasks())
+    assert task_pool.get_task_by_id('grogu.1') is None
+
+    itask = task_pool.get_task_by_id('foo.1')
+    task_pool.remove(itask)
+    assert task_pool.get_task_by_id('foo.1') is None
+    assert 'foo.1' not in task_pool.main_pool_by_id
+
+    task_pool.add_to_pool(itask, is_new=False)
+    assert task_pool.get_task_by_id('foo.1') is itask
+
+
+@pytest.mark.asyncio
+async def test_runahead_counts(example_flow: Scheduler) -> None:
+    """Test the per-point counts used for runahead limiting stay in sync."""
+    task_pool = example_flow.pool
+
+    def assert_counts_in_sync():
+        assert task_pool.unfinished_point_counts == Counter(
+            itask.point
+            for itask in task_pool.get_all_tasks()
+            if not itask.state(*RUNAHEAD_FINISHED_STATUSES)
+        )
+        assert sorted(
+            itask.identity
+            for itask_id_map in task_pool.runahead_pool.values()
+            for itask in itask_id_map.values()
+        ) == sorted(
+            itask.identity
+            for itask in task_pool.get_tasks()
+            if itask.state.is_runahead
+        )
+
+    assert_counts_in_sync()
+    assert task_pool.runahead_pool
+
+    assert task_pool.release_runahead_tasks()
+    assert_counts_in_sync()
+
+    itask = task_pool.get_task_by_id('foo.1')
+    itask.state.reset(TASK_STATUS_SUCCEEDED)
+    assert_counts_in_sync()
+
+    task_pool.remove(itask)
+    assert_counts_in_sync()
+
+
+@pytest.mark.asyncio
+async def test_active_task_counts(example_flow: Scheduler) -> None:
+    """Test the active task counts used for queueing stay in sync."""
+    task_pool = example_flow.pool
+
+    def assert_counts_in_sync():
+        assert task_pool.active_task_counts == Counter(
+            itask.tdef.name
+            for itask in task_pool.get_tasks()
+            if itask.state(*QUEUE_ACTIVE_STATUSES)
+        )
+
+    task_pool.release_runahead_tasks()
+    assert_counts_in_sync()
+    released = task_pool.release_queued_tasks()
+    assert released
+    assert_counts_in_sync()
+    assert sum(task_pool.active_task_counts.values()) == len(released)
+
+    itask = released[0]
+    itask.state.reset(TASK_STATUS_RUNNING)
+    assert_counts_in_sync()
+    itask.state.reset(TASK_STATUS_SUCCEEDED)
+    assert_counts_in_sync()
+
+    task_pool.remove(released[1])
+    assert_counts_in_sync()
+
+
+@pytest.mark.asyncio
+async def test_dependent_tasks(example_flow: Scheduler) -> None:
+    """Test the index of tasks by the outputs they depend on."""
+    task_pool = example_flow.pool
+    message = ('foo', '1', TASK_OUTPUT_SUCCEEDED)
+    assert task_pool.get_dependent_tasks(message) == []
+
+    foo = task_pool.get_task('foo', IntegerPoint('1'))
+    pub = task_pool.get_or_spawn_task(
+        'pub', IntegerPoint('2'), foo.flow_label)
+    task_pool.add_to_pool(pub)
+    assert task_pool.get_dependent_tasks(message) == [pub]
+    assert not pub.state.prerequisites_all_satisfied()
+
+    # completing the absolute output satisfies the dependent task
+    task_pool.spawn_on_output(foo, TASK_OUTPUT_SUCCEEDED)
+    assert message in task_pool.abs_outputs_done
+    assert pub.state.prerequisites_all_satisfied()
+
+    task_pool.remove(pub)
+    assert task_pool.get_dependent_tasks(message) == []
@@ -17,8 +17,9 @@
 import unittest
 from datetime import datetime
 
+from cylc.flow.cycling import cmp
 from cylc.flow.cycling.iso8601 import init, ISO8601Sequence, ISO8601Point,\
-    ISO8601Interval, ingest_time
+    ISO8601Interval, ingest_time, interval_parse, point_parse
 
 
 class TestISO8601Sequence(unittest.TestCase):
@@ -528,6 +529,92 @@ class TestISO8601Sequence(unittest.TestCase):
             sequence.is_on_sequence(ISO8601Point('20100809T0005')))
 
 
+class TestISO8601PointArithmetic(unittest.TestCase):
+    """Integer point arithmetic must agree with isodatetime."""
+
+    POINTS = [
+        '20000101T0000Z', '19991230T2359Z', '21000228T1200Z',
+        '20240130T0600Z', '19000301T0000Z', '20210330T1745Z',
+    ]
+    # (not valid in all calendars)
+    GREGORIAN_POINTS = ['20000229T2330Z', '19991231T2359Z', '20240131T0600Z']
+    INTERVALS = [
+        'PT1M', 'PT6H', 'PT36H', 'P1D', '-P1D', 'P2W', 'P1M', '-P1M',
+        'P13M', 'P1Y', '-P1Y', 'P1Y1M1DT1H1M', 'P400D', 'P0Y',
+    ]
+
+    def tearDown(self):
+        init(time_zone='Z', cycling_mode='gregorian')
+
+    def test_arithmetic(self):
+        for kwargs in [
+            {'cycling_mode': 'gregorian'},
+            {'cycling_mode': '360day'},
+            {'cycling_mode': '365day'},
+            {'cycling_mode': '366day'},
+            {'cycling_mode': 'gregorian', 'time_zone': '+0530'},
+            {'cycling_mode': 'gregorian', 'num_expanded_year_digits': 2},
+            {'cycling_mode': 'gregorian',
+             'custom_dump_format': 'CCYY-MM-DDThh:mm+hh:mm'},
+            {'cycling_mode': 'gregorian',
+             'custom_dump_format': '%Y%m%d%H%M'},
+        ]:
+            init(**{'time_zone': 'Z', **kwargs})
+            values = self.POINTS
+            if kwargs['cycling_mode'] == 'gregorian':
+                values = values + self.GREGORIAN_POINTS
+            points = [
+                ISO8601Point.from_nonstandard_string(value)
+                for value in values
+            ]
+            for point in points:
+                for value in self.INTERVALS:
+                    interval = ISO8601Interval(value).standardise()
+                    with self.subTest(
+                        kwargs=kwargs, point=point, interval=interval
+                    ):
+                        self.assertEqual(
+                            str(point + interval),
+                            str(point_parse(point.value)
+                                + interval_parse(interval.value)))
+                        self.assertEqual(
+                            str(point - interval),
+                            str(point_parse(point.value)
+                                - interval_parse(interval.value)))
+                for other in points:
+                    with self.subTest(kwargs=kwargs, point=point, other=other):
+                        self.assertEqual(
+                            point._cmp(other),
+                            cmp(point_parse(point.value),
+                                point_parse(other.value)))
+                        self.assertEqual(
+                            str(point - other),
+                            str(point_parse(point.value)
+                                - point_parse(other.value)))
+
+    def test_interval_cmp(self):
+        intervals = sorted(
+            ISO8601Interval(value).standardise()
+            for value in ['P1D', 'PT25H', '-PT1H', 'P1M', 'PT24H', 'P0Y']
+        )
+        self.assertEqual(
+            [str(interval) for interval in intervals],
+            ['-PT1H', 'P0Y', 'P1D', 'PT24H', 'PT25H', 'P1M'])
+        self.assertEqual(ISO8601Interval('P1D'), ISO8601Interval('PT24H'))
+
+    def test_calendar_change(self):
+        """Cached integer values must not outlive a calendar change."""
+        point = ISO8601Point('20000301T0000Z')
+        init(time_zone='Z', cycling_mode='gregorian')
+        self.assertEqual(
+            str(point - ISO8601Interval('P1D')), '20000229T0000Z')
+        init(time_zone='Z', cycling_mode='360day')
+        self.assertEqual(
+            str(point - ISO8601Interval('P1D')), '20000230T0000Z')
+        self.assertEqual(
+            str(point - ISO8601Point('20000101T0000Z')), 'P60D')
+
+
 class TestRelativeCyclePoint(unittest.TestCase):
     """Contains unit tests for cycle point relative to current time."""
 
@@ -0,0 +1,183 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""A stand-in for ssh, for testing connection sharing without an sshd.
+
+(There should be no tests in this module.)
+
+Usage:
+    python fake_ssh.py [OPTIONS] HOST [COMMAND...]
+
+Runs COMMAND on the local host after a delay ($FAKE_SSH_DELAY seconds,
+default 0.2) emulating connection setup and authentication.
+
+Implements enough of the OpenSSH ControlMaster options for
+cylc.flow.ssh_control_mgr:
+
+* "-oControlMaster=yes -oControlPath=PATH -N": after the delay, listen for
+  commands on the socket PATH (until terminated or stopped). With
+  "-oControlPersist=Ns" go into the background once listening and exit
+  after N seconds with no commands running.
+* "-oControlPath=PATH": run COMMAND via the master listening on PATH (with
+  no delay), if there is one.
+* "-O check|exit|stop -oControlPath=PATH": control the master ("stop" makes
+  it stop listening and exit once the commands it is running have finished).
+"""
+
+from contextlib import suppress
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+from threading import Event, Thread
+import time
+
+
+def parse_args(args):
+    """Return ({option: value}, host, command)."""
+    opts = {}
+    args = list(args)
+    while args and args[0].startswith('-'):
+        arg = args.pop(0)
+        if arg.startswith('-o'):
+            key, value = (arg[2:] or args.pop(0)).split('=', 1)
+            opts[key] = value
+        elif arg in {'-O', '-S'}:
+            opts[arg] = args.pop(0)
+        else:
+            opts[arg] = True
+    return opts, args[0], args[1:]
+
+
+def recv_all(sock):
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+def request(path, message):
+    """Send a request to a master, return the response or None."""
+    try:
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(path)
+            sock.sendall(json.dumps(message).encode())
+            sock.shutdown(socket.SHUT_WR)
+            return json.loads(recv_all(sock))
+    except (OSError, ValueError):
+        return None
+
+
+def run(command, stdin):
+    proc = subprocess.run(
+        ['sh', '-c', ' '.join(command)],
+        input=stdin.encode(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    return {
+        'out': proc.stdout.decode(),
+        'err': proc.stderr.decode(),
+        'ret_code': proc.returncode
+    }
+
+
+def serve(conn, path, stop):
+    with conn:
+        message = json.loads(recv_all(conn))
+        if 'command' in message:
+            response = run(message['command'], message['stdin'])
+        else:
+            response = {'ret_code': 0}
+        if message.get('op') == 'stop':
+            # stop listening before replying, like ssh
+            stop.set()
+            with suppress(FileNotFoundError):
+                os.unlink(path)
+        conn.sendall(json.dumps(response).encode())
+    if message.get('op') == 'exit':
+        os.kill(os.getpid(), signal.SIGTERM)
+
+
+def master(path, persist=None):
+    time.sleep(float(os.environ.get('FAKE_SSH_DELAY', 0.2)))
+    sock = socket.socket(socket.AF_UNIX)
+    sock.bind(path)
+    sock.listen(64)
+    sock.settimeout(0.05)
+    if persist is not None:
+        # go into the background, like ssh
+        if os.fork():
+            return 0
+        os.setsid()
+    stop = Event()
+    threads = []
+    last_used = time.time()
+
+    def terminate(*_):
+        with suppress(FileNotFoundError):
+            os.unlink(path)
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+    while not stop.is_set():
+        threads = [thread for thread in threads if thread.is_alive()]
+        if threads:
+            last_used = time.time()
+        elif persist and time.time() - last_used > persist:
+            with suppress(FileNotFoundError):
+                os.unlink(path)
+            break
+        try:
+            conn, _ = sock.accept()
+        except socket.timeout:
+            continue
+        thread = Thread(target=serve, args=(conn, path, stop), daemon=True)
+        thread.start()
+        threads.append(thread)
+    sock.close()
+    for thread in threads:
+        thread.join()
+    return 0
+
+
+def main(args):
+    opts, _, command = parse_args(args)
+    path = opts.get('-S', opts.get('ControlPath'))
+    if opts.get('ControlMaster') == 'yes':
+        persist = opts.get('ControlPersist')
+        return master(path, persist and float(persist.rstrip('s')))
+    if '-O' in opts:
+        response = request(path, {'op': opts['-O']})
+        return 0 if response else 255
+    stdin = '' if '-n' in opts else sys.stdin.read()
+    response = None
+    if path:
+        response = request(path, {'command': command, 'stdin': stdin})
+    if response is None:
+        time.sleep(float(os.environ.get('FAKE_SSH_DELAY', 0.2)))
+        response = run(command, stdin)
+    sys.stdout.write(response['out'])
+    sys.stderr.write(response['err'])
+    return response['ret_code']
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -19,8 +19,8 @@ import unittest
 
 from cylc.flow.parsec.OrderedDict import OrderedDictWithDefaults
 from cylc.flow.parsec.util import (
-    itemstr, listjoin, m_override, pdeepcopy, poverride, printcfg,
-    replicate, un_many
+    itemstr, listjoin, m_override, pdeepcopy, poverlay, poverride, printcfg,
+    replicate, un_many, unshare
 )
 
 
@@ -135,6 +135,48 @@ class TestUtil(unittest.TestCase):
 
         self.assertEqual(source, target)
 
+    # --- poverlay
+
+    def test_poverlay(self):
+        """Test poverlay is equivalent to replicate but shares sections."""
+        base = OrderedDictWithDefaults()
+        base["script"] = "true"
+        base["environment"] = OrderedDictWithDefaults()
+        base["environment"]["A"] = "a"
+        base["environment"]["B"] = "b"
+        base["directives"] = OrderedDictWithDefaults()
+        base["directives"]["--mem"] = "1G"
+        source = OrderedDictWithDefaults()
+        source["environment"] = OrderedDictWithDefaults()
+        source["environment"]["A"] = "x"
+        source["environment"]["C"] = "c"
+        source["directives"] = OrderedDictWithDefaults()
+        source["retry delays"] = [1, 2]
+
+        expected = pdeepcopy(base)
+        replicate(expected, source)
+        target = poverlay(base, source)
+
+        self.assertEqual(str(expected), str(target))
+        # only the (non-empty) sections set by the source are copied
+        self.assertIsNot(target["environment"], base["environment"])
+        self.assertIs(target["directives"], base["directives"])
+        self.assertEqual(
+            list(base["environment"].items()), [("A", "a"), ("B", "b")])
+
+    def test_unshare(self):
+        base = OrderedDictWithDefaults()
+        base["environment"] = OrderedDictWithDefaults()
+        base["environment"]["A"] = "a"
+        base["environment"].defaults_ = {"B": "b"}
+        target = poverlay(base, None)
+
+        unshare(target, "environment")["A"] = "x"
+
+        self.assertEqual(base["environment"]["A"], "a")
+        self.assertEqual(target["environment"]["A"], "x")
+        self.assertEqual(target["environment"]["B"], "b")
+
     # --- poverride
 
     def test_poverride_append(self):
@@ -306,6 +348,26 @@ class TestUtil(unittest.TestCase):
         with self.assertRaises(Exception):
             m_override(target, source)
 
+    def test_m_override_shared(self):
+        """Test sections shared in the source are shared in the target."""
+        section = OrderedDictWithDefaults()
+        section["A"] = "a"
+        source = OrderedDictWithDefaults()
+        for name in ("foo", "bar"):
+            source[name] = OrderedDictWithDefaults()
+            source[name]["environment"] = section
+        target = OrderedDictWithDefaults()
+        target['__MANY__'] = OrderedDictWithDefaults()
+        target['__MANY__']['environment'] = OrderedDictWithDefaults()
+        target['__MANY__']['environment']['__MANY__'] = None
+
+        m_override(target, source)
+
+        self.assertEqual(target["foo"]["environment"]["A"], "a")
+        self.assertIs(target["foo"]["environment"],
+                      target["bar"]["environment"])
+        self.assertIsNot(target["foo"]["environment"], section)
+
     # --- un_many
 
     def test_un_many(self):
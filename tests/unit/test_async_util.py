@@ -17,10 +17,13 @@
 import asyncio
 import logging
 from random import random
+import threading
 
 import pytest
 
 from cylc.flow.async_util import (
+    BLOCKING_WORKERS,
+    _Batch,
     pipe,
     asyncqgen
 )
@@ -194,6 +197,119 @@ async def test_pipe_concurrent(caplog, preserve_order):
     ] * 4
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize('preserve_order', (True, False))
+async def test_pipe_concurrency_limit(preserve_order):
+    """It limits the number of items a function processes at once."""
+    active = 0
+    max_active = 0
+
+    @pipe(concurrency=3)
+    async def limited(x):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(active, max_active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return x
+
+    mypipe = a_range(20) | limited
+    mypipe.preserve_order = preserve_order
+    assert sorted([item async for item in mypipe]) == list(range(20))
+    assert max_active == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('preserve_order', (True, False))
+async def test_pipe_back_pressure(preserve_order):
+    """It pauses the generator while the pipe is full."""
+    generated = []
+
+    @pipe
+    async def gen():
+        for num in range(20):
+            generated.append(num)
+            yield num
+
+    mypipe = gen | even
+    mypipe.preserve_order = preserve_order
+    mypipe.max_items = 4
+    async for num in mypipe:
+        if num == 0:
+            await asyncio.sleep(0.1)
+            # the generator can't run ahead of the slow consumer
+            assert len(generated) <= 5
+    assert generated == list(range(20))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('preserve_order', (True, False))
+async def test_pipe_generator_error(preserve_order):
+    """It raises errors from the generator."""
+    @pipe
+    async def gen():
+        yield 1
+        raise ValueError('bad')
+
+    mypipe = gen | mult(2)
+    mypipe.preserve_order = preserve_order
+    with pytest.raises(ValueError, match='bad'):
+        async for _ in mypipe:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_pipe_blocking():
+    """It runs blocking functions on a thread pool in batches."""
+    calls = []
+
+    @pipe(blocking=True)
+    def blocking_even(x):
+        """Blocking filter."""
+        calls.append(threading.current_thread())
+        if x == 3:
+            raise ValueError('bad')
+        return x % 2 == 0
+
+    assert blocking_even.__doc__ == 'Blocking filter.'
+    assert await blocking_even.func(2) is True
+    with pytest.raises(ValueError):
+        await blocking_even.func(3)
+
+    calls.clear()
+    batches = 0
+    run = blocking_even.func._run
+
+    def _run(pending):
+        nonlocal batches
+        batches += 1
+        return run(pending)
+
+    blocking_even.func._run = _run
+    # the error is logged and the item skipped
+    assert [x async for x in a_range(10) | blocking_even] == [0, 2, 4, 6, 8]
+    assert len(calls) == 10
+    assert threading.current_thread() not in calls
+    assert batches < 10
+
+
+@pytest.mark.asyncio
+async def test_batch_parallel():
+    """It splits a batch of calls between the worker threads."""
+    # (this deadlocks unless BLOCKING_WORKERS calls can run at once)
+    barrier = threading.Barrier(BLOCKING_WORKERS, timeout=5)
+
+    def func(x):
+        barrier.wait()
+        return threading.current_thread(), x
+
+    batch = _Batch(func)
+    results = await asyncio.gather(
+        *(batch(x) for x in range(BLOCKING_WORKERS * 3)))
+    assert [x for _, x in results] == list(range(BLOCKING_WORKERS * 3))
+    assert len({thread for thread, _ in results}) == BLOCKING_WORKERS
+
+
 def test_pipe_str():
     """It has helpful textual representations."""
     pipe = a_range(5) | even(filter_stop=False) | mult(10, kwarg=42)
@@ -23,8 +23,10 @@ from unittest.mock import Mock
 from cylc.flow import CYLC_LOG
 from cylc.flow.config import WorkflowConfig
 from cylc.flow.cycling import loader
+from cylc.flow.cycling.integer import IntegerPoint
 from cylc.flow.cycling.loader import INTEGER_CYCLING_TYPE, ISO8601_CYCLING_TYPE
-from cylc.flow.exceptions import WorkflowConfigError, PointParsingError
+from cylc.flow.exceptions import (
+    GraphParseError, PointParsingError, WorkflowConfigError)
 from cylc.flow.workflow_files import WorkflowFiles
 from cylc.flow.wallclock import get_utc_mode, set_utc_mode
 from cylc.flow.xtrigger_mgr import XtriggerManager
@@ -226,6 +228,58 @@ def test_family_inheritance_and_quotes(
             config.runtime['descendants']['SOMEFAM'])
 
 
+def test_inherited_sections_not_shared(tmp_path):
+    """Test namespaces which share inherited config can modify their own.
+
+    Tasks which inherit the same sections share them, but modifying the
+    config of one task (e.g. for dummy mode) mustn't affect another.
+    """
+    cfg = """
+        [scheduler]
+            allow implicit tasks = True
+        [scheduling]
+            [[graph]]
+                R1 = foo & bar & baz
+        [runtime]
+            [[root]]
+                [[[meta]]]
+                    URL = http://%(task_name)s
+                [[[simulation]]]
+                    speedup factor = 1
+                    fail cycle points = 1
+            [[FAM]]
+                [[[directives]]]
+                    -l = x
+            [[foo]]
+                inherit = FAM
+                execution time limit = PT1M
+            [[bar]]
+                inherit = FAM
+                execution time limit = PT2M
+    """
+    file_path = tmp_path / 'flow.cylc'
+    file_path.write_text(cfg)
+    config = WorkflowConfig(
+        'test',
+        str(file_path),
+        template_vars={},
+        options=Mock(spec=[], run_mode='dummy')
+    )
+    foo, bar, baz = (
+        config.get_taskdef(name).rtconfig for name in ('foo', 'bar', 'baz'))
+    # inherited sections are shared
+    assert foo['directives'] is bar['directives']
+    # but modified ones aren't
+    assert foo['meta']['URL'] == 'http://foo'
+    assert bar['meta']['URL'] == 'http://bar'
+    assert baz['meta']['URL'] == 'http://baz'
+    assert config.cfg['runtime']['root']['meta']['URL'] == 'http://root'
+    assert foo['job']['simulated run length'] == 60
+    assert bar['job']['simulated run length'] == 120
+    assert foo['simulation']['fail cycle points'] == [IntegerPoint('1')]
+    assert bar['simulation']['fail cycle points'] == [IntegerPoint('1')]
+
+
 @pytest.mark.parametrize(
     ('cycling_type', 'scheduling_cfg', 'expected_icp', 'expected_opt_icp',
      'expected_err'),
@@ -897,3 +951,67 @@ def test_check_circular(opt, monkeypatch, caplog, tmp_path):
         assert msg in caplog.text
     else:
         WorkflowConfig__assert_err_raised()
+
+
+def test_load_graph_parallel(monkeypatch, tmp_path):
+    """Test graph sections parsed in worker processes give the same config."""
+    flow_file = tmp_path.joinpath(WorkflowFiles.FLOW_FILE)
+    flow_file.write_text("""
+    [scheduler]
+        allow implicit tasks = True
+    [scheduling]
+        cycling mode = integer
+        final cycle point = 4
+        [[graph]]
+            R1 = "a => b<x> => c"
+            R1/2 = "c[-P1] => d & e"
+            P2 = "d:fail | c => FAM"
+    [task parameters]
+        x = 1..3
+    [runtime]
+        [[FAM]]
+        [[f1, f2]]
+            inherit = FAM
+    """)
+
+    def load_config():
+        config = WorkflowConfig(workflow='parallel', fpath=flow_file)
+        sequences = config.sequences
+        return (
+            {
+                name: sorted(
+                    (sequences.index(seq), str(dependency))
+                    for seq, dependencies in taskdef.dependencies.items()
+                    for dependency in dependencies
+                )
+                for name, taskdef in config.taskdefs.items()
+            },
+            sorted(
+                (sequences.index(seq), str(edge))
+                for seq, edges in config.edges.items()
+                for edge in edges
+            ),
+            [
+                (str(seq.get_start_point()), str(seq.get_interval()))
+                for seq in sequences
+            ]
+        )
+
+    expected = load_config()
+    monkeypatch.setattr(
+        'cylc.flow.config.WorkflowConfig.GRAPH_PARALLEL_MIN_SIZE', 0)
+    monkeypatch.setattr('cylc.flow.config.os.cpu_count', lambda: 2)
+    assert load_config() == expected
+
+    # errors in worker processes are raised
+    flow_file.write_text("""
+    [scheduler]
+        allow implicit tasks = True
+    [scheduling]
+        cycling mode = integer
+        [[graph]]
+            R1 = "a => b"
+            R1/2 = "a => & b"
+    """)
+    with pytest.raises(GraphParseError):
+        WorkflowConfig(workflow='parallel', fpath=flow_file)
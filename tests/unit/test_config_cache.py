@@ -0,0 +1,195 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from cylc.flow import CYLC_LOG
+from cylc.flow.config import WorkflowConfig
+from cylc.flow.config_cache import ENV_CONFIG_CACHE, get_cache_dir, is_enabled
+
+FLOW = '''#!jinja2
+[scheduler]
+    allow implicit tasks = True
+    UTC mode = True
+[scheduling]
+    initial cycle point = {{ environ['ICP'] }}
+    [[xtriggers]]
+        x = echo(succeed=True)
+    [[graph]]
+        P1Y = """
+            @x => {{ TASK }}
+            foo & {{ TASK }}
+        """
+[runtime]
+    [[foo]]
+        execution time limit = PT1M
+'''
+
+
+@pytest.fixture
+def flow(monkeypatch, tmp_path):
+    """Write a workflow and return a function which loads it."""
+    monkeypatch.setenv(ENV_CONFIG_CACHE, 'true')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.setenv('ICP', '2000')
+    flow_file = tmp_path / 'flow' / 'flow.cylc'
+    flow_file.parent.mkdir()
+    flow_file.write_text(FLOW)
+
+    def _load(template_vars=None, **opts):
+        return WorkflowConfig(
+            'test',
+            str(flow_file),
+            options=Mock(spec=[], **opts),
+            template_vars=template_vars or {'TASK': 'bar'},
+            xtrigger_mgr=Mock(),
+            output_fname=str(flow_file) + '.processed',
+        )
+
+    return _load
+
+
+@pytest.fixture
+def process(monkeypatch):
+    """Spy on processing of the workflow configuration."""
+    process = Mock(wraps=WorkflowConfig._process)
+    monkeypatch.setattr(
+        WorkflowConfig, '_process',
+        lambda *args, **kwargs: process(*args, **kwargs))
+    return process
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [(None, False), ('', False), ('false', False), ('true', True),
+     ('True', True), ('1', True)]
+)
+def test_is_enabled(value, expected, monkeypatch):
+    if value is None:
+        monkeypatch.delenv(ENV_CONFIG_CACHE, raising=False)
+    else:
+        monkeypatch.setenv(ENV_CONFIG_CACHE, value)
+    assert is_enabled() is expected
+
+
+def test_get_cache_dir(monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', '/a')
+    assert get_cache_dir() == Path('/a/cylc/config')
+    monkeypatch.delenv('XDG_CACHE_HOME')
+    assert get_cache_dir() == Path('~/.cache/cylc/config').expanduser()
+
+
+def test_load(flow, process, monkeypatch, tmp_path):
+    """It loads an unchanged config from the cache, with side effects."""
+    config1 = flow()
+    assert process.call_count == 1
+    processed = tmp_path / 'flow' / 'flow.cylc.processed'
+    processed_text = processed.read_text()
+    processed.unlink()
+    monkeypatch.setenv('CYLC_WORKFLOW_INITIAL_CYCLE_POINT', 'x')
+    template_vars = {'TASK': 'bar'}
+
+    config2 = flow(template_vars)
+    assert process.call_count == 1
+    assert set(config2.taskdefs) == {'foo', 'bar'}
+    assert config2.cfg['runtime'] == config1.cfg['runtime']
+    assert config2.initial_point == config1.initial_point
+    assert config2.get_taskdef('bar').xtrig_labels
+    # side effects of processing the config are repeated
+    config2.xtrigger_mgr.add_trig.assert_called_once_with(
+        'x', config2.cfg['scheduling']['xtriggers']['x'], config2.fdir)
+    assert os.environ['CYLC_WORKFLOW_INITIAL_CYCLE_POINT'] == (
+        '20000101T0000Z')
+    assert processed.read_text() == processed_text
+    assert template_vars['CYLC_TEMPLATE_VARS'] is template_vars
+    assert config2.pcfg.tvars is template_vars
+
+
+def test_warnings_repeated(flow, process, caplog):
+    """It repeats warnings logged when the config was processed."""
+    caplog.set_level(logging.WARNING, CYLC_LOG)
+    flow(utc_mode=False)
+    assert process.call_count == 1
+    warnings = caplog.messages
+    assert any('UTC mode' in msg for msg in warnings)
+    caplog.clear()
+    flow(utc_mode=False)
+    assert process.call_count == 1
+    assert caplog.messages == warnings
+
+
+@pytest.mark.parametrize(
+    'change',
+    [
+        pytest.param(
+            lambda path, monkeypatch: (path / 'flow.cylc').write_text(
+                FLOW.replace('PT1M', 'PT10M')),
+            id='flow.cylc changed'),
+        pytest.param(
+            lambda path, monkeypatch: (path / 'x').touch(),
+            id='source file added'),
+        pytest.param(
+            lambda path, monkeypatch: monkeypatch.setenv('ICP', '2001'),
+            id='environment variable read by template changed'),
+    ]
+)
+def test_invalidate(change, flow, process, monkeypatch, tmp_path):
+    """It processes the config again if its inputs change."""
+    flow()
+    change(tmp_path / 'flow', monkeypatch)
+    flow()
+    assert process.call_count == 2
+
+
+@pytest.mark.parametrize(
+    'args',
+    [
+        pytest.param({'template_vars': {'TASK': 'baz'}}, id='template vars'),
+        pytest.param({'run_mode': 'simulation'}, id='run mode'),
+        pytest.param({'fcp': '2010'}, id='final cycle point'),
+    ]
+)
+def test_inputs(args, flow, process):
+    """Different inputs get different cache entries."""
+    flow()
+    flow(**args)
+    assert process.call_count == 2
+    flow()
+    flow(**args)
+    assert process.call_count == 2
+
+
+def test_time_dependent(flow, process, monkeypatch, tmp_path):
+    """It doesn't cache configs which depend on the current time."""
+    monkeypatch.setenv('ICP', 'now')
+    flow()
+    flow()
+    assert process.call_count == 2
+    assert not (tmp_path / 'cache').exists()
+
+
+def test_disabled(flow, process, monkeypatch, tmp_path):
+    """It does not use the cache unless enabled."""
+    monkeypatch.setenv(ENV_CONFIG_CACHE, 'false')
+    flow()
+    flow()
+    assert process.call_count == 2
+    assert not (tmp_path / 'cache').exists()
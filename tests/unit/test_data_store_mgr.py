@@ -17,10 +17,14 @@
 from copy import deepcopy
 from time import time
 
+from cylc.flow.data_messages_pb2 import PbTask  # type: ignore
 from cylc.flow.data_store_mgr import (
     task_mean_elapsed_time,
     parse_job_item,
     apply_delta,
+    NodeIndex,
+    TASKS,
+    TASK_PROXIES,
     WORKFLOW,
     DELTAS_MAP,
     ALL_DELTAS,
@@ -84,3 +88,40 @@ def test_apply_delta():
 
     assert data[WORKFLOW].id == w_id
     assert data[WORKFLOW].pruned is True
+
+
+def test_apply_delta_index():
+    """Test delta application keeps a node index up to date."""
+    data = deepcopy(DATA_TEMPLATE)
+    index = NodeIndex()
+
+    delta = DELTAS_MAP[TASK_PROXIES]()
+    for name in ('foo', 'bar'):
+        delta.added.add(
+            id=f'1|{name}', name=name, state='waiting', cycle_point='1',
+            namespace=[name, 'FAM', 'root'], is_queued=True)
+    apply_delta(TASK_PROXIES, delta, data, index)
+    assert index.states == {'waiting': {'1|foo', '1|bar'}}
+    assert index.cycle_points == {'1': {'1|foo', '1|bar'}}
+    assert index.namespaces['FAM'] == {'1|foo', '1|bar'}
+    assert index.queued == {'1|foo', '1|bar'}
+
+    delta = DELTAS_MAP[TASK_PROXIES]()
+    delta.updated.add(id='1|foo', state='running', is_held=True)
+    apply_delta(TASK_PROXIES, delta, data, index)
+    assert index.states == {'waiting': {'1|bar'}, 'running': {'1|foo'}}
+    assert index.held == {'1|foo'}
+    # (protobuf merging doesn't unset fields)
+    assert index.queued == {'1|foo', '1|bar'}
+
+    delta = DELTAS_MAP[TASK_PROXIES]()
+    delta.pruned.append('1|bar')
+    data[TASK_PROXIES]['1|bar'].task = 'bar'
+    data[TASKS]['bar'] = PbTask(id='bar', proxies=['1|bar'])
+    data[WORKFLOW].task_proxies.append('1|bar')
+    apply_delta(TASK_PROXIES, delta, data, index)
+    assert len(index) == 1
+    assert index.states == {'running': {'1|foo'}}
+    assert index.namespaces == {
+        'foo': {'1|foo'}, 'FAM': {'1|foo'}, 'root': {'1|foo'}}
+    assert index.queued == {'1|foo'}
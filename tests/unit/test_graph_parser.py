@@ -113,6 +113,27 @@ class TestGraphParser(unittest.TestCase):
 
         self.assertEqual({}, families)
 
+    def test_parse_graph_lone_node(self):
+        """Test lone nodes get the same trigger as nodes in expressions."""
+        for node, expected in [
+            ('foo', 'foo:succeed'),
+            ('foo[-P1]', 'foo[-P1]:succeed'),
+            ('foo[^]', 'foo[^]:succeed'),
+            ('foo_bar[-P1D]', 'foo_bar[-P1D]:succeed'),
+        ]:
+            with self.subTest(node=node):
+                # (a lone node skips the regex substitution)
+                lone = GraphParser()
+                lone.parse_graph(f'{node} => bar')
+                expr, = lone.triggers['bar']
+                self.assertEqual(expected, expr)
+                self.assertEqual([expected], lone.triggers['bar'][expr][0])
+                # (a node in an expression does not)
+                regex = GraphParser()
+                regex.parse_graph(f'{node} | baz => bar')
+                expr, = regex.triggers['bar']
+                self.assertEqual(f'{expected}|baz:succeed', expr)
+
     # --- parameterized graphs
 
     def test_parse_graph_with_parameters(self):
@@ -86,7 +86,9 @@ def test_queue_and_release(
         queue_mgr.push_task(itask)
 
     # release tasks, given current active task counter
-    released = queue_mgr.release_tasks(active)
+    for name, count in active.items():
+        queue_mgr.update_active(name, count)
+    released = queue_mgr.release_tasks()
     assert sorted([r.tdef.name for r in released]) == sorted(expected_released)
 
     # check released tasks change state to "preparing", and not is_queued
@@ -103,3 +105,27 @@ def test_queue_and_release(
     # check second assignment overrides first
     for group in expected_foo_groups:
         assert "foo" in queue_mgr.queues[group].members
+
+
+def test_release_on_active_change():
+    """Test queues release more tasks as active tasks finish."""
+    queue_mgr = IndepQueueManager(QCONFIG, ALL_TASK_NAMES, DESCENDANTS)
+    for name in ["b1", "b2", "b3"]:
+        itask = Mock()
+        itask.tdef.name = name
+        queue_mgr.push_task(itask)
+
+    # the "big" queue limit is 2
+    released = queue_mgr.release_tasks()
+    assert [r.tdef.name for r in released] == ["b1", "b2"]
+    for itask in released:
+        queue_mgr.update_active(itask.tdef.name, 1)
+    assert queue_mgr.release_tasks() == []
+
+    # a task in another queue finishing makes no difference
+    queue_mgr.update_active("s1", 1)
+    queue_mgr.update_active("s1", -1)
+    assert queue_mgr.release_tasks() == []
+
+    queue_mgr.update_active("b1", -1)
+    assert [r.tdef.name for r in queue_mgr.release_tasks()] == ["b3"]
@@ -0,0 +1,118 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from pathlib import Path
+import sys
+from textwrap import dedent
+
+import pytest
+
+from cylc.flow.job_runner_mgr import JobRunnerManager
+from cylc.flow.task_job_logs import JOB_LOG_STATUS
+
+
+@pytest.fixture
+def fake_runner(tmp_path, monkeypatch):
+    """A job runner which reports the jobs in $FAKE_JOBS as present.
+
+    Calls to the job runner are logged in the "calls" file.
+    """
+    calls = tmp_path / 'calls'
+    calls.touch()
+    script = tmp_path / 'fake-qstat'
+    script.write_text(dedent(f'''
+        #!{sys.executable}
+        import os
+        import sys
+        with open({str(calls)!r}, 'a') as handle:
+            handle.write(' '.join(sys.argv[1:]) + '\\n')
+        print('JOBID STATE')
+        for job_id in os.environ['FAKE_JOBS'].split():
+            if '--all' in sys.argv or job_id in sys.argv:
+                print(f'{{job_id}} R')
+    ''').lstrip())
+    script.chmod(0o755)
+
+    class FakeHandler:
+        POLL_CMD = str(script)
+        POLL_ALL_CMD_TMPL = f"{script} --all -u '%(user)s'"
+
+    monkeypatch.setitem(JobRunnerManager._INSTANCES, 'fake', FakeHandler())
+    monkeypatch.setattr(
+        JobRunnerManager, 'STATUS_CACHE_DIR', str(tmp_path / 'cache'))
+    return calls
+
+
+def make_jobs(tmp_path, job_ids):
+    """Write job status files for jobs submitted to the fake job runner."""
+    job_log_root = tmp_path / 'log' / 'job'
+    job_log_dirs = []
+    for job_id in job_ids:
+        job_log_dir = f'1/foo{job_id}/01'
+        (job_log_root / job_log_dir).mkdir(parents=True)
+        (job_log_root / job_log_dir / JOB_LOG_STATUS).write_text(
+            'CYLC_JOB_RUNNER_NAME=fake\n'
+            f'CYLC_JOB_ID={job_id}\n'
+        )
+        job_log_dirs.append(job_log_dir)
+    return str(job_log_root), job_log_dirs
+
+
+def exited(job_log_root, job_log_dirs):
+    """Return the job log dirs of jobs polled to have left the job runner."""
+    return [
+        job_log_dir
+        for job_log_dir in job_log_dirs
+        if JobRunnerManager.CYLC_JOB_RUNNER_EXIT_POLLED in Path(
+            job_log_root, job_log_dir, JOB_LOG_STATUS
+        ).read_text()
+    ]
+
+
+def test_jobs_poll(fake_runner, tmp_path, monkeypatch):
+    """It should mark jobs missing from the poll output as exited."""
+    monkeypatch.setenv('FAKE_JOBS', '1 3')
+    job_log_root, job_log_dirs = make_jobs(tmp_path, ['1', '2', '3'])
+    JobRunnerManager().jobs_poll(job_log_root, job_log_dirs)
+    assert exited(job_log_root, job_log_dirs) == ['1/foo2/01']
+    assert fake_runner.read_text() == '1 2 3\n'
+
+
+def test_jobs_poll_status_cache(fake_runner, tmp_path, monkeypatch):
+    """It should share a list of the user's jobs between polls."""
+    monkeypatch.setenv('FAKE_JOBS', '1 2')
+    job_log_root, job_log_dirs = make_jobs(tmp_path, ['1', '2'])
+    for _ in range(3):
+        JobRunnerManager().jobs_poll(
+            job_log_root, job_log_dirs, status_cache=60)
+    assert not exited(job_log_root, job_log_dirs)
+    # the job runner was only queried once
+    assert fake_runner.read_text().startswith('--all -u')
+    assert len(fake_runner.read_text().splitlines()) == 1
+
+    # jobs missing from the list (e.g. submitted since) are queried
+    monkeypatch.setenv('FAKE_JOBS', '1 2 3')
+    job_log_root, job_log_dirs = make_jobs(tmp_path / 'new', ['3', '4'])
+    JobRunnerManager().jobs_poll(job_log_root, job_log_dirs, status_cache=60)
+    assert fake_runner.read_text().splitlines()[1:] == ['3 4']
+    assert exited(job_log_root, job_log_dirs) == ['1/foo4/01']
+
+    # the list is refreshed when it gets too old
+    cache_file, = (tmp_path / 'cache').glob('*-fake.json')
+    os.utime(cache_file, (0, 0))
+    JobRunnerManager().jobs_poll(job_log_root, job_log_dirs, status_cache=60)
+    assert fake_runner.read_text().splitlines()[2].startswith('--all')
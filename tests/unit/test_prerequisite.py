@@ -0,0 +1,113 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from itertools import product
+
+import pytest
+
+from cylc.flow.cycling.integer import IntegerPoint
+from cylc.flow.exceptions import TriggerExpressionError
+from cylc.flow.prerequisite import Prerequisite
+
+
+@pytest.mark.parametrize(
+    'expr',
+    [
+        'a|b',
+        'a|b&c',
+        '(a|b)&c',
+        'a&(b|c)|d',
+        '((a|b)&(c|d))|a&d',
+        'a | b & ( c | d )',
+    ]
+)
+def test_conditional(expr):
+    """Conditional prerequisites agree with Python boolean logic."""
+    names = sorted({char for char in expr if char.isalpha()})
+    for states in product([False, True], repeat=len(names)):
+        prereq = Prerequisite(IntegerPoint('1'))
+        for name in names:
+            prereq.add(name, '1', 'succeeded')
+        prereq.set_condition(''.join(
+            Prerequisite.MESSAGE_TEMPLATE % (char, '1', 'succeeded')
+            if char.isalpha() else char
+            for char in expr
+        ))
+        satisfied = {
+            (name, '1', 'succeeded')
+            for name, state in zip(names, states)
+            if state
+        }
+        prereq.satisfy_me(satisfied)
+        expected = eval(  # nosec
+            ''.join(
+                str(dict(zip(names, states)).get(char, char))
+                for char in expr
+            )
+        )
+        assert prereq.is_satisfied() == bool(expected), satisfied
+
+
+def test_conditional_shared():
+    """Prerequisites of the same shape share their compiled expression."""
+    prereqs = []
+    for point in ('1', '2'):
+        prereq = Prerequisite(IntegerPoint(point))
+        prereq.add('a', point, 'succeeded')
+        prereq.add('b', point, 'failed')
+        prereq.set_condition(f'a.{point} succeeded|b.{point} failed')
+        prereqs.append(prereq)
+    assert prereqs[0].conditional_expression == '<0>|<1>'
+    assert (
+        prereqs[0].conditional_expression
+        is prereqs[1].conditional_expression
+    )
+    assert (
+        prereqs[1].get_raw_conditional_expression()
+        == 'a.2 succeeded|b.2 failed'
+    )
+
+
+def test_conditional_overlapping_messages():
+    """A message which is part of another must not be confused with it."""
+    prereq = Prerequisite(IntegerPoint('1'))
+    prereq.add('a', '1', 'succeeded')
+    prereq.add('aa', '1', 'succeeded')
+    prereq.set_condition('a.1 succeeded|aa.1 succeeded')
+    assert prereq.conditional_expression == '<0>|<1>'
+    prereq.satisfy_me({('aa', '1', 'succeeded')})
+    assert prereq.is_satisfied()
+
+
+@pytest.mark.parametrize(
+    'expr, error',
+    [
+        ('(a.1 succeeded|b.1 succeeded', 'unmatched parentheses'),
+        ('a.1 succeeded|b.1 succeeded)', 'unmatched parentheses'),
+        ('a.1 succeeded|@wall_clock', 'invalid syntax at "@wall_clock"'),
+        ('a.1 succeeded||b.1 succeeded', 'unexpected "|"'),
+    ]
+)
+def test_conditional_error(expr, error):
+    """Invalid expressions are reported when evaluated."""
+    prereq = Prerequisite(IntegerPoint('1'))
+    prereq.add('a', '1', 'succeeded')
+    prereq.add('b', '1', 'succeeded')
+    prereq.set_condition(expr)
+    with pytest.raises(TriggerExpressionError) as exc:
+        prereq.is_satisfied()
+    assert error in str(exc.value)
+    assert expr in str(exc.value)
@@ -0,0 +1,217 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Tests for the priority task queue manager module
+
+import pytest
+from unittest.mock import Mock
+
+from cylc.flow.exceptions import WorkflowConfigError
+from cylc.flow.task_queues.priority import (
+    PriorityQueueManager,
+    get_critical_paths
+)
+
+
+# a => b => c, with post1..post4 each run off a
+GRAPH = {
+    "a": ["b", "post1", "post2", "post3", "post4"],
+    "b": ["c"],
+    "c": [],
+    "post1": [],
+    "post2": [],
+    "post3": [],
+    "post4": [],
+}
+
+ALL_TASK_NAMES = list(GRAPH)
+
+DESCENDANTS = {
+    "root": ALL_TASK_NAMES + ["POST"],
+    "POST": ["post1", "post2", "post3", "post4"],
+}
+
+
+def get_qconfig():
+    return {
+        "default": {
+            "limit": 0,
+            "members": [],
+        },
+        "post": {
+            "limit": 0,
+            "members": ["POST"],
+        },
+    }
+
+
+def get_config(limit=0, order=None, offset=None):
+    taskdefs = {}
+    for name, children in GRAPH.items():
+        taskdefs[name] = Mock(
+            graph_children={
+                "seq": {
+                    "succeeded": [
+                        (child, Mock(cycle_point_offset=offset))
+                        for child in children
+                    ]
+                }
+            }
+        )
+    config = Mock(taskdefs=taskdefs)
+    config.cfg = {
+        "scheduling": {
+            "active task limit": limit,
+            "queue priority": order or [
+                "priority", "cycle point", "critical path"],
+        }
+    }
+    return config
+
+
+def make_task(name, point=1):
+    itask = Mock(point=point)
+    itask.tdef.name = name
+    return itask
+
+
+def test_get_critical_paths():
+    """Test critical path lengths include same-cycle children only."""
+    assert get_critical_paths(get_config()) == {
+        "a": 3, "b": 2, "c": 1,
+        "post1": 1, "post2": 1, "post3": 1, "post4": 1
+    }
+    assert set(get_critical_paths(get_config(offset="-P1")).values()) == {1}
+
+
+def test_get_critical_paths_long_chain():
+    """Test critical paths of a chain too long to search recursively."""
+    length = 5000
+    taskdefs = {
+        f"t{num}": Mock(
+            graph_children={
+                "seq": {
+                    "succeeded": [
+                        (f"t{num + 1}", Mock(cycle_point_offset=None))
+                    ] if num + 1 < length else []
+                }
+            }
+        )
+        # (in reverse so the search starts at the end of the chain)
+        for num in reversed(range(length))
+    }
+    lengths = get_critical_paths(Mock(taskdefs=taskdefs))
+    assert lengths["t0"] == length
+    assert lengths[f"t{length - 1}"] == 1
+
+
+def test_get_critical_paths_cyclic():
+    """Test cyclic dependence is ignored."""
+    taskdefs = {
+        name: Mock(
+            graph_children={
+                "seq": {"succeeded": [(child, Mock(cycle_point_offset=None))]}
+            }
+        )
+        for name, child in (("a", "b"), ("b", "a"))
+    }
+    assert get_critical_paths(Mock(taskdefs=taskdefs)) == {"a": 2, "b": 1}
+
+
+@pytest.mark.parametrize(
+    "order, expected",
+    [
+        (None, ["b.1", "post1.1", "post2.1", "b.2", "post3.2"]),
+        (
+            ["critical path", "cycle point"],
+            ["b.1", "b.2", "post1.1", "post2.1", "post3.2"]
+        ),
+    ]
+)
+def test_release_order(order, expected):
+    """Test tasks are released in priority order."""
+    qconfig = get_qconfig()
+    del qconfig["post"]
+    queue_mgr = PriorityQueueManager(
+        qconfig, ALL_TASK_NAMES, DESCENDANTS, get_config(order=order))
+    for name, point in [
+        ("post3", 2), ("b", 2), ("post1", 1), ("post2", 1), ("b", 1)
+    ]:
+        queue_mgr.push_task(make_task(name, point))
+    released = queue_mgr.release_tasks()
+    assert [
+        f"{itask.tdef.name}.{itask.point}" for itask in released
+    ] == expected
+
+
+def test_queue_priority():
+    """Test the priority of queues takes precedence."""
+    qconfig = get_qconfig()
+    qconfig["post"]["priority"] = 1
+    queue_mgr = PriorityQueueManager(
+        qconfig, ALL_TASK_NAMES, DESCENDANTS, get_config(limit=1))
+    queue_mgr.push_task(make_task("b"))
+    queue_mgr.push_task(make_task("post1"))
+    assert [r.tdef.name for r in queue_mgr.release_tasks()] == ["post1"]
+
+
+def test_fair_share():
+    """Test the active task limit is shared between queues."""
+    qconfig = get_qconfig()
+    qconfig["post"]["share"] = 3
+    queue_mgr = PriorityQueueManager(
+        qconfig, ALL_TASK_NAMES, DESCENDANTS, get_config(limit=4))
+    for name in ["post1", "post2", "post3", "post4"]:
+        queue_mgr.push_task(make_task(name))
+    for point in range(1, 5):
+        queue_mgr.push_task(make_task("b", point))
+
+    released = queue_mgr.release_tasks()
+    assert sorted(r.tdef.name for r in released) == [
+        "b", "post1", "post2", "post3"]
+    for itask in released:
+        queue_mgr.update_active(itask.tdef.name, 1)
+    assert queue_mgr.release_tasks() == []
+
+    # a default queue task finishing frees capacity for the default queue
+    queue_mgr.update_active("b", -1)
+    released = queue_mgr.release_tasks()
+    assert [(r.tdef.name, r.point) for r in released] == [("b", 2)]
+
+
+def test_remove_and_force_release():
+    """Test removed tasks are not released, force released ones are."""
+    queue_mgr = PriorityQueueManager(
+        get_qconfig(), ALL_TASK_NAMES, DESCENDANTS, get_config(limit=1))
+    tasks = [make_task("b", point) for point in range(1, 4)]
+    for itask in tasks:
+        queue_mgr.push_task(itask)
+    queue_mgr.remove_task(tasks[0])
+    queue_mgr.force_release_task(tasks[2])
+    assert queue_mgr.release_tasks() == [tasks[1], tasks[2]]
+
+
+def test_bad_config():
+    """Test invalid settings are rejected."""
+    with pytest.raises(WorkflowConfigError):
+        PriorityQueueManager(
+            get_qconfig(), ALL_TASK_NAMES, DESCENDANTS,
+            get_config(order=["priority", "name"]))
+    qconfig = get_qconfig()
+    qconfig["post"]["share"] = 0
+    with pytest.raises(WorkflowConfigError):
+        PriorityQueueManager(
+            qconfig, ALL_TASK_NAMES, DESCENDANTS, get_config())
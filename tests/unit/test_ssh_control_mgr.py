@@ -0,0 +1,214 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from pathlib import Path
+import shlex
+import subprocess
+import sys
+from time import sleep, time
+from unittest.mock import Mock
+
+import pytest
+
+from cylc.flow.ssh_control_mgr import SSHControlMgr
+
+FAKE_SSH = Path(__file__).parent / 'fake_ssh.py'
+
+
+@pytest.fixture
+def platform():
+    return {
+        'ssh command': f'{sys.executable} {FAKE_SSH}',
+        'ssh control persist': 60.0,
+        'hosts': ['fakehost'],
+    }
+
+
+@pytest.fixture
+def ssh_control_mgr(monkeypatch):
+    monkeypatch.setenv('FAKE_SSH_DELAY', '1')
+    ssh_control_mgr = SSHControlMgr(Mock())
+    yield ssh_control_mgr
+    ssh_control_mgr.close()
+
+
+def wait_connected(master, timeout=10):
+    """Wait for a master to start listening."""
+    timeout += time()
+    while not master.is_connected():
+        assert time() < timeout
+        sleep(0.05)
+
+
+def ssh(ssh_cmd, *command):
+    return subprocess.run(
+        [*shlex.split(ssh_cmd), '-n', 'fakehost', *command],
+        stdout=subprocess.PIPE,
+        check=True
+    ).stdout.decode()
+
+
+def test_no_sharing(ssh_control_mgr, platform):
+    """Test the ssh command is unchanged if sharing is disabled."""
+    platform['ssh control persist'] = 0.0
+    assert (
+        ssh_control_mgr.get_ssh_cmd(platform, 'fakehost')
+        == platform['ssh command']
+    )
+    assert not ssh_control_mgr.masters
+
+
+def test_shared_connection(ssh_control_mgr, platform):
+    """Test commands are run over the master connection."""
+    ssh_cmd = ssh_control_mgr.get_ssh_cmd(platform, 'fakehost')
+    master, = ssh_control_mgr.masters.values()
+    # commands work while the master is connecting
+    assert ssh(ssh_cmd, 'echo', 'hello') == 'hello\n'
+    wait_connected(master)
+    # and (without the connection delay) once it has
+    start = time()
+    assert ssh(ssh_cmd, 'echo', 'hello') == 'hello\n'
+    assert time() - start < 1
+    # the master is re-used
+    assert ssh_control_mgr.get_ssh_cmd(platform, 'fakehost') == ssh_cmd
+    assert list(ssh_control_mgr.masters.values()) == [master]
+    # other hosts get their own master
+    ssh_control_mgr.get_ssh_cmd(platform, 'otherhost')
+    assert len(ssh_control_mgr.masters) == 2
+
+    ssh_control_mgr.close()
+    assert not master.is_alive()
+    assert not Path(master.socket).parent.exists()
+
+
+def test_construct_ssh_cmd(ssh_control_mgr, platform):
+    """Test construct_ssh_cmd uses the master connection."""
+    platform.update({'cylc path': None, 'use login shell': False})
+    cmd = ssh_control_mgr.construct_ssh_cmd(['version'], platform)
+    master, = ssh_control_mgr.masters.values()
+    assert f'-oControlPath={master.socket}' in cmd
+    assert cmd[cmd.index('-oControlMaster=no') + 2] == 'fakehost'
+
+
+def run_command(ctx, callback, *args):
+    """Run a command submitted to the (mock) process pool."""
+    ctx.ret_code = subprocess.run(ctx.cmd).returncode
+    callback(ctx, *args)
+
+
+def test_check(ssh_control_mgr, platform):
+    """Test health checks retire or stop dead, idle and unresponsive masters.
+    """
+    ssh_control_mgr.RESTART_DELAY = 0
+    ssh_control_mgr.get_ssh_cmd(platform, 'fakehost')
+    master, = ssh_control_mgr.masters.values()
+    wait_connected(master)
+    put_command = ssh_control_mgr.proc_pool.put_command
+
+    # checks are rate limited
+    ssh_control_mgr.check()
+    assert not put_command.called
+
+    # healthy master
+    ssh_control_mgr.next_check = 0
+    ssh_control_mgr.check()
+    ctx, callback, args = put_command.call_args[0]
+    assert ctx.cmd == [
+        *shlex.split(master.get_ssh_cmd()), '-O', 'check', 'fakehost']
+    run_command(ctx, callback, *args)
+    assert master.is_alive()
+    assert ssh_control_mgr.masters
+
+    # unresponsive master
+    ctx.ret_code = 255
+    callback(ctx, *args)
+    assert not ssh_control_mgr.masters
+    assert ssh_control_mgr.retired == [master]
+    ctx, callback, args = put_command.call_args[0]
+    assert ctx.cmd == [
+        *shlex.split(master.get_ssh_cmd()), '-O', 'stop', 'fakehost']
+    run_command(ctx, callback, *args)
+    ssh_control_mgr.next_check = 0
+    ssh_control_mgr.check()
+    assert not ssh_control_mgr.retired
+    # a new one is started on next use
+    ssh_control_mgr.get_ssh_cmd(platform, 'fakehost')
+    new_master, = ssh_control_mgr.masters.values()
+    assert new_master is not master
+    assert new_master.socket != master.socket
+    master = new_master
+    assert master.is_alive()
+
+    # dead master
+    wait_connected(master)
+    subprocess.run(master.get_control_cmd('exit'))
+    ssh_control_mgr.next_check = 0
+    ssh_control_mgr.check()
+    assert master.proc is None
+
+    # idle master
+    ssh_control_mgr.get_ssh_cmd(platform, 'fakehost')
+    master.last_used -= 61
+    ssh_control_mgr.next_check = 0
+    ssh_control_mgr.check()
+    assert ssh_control_mgr.retired == [master]
+
+    # retired masters which can't be stopped are terminated
+    ctx, callback, args = put_command.call_args[0]
+    ctx.ret_code = 255
+    callback(ctx, *args)
+    assert not master.is_alive()
+
+
+def test_retire(ssh_control_mgr, platform):
+    """Test commands running over a retired master are left to finish."""
+    ssh_cmd = ssh_control_mgr.get_ssh_cmd(platform, 'fakehost')
+    master, = ssh_control_mgr.masters.values()
+    wait_connected(master)
+    proc = subprocess.Popen(
+        [*shlex.split(ssh_cmd), '-n', 'fakehost', 'sleep 1; echo done'],
+        stdout=subprocess.PIPE
+    )
+    sleep(0.2)
+
+    master.last_used -= 61
+    ssh_control_mgr.next_check = 0
+    ssh_control_mgr.check()
+    run_command(*ssh_control_mgr.proc_pool.put_command.call_args[0])
+    # the master stops accepting new commands
+    assert not Path(master.socket).exists()
+    # but the running command finishes
+    assert proc.communicate()[0] == b'done\n'
+    ssh_control_mgr.next_check = 0
+    ssh_control_mgr.check()
+    assert not ssh_control_mgr.retired
+
+
+def test_orphaned_master(ssh_control_mgr, platform):
+    """Test masters exit by themselves if the scheduler goes away."""
+    platform['ssh control persist'] = 1.0
+    ssh_cmd = ssh_control_mgr.get_ssh_cmd(platform, 'fakehost')
+    master, = ssh_control_mgr.masters.values()
+    wait_connected(master)
+    # the master outlives the process the scheduler started
+    master.proc.wait(10)
+    assert ssh(ssh_cmd, 'echo', 'hello') == 'hello\n'
+    # and exits once idle, without the manager retiring it
+    ssh_control_mgr.masters.clear()
+    timeout = time() + 10
+    while master.is_connected():
+        assert time() < timeout
+        sleep(0.1)
@@ -14,12 +14,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 from tempfile import NamedTemporaryFile, SpooledTemporaryFile, TemporaryFile,\
     TemporaryDirectory
 import unittest
 
 from pathlib import Path
 
+import pytest
+
 from cylc.flow.subprocctx import SubProcContext
 from cylc.flow.subprocpool import SubProcPool, _XTRIG_FUNCS, get_func
 
@@ -195,5 +198,173 @@ class TestSubProcPool(unittest.TestCase):
                 get_func("the_sword", temp_dir)
 
 
+async def _join(pool):
+    """Wait for the pool to empty."""
+    while pool.is_not_done():
+        pool.process()
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_put_command():
+    """It should run commands as they are queued and call back on exit."""
+    pool = SubProcPool()
+    pool.size = 2
+    results = []
+    for cmd in (['echo', 'pirate'], ['bash', '-c', 'echo arr >&2; exit 2']):
+        pool.put_command(
+            SubProcContext('parrot', cmd, stdin_str='x'),
+            lambda ctx, *args: results.append(
+                (ctx.out, ctx.err, ctx.ret_code, args)),
+            ['a', 'b']
+        )
+    assert len(pool.runnings) == 2
+    pool.put_command(SubProcContext('truth', ['true']))
+    # no room in the pool
+    assert len(pool.queuings) == 1
+    await _join(pool)
+    assert sorted(results, key=str) == [
+        ('pirate\n', None, 0, ('a', 'b')),
+        (None, 'arr\n', 2, ('a', 'b')),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_put_command_bad_command():
+    """It should call back if the command cannot be run."""
+    pool = SubProcPool()
+    results = []
+    pool.put_command(
+        SubProcContext('bad', ['no-such-command-here']),
+        lambda ctx: results.append(ctx.ret_code)
+    )
+    await _join(pool)
+    assert results == [1]
+
+
+@pytest.mark.asyncio
+async def test_put_command_timeout():
+    """It should kill commands which run for too long."""
+    pool = SubProcPool()
+    pool.proc_pool_timeout = 0.2
+    results = []
+    pool.put_command(
+        SubProcContext('sleepy', ['sleep', '10']),
+        lambda ctx: results.append(ctx)
+    )
+    await _join(pool)
+    ctx, = results
+    assert ctx.ret_code == -9
+    assert 'killed on timeout (0.2)' in ctx.err
+
+
+@pytest.mark.asyncio
+async def test_callback_error():
+    """It should re-raise callback errors from process()."""
+    def _callback(ctx):
+        raise ValueError('bad callback')
+
+    pool = SubProcPool()
+    pool.put_command(SubProcContext('truth', ['true']), _callback)
+    await pool.join()
+    with pytest.raises(ValueError, match='bad callback'):
+        pool.process()
+    pool.process()
+
+
+def test_put_command_no_loop():
+    """It should launch commands queued without an event loop later."""
+    pool = SubProcPool()
+    results = []
+    pool.put_command(
+        SubProcContext('truth', ['true']),
+        lambda ctx: results.append(ctx.ret_code)
+    )
+    assert len(pool.queuings) == 1
+    assert not pool.runnings
+    asyncio.run(_join(pool))
+    assert results == [0]
+
+
+@pytest.mark.asyncio
+async def test_terminate():
+    """It should kill running commands and fail queued ones."""
+    pool = SubProcPool()
+    pool.size = 1
+    results = []
+    for _ in range(2):
+        pool.put_command(
+            SubProcContext('sleepy', ['sleep', '10']),
+            lambda ctx: results.append(ctx.ret_code)
+        )
+    # let the first command start
+    await asyncio.sleep(0.2)
+    pool.terminate()
+    await pool.join()
+    assert not pool.is_not_done()
+    assert results == [-9]
+
+
+@pytest.mark.asyncio
+async def test_put_command_coalesce():
+    """It should run commands with the same key once."""
+    pool = SubProcPool()
+    pool.size = 1
+    results = []
+    # occupy the pool so the next commands are queued
+    pool.put_command(SubProcContext('sleepy', ['sleep', '0.2']))
+    for arg in ('a', 'b', 'c'):
+        pool.put_command(
+            SubProcContext('parrot', ['echo', 'pirate']),
+            lambda ctx, arg: results.append((ctx.out, ctx.ret_code, arg)),
+            [arg],
+            key='parrot'
+        )
+    pool.put_command(
+        SubProcContext('parrot', ['echo', 'arr']),
+        lambda ctx: results.append((ctx.out, ctx.ret_code, 'd')),
+        key='arr'
+    )
+    assert len(pool.queuings) == 2
+    await _join(pool)
+    assert results == [
+        ('pirate\n', 0, 'a'),
+        ('pirate\n', 0, 'b'),
+        ('pirate\n', 0, 'c'),
+        ('arr\n', 0, 'd'),
+    ]
+    assert pool.stats == {'run': 3, 'coalesced': 2}
+    assert not pool.coalescing
+
+    # the key can be used again once the command has exited
+    pool.put_command(
+        SubProcContext('parrot', ['echo', 'pirate']),
+        lambda ctx: results.append((ctx.out, ctx.ret_code, 'e')),
+        key='parrot'
+    )
+    await _join(pool)
+    assert results[-1] == ('pirate\n', 0, 'e')
+    assert pool.stats == {'run': 4, 'coalesced': 2}
+
+
+@pytest.mark.asyncio
+async def test_terminate_coalesced():
+    """It should fail queued commands with the same key."""
+    pool = SubProcPool()
+    pool.size = 1
+    ctxs = [SubProcContext('sleepy', ['sleep', '10']) for _ in range(3)]
+    for ctx in ctxs:
+        pool.put_command(ctx, key=('sleepy' if ctx is not ctxs[0] else None))
+    await asyncio.sleep(0.2)
+    pool.terminate()
+    await pool.join()
+    assert not pool.coalescing
+    assert [ctx.ret_code for ctx in ctxs] == [
+        -9,
+        SubProcPool.RET_CODE_WORKFLOW_STOPPING,
+        SubProcPool.RET_CODE_WORKFLOW_STOPPING,
+    ]
+
+
 if __name__ == '__main__':
     unittest.main()
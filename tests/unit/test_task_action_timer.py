@@ -0,0 +1,64 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from cylc.flow.task_action_timer import TaskActionTimer, TimerQueue
+
+
+def test_timer_queue_pop_due():
+    """Keys are popped once, earliest first, strictly before now."""
+    queue = TimerQueue()
+    queue.schedule('b', 2.0)
+    queue.schedule('a', 1.0)
+    queue.schedule('c', 3.0)
+    assert queue.pop_due(1.0) == []
+    assert queue.pop_due(2.5) == ['a', 'b']
+    assert queue.pop_due(2.5) == []
+    assert 'c' in queue
+    assert len(queue) == 1
+
+
+def test_timer_queue_reschedule():
+    """Rescheduled or cancelled keys do not fall due at the old time."""
+    queue = TimerQueue()
+    queue.schedule('a', 1.0)
+    queue.schedule('b', 1.0)
+    queue.schedule('a', 5.0)
+    queue.schedule('b', None)
+    assert queue.next_due() == 5.0
+    assert queue.pop_due(2.0) == []
+    queue.schedule('a', 1.0)
+    assert queue.pop_due(2.0) == ['a']
+    assert queue.next_due() is None
+
+
+def test_timer_queue_compaction():
+    """Stale heap entries do not accumulate."""
+    queue = TimerQueue()
+    for due in range(1000):
+        queue.schedule('a', float(due))
+    assert len(queue) == 1
+    assert len(queue._heap) < 100
+    assert queue.pop_due(1000.0) == ['a']
+
+
+def test_timer_queue_with_action_timer():
+    """Due times agree with TaskActionTimer.is_delay_done."""
+    timer = TaskActionTimer(delays=[10])
+    timer.next()
+    queue = TimerQueue()
+    queue.schedule('a', timer.timeout)
+    for now in (timer.timeout - 1, timer.timeout, timer.timeout + 1):
+        assert bool(queue.pop_due(now)) == timer.is_delay_done(now)
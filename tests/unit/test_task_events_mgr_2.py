@@ -18,7 +18,11 @@ from unittest.mock import Mock
 import pytest
 
 
-from cylc.flow.task_events_mgr import TaskEventsManager
+from cylc.flow.task_action_timer import TaskActionTimer
+from cylc.flow.task_events_mgr import (
+    CustomTaskEventHandlerContext,
+    TaskEventsManager
+)
 
 
 @pytest.mark.parametrize(
@@ -103,3 +107,70 @@ def test_get_workflow_platforms_conf(broadcast, workflow, platforms, expected):
         task_events_mgr._get_workflow_platforms_conf(itask, KEY, DEFAULT) ==
         expected
     )
+
+
+def test_process_events_due_timers_only():
+    """Test TaskEventsManager.process_events only runs handlers due."""
+    task_events_mgr = TaskEventsManager(
+        None, Mock(), None, None, None, None, None, None)
+    timers = {}
+    for name, delays in (('now', [0]), ('later', [3600]), ('busy', [0])):
+        id_key = (
+            ('event-handler-00', 'failed'), '1', name, 1)
+        timers[name] = TaskActionTimer(
+            CustomTaskEventHandlerContext(
+                id_key[0], task_events_mgr.HANDLER_CUSTOM, 'true'),
+            delays)
+        task_events_mgr.add_event_timer(id_key, timers[name])
+    timers['busy'].set_waiting()
+    schd = Mock(stop_mode=None)
+
+    task_events_mgr.process_events(schd)
+    assert task_events_mgr.proc_pool.put_command.call_count == 1
+    assert timers['now'].is_waiting
+    assert not timers['later'].is_waiting
+    assert timers['later'].is_timeout_set()
+
+    # Nothing new is due.
+    task_events_mgr.process_events(schd)
+    assert task_events_mgr.proc_pool.put_command.call_count == 1
+
+    # A failed handler is retried (here, with no more delays: removed).
+    id_key = (('event-handler-00', 'failed'), '1', 'now', 1)
+    task_events_mgr.unset_waiting_event_timer(id_key)
+    task_events_mgr.process_events(schd)
+    assert id_key not in task_events_mgr._event_timers
+
+
+def test_check_messaging():
+    """Test TaskEventsManager records whether task messaging is working."""
+    task_events_mgr = TaskEventsManager(
+        None, None, None, None, None, None, None, None)
+    platform = {'name': 'hpc', 'communication method': 'zmq'}
+    assert task_events_mgr.is_messaging(platform)
+
+    # poll finds a job has started before it reported it
+    itask = Mock(platform=platform, state=Mock(return_value=True))
+    task_events_mgr._check_messaging(
+        itask, 'started', task_events_mgr.FLAG_POLLED)
+    assert not task_events_mgr.is_messaging(platform)
+
+    # a message arrives from a job
+    task_events_mgr._check_messaging(
+        itask, 'started', task_events_mgr.FLAG_RECEIVED)
+    assert task_events_mgr.is_messaging(platform)
+
+    # poll confirms what we already know
+    itask.state.return_value = False
+    task_events_mgr._check_messaging(
+        itask, 'started', task_events_mgr.FLAG_POLLED)
+    assert task_events_mgr.is_messaging(platform)
+
+    assert not task_events_mgr.is_messaging(
+        {'name': 'other', 'communication method': 'poll'})
+
+    # simulated jobs have no platform
+    itask = Mock(platform='SIMULATION', tdef=Mock(run_mode='simulation'))
+    task_events_mgr._check_messaging(
+        itask, 'started', task_events_mgr.FLAG_RECEIVED)
+    assert task_events_mgr.platform_messaging == {'hpc': True}
@@ -22,7 +22,7 @@ from unittest.mock import Mock
 from cylc.flow.cycling import PointBase
 from cylc.flow.cycling.integer import IntegerPoint
 from cylc.flow.cycling.iso8601 import ISO8601Point
-from cylc.flow.task_proxy import TaskProxy
+from cylc.flow.task_proxy import GhostTask, TaskProxy
 
 
 @pytest.mark.parametrize(
@@ -81,3 +81,30 @@ def test_status_match(status_str: Optional[str], expected: bool):
     mock_itask = Mock(state=Mock(status='waiting'))
 
     assert TaskProxy.status_match(mock_itask, status_str) is expected
+
+
+def test_ghost_task(monkeypatch: pytest.MonkeyPatch):
+    """Test GhostTask generates graph children and state on demand."""
+    point = IntegerPoint(1)
+    children = {'succeeded': [('bar', point, False)]}
+    mock_generate_graph_children = Mock(return_value=children)
+    monkeypatch.setattr(
+        'cylc.flow.task_proxy.generate_graph_children',
+        mock_generate_graph_children)
+    mock_task_state = Mock()
+    monkeypatch.setattr('cylc.flow.task_proxy.TaskState', mock_task_state)
+    mock_tdef = Mock()
+    mock_tdef.name = 'foo'
+
+    ghost = GhostTask(mock_tdef, point, 'x')
+    assert ghost.identity == 'foo.1'
+    mock_generate_graph_children.assert_not_called()
+    mock_task_state.assert_not_called()
+
+    assert ghost.graph_children == children
+    assert ghost.graph_children == children
+    mock_generate_graph_children.assert_called_once_with(mock_tdef, point)
+
+    assert ghost.state is ghost.state
+    mock_task_state.assert_called_once_with(mock_tdef, point, 'waiting', False)
+    ghost.state.outputs.add.assert_called_once_with('succeeded')
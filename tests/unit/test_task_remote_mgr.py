@@ -16,7 +16,7 @@
 
 import pytest
 from typing import Any
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock
 
 from cylc.flow.network.client_factory import CommsMeth
 from cylc.flow.task_remote_mgr import (
@@ -46,9 +46,8 @@ def test_remote_init_skip(
         'communication method': CommsMeth.POLL
     }
     mock_task_remote_mgr = MagicMock(remote_init_map={})
-    mock_construct_ssh_cmd = Mock()
-    monkeypatch.setattr('cylc.flow.task_remote_mgr.construct_ssh_cmd',
-                        mock_construct_ssh_cmd)
+    mock_construct_ssh_cmd = (
+        mock_task_remote_mgr.ssh_control_mgr.construct_ssh_cmd)
     for item in (
             'tarfile',
             'get_remote_workflow_run_dir',
@@ -0,0 +1,74 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest.mock import Mock
+
+from cylc.flow.cycling.integer import IntegerPoint
+from cylc.flow.task_trigger import TaskTrigger
+from cylc.flow.taskdef import (
+    TaskDef,
+    generate_graph_children,
+    generate_graph_parents
+)
+
+
+def test_generate_graph_children_cache():
+    """Graph children are cached per point and invalidated on change."""
+    tdef = TaskDef('foo', {}, 'live', '1', '1')
+    seq = Mock(is_valid=Mock(return_value=True))
+    tdef.add_graph_child(TaskTrigger('foo', None, 'succeeded'), 'bar', seq)
+
+    children = generate_graph_children(tdef, IntegerPoint(1))
+    assert children == {'succeeded': [('bar', IntegerPoint(1), False)]}
+    assert generate_graph_children(tdef, IntegerPoint(1)) is children
+    assert seq.is_valid.call_count == 1
+    assert (
+        generate_graph_children(tdef, IntegerPoint(2))
+        == {'succeeded': [('bar', IntegerPoint(2), False)]}
+    )
+
+    tdef.add_graph_child(TaskTrigger('foo', None, 'succeeded'), 'baz', seq)
+    assert generate_graph_children(tdef, IntegerPoint(1)) == {
+        'succeeded': [
+            ('bar', IntegerPoint(1), False),
+            ('baz', IntegerPoint(1), False)
+        ]
+    }
+
+
+def test_generate_graph_parents_cache():
+    """Graph parents are cached per point and invalidated on change."""
+    tdef = TaskDef('bar', {}, 'live', '1', '1')
+    seq = Mock(is_valid=Mock(return_value=True))
+    tdef.add_graph_parent(TaskTrigger('foo', None, 'succeeded'), 'foo', seq)
+
+    parents = generate_graph_parents(tdef, IntegerPoint(1))
+    assert parents == {seq: [('foo', IntegerPoint(1), False)]}
+    assert generate_graph_parents(tdef, IntegerPoint(1)) is parents
+
+    tdef.add_graph_parent(TaskTrigger('baz', None, 'succeeded'), 'baz', seq)
+    assert len(generate_graph_parents(tdef, IntegerPoint(1))[seq]) == 2
+
+
+def test_graph_cache_size():
+    """The oldest cached points are dropped."""
+    tdef = TaskDef('foo', {}, 'live', '1', '1')
+    for point in range(TaskDef.MAX_LEN_GRAPH_CACHE + 5):
+        generate_graph_children(tdef, IntegerPoint(point))
+    assert len(tdef.graph_children_cache) == TaskDef.MAX_LEN_GRAPH_CACHE
+    assert IntegerPoint(0) not in tdef.graph_children_cache
+    assert IntegerPoint(
+        TaskDef.MAX_LEN_GRAPH_CACHE + 4) in tdef.graph_children_cache
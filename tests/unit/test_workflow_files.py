@@ -41,9 +41,12 @@ from cylc.flow.workflow_files import (
     check_nested_run_dirs,
     get_symlink_dirs,
     get_workflow_source_dir,
+    dump_registry,
     glob_in_run_dir,
+    load_registry,
     reinstall_workflow,
-    search_install_source_dirs
+    search_install_source_dirs,
+    update_registry
 )
 
 from .conftest import MonkeyMock
@@ -1441,3 +1444,38 @@ def test_check_flow_file_symlink(
                 log_msg = f'{log_msg}. Symlink created.'
         assert result == tmp_path.joinpath(expected_file)
         assert caplog.messages == [log_msg]
+
+
+def test_update_registry(tmp_path: Path):
+    """It should add/remove workflows to/from an existing registry only."""
+    # no registry - nothing to update
+    update_registry(add=['foo'], run_dir=tmp_path)
+    assert load_registry(tmp_path) is None
+
+    dump_registry(['foo', 'bar'], ['foo', 'bar/run1'], tmp_path, {'bar': 1})
+    (tmp_path / 'bar').mkdir()
+    update_registry(add=['baz/run1', 'bar/run2/'], run_dir=tmp_path)
+    assert load_registry(tmp_path) == {
+        'version': 2,
+        'dirs': ['bar', 'baz', 'foo'],
+        'workflows': ['bar/run1', 'bar/run2', 'baz/run1', 'foo'],
+        'mtimes': {'bar': 1},
+    }
+
+    # removing a dir removes the workflows nested within it
+    update_registry(remove=['foo', 'bar'], run_dir=tmp_path)
+    assert load_registry(tmp_path) == {
+        'version': 2,
+        'dirs': ['bar', 'baz'],
+        'workflows': ['baz/run1'],
+        'mtimes': {'bar': 1},
+    }
+
+
+def test_load_registry_bad(tmp_path: Path):
+    """It should ignore registries it cannot read."""
+    registry = workflow_files.get_registry_file(tmp_path)
+    registry.write_text('{"version": 1, "dirs"')
+    assert load_registry(tmp_path) is None
+    registry.write_text('{"version": 1, "dirs": [], "workflows": []}')
+    assert load_registry(tmp_path) is None